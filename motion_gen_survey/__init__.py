@@ -0,0 +1,9 @@
+"""Shared tooling for the motion generation survey workspace.
+
+Modules in this package back the viewers (``animation_viewer``,
+``frame_viewer``; thin wrappers remain in ``tests/``) and the CLI tools in
+``scripts/``. ``python -m motion_gen_survey <command>`` dispatches to the
+per-module command lines. Heavy optional backends (PyVista, torch, SMPL-X)
+are only imported by the modules that need them, and only when first used
+(see :mod:`motion_gen_survey.lazy_import`).
+"""
@@ -0,0 +1,110 @@
+"""Single entry point for the package's command-line tools.
+
+    python -m motion_gen_survey <command> [args...]
+    python -m motion_gen_survey --help
+
+Each command maps to a module's ``main``; only the chosen module is
+imported, and the heavy backends (PyVista/VTK, torch, SMPL-X) are imported
+lazily inside those modules, so ``--help``, argument errors and the
+store / metric / index commands start without them.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from collections.abc import Sequence
+
+
+# command -> (module, one-line help)
+COMMANDS: dict[str, tuple[str, str]] = {
+    "animate": (
+        "motion_gen_survey.animation_viewer",
+        "Interactive or headless skeleton animation (PyVista)",
+    ),
+    "frame": (
+        "motion_gen_survey.frame_viewer",
+        "Single-frame / onion-skin skeleton viewer (PyVista)",
+    ),
+    "store": (
+        "motion_gen_survey.motion_store",
+        "Convert results.npy to memory-mapped motion stores",
+    ),
+    "features": (
+        "motion_gen_survey.features",
+        "Build cached per-frame feature indexes",
+    ),
+    "metrics": (
+        "motion_gen_survey.metrics",
+        "Peak Jerk / Area Under Jerk transition metrics",
+    ),
+    "codec": (
+        "motion_gen_survey.motion_codec",
+        "Compact quantized motion archives: encode, decode, verify",
+    ),
+    "stream": (
+        "motion_gen_survey.stream",
+        "Live frame streaming: replay a result to viewers, tail a stream",
+    ),
+    "retarget": (
+        "motion_gen_survey.retarget",
+        "Resample stores to a common FPS and convert joint sets",
+    ),
+    "report": (
+        "motion_gen_survey.report",
+        "Per-sample trajectory statistics and sanity checks (CSV/Parquet)",
+    ),
+    "index": (
+        "motion_gen_survey.motion_index",
+        "Motion similarity index: build, query, dupes",
+    ),
+    "bake": (
+        "motion_gen_survey.smplx_bake",
+        "Bake SMPL-X pose sequences into the vertex cache (torch or NumPy)",
+    ),
+    "lbs": (
+        "motion_gen_survey.lbs_numpy",
+        "Torch-free SMPL-X skinning: extract compact model, check vs smplx",
+    ),
+    "ik-fit": (
+        "motion_gen_survey.ik_fit",
+        "Fit SMPL-X pose/translation to joint trajectories (torch)",
+    ),
+    "prompt-cache": (
+        "motion_gen_survey.prompt_cache",
+        "Inspect and prune the prompt embedding cache",
+    ),
+    "papers": (
+        "motion_gen_survey.paper_db",
+        "Survey paper database: ingest, full-text/faceted query, tables",
+    ),
+}
+
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = ["usage: python -m motion_gen_survey <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {text}" for name, (_, text) in COMMANDS.items()]
+    lines += [
+        "",
+        "Run 'python -m motion_gen_survey <command> --help' for command options.",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in ("-h", "--help"):
+        print(usage())
+        return
+    command, rest = args[0], args[1:]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        sys.exit(f"\nunknown command: {command}")
+    module = importlib.import_module(COMMANDS[command][0])
+    sys.argv = [f"motion_gen_survey {command}", *rest]
+    module.main(rest)
+
+
+if __name__ == "__main__":
+    main()
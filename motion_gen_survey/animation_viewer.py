@@ -0,0 +1,1530 @@
+"""
+FlowMDM Motion Animation Script
+
+Animates T2M format motion data from FlowMDM results using PyVistaQT.
+- Interactive 3D animation of 22-joint human skeleton
+- Supports both Babel (30 FPS) and HumanML3D (20 FPS) datasets
+- Uses correct T2M kinematic chain structure from HumanML3D documentation
+- Provides play/pause controls and frame scrubbing
+- Grid mode lays out several samples / repetitions side by side in one scene
+- Optional root trail and foot-skate highlight from the cached feature index
+  (motion_gen_survey.features)
+
+Usage:
+    python -m motion_gen_survey animate [--result-dir DIR] [--sample N]
+    python -m motion_gen_survey animate --grid 16 --grid-spacing 1.5
+    python -m motion_gen_survey animate --speed 0.5 --no-interp
+    python -m motion_gen_survey animate --chunk-frames 2048 --cache-chunks 3
+    python -m motion_gen_survey animate --root-trail --skate
+    python -m motion_gen_survey animate --up-axis auto
+    python -m motion_gen_survey animate --result-dir <result_dir>/motion.t2mc
+    python -m motion_gen_survey animate --stream 127.0.0.1:8765
+    python -m motion_gen_survey animate --profile --profile-alloc --profile-json tmp/anim_profile.json
+    python -m motion_gen_survey animate --grid 64 --label-budget 32 --label-every 6
+    python -m motion_gen_survey animate --result-dir model_zoo/FlowMDM/results --headless tmp/renders --workers 8
+
+(``python tests/check-flowmdm-result-animation.py`` is a thin wrapper that
+takes the same arguments.) PyVista, pyvistaqt and VTK are imported lazily
+on first use, so ``--help`` and argument errors do not pay for them.
+
+Controls:
+    - Spacebar: Play/Pause animation
+    - Left/Right arrows: Step frame by frame
+    - '[' / ']': Halve / double playback speed (0.25x - 8x)
+    - 'i': Toggle linear interpolation between source frames
+    - 'r': Reset to frame 0
+    - 'h': Toggle the profiling HUD (with --profile)
+    - 'q': Quit
+
+Animation Implementation Details:
+==============================
+
+The animation system uses efficient in-place geometry updates to achieve smooth real-time motion:
+
+1. **Data Structure**: FlowMDM's pickled results.npy is converted once into a
+   memory-mapped motion store (see motion_gen_survey.motion_store) where each
+   sample is a frame-contiguous (seq_len, 22, 3) float32 slab:
+   - 22 joints represent the T2M human skeleton format
+   - 3 coordinates (x, y, z) per joint
+   - seq_len frames of motion sequence
+   Opening the store maps the file instead of reading it, so start-up cost does
+   not depend on sequence length. The animator reads it through a frame source
+   (motion_gen_survey.frame_source): long sequences are decoded in fixed-size
+   chunks kept in a small LRU, with the next chunk prefetched on a worker
+   thread, so memory stays constant for 200 or 200k frames.
+
+2. **Skeleton Rendering**: Uses a single PyVista PolyData for all N skeletons:
+   - Points: N*22 joint positions (updated each frame)
+   - Lines: Kinematic chain connections, offset by 22*k for skeleton k (static topology)
+   - In-place updates via one np.copyto() over the (N*22, 3) block, so a grid of
+     16-64 samples is still one actor and one render call
+
+3. **Text Updates**: Direct VTK text actor manipulation:
+   - Creates vtk.vtkTextActor once during initialization
+   - Updates content via SetInput() without actor recreation
+   - Zero memory allocation during animation loop
+
+4. **Animation Loop**: Clock-driven frame updates:
+   - Timer callback triggers at display rate (~60 Hz), independent of source FPS
+   - A monotonic PlaybackClock (motion_gen_survey.playback) maps wall time to a
+     fractional source frame using the FPS from the motion store metadata, so
+     playback holds real time; frames are dropped (and counted) when a render
+     overruns, and joints are linearly interpolated between source frames
+   - Each frame: update joint positions → update labels → update status text → render
+   - Efficient geometry updates avoid costly mesh recreation
+
+   Joint labels use level-of-detail (motion_gen_survey.label_lod, --labels lod):
+   - Each skeleton's on-screen height (camera distance, zoom, window size)
+     picks all joint names, key joints, the head only, or nothing; the
+     nearest visible skeletons are labelled first, up to --label-budget
+   - Label anchors follow the geometry every --label-every frames, and the
+     selection is refreshed on camera changes or every 30 frames
+   - Labels are pooled billboard text actors whose rendered text textures
+     are kept and reused across skeletons, so frame time stays flat as the
+     grid grows. --labels first restores the old placement-mapper labels on
+     the first skeleton; --labels none hides them
+
+5. **Instrumentation** (--profile):
+   - A FrameProfiler (motion_gen_survey.instrument) times the copy, label,
+     text and render stages of every frame into preallocated ring buffers
+   - The status text actor gains a second HUD line with per-stage means,
+     frame latency p50/p95 and rolling FPS (refreshed every 15 frames)
+   - --profile-alloc adds per-frame Python heap allocations (tracemalloc);
+     --profile-json writes the rolling summary and latency histogram on exit
+
+6. **Memory Efficiency**:
+   - Skeleton geometry created once, points updated in-place
+   - Text actors reused with content updates only
+   - No dynamic allocation during animation playback
+
+This approach ensures smooth real-time animation even for long motion sequences.
+
+Live Streams:
+============
+
+With --stream ADDRESS the animator connects to a frame producer
+(motion_gen_survey.stream: a generation loop, or ``stream replay``) instead
+of opening a result. An asyncio reader thread appends received frames to a
+growable ring buffer that serves as the frame source; the Qt timer picks up
+the new frame count on every tick, so playback starts with the first frames
+and keeps running while the motion is still being generated. Playback holds
+at the live edge until more frames arrive, and loops normally once the
+producer has sent the whole sequence.
+
+Headless Rendering:
+==================
+
+With --headless OUT_DIR the same scene (_setup_scene, _build_skeleton_polydata,
+render_frame) is built on an off-screen pv.Plotter instead of the Qt window.
+Every frame is grabbed as an RGB array and written straight to the stdin of an
+ffmpeg subprocess (rawvideo rgb24 -> H.264 MP4), so no PNG intermediates are
+written. --result-dir may then point at a whole results tree; every
+results.npy / motion store below it is rendered by a bounded process pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import contextlib
+import multiprocessing
+import pathlib
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.features import open_features
+from motion_gen_survey.frame_source import (
+    DEFAULT_CHUNK_FRAMES,
+    DEFAULT_MAX_CHUNKS,
+    FrameSource,
+    as_frame_source,
+)
+from motion_gen_survey.instrument import FrameProfiler
+from motion_gen_survey.label_lod import (
+    ALL_LABEL_JOINTS,
+    DEFAULT_MAX_LABELS,
+    DEFAULT_UPDATE_EVERY,
+    LabelLOD,
+)
+from motion_gen_survey.lazy_import import lazy_import
+from motion_gen_survey.motion_codec import MotionArchive, open_motion
+from motion_gen_survey.motion_store import (
+    iter_result_dirs,
+    open_motion_store,
+    require_t2m,
+)
+from motion_gen_survey.playback import PlaybackClock, frame_pair, lerp_poses
+from motion_gen_survey.stream import StreamClient
+from motion_gen_survey.t2m import (
+    FOOT_JOINTS,
+    NUM_JOINTS,
+    grid_layout,
+    skeleton_line_cells,
+    t2m_joint_names,
+)
+from motion_gen_survey.transforms import (
+    AxisMap,
+    apply_axis_map,
+    infer_up_axis,
+    up_axis_map,
+)
+
+
+pv = lazy_import("pyvista")
+pvqt = lazy_import("pyvistaqt")
+vtk = lazy_import("vtk")
+
+
+# Stages timed by the profiler, in _render_pose order
+PROFILE_STAGES = ("copy", "label", "text", "render")
+STAGE_COPY, STAGE_LABEL, STAGE_TEXT, STAGE_RENDER = range(len(PROFILE_STAGES))
+
+# Default FlowMDM result
+flowmdm_result_dir = pathlib.Path(
+    r"model_zoo\FlowMDM\results\babel\FlowMDM\001300000_s10_simple_walk_instructions"
+)
+
+
+class FlowMDMAnimator:
+    """Interactive animator for FlowMDM motion data with in-place geometry updates.
+
+    This class provides real-time 3D visualization of T2M format motion sequences
+    with efficient geometry updates and interactive controls. The animation system
+    uses in-place point updates to achieve smooth 30 FPS playback without memory
+    allocation during the animation loop.
+
+    Parameters
+    ----------
+    motion_data : np.ndarray | FrameSource
+        Motion of one sample with shape (seq_len, 22, 3), or of N samples
+        shown as a grid with shape (N, seq_len, 22, 3), where:
+        - seq_len: number of frames in the sequence
+        - 22: number of T2M joints
+        - 3: spatial coordinates (x, y, z)
+        Usually a read-only memmap slab from ``MotionStore.sample()`` or a
+        slice of ``MotionStore.joints``; memmaps are wrapped in a chunked
+        frame source. An existing FrameSource is used as is.
+    grid_spacing : float, optional
+        Distance in meters between grid cells when N > 1 (default 1.5).
+    offscreen : bool, optional
+        Render into an off-screen pv.Plotter (no window, no keyboard/timer
+        callbacks) for headless recording with record() (default False).
+    window_size : tuple[int, int], optional
+        Render window / video size in pixels (default (1024, 768)).
+    fps : float, optional
+        Source frame rate, normally MotionStore.fps (default 30.0).
+    speed : float, optional
+        Initial playback speed multiplier, 0.25-8 (default 1.0).
+    interpolate : bool, optional
+        Linearly interpolate joints between source frames (default True).
+    display_fps : float, optional
+        Timer rate used to poll the playback clock (default 60.0).
+    chunk_frames : int, optional
+        Frames per decoded chunk for memmapped input (default 1024).
+    cache_chunks : int, optional
+        Decoded chunks kept in memory for memmapped input (default 4).
+    root_trail : np.ndarray, optional
+        (N, seq_len, 3) root trajectory (``FeatureIndex.root``) drawn on the
+        ground as one polyline per sample.
+    foot_skate : np.ndarray, optional
+        (N, seq_len, 4) bool foot-skate flags (``FeatureIndex.foot_skate``);
+        skating feet are highlighted in red.
+    axis_map : AxisMap, optional
+        Conversion to the Y-up viewer frame for non-Y-up input (see
+        motion_gen_survey.transforms); applied per decoded chunk.
+    profile : bool, optional
+        Time the render stages with a FrameProfiler and show the HUD line
+        (default False).
+    profile_alloc : bool, optional
+        Also count Python heap allocations per frame (implies profile).
+
+    Attributes
+    ----------
+    source : FrameSource
+        Per-frame access to the (N, seq_len, 22, 3) motion
+    num_skeletons : int
+        Number of samples shown side by side (1 outside grid mode)
+    grid_offsets : np.ndarray
+        Per-skeleton (N, 1, 3) float32 translation placing each sample's
+        starting root position at its grid cell
+    current_frame : int
+        Current animation frame index
+    total_frames : int
+        Total number of frames in the sequence (grows for a live stream)
+    live : bool
+        Whether frames are still arriving from a live stream
+    is_playing : bool
+        Animation playback state
+    fps : float
+        Source frames per second (30 for Babel, 20 for HumanML3D)
+    clock : PlaybackClock
+        Monotonic playback clock (speed, dropped frames, render latency)
+    interpolate : bool
+        Whether playback interpolates between source frames
+    dropped_frames : int
+        Source frames skipped because rendering fell behind (read-only)
+    render_latency_ms : float
+        Moving average of render time in milliseconds (read-only)
+    plotter : pvqt.BackgroundPlotter | pv.Plotter
+        PyVista Qt plotter for 3D rendering, or an off-screen plotter in
+        headless mode
+    skel_poly : pv.PolyData
+        Skeleton polydata with updateable point positions
+    skel_actor : pv.Actor
+        Skeleton mesh actor in the scene
+    label_lod : LabelLOD | None
+        Level-of-detail labels (labels="lod")
+    label_poly : pv.PolyData | None
+        Joint label anchor points (labels="first")
+    labels_actor : pv.Actor | None
+        Joint label text actor (labels="first")
+    vtk_text_actor : vtk.vtkTextActor
+        Status text actor for efficient text updates
+    key_joint_ids : list[int]
+        Indices of joints to display labels for
+    profiler : FrameProfiler | None
+        Per-stage frame timings when profiling is enabled
+    show_hud : bool
+        Whether the profiler line is appended to the status text
+
+    Methods
+    -------
+    render_frame(frame_index)
+        Update geometry and render a specific frame
+    render_position(position)
+        Render a fractional frame position (interpolated)
+    change_speed(direction)
+        Step playback speed up or down
+    toggle_animation()
+        Toggle between play and pause states
+    step_frame(direction)
+        Step animation by one frame in given direction
+    reset_animation()
+        Reset animation to frame 0
+    quit_animation()
+        Stop animation and close window
+    show()
+        Start the interactive animation display
+    record(output_path, ffmpeg, crf)
+        Render every frame off-screen and encode it with ffmpeg
+    dump_profile(path)
+        Write the profiler summary as JSON
+    """
+
+    def __init__(
+        self,
+        motion_data: np.ndarray | FrameSource,
+        grid_spacing: float = 1.5,
+        offscreen: bool = False,
+        window_size: tuple[int, int] = (1024, 768),
+        fps: float = 30.0,
+        speed: float = 1.0,
+        interpolate: bool = True,
+        display_fps: float = 60.0,
+        chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+        cache_chunks: int = DEFAULT_MAX_CHUNKS,
+        root_trail: np.ndarray | None = None,
+        foot_skate: np.ndarray | None = None,
+        axis_map: AxisMap | None = None,
+        profile: bool = False,
+        profile_alloc: bool = False,
+        labels: str = "lod",
+        label_budget: int = DEFAULT_MAX_LABELS,
+        label_every: int = DEFAULT_UPDATE_EVERY,
+    ) -> None:
+        """Initialize the FlowMDM animator with motion data.
+
+        Sets up the 3D scene, skeleton geometry, text actors, and animation controls.
+        Creates all necessary visualization components and prepares for real-time
+        animation playback.
+
+        Parameters
+        ----------
+        motion_data : np.ndarray | FrameSource
+            Motion sequence data with shape (seq_len, 22, 3) or (N, seq_len, 22, 3)
+        grid_spacing : float, optional
+            Distance between grid cells in meters
+        offscreen : bool, optional
+            Build the scene on an off-screen plotter for headless recording
+        window_size : tuple[int, int], optional
+            Render window size in pixels
+        fps : float, optional
+            Source frame rate from the motion store metadata
+        speed : float, optional
+            Initial playback speed multiplier
+        interpolate : bool, optional
+            Interpolate joints between source frames during playback
+        display_fps : float, optional
+            Rate at which the timer polls the playback clock
+        chunk_frames : int, optional
+            Frames per chunk when streaming from a memmap
+        cache_chunks : int, optional
+            Size of the decoded-chunk LRU
+        root_trail : np.ndarray, optional
+            Root trajectory to draw as a ground trail
+        foot_skate : np.ndarray, optional
+            Per-frame foot-skate flags to highlight
+        axis_map : AxisMap, optional
+            Axis conversion of the input to Y-up
+        profile : bool, optional
+            Enable per-stage frame timing and the HUD line
+        profile_alloc : bool, optional
+            Track per-frame Python heap allocations
+        labels : str, optional
+            "lod" (level-of-detail labels on all skeletons), "first" (all
+            key joints of the first skeleton, VTK label placement) or "none"
+        label_budget : int, optional
+            Maximum number of labels shown in "lod" mode
+        label_every : int, optional
+            Frames between label anchor updates in "lod" mode
+
+        Notes
+        -----
+        This method performs several initialization steps:
+        1. Creates PyVista Qt plotter window
+        2. Sets up 3D scene with ground plane and axes
+        3. Builds skeleton geometry from T2M kinematic chains
+        4. Creates joint labels for key anatomical points
+        5. Sets up efficient VTK text actor for status display
+        6. Registers keyboard controls and timer callbacks (interactive mode only)
+        """
+        # Always work on (N, seq_len, 22, 3) frames; a single sample is a grid of one.
+        # Memmapped motion is streamed in chunks, never loaded whole.
+        self.source = as_frame_source(
+            motion_data,
+            chunk_frames=chunk_frames,
+            max_chunks=cache_chunks,
+            axis_map=axis_map,
+        )
+        if self.source.num_joints != NUM_JOINTS:
+            raise ValueError(
+                f"the animator draws {NUM_JOINTS} T2M joints, got {self.source.num_joints}"
+            )
+        self.num_skeletons = self.source.num_skeletons
+        self.current_frame = 0
+        self.total_frames = self.source.num_frames
+        # A live stream (motion_gen_survey.stream) grows while playing: hold at its edge instead of looping
+        self.live = bool(getattr(self.source, "live", False))
+        self.is_playing = False
+        self.fps = float(fps)
+        self.clock = PlaybackClock(
+            self.fps, self.total_frames, speed=speed, loop=not self.live
+        )
+        self.interpolate = interpolate
+        # Interpolation target, reused every tick
+        self._interp_buffer = np.empty(
+            (self.num_skeletons, NUM_JOINTS, 3), dtype=np.float32
+        )
+        self.grid_offsets = self._compute_grid_offsets(grid_spacing)
+        self.offscreen = offscreen
+        self.profiler = (
+            FrameProfiler(PROFILE_STAGES, track_allocations=profile_alloc)
+            if profile or profile_alloc
+            else None
+        )
+        self.show_hud = self.profiler is not None
+
+        # Plotter (Qt background, or off-screen for headless recording)
+        title = "FlowMDM T2M Motion Animation - 22 Joints"
+        if self.num_skeletons > 1:
+            title += f" x {self.num_skeletons} samples"
+        if offscreen:
+            self.plotter = pv.Plotter(off_screen=True, window_size=list(window_size))
+        else:
+            self.plotter = pvqt.BackgroundPlotter(  # type: ignore[attr-defined]
+                title=title, window_size=window_size
+            )
+        self._setup_scene()
+        if not offscreen:
+            self._setup_controls()
+
+        # Construct skeleton polydata once
+        self.skel_poly = self._build_skeleton_polydata(0)
+        self.skel_actor = self.plotter.add_mesh(  # type: ignore[attr-defined]
+            self.skel_poly,
+            color=[0.2, 0.4, 0.8],
+            line_width=3.0,
+            render_lines_as_tubes=True,
+            point_size=10,
+            render_points_as_spheres=True,
+        )
+
+        # Optional feature overlays (root trail, skating feet)
+        if root_trail is not None:
+            self.trail_actor = self.plotter.add_mesh(  # type: ignore[attr-defined]
+                self._build_root_trail(root_trail),
+                color=[0.9, 0.5, 0.1],
+                line_width=2.0,
+            )
+        self.foot_skate = foot_skate
+        self.skate_poly: Any | None = None
+        if foot_skate is not None:
+            self.skate_poly = pv.PolyData(
+                np.zeros((self.num_skeletons * len(FOOT_JOINTS), 3), np.float32)
+            )
+            self.skate_poly.point_data["skate"] = np.zeros(
+                self.skate_poly.n_points, np.float32
+            )
+            self.plotter.add_mesh(  # type: ignore[attr-defined]
+                self.skate_poly,
+                scalars="skate",
+                cmap=["#3366cc", "#ff2020"],
+                clim=[0, 1],
+                point_size=16,
+                render_points_as_spheres=True,
+                show_scalar_bar=False,
+            )
+
+        # Labels - Show all important keypoints with larger font
+        self.key_joint_ids = list(ALL_LABEL_JOINTS)  # All major joints
+        self.label_lod: LabelLOD | None = None
+        self.label_poly: Any | None = None
+        self.labels_actor = None
+        if labels == "lod":
+            self.label_lod = LabelLOD(
+                self.plotter.renderer,
+                self.num_skeletons,
+                max_labels=label_budget,
+                update_every=label_every,
+                font_size=15,
+            )
+        elif labels == "first":
+            first = self.source.frame(0)[0] + self.grid_offsets[0]
+            self.label_poly = pv.PolyData(first[self.key_joint_ids].copy())
+            self.labels_actor = self.plotter.add_point_labels(  # type: ignore[attr-defined]
+                self.label_poly,
+                [t2m_joint_names[i] for i in self.key_joint_ids],
+                show_points=False,
+                font_size=15,  # Increased from 10 to 15 (1.5x larger)
+                always_visible=True,
+            )
+        elif labels != "none":
+            raise ValueError(f"labels must be 'lod', 'first' or 'none', got {labels!r}")
+
+        # Status text actor - Create VTK text actor directly for guaranteed efficient updates
+        self.vtk_text_actor = vtk.vtkTextActor()
+        self.vtk_text_actor.SetInput("Frame 0")
+        self.vtk_text_actor.GetPositionCoordinate().SetCoordinateSystemToNormalizedViewport()
+        self.vtk_text_actor.GetPositionCoordinate().SetValue(
+            0.02, 0.02
+        )  # lower_left position
+
+        # Set text properties - 1.5x larger font
+        text_prop = self.vtk_text_actor.GetTextProperty()
+        text_prop.SetFontSize(16)  # Increased from 11 to 16 (1.5x larger)
+        text_prop.SetColor(0, 0, 0)
+        text_prop.SetJustificationToLeft()
+        text_prop.SetVerticalJustificationToBottom()
+
+        # Add to plotter as VTK actor
+        self.plotter.add_actor(self.vtk_text_actor, name="status_text")  # type: ignore[attr-defined]
+
+        if offscreen:
+            # First render creates the off-screen render window; later render() calls reuse it
+            self.plotter.show(auto_close=False, interactive=False)  # type: ignore[attr-defined]
+
+        # Initial frame
+        self.render_frame(0)
+
+        # Register timer callback; it polls the playback clock at display rate
+        if not offscreen:
+            interval = max(1, int(1000 / max(self.fps, display_fps)))
+            self.plotter.add_callback(self._on_timer, interval=interval)  # type: ignore[attr-defined]
+
+    # --- Setup helpers ---
+    def _setup_scene(self) -> None:
+        """Set up the 3D scene with ground plane, axes, and camera.
+
+        Creates the basic 3D environment for motion visualization including:
+        - Semi-transparent ground plane for spatial reference
+        - 3D coordinate axes for orientation
+        - Light gray background for better contrast
+        - Optimal camera position for viewing human motion
+
+        Notes
+        -----
+        The ground plane is positioned at y=0 (assuming y-up coordinate system)
+        with grid lines for scale reference. Camera is positioned at [3,2,3]
+        looking at origin with y-axis as up vector. In grid mode the plane and
+        camera distance are scaled to cover all grid cells.
+        """
+        size = 4.0
+        if self.num_skeletons > 1:
+            size = max(
+                size, 2 * float(np.abs(self.grid_offsets[:, 0, [0, 2]]).max()) + 2.0
+            )
+        res = int(5 * size)
+        plane = pv.Plane(
+            center=[0, 0, 0],
+            direction=[0, 1, 0],
+            i_size=size,
+            j_size=size,
+            i_resolution=res,
+            j_resolution=res,
+        )
+        self.plotter.add_mesh(
+            plane, color=[0.6, 0.6, 0.6], opacity=0.3, show_edges=True, line_width=0.5
+        )  # type: ignore[attr-defined]
+        self.plotter.add_axes()  # type: ignore[attr-defined]
+        self.plotter.set_background([0.95, 0.95, 0.95])  # type: ignore[attr-defined]
+        scale = size / 4.0
+        self.plotter.camera_position = (
+            [3 * scale, 2 * scale, 3 * scale],
+            [0, 1, 0],
+            [0, 1, 0],
+        )  # type: ignore[attr-defined]
+
+    def _setup_controls(self) -> None:
+        """Register keyboard event handlers for animation control.
+
+        Sets up interactive keyboard controls for the animation:
+        - Spacebar: Toggle play/pause
+        - Left/Right arrows: Step frame by frame
+        - '[' / ']': Slower / faster playback
+        - 'i': Toggle interpolation
+        - 'r': Reset to frame 0
+        - 'h': Toggle the profiler HUD
+        - 'q': Quit application
+
+        Notes
+        -----
+        Both ' ' (space) and 'space' key events are registered for
+        play/pause functionality to ensure compatibility across
+        different PyVista versions and platforms.
+        """
+        for key in (" ", "space"):
+            self.plotter.add_key_event(key, self.toggle_animation)  # type: ignore[attr-defined]
+        self.plotter.add_key_event("Left", lambda: self.step_frame(-1))  # type: ignore[attr-defined]
+        self.plotter.add_key_event("Right", lambda: self.step_frame(1))  # type: ignore[attr-defined]
+        self.plotter.add_key_event("bracketleft", lambda: self.change_speed(-1))  # type: ignore[attr-defined]
+        self.plotter.add_key_event("bracketright", lambda: self.change_speed(1))  # type: ignore[attr-defined]
+        self.plotter.add_key_event("i", self.toggle_interpolation)  # type: ignore[attr-defined]
+        self.plotter.add_key_event("r", self.reset_animation)  # type: ignore[attr-defined]
+        self.plotter.add_key_event("h", self.toggle_hud)  # type: ignore[attr-defined]
+        self.plotter.add_key_event("q", self.quit_animation)  # type: ignore[attr-defined]
+
+    # --- Geometry helpers ---
+    def _compute_grid_offsets(self, spacing: float) -> np.ndarray:
+        """Compute per-skeleton translations for grid mode.
+
+        Each sample is shifted so that its root (pelvis) starts above the
+        centre of its grid cell; heights are left untouched. A single
+        skeleton is not moved.
+
+        Parameters
+        ----------
+        spacing : float
+            Distance between neighbouring grid cells in meters
+
+        Returns
+        -------
+        np.ndarray
+            Offsets of shape (N, 1, 3), float32, broadcastable over the
+            (N, 22, 3) point block
+        """
+        offsets = np.zeros((self.num_skeletons, 1, 3), dtype=np.float32)
+        if self.num_skeletons > 1:
+            start_root = np.asarray(self.source.frame(0)[:, 0], dtype=np.float32)
+            offsets[:, 0] = grid_layout(self.num_skeletons, spacing)
+            offsets[:, 0, [0, 2]] -= start_root[:, [0, 2]]
+        return offsets
+
+    def _build_skeleton_polydata(self, frame_index: int) -> Any:
+        """Build PyVista PolyData for all skeletons at a specific frame.
+
+        Creates a PolyData object containing the N*22 joint positions and
+        kinematic chain connections for the T2M skeleton format. Skeleton k
+        owns points [22*k, 22*(k+1)), and its line cells are the shared
+        skeleton_pairs topology offset by 22*k. The resulting geometry can
+        be efficiently updated by modifying point positions without
+        recreating the topology.
+
+        Parameters
+        ----------
+        frame_index : int
+            Frame number to extract joint positions from (0-based index)
+
+        Returns
+        -------
+        pv.PolyData
+            PolyData object with:
+            - points: N*22 joint positions (shape: N*22 x 3)
+            - lines: kinematic chain connections as line cells
+
+        Notes
+        -----
+        The kinematic chain structure follows the T2M format:
+        - Right leg: Pelvis → R.Hip → R.Knee → R.Ankle → R.Foot
+        - Left leg: Pelvis → L.Hip → L.Knee → L.Ankle → L.Foot
+        - Spine: Pelvis → Spine1 → Spine2 → Spine3 → Neck → Head
+        - Right arm: Spine3 → R.Collar → R.Shoulder → R.Elbow → R.Wrist
+        - Left arm: Spine3 → L.Collar → L.Shoulder → L.Elbow → L.Wrist
+
+        Line cells are formatted as [2, start_idx, end_idx] for each bone.
+        """
+        joints = (self.source.frame(frame_index) + self.grid_offsets).reshape(-1, 3)
+        poly = pv.PolyData()
+        poly.points = joints
+        poly.lines = skeleton_line_cells(self.num_skeletons)
+        return poly
+
+    def _build_root_trail(self, root_trail: np.ndarray, max_points: int = 4096) -> Any:
+        """Build one ground-level polyline per skeleton from (N, seq_len, 3) root positions.
+
+        Long sequences are subsampled to at most ``max_points`` vertices per
+        skeleton; the trail is static, so this is done once.
+        """
+        step = max(1, -(-root_trail.shape[1] // max_points))
+        trail = np.array(root_trail[:, ::step], dtype=np.float32)
+        trail += self.grid_offsets
+        trail[..., 1] = 0.005  # just above the ground plane
+        n, m = trail.shape[:2]
+        lines = np.empty((n, m + 1), dtype=np.int64)
+        lines[:, 0] = m
+        lines[:, 1:] = np.arange(n * m, dtype=np.int64).reshape(n, m)
+        poly = pv.PolyData(trail.reshape(-1, 3))
+        poly.lines = lines.ravel()
+        return poly
+
+    # --- Frame / animation logic ---
+    def render_frame(self, frame_index: int) -> None:
+        """Render a specific animation frame with efficient geometry updates.
+
+        Updates the 3D visualization to display the skeleton pose(s) at the
+        specified frame. Uses in-place geometry updates for maximum performance:
+        - Updates all N skeletons' joint positions via one np.copyto() over
+          the (N*22, 3) point block, then adds the grid offsets in place
+        - Updates joint label anchors (level-of-detail subset, reduced rate)
+        - Updates status text with current frame info
+        - Triggers scene re-rendering
+
+        Parameters
+        ----------
+        frame_index : int
+            Target frame to render (0-based index). Must be within
+            [0, total_frames-1] range.
+
+        Notes
+        -----
+        This method is optimized for real-time animation:
+        - No new memory allocation during updates
+        - Direct VTK text actor manipulation for status text
+        - In-place point array updates using np.copyto()
+        - Exception handling for label actor updates
+
+        The status text displays: "F {frame}/{total-1} | {Play/Pause}"
+        (plus the sample count in grid mode, and speed / render latency /
+        dropped frames in interactive mode)
+        """
+        if not (0 <= frame_index < self.total_frames):
+            return
+        self._render_pose(self.source.frame(frame_index), frame_index)
+
+    def render_position(self, position: float) -> None:
+        """Render a fractional frame position.
+
+        With interpolation enabled, joints are blended between the two
+        neighbouring source frames into a preallocated buffer; otherwise
+        the lower source frame is shown. Both frames come from the frame
+        source, so at a chunk boundary two cached chunks are touched.
+
+        Parameters
+        ----------
+        position : float
+            Fractional frame index in [0, total_frames)
+        """
+        if self.interpolate:
+            i0, i1, t = frame_pair(position, self.total_frames, loop=self.clock.loop)
+            lerp_poses(
+                self.source.frame(i0),
+                self.source.frame(i1) if t > 0.0 else None,
+                t,
+                self._interp_buffer,
+            )
+            self._render_pose(self._interp_buffer, i0)
+        else:
+            self.render_frame(int(position))
+
+    def _render_pose(self, pose: np.ndarray, frame_index: int) -> None:
+        """Push an (N, 22, 3) pose block into the scene and render it."""
+        prof = self.profiler
+        if prof is not None:
+            prof.begin()
+        self.current_frame = frame_index
+        # Update skeleton points: (N, 22, 3) view of the shared (N*22, 3) buffer
+        pts = self.skel_poly.points
+        block = pts.reshape(self.num_skeletons, NUM_JOINTS, 3)
+        np.copyto(block, pose)
+        if self.num_skeletons > 1:
+            block += self.grid_offsets
+        self.skel_poly.points = pts
+        # Skate overlay points follow the feet, so they count as point copy
+        skating = False
+        if self.skate_poly is not None and self.foot_skate is not None:
+            spts = self.skate_poly.points
+            np.copyto(
+                spts.reshape(self.num_skeletons, len(FOOT_JOINTS), 3),
+                block[:, FOOT_JOINTS],
+            )
+            self.skate_poly.points = spts
+            flags = self.foot_skate[:, frame_index]
+            self.skate_poly.point_data["skate"][:] = flags.ravel()
+            self.skate_poly.GetPointData().GetArray("skate").Modified()
+            skating = bool(flags.any())
+        if prof is not None:
+            prof.mark(STAGE_COPY)
+        # Update labels: LOD anchors at a reduced rate (exact while paused / stepping)
+        if self.label_lod is not None:
+            self.label_lod.update(pts, force=not self.is_playing and not self.offscreen)
+        elif self.label_poly is not None:
+            # Gathered straight into the label buffer
+            lpts = self.label_poly.points
+            np.take(block[0], self.key_joint_ids, axis=0, out=lpts, mode="clip")
+            self.label_poly.points = lpts
+            with contextlib.suppress(Exception):
+                self.labels_actor.SetInputData(self.label_poly)  # type: ignore[attr-defined]
+        if prof is not None:
+            prof.mark(STAGE_LABEL)
+        # Update status text - Direct VTK update (most efficient, no new actors)
+        status = f"F {frame_index}/{self.total_frames - 1} | {'Play' if self.is_playing else 'Pause'}"
+        if self.num_skeletons > 1:
+            status += f" | {self.num_skeletons} samples"
+        if skating:
+            status += " | SKATE"
+        if self.live:
+            status += " | LIVE"
+        if not self.offscreen:
+            status += f" | {self.clock.status()}"
+        if prof is not None and self.show_hud:
+            status += "\n" + prof.hud()
+        self.vtk_text_actor.SetInput(status)  # Direct VTK call - guaranteed efficient
+        if prof is not None:
+            prof.mark(STAGE_TEXT)
+        self.plotter.render()  # type: ignore[attr-defined]
+        if prof is not None:
+            prof.mark(STAGE_RENDER)
+            prof.end()
+
+    def _on_timer(self) -> None:
+        """Timer callback for automatic animation playback.
+
+        Called periodically (~60 Hz) during animation playback. Asks the
+        playback clock for the current fractional frame, renders it and
+        reports the render time back to the clock. Looping is handled by
+        the clock.
+
+        Notes
+        -----
+        Only advances frames when is_playing is True. If a render overruns,
+        the next tick simply lands on a later frame (counted as dropped)
+        instead of slowing playback down. Without interpolation, ticks that
+        land on the frame already shown are skipped. A live stream's new
+        frames are picked up here first.
+        """
+        if self.live:
+            self._follow_stream()
+        if not self.is_playing:
+            return
+        position = self.clock.tick()
+        if not self.interpolate and int(position) == self.current_frame:
+            return
+        start = time.perf_counter()
+        self.render_position(position)
+        self.clock.record_render(time.perf_counter() - start)
+
+    def _follow_stream(self) -> None:
+        """Grow to the frames received so far; resume if playback was waiting at the live edge."""
+        received = self.source.num_frames
+        if received > self.total_frames:
+            self.total_frames = received
+            self.clock.set_num_frames(received)
+            if self.is_playing and not self.clock.playing:
+                self.clock.play()
+        if not getattr(self.source, "live", False):
+            # Stream complete: behave like a finished result from now on
+            self.live = False
+            self.clock.loop = True
+            if self.is_playing and not self.clock.playing:
+                self.clock.play()
+
+    @property
+    def dropped_frames(self) -> int:
+        """Number of source frames skipped because rendering fell behind."""
+        return self.clock.dropped_frames
+
+    @property
+    def render_latency_ms(self) -> float:
+        """Moving average of the per-frame render time in milliseconds."""
+        return self.clock.mean_latency * 1000.0
+
+    # --- Control methods ---
+    def toggle_animation(self) -> None:
+        """Toggle between play and pause states.
+
+        Switches the animation between playing and paused states.
+        Prints the current state to console for user feedback.
+        Bound to spacebar key events in the interactive window.
+        """
+        self.is_playing = not self.is_playing
+        if self.is_playing:
+            self.clock.seek(self.current_frame)
+            self.clock.play()
+        else:
+            self.clock.pause()
+        print("Playing" if self.is_playing else "Paused")
+
+    def change_speed(self, direction: int) -> None:
+        """Step playback speed through 0.25x ... 8x.
+
+        Parameters
+        ----------
+        direction : int
+            +1 for faster, -1 for slower
+        """
+        speed = self.clock.step_speed(direction)
+        print(f"Speed: {speed:g}x")
+        self.render_frame(self.current_frame)
+
+    def toggle_hud(self) -> None:
+        """Show or hide the profiler line of the status text."""
+        if self.profiler is None:
+            print("Profiling is off (start with --profile)")
+            return
+        self.show_hud = not self.show_hud
+        self.render_frame(self.current_frame)
+
+    def dump_profile(self, path: str | pathlib.Path) -> pathlib.Path | None:
+        """Write the profiler summary (stages, latency histogram, FPS, allocations) as JSON."""
+        if self.profiler is None:
+            return None
+        extra: dict[str, Any] = {
+            "skeletons": self.num_skeletons,
+            "total_frames": self.total_frames,
+            "fps_source": self.fps,
+            "dropped_frames": self.dropped_frames,
+            "offscreen": self.offscreen,
+        }
+        if self.label_lod is not None:
+            extra["labels"] = self.label_lod.stats()
+        return self.profiler.dump(path, extra)
+
+    def toggle_interpolation(self) -> None:
+        """Toggle linear interpolation between source frames."""
+        self.interpolate = not self.interpolate
+        print("Interpolation on" if self.interpolate else "Interpolation off")
+
+    def step_frame(self, direction: int) -> None:
+        """Step animation by one frame in the specified direction.
+
+        Advances or retreats the animation by exactly one frame.
+        Automatically pauses playback and uses modulo arithmetic
+        for seamless looping in both directions.
+
+        Parameters
+        ----------
+        direction : int
+            Direction to step: +1 for forward, -1 for backward
+
+        Notes
+        -----
+        Bound to Left/Right arrow keys. Always pauses animation
+        to allow precise frame-by-frame inspection.
+        """
+        self.is_playing = False
+        self.clock.pause()
+        self.clock.seek((self.current_frame + direction) % self.total_frames)
+        self.render_frame((self.current_frame + direction) % self.total_frames)
+
+    def reset_animation(self) -> None:
+        """Reset animation to the first frame.
+
+        Pauses playback and jumps to frame 0. Useful for restarting
+        the animation sequence. Prints confirmation to console.
+        Bound to 'r' key event in the interactive window.
+        """
+        self.is_playing = False
+        self.clock.pause()
+        self.clock.seek(0)
+        self.render_frame(0)
+        print("Animation reset")
+
+    def quit_animation(self) -> None:
+        """Stop animation and close the visualization window.
+
+        Pauses playback and closes the PyVista plotter window,
+        effectively terminating the application. Bound to 'q'
+        key event for quick exit.
+        """
+        self.is_playing = False
+        self.plotter.close()  # type: ignore[attr-defined]
+        self.source.close()
+        if self.profiler is not None:
+            self.profiler.close()
+
+    # --- Headless recording ---
+    def record(
+        self, output_path: str | pathlib.Path, ffmpeg: str = "ffmpeg", crf: int = 20
+    ) -> int:
+        """Render every frame off-screen and stream it to an ffmpeg encoder.
+
+        Frames are grabbed from the render window as (H, W, 3) uint8 arrays
+        and written to ffmpeg's stdin as raw rgb24 video, so nothing touches
+        the disk except the final MP4.
+
+        Parameters
+        ----------
+        output_path : str | pathlib.Path
+            Destination video file (container chosen by ffmpeg from suffix)
+        ffmpeg : str, optional
+            ffmpeg executable (default "ffmpeg" on PATH)
+        crf : int, optional
+            x264 constant rate factor (default 20)
+
+        Returns
+        -------
+        int
+            Number of frames written
+
+        Raises
+        ------
+        RuntimeError
+            If the animator is not off-screen or ffmpeg fails
+        """
+        if not self.offscreen:
+            raise RuntimeError(
+                "record() requires an animator created with offscreen=True"
+            )
+        output_path = pathlib.Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_playing = True
+        self.render_frame(0)
+        height, width = self.plotter.screenshot(return_img=True).shape[:2]  # type: ignore[attr-defined]
+        cmd = [
+            ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{width}x{height}",
+            "-r",
+            f"{self.fps:g}",
+            "-i",
+            "-",
+            # yuv420p needs even dimensions
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            "-crf",
+            str(crf),
+            str(output_path),
+        ]
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        assert proc.stdin is not None
+        written = 0
+        try:
+            for frame_index in range(self.total_frames):
+                self.render_frame(frame_index)
+                img = self.plotter.screenshot(return_img=True)  # type: ignore[attr-defined]
+                proc.stdin.write(np.ascontiguousarray(img[..., :3]).data)
+                written += 1
+        except BrokenPipeError:
+            pass
+        finally:
+            proc.stdin.close()
+            stderr = proc.stderr.read().decode(errors="replace") if proc.stderr else ""
+            proc.wait()
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg failed ({proc.returncode}) for {output_path}: {stderr.strip()}"
+            )
+        return written
+
+    # --- UI ---
+    def show(self) -> None:
+        """Start the interactive animation display.
+
+        Prints control instructions to console and opens the PyVista
+        Qt window for interactive 3D visualization. This method blocks
+        until the window is closed.
+
+        Notes
+        -----
+        The animation starts in paused state at frame 0. Use spacebar
+        to begin playback. The window remains responsive to all registered
+        keyboard controls during display.
+
+        Control summary printed to console:
+        - Spacebar: Play/Pause animation
+        - Left/Right arrows: Step frame by frame
+        - r: Reset to frame 0
+        - q: Quit application
+        """
+        print("\nAnimation Controls:")
+        print("  Spacebar: Play/Pause")
+        print("  Left/Right arrows: Step frame")
+        print("  r: Reset")
+        print("  q: Quit")
+        print("\nStarting interactive animation...")
+        self.plotter.show()  # type: ignore[attr-defined]
+
+
+def resolve_up_axis(up_axis: str, joints: np.ndarray) -> int:
+    """Up axis index for ``--up-axis`` (``x``/``y``/``z``, or ``auto`` to infer it from ``joints``)."""
+    if up_axis != "auto":
+        return "xyz".index(up_axis)
+    step = max(
+        1, joints.shape[1] // 4096
+    )  # a strided subset of frames is enough for the vote
+    return infer_up_axis(joints[:, ::step])
+
+
+def _render_job(
+    job: tuple[
+        str,
+        str,
+        int,
+        int,
+        float,
+        tuple[int, int],
+        str,
+        int,
+        bool,
+        bool,
+        str,
+        int,
+        int,
+        str,
+        float | None,
+    ],
+) -> tuple[bool, str]:
+    """Process-pool worker: render one result off-screen to a video file.
+
+    With profiling on, the stage timings are written next to the video as
+    ``<name>.profile.json``. Returns ``(ok, message)``; a result that fails
+    is reported instead of aborting the rest of the tree.
+    """
+    (
+        result_path,
+        output_path,
+        sample,
+        grid,
+        grid_spacing,
+        window_size,
+        ffmpeg,
+        crf,
+        profile,
+        profile_alloc,
+        labels,
+        label_budget,
+        label_every,
+        up_axis,
+        fps,
+    ) = job
+    try:
+        return True, _render_result(
+            result_path,
+            output_path,
+            sample,
+            grid,
+            grid_spacing,
+            window_size,
+            ffmpeg,
+            crf,
+            profile,
+            profile_alloc,
+            labels,
+            label_budget,
+            label_every,
+            up_axis,
+            fps,
+        )
+    except Exception as exc:  # one broken result must not abort the whole render
+        return False, f"{result_path}: {type(exc).__name__}: {exc}"
+
+
+def _render_result(
+    result_path: str,
+    output_path: str,
+    sample: int,
+    grid: int,
+    grid_spacing: float,
+    window_size: tuple[int, int],
+    ffmpeg: str,
+    crf: int,
+    profile: bool,
+    profile_alloc: bool,
+    labels: str,
+    label_budget: int,
+    label_every: int,
+    up_axis: str,
+    fps: float | None,
+) -> str:
+    store = open_motion_store(result_path)
+    require_t2m(store, "the animator")
+    if not 0 <= sample < store.num_samples:
+        raise ValueError(
+            f"sample {sample} out of range for {store.num_samples} stored samples"
+        )
+    stop = min(store.num_samples, sample + max(1, grid))
+    axis_map = up_axis_map(resolve_up_axis(up_axis, store.joints[sample:stop]))
+    animator = FlowMDMAnimator(
+        store.joints[sample:stop],
+        grid_spacing=grid_spacing,
+        axis_map=axis_map,
+        offscreen=True,
+        window_size=window_size,
+        fps=fps or store.fps,
+        profile=profile,
+        profile_alloc=profile_alloc,
+        labels=labels,
+        label_budget=label_budget,
+        label_every=label_every,
+    )
+    try:
+        frames = animator.record(output_path, ffmpeg=ffmpeg, crf=crf)
+        animator.dump_profile(pathlib.Path(output_path).with_suffix(".profile.json"))
+    finally:
+        animator.plotter.close()  # type: ignore[attr-defined]
+        animator.source.close()
+    return f"{output_path} ({frames} frames)"
+
+
+def render_headless(args: argparse.Namespace) -> None:
+    """Render every result below args.result_dir to args.headless with a process pool."""
+    root = pathlib.Path(args.result_dir)
+    if root.is_file():
+        root = root.parent
+    out_dir = pathlib.Path(args.headless)
+    results = list(iter_result_dirs(root))
+    jobs = []
+    for result_path in results:
+        rel = (
+            result_path.relative_to(root)
+            if result_path.is_relative_to(root)
+            else pathlib.Path(result_path.name)
+        )
+        name = "__".join(rel.parts) or result_path.name
+        jobs.append(
+            (
+                str(result_path),
+                str(out_dir / f"{name}.mp4"),
+                args.sample,
+                args.grid,
+                args.grid_spacing,
+                tuple(args.window_size),
+                args.ffmpeg,
+                args.crf,
+                args.profile,
+                args.profile_alloc,
+                args.labels,
+                args.label_budget,
+                args.label_every,
+                args.up_axis,
+                args.fps,
+            )
+        )
+    print(f"Rendering {len(jobs)} result(s) to {out_dir} with {args.workers} worker(s)")
+    # spawn: each worker creates its own VTK/OpenGL context from scratch
+    ctx = multiprocessing.get_context("spawn")
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx) as pool:
+        for ok, message in pool.map(_render_job, jobs):
+            if ok:
+                print(f"  wrote {message}")
+            else:
+                failed += 1
+                print(f"ERROR: {message}", file=sys.stderr)
+    if failed:
+        print(
+            f"ERROR: {failed} of {len(jobs)} result(s) failed to render",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def animate_stream(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """Show a live stream: wait for the first frames, then play while the rest arrives."""
+    if args.root_trail or args.skate:
+        parser.error("--root-trail/--skate need a motion store, not a live stream")
+    if args.up_axis == "auto":
+        parser.error("--up-axis auto needs the whole motion; pass y or z with --stream")
+    client = StreamClient(
+        args.stream,
+        max_frames=args.stream_max_frames,
+        connect_timeout=args.stream_timeout,
+        axis_map=up_axis_map("xyz".index(args.up_axis)),
+    )
+    print(f"Waiting for frames on {args.stream} ...")
+    try:
+        buffer = client.start().wait_first_frame(args.stream_timeout)
+    except (TimeoutError, ConnectionError, OSError) as e:
+        client.close()
+        print("ERROR:", e, file=sys.stderr)
+        sys.exit(1)
+    latency = client.first_frame_s
+    assert latency is not None  # set before the first frames are handed out
+    print(
+        f"First frames after {latency * 1000:.0f} ms: {buffer.num_skeletons} skeleton(s) "
+        f"at {client.fps:g} FPS"
+    )
+    print(f"Text prompts: {client.meta.get('text') or ['No text available']}")
+    animator = FlowMDMAnimator(
+        buffer,
+        grid_spacing=args.grid_spacing,
+        window_size=tuple(args.window_size),
+        fps=args.fps or client.fps,
+        speed=args.speed,
+        interpolate=not args.no_interp,
+        profile=args.profile,
+        profile_alloc=args.profile_alloc,
+        labels=args.labels,
+        label_budget=args.label_budget,
+        label_every=args.label_every,
+    )
+    atexit.register(client.close)
+    if args.profile_json:
+        atexit.register(
+            lambda: print(f"Profile: {animator.dump_profile(args.profile_json)}")
+        )
+    animator.toggle_animation()  # follow the stream from the start
+    animator.show()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Animate a FlowMDM result with PyVistaQt"
+    )
+    parser.add_argument(
+        "--result-dir",
+        default=str(flowmdm_result_dir),
+        help="FlowMDM result directory, results.npy, motion store directory or .t2mc archive",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=0,
+        help="Sample index to animate (first grid sample)",
+    )
+    parser.add_argument(
+        "--grid",
+        type=int,
+        default=1,
+        help="Number of consecutive samples/repetitions to show side by side",
+    )
+    parser.add_argument(
+        "--grid-spacing",
+        type=float,
+        default=1.5,
+        help="Distance between grid cells in meters",
+    )
+    parser.add_argument(
+        "--headless",
+        metavar="OUT_DIR",
+        default=None,
+        help="Render off-screen to MP4 files in OUT_DIR instead of opening a window; "
+        "--result-dir may then be a whole results tree",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, (multiprocessing.cpu_count() or 2) // 2),
+        help="Parallel render processes in headless mode",
+    )
+    parser.add_argument(
+        "--window-size", type=int, nargs=2, default=[1024, 768], metavar=("W", "H")
+    )
+    parser.add_argument(
+        "--ffmpeg", default="ffmpeg", help="ffmpeg executable for headless mode"
+    )
+    parser.add_argument(
+        "--crf", type=int, default=20, help="x264 quality for headless mode"
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=None,
+        help="Override the source FPS from the store metadata",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Initial playback speed (0.25-8)"
+    )
+    parser.add_argument(
+        "--no-interp",
+        action="store_true",
+        help="Disable interpolation between source frames",
+    )
+    parser.add_argument(
+        "--up-axis",
+        choices=["y", "z", "auto"],
+        default="y",
+        help="Up axis of the stored joints; 'auto' infers it from the sample's extent",
+    )
+    parser.add_argument(
+        "--root-trail",
+        action="store_true",
+        help="Draw the root trajectory from the feature index",
+    )
+    parser.add_argument(
+        "--skate",
+        action="store_true",
+        help="Highlight foot-skate frames from the feature index",
+    )
+    parser.add_argument(
+        "--chunk-frames",
+        type=int,
+        default=DEFAULT_CHUNK_FRAMES,
+        help="Frames per streamed chunk for long sequences",
+    )
+    parser.add_argument(
+        "--cache-chunks",
+        type=int,
+        default=DEFAULT_MAX_CHUNKS,
+        help="Decoded chunks kept in memory",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time copy/label/text/render stages per frame and show them in the status HUD",
+    )
+    parser.add_argument(
+        "--profile-alloc",
+        action="store_true",
+        help="Also track Python heap allocations per frame (tracemalloc; implies --profile)",
+    )
+    parser.add_argument(
+        "--profile-json",
+        default=None,
+        help="Write the profiler summary to this JSON file on exit (implies --profile)",
+    )
+    parser.add_argument(
+        "--labels",
+        choices=["lod", "first", "none"],
+        default="lod",
+        help="Joint labels: level-of-detail on all skeletons, every key joint of the first "
+        "skeleton, or none",
+    )
+    parser.add_argument(
+        "--label-budget",
+        type=int,
+        default=DEFAULT_MAX_LABELS,
+        help="Maximum labels shown with --labels lod",
+    )
+    parser.add_argument(
+        "--label-every",
+        type=int,
+        default=DEFAULT_UPDATE_EVERY,
+        help="Frames between label anchor updates with --labels lod",
+    )
+    parser.add_argument(
+        "--stream",
+        metavar="ADDRESS",
+        default=None,
+        help="Show frames from a live stream (host:port or unix:/path) instead of a result",
+    )
+    parser.add_argument(
+        "--stream-max-frames",
+        type=int,
+        default=None,
+        help="Keep only the most recent frames of a live stream (default: all)",
+    )
+    parser.add_argument(
+        "--stream-timeout",
+        type=float,
+        default=60.0,
+        help="Seconds to wait for the first streamed frames",
+    )
+    args = parser.parse_args(argv)
+    args.profile = args.profile or args.profile_alloc or args.profile_json is not None
+
+    if args.headless:
+        render_headless(args)
+        return
+    if args.stream:
+        animate_stream(args, parser)
+        return
+
+    # Open (and on first use convert) the memory-mapped motion store, or a compact motion archive
+    store = open_motion(args.result_dir)
+    if not isinstance(store, MotionArchive):
+        try:
+            require_t2m(store, "the animator")
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Print dataset info
+    print(f"Loaded motion store: {store.joints.shape} (batch, frames, 22, 3)")
+    print(f"Text prompts: {store.text or ['No text available']}")
+    print(f"Sequence lengths: {store.lengths or 'Not specified'}")
+    print(f"FPS: {store.fps:g}")
+    print(f"Total frames: {store.num_frames}")
+
+    stop = args.sample + max(1, args.grid)
+    if not (args.sample >= 0 and stop <= store.num_samples):
+        parser.error(
+            f"samples [{args.sample}, {stop}) out of range for {store.num_samples} stored samples"
+        )
+
+    # Bring Z-up (or auto-detected) input into the Y-up viewer frame
+    up_axis = resolve_up_axis(args.up_axis, store.joints[args.sample : stop])
+    if args.up_axis == "auto":
+        print(f"Inferred up axis: {'XYZ'[up_axis]}")
+    axis_map = up_axis_map(up_axis)
+
+    # Cached per-frame features (built on first use, rebuilt when the store changes)
+    root_trail = foot_skate = None
+    if args.root_trail or args.skate:
+        if isinstance(store, MotionArchive):
+            parser.error(
+                "--root-trail/--skate need a motion store; decode the archive first (codec decode)"
+            )
+        features = open_features(store)
+        print(f"Features: {features}")
+        if args.root_trail:
+            root_trail = apply_axis_map(features.root[args.sample : stop], axis_map)
+        if args.skate:
+            foot_skate = features.foot_skate[args.sample : stop]
+            for k in range(args.sample, stop):
+                print(f"  sample {k}: skate {features.skate_ratio(k):.1%} of frames")
+
+    # Create and run the animator (basic slice of the memmap, no copy)
+    animator = FlowMDMAnimator(
+        store.joints[args.sample : stop],
+        grid_spacing=args.grid_spacing,
+        window_size=tuple(args.window_size),
+        fps=args.fps or store.fps,
+        speed=args.speed,
+        interpolate=not args.no_interp,
+        chunk_frames=args.chunk_frames,
+        cache_chunks=args.cache_chunks,
+        root_trail=root_trail,
+        foot_skate=foot_skate,
+        axis_map=axis_map,
+        profile=args.profile,
+        profile_alloc=args.profile_alloc,
+        labels=args.labels,
+        label_budget=args.label_budget,
+        label_every=args.label_every,
+    )
+    if args.profile_json:
+        # Closing the window does not go through quit_animation, so dump at interpreter exit
+        atexit.register(
+            lambda: print(f"Profile: {animator.dump_profile(args.profile_json)}")
+        )
+    animator.show()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
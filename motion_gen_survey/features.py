@@ -0,0 +1,323 @@
+"""Cached per-frame derived quantities for motion stores.
+
+Reviewing generations keeps needing the same signals derived from the
+``(22, 3)`` joints. This module computes them for every sample of a motion
+store in one vectorized, frame-blocked pass and saves them as
+``features.npz`` next to ``joints.f32``:
+
+- ``root``: root (pelvis, joint 0) trajectory, ``(batch, frames, 3)``.
+- ``foot_height``: height of joints 7/8/10/11 above the sample's floor
+  (lowest foot position), ``(batch, frames, 4)``.
+- ``foot_speed``: 3D speed of those joints in m/s, ``(batch, frames, 4)``.
+- ``foot_contact``: foot low and slow, ``(batch, frames, 4)`` bool.
+- ``foot_skate``: foot low but sliding horizontally, ``(batch, frames, 4)`` bool.
+- ``joint_speed``: speed of every joint in m/s, ``(batch, frames, 22)``.
+
+Speeds are backward differences scaled by the store fps (frame 0 repeats
+frame 1). Only each sample's valid frames (its segment lengths) count:
+the floor is the lowest foot over those frames, and padding frames have
+zero speed and no contact or skate. The file records the store's ``content_hash`` and the thresholds;
+:func:`open_features` rebuilds it when either changed.
+
+Usage:
+    python -m motion_gen_survey.features build model_zoo/FlowMDM/results --workers 8
+    python -m motion_gen_survey.features info <result_dir>
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.motion_store import (
+    MotionStore,
+    iter_result_dirs,
+    open_motion_store,
+    require_t2m,
+)
+from motion_gen_survey.t2m import FOOT_JOINTS, ROOT_JOINT
+
+
+FEATURES_VERSION = 2
+FEATURES_FILENAME = "features.npz"
+# Y-up, meters
+UP_AXIS = 1
+CONTACT_HEIGHT = 0.05
+CONTACT_SPEED = 0.3
+SKATE_SPEED = 0.3
+FEATURE_BLOCK_FRAMES = 4096
+FEATURE_KEYS: tuple[str, ...] = (
+    "root",
+    "foot_height",
+    "foot_speed",
+    "foot_contact",
+    "foot_skate",
+    "joint_speed",
+)
+
+
+def _thresholds(
+    contact_height: float, contact_speed: float, skate_speed: float
+) -> dict[str, float]:
+    return {
+        "contact_height": float(contact_height),
+        "contact_speed": float(contact_speed),
+        "skate_speed": float(skate_speed),
+    }
+
+
+def compute_features(
+    joints: np.ndarray,
+    fps: float,
+    contact_height: float = CONTACT_HEIGHT,
+    contact_speed: float = CONTACT_SPEED,
+    skate_speed: float = SKATE_SPEED,
+    block_frames: int = FEATURE_BLOCK_FRAMES,
+    lengths: Sequence[int] | None = None,
+) -> dict[str, np.ndarray]:
+    """Compute all features for ``(batch, frames, joints, 3)`` positions.
+
+    Frames are processed in blocks (overlapping by one frame for the
+    differences) so temporaries stay bounded for very long compositions.
+    ``lengths`` gives the valid frame count of each sample (default: all
+    frames); padding past it does not affect the floor or the speeds.
+    """
+    batch, num_frames, num_joints = joints.shape[:3]
+    feet = list(FOOT_JOINTS)
+    out: dict[str, np.ndarray] = {
+        "root": np.empty((batch, num_frames, 3), np.float32),
+        "foot_height": np.empty((batch, num_frames, len(feet)), np.float32),
+        "foot_speed": np.zeros((batch, num_frames, len(feet)), np.float32),
+        "joint_speed": np.zeros((batch, num_frames, num_joints), np.float32),
+    }
+    foot_hspeed = np.zeros((batch, num_frames, len(feet)), np.float32)
+    horizontal = [a for a in range(3) if a != UP_AXIS]
+    rate = np.float32(fps)
+    for start in range(0, num_frames, block_frames):
+        stop = min(num_frames, start + block_frames)
+        lo = max(0, start - 1)
+        x = np.asarray(joints[:, lo:stop], dtype=np.float32)
+        out["root"][:, start:stop] = x[:, start - lo :, ROOT_JOINT]
+        out["foot_height"][:, start:stop] = x[:, start - lo :, feet, UP_AXIS]
+        if x.shape[1] < 2:
+            continue
+        d = np.diff(x, axis=1)  # (batch, n - 1, joints, 3); row k is frame lo + k + 1
+        d *= rate
+        speed = np.sqrt(np.einsum("bfjc,bfjc->bfj", d, d))
+        out["joint_speed"][:, lo + 1 : stop] = speed
+        out["foot_speed"][:, lo + 1 : stop] = speed[:, :, feet]
+        dh = d[:, :, feet][..., horizontal]
+        foot_hspeed[:, lo + 1 : stop] = np.sqrt(np.einsum("bfjc,bfjc->bfj", dh, dh))
+    valid_frames = (
+        np.full(batch, num_frames) if lengths is None else np.asarray(lengths)
+    )
+    valid = np.arange(num_frames) < valid_frames[:, None]  # (batch, frames)
+    for arr in (out["joint_speed"], out["foot_speed"], foot_hspeed):
+        arr[~valid] = 0.0
+        if num_frames > 1:
+            arr[:, 0] = arr[:, 1]
+    # Heights relative to each sample's floor (lowest foot position over its valid frames)
+    floor = np.where(valid[..., None], out["foot_height"], np.inf).min(
+        axis=(1, 2), keepdims=True
+    )
+    out["foot_height"] -= np.where(np.isfinite(floor), floor, 0.0)
+    low = (out["foot_height"] < contact_height) & valid[..., None]
+    out["foot_contact"] = low & (out["foot_speed"] < contact_speed)
+    out["foot_skate"] = low & (foot_hspeed > skate_speed)
+    return out
+
+
+class FeatureIndex:
+    """Loaded feature arrays of one motion store.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        The ``features.npz`` file.
+    meta : dict
+        Version, content hash, fps, thresholds and per-sample valid
+        ``lengths`` the features were built with.
+    arrays : dict[str, np.ndarray]
+        Feature arrays keyed by ``FEATURE_KEYS``.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = pathlib.Path(path)
+        with np.load(self.path, allow_pickle=False) as data:
+            self.meta: dict[str, Any] = json.loads(str(data["meta"]))
+            self.arrays: dict[str, np.ndarray] = {k: data[k] for k in FEATURE_KEYS}
+
+    @property
+    def root(self) -> np.ndarray:
+        return self.arrays["root"]
+
+    @property
+    def foot_skate(self) -> np.ndarray:
+        return self.arrays["foot_skate"]
+
+    @property
+    def foot_contact(self) -> np.ndarray:
+        return self.arrays["foot_contact"]
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.arrays["root"].shape[0])
+
+    @property
+    def num_frames(self) -> int:
+        return int(self.arrays["root"].shape[1])
+
+    def root_trail(
+        self, sample: int, start: int = 0, stop: int | None = None
+    ) -> np.ndarray:
+        """Return the ``(frames, 3)`` root trajectory of ``sample``."""
+        return self.arrays["root"][sample, start:stop]
+
+    def skate_frames(self, sample: int) -> np.ndarray:
+        """Return the frame indices where any foot of ``sample`` skates."""
+        return np.flatnonzero(self.arrays["foot_skate"][sample].any(axis=-1))
+
+    def contact_frames(self, sample: int) -> np.ndarray:
+        """Return the frame indices where any foot of ``sample`` is planted."""
+        return np.flatnonzero(self.arrays["foot_contact"][sample].any(axis=-1))
+
+    def skate_ratio(self, sample: int, num_frames: int | None = None) -> float:
+        """Fraction of the first ``num_frames`` frames (default: the valid ones) with a skating foot."""
+        if num_frames is None and "lengths" in self.meta:
+            num_frames = int(self.meta["lengths"][sample])
+        skate = self.arrays["foot_skate"][sample, :num_frames]
+        return float(skate.any(axis=-1).mean()) if len(skate) else 0.0
+
+    def __repr__(self) -> str:
+        return f"FeatureIndex({str(self.path)!r}, samples={self.num_samples}, frames={self.num_frames})"
+
+
+def features_path(store: MotionStore) -> pathlib.Path:
+    return store.store_dir / FEATURES_FILENAME
+
+
+def is_features_current(
+    path: pathlib.Path, store: MotionStore, thresholds: dict[str, float]
+) -> bool:
+    """Return True if ``path`` exists and was built from this store content and thresholds."""
+    if not path.exists():
+        return False
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+    except (OSError, KeyError, ValueError):
+        return False
+    return (
+        meta.get("version") == FEATURES_VERSION
+        and meta.get("content_hash") == store.content_hash
+        and meta.get("thresholds") == thresholds
+    )
+
+
+def build_features(
+    store: MotionStore,
+    contact_height: float = CONTACT_HEIGHT,
+    contact_speed: float = CONTACT_SPEED,
+    skate_speed: float = SKATE_SPEED,
+) -> FeatureIndex:
+    """Compute the features of ``store`` and write them atomically next to it."""
+    require_t2m(store, "the feature index")
+    thresholds = _thresholds(contact_height, contact_speed, skate_speed)
+    lengths = [sum(store.segment_lengths(i)) for i in range(store.num_samples)]
+    arrays = compute_features(
+        store.joints,
+        store.fps,
+        contact_height=thresholds["contact_height"],
+        contact_speed=thresholds["contact_speed"],
+        skate_speed=thresholds["skate_speed"],
+        lengths=lengths,
+    )
+    meta = {
+        "version": FEATURES_VERSION,
+        "content_hash": store.content_hash,
+        "fps": store.fps,
+        "thresholds": thresholds,
+        "lengths": lengths,
+    }
+    path = features_path(store)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+    return FeatureIndex(path)
+
+
+def open_features(
+    path: str | os.PathLike[str] | MotionStore,
+    rebuild: bool = False,
+    contact_height: float = CONTACT_HEIGHT,
+    contact_speed: float = CONTACT_SPEED,
+    skate_speed: float = SKATE_SPEED,
+) -> FeatureIndex:
+    """Open the feature index of a store, building it if missing or stale.
+
+    ``path`` may be anything :func:`open_motion_store` accepts, or an open
+    :class:`MotionStore`.
+    """
+    store = path if isinstance(path, MotionStore) else open_motion_store(path)
+    thresholds = _thresholds(contact_height, contact_speed, skate_speed)
+    target = features_path(store)
+    if rebuild or not is_features_current(target, store, thresholds):
+        return build_features(store, **thresholds)
+    return FeatureIndex(target)
+
+
+def _build_path(job: tuple[str, bool]) -> str:
+    path, force = job
+    index = open_features(path, rebuild=force)
+    return str(index.path)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Build cached per-frame feature indexes for motion stores"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser(
+        "build", help="Build (or refresh) feature indexes for result trees"
+    )
+    p_build.add_argument(
+        "paths", nargs="+", help="results.npy files, result directories or result trees"
+    )
+    p_build.add_argument(
+        "--force", action="store_true", help="Rebuild even if the index is current"
+    )
+    p_build.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    p_info = sub.add_parser("info", help="Summarize the feature index of one result")
+    p_info.add_argument("path", help="Store directory, result directory or results.npy")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        jobs = [
+            (str(d), args.force) for root in args.paths for d in iter_result_dirs(root)
+        ]
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            for built in pool.map(_build_path, jobs):
+                print(f"features: {built}")
+    else:
+        index = open_features(args.path)
+        print(index)
+        print(f"Thresholds: {index.meta['thresholds']}")
+        for sample in range(index.num_samples):
+            print(
+                f"  sample {sample}: skate {index.skate_ratio(sample):.1%}, "
+                f"contact frames {len(index.contact_frames(sample))}"
+            )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,233 @@
+"""Frame sources: bounded-memory random access to ``(N, frames, joints, 3)`` motion.
+
+Viewers only ever need one frame (or two, when interpolating) of every
+skeleton at a time, so they read motion through a small frame-source
+interface instead of holding the whole array:
+
+- :class:`ArrayFrameSource` wraps an in-memory array (no copy).
+- :class:`ChunkedFrameSource` reads fixed-size frame chunks from any
+  sliceable array (typically the motion store's ``joints.f32`` memmap),
+  keeps at most ``max_chunks`` decoded chunks in an LRU and prefetches the
+  next chunk on a worker thread while the current one is being played.
+
+A chunked source can also convert axes (e.g. Z-up input for the Y-up
+viewers) while decoding a chunk, in place, with
+:func:`motion_gen_survey.transforms.apply_axis_map`.
+
+With the chunked source, resident memory is
+``max_chunks * chunk_frames * N * joints * 3 * 4`` bytes, independent of the
+sequence length, so hour-long compositions play like 200-frame ones.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Protocol, runtime_checkable
+
+import numpy as np
+
+from motion_gen_survey.transforms import IDENTITY, AxisMap, apply_axis_map
+
+
+DEFAULT_CHUNK_FRAMES = 1024
+DEFAULT_MAX_CHUNKS = 4
+
+
+@runtime_checkable
+class FrameSource(Protocol):
+    """Random access to the poses of N skeletons, one frame at a time."""
+
+    num_skeletons: int
+    num_frames: int
+    num_joints: int
+
+    def frame(self, index: int) -> np.ndarray:
+        """Return the ``(N, joints, 3)`` poses at ``index`` (read-only view)."""
+        ...
+
+    def close(self) -> None:
+        """Release worker threads and cached chunks."""
+        ...
+
+
+def _as_batched(joints: Any) -> Any:
+    """Give a single ``(frames, joints, 3)`` sequence a leading sample axis (view, no copy)."""
+    return joints[None] if joints.ndim == 3 else joints
+
+
+class ArrayFrameSource:
+    """Frame source over an array that already lives in memory."""
+
+    def __init__(self, joints: np.ndarray) -> None:
+        self._joints = _as_batched(joints)
+        self.num_skeletons, self.num_frames, self.num_joints = self._joints.shape[:3]
+
+    def frame(self, index: int) -> np.ndarray:
+        return self._joints[:, index]
+
+    def close(self) -> None:
+        pass
+
+
+class ChunkedFrameSource:
+    """Chunked, LRU-cached, prefetching frame source.
+
+    Parameters
+    ----------
+    joints : array-like
+        ``(N, frames, joints, 3)`` or ``(frames, joints, 3)`` array supporting
+        basic slicing, e.g. ``MotionStore.joints`` (a memmap).
+    chunk_frames : int
+        Frames per chunk.
+    max_chunks : int
+        Decoded chunks kept in memory (at least 2, so the current and the
+        prefetched chunk can coexist).
+    prefetch : bool
+        Load the following chunk on a background thread after each access.
+    axis_map : AxisMap, optional
+        Axis conversion applied to every chunk as it is decoded.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Chunk cache statistics; a miss is a chunk loaded on the calling thread.
+    """
+
+    def __init__(
+        self,
+        joints: Any,
+        chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+        max_chunks: int = DEFAULT_MAX_CHUNKS,
+        prefetch: bool = True,
+        axis_map: AxisMap | None = None,
+    ) -> None:
+        self._joints = _as_batched(joints)
+        self.axis_map = axis_map if axis_map != IDENTITY else None
+        self.num_skeletons, self.num_frames, self.num_joints = self._joints.shape[:3]
+        self.chunk_frames = max(1, int(chunk_frames))
+        self.max_chunks = max(2, int(max_chunks))
+        self.num_chunks = -(-self.num_frames // self.chunk_frames)
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._pending: dict[int, Future[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-prefetch")
+            if prefetch and self.num_chunks > 1
+            else None
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Upper bound of the memory held by cached chunks."""
+        return (
+            self.max_chunks
+            * self.chunk_frames
+            * self.num_skeletons
+            * self.num_joints
+            * 3
+            * 4
+        )
+
+    def _load(self, chunk: int) -> np.ndarray:
+        start = chunk * self.chunk_frames
+        stop = min(self.num_frames, start + self.chunk_frames)
+        if self.axis_map is None:
+            block = np.ascontiguousarray(self._joints[:, start:stop], dtype=np.float32)
+        else:
+            block = np.array(self._joints[:, start:stop], dtype=np.float32)
+            apply_axis_map(block, self.axis_map, out=block)
+        block.flags.writeable = False
+        return block
+
+    def _insert(self, chunk: int, block: np.ndarray) -> None:
+        with self._lock:
+            self._cache[chunk] = block
+            self._cache.move_to_end(chunk)
+            while len(self._cache) > self.max_chunks:
+                self._cache.popitem(last=False)
+
+    def _prefetch_job(self, chunk: int) -> np.ndarray:
+        try:
+            block = self._load(chunk)
+            self._insert(chunk, block)
+            return block
+        finally:
+            with self._lock:
+                self._pending.pop(chunk, None)
+
+    def chunk(self, chunk: int) -> np.ndarray:
+        """Return chunk ``chunk`` as an ``(N, <=chunk_frames, joints, 3)`` float32 array."""
+        with self._lock:
+            block = self._cache.get(chunk)
+            if block is not None:
+                self._cache.move_to_end(chunk)
+                self.hits += 1
+                return block
+            pending = self._pending.get(chunk)
+        if pending is not None:
+            # Prefetch already in flight: wait for it instead of loading twice
+            self.hits += 1
+            return pending.result()
+        self.misses += 1
+        block = self._load(chunk)
+        self._insert(chunk, block)
+        return block
+
+    def prefetch(self, chunk: int) -> None:
+        """Schedule ``chunk`` for background loading if it is not cached or pending."""
+        if self._executor is None or not (0 <= chunk < self.num_chunks):
+            return
+        with self._lock:
+            if chunk in self._cache or chunk in self._pending:
+                return
+            self._pending[chunk] = self._executor.submit(self._prefetch_job, chunk)
+
+    def frame(self, index: int) -> np.ndarray:
+        chunk, offset = divmod(int(index), self.chunk_frames)
+        block = self.chunk(chunk)
+        # Playback moves forward and loops, so the next chunk is the likely one
+        self.prefetch((chunk + 1) % self.num_chunks)
+        return block[:, offset]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        with self._lock:
+            self._cache.clear()
+
+    def __enter__(self) -> ChunkedFrameSource:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def as_frame_source(
+    joints: Any,
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+    max_chunks: int = DEFAULT_MAX_CHUNKS,
+    axis_map: AxisMap | None = None,
+) -> FrameSource:
+    """Wrap ``joints`` in a frame source.
+
+    Existing frame sources are returned unchanged. Memory-mapped arrays (and
+    anything that is not an in-memory ndarray) longer than one chunk, and
+    any input that needs an axis conversion, get a
+    :class:`ChunkedFrameSource`; everything else an :class:`ArrayFrameSource`.
+    """
+    if isinstance(joints, FrameSource):
+        return joints
+    # Slices of a memmap stay np.memmap instances
+    in_memory = isinstance(joints, np.ndarray) and not isinstance(joints, np.memmap)
+    frames = _as_batched(joints).shape[1]
+    convert = axis_map is not None and axis_map != IDENTITY
+    if not convert and (in_memory or frames <= chunk_frames):
+        return ArrayFrameSource(np.asarray(joints))
+    return ChunkedFrameSource(
+        joints, chunk_frames=chunk_frames, max_chunks=max_chunks, axis_map=axis_map
+    )
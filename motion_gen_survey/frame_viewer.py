@@ -0,0 +1,160 @@
+"""
+FlowMDM Motion Visualization Script
+
+Visualizes T2M format motion data from FlowMDM results using correct joint topology.
+- Fixed skeleton connections to match T2M kinematic chain structure
+- Corrected joint indices and labels based on HumanML3D documentation
+- Supports both Babel (30 FPS) and HumanML3D (20 FPS) datasets
+- Optional onion skin: K frames of the sequence drawn in one scene
+
+Usage:
+    python -m motion_gen_survey frame [--result-dir DIR] [--sample N] [--frame 10]
+    python -m motion_gen_survey frame --onion-frames 20 --onion-step 5 --all-joints
+
+(``python tests/check-flowmdm-result-single-frame.py`` is a thin wrapper that
+takes the same arguments.)
+
+Settings:
+    - --frame: Which frame to visualize (0 to seq_len-1)
+    - --all-joints: Label all 22 joints instead of key joints only
+    - --onion-frames: Number of frames drawn (1 = single frame; frames
+      frame, frame - step, ... are shown with fading colour)
+    - --onion-step: Frame stride between onion-skin poses
+
+All skeletons are drawn through motion_gen_survey.skeleton_render, which packs
+every pose into one PolyData and emits exactly one line actor, one joint
+actor and one label actor, so a 100-frame onion skin stays interactive.
+PyVista and pyvistaqt are imported lazily on first use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+from collections.abc import Sequence
+
+import numpy as np
+
+from motion_gen_survey.lazy_import import lazy_import
+from motion_gen_survey.motion_codec import MotionArchive, open_motion
+from motion_gen_survey.motion_store import require_t2m
+from motion_gen_survey.skeleton_render import add_skeletons, key_joint_labels
+
+
+pv = lazy_import("pyvista")
+pvqt = lazy_import("pyvistaqt")
+
+
+# Default FlowMDM result
+flowmdm_result_dir = pathlib.Path(
+    "model_zoo/FlowMDM/results/babel/FlowMDM/001300000_s10_simple_walk_instructions"
+)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Show one frame (or an onion skin) of a FlowMDM result"
+    )
+    parser.add_argument(
+        "--result-dir",
+        default=str(flowmdm_result_dir),
+        help="FlowMDM result directory, results.npy, motion store directory or .t2mc archive",
+    )
+    parser.add_argument("--sample", type=int, default=0)
+    parser.add_argument("--frame", type=int, default=10, help="Frame to visualize")
+    parser.add_argument(
+        "--all-joints",
+        action="store_true",
+        help="Label all joints, not only key joints",
+    )
+    parser.add_argument(
+        "--onion-frames", type=int, default=1, help="Overlay this many earlier frames"
+    )
+    parser.add_argument(
+        "--onion-step",
+        type=int,
+        default=5,
+        help="Frame stride between onion-skin poses",
+    )
+    args = parser.parse_args(argv)
+
+    # Load FlowMDM result (memory-mapped motion store, converted from results.npy on first use,
+    # or a compact motion archive, decoded here)
+    store = open_motion(args.result_dir)
+    if not isinstance(store, MotionArchive):
+        try:
+            require_t2m(store, "the frame viewer")
+        except ValueError as e:
+            parser.error(str(e))
+    motion_data: np.ndarray = store.sample(args.sample)  # Shape: (seq_len, 22, 3)
+    frame_index = args.frame
+
+    # Print dataset info
+    print(f"Loaded motion store: {store.joints.shape} (batch, frames, 22, 3)")
+    print(f"Text prompts: {store.text or ['No text available']}")
+    print(f"Sequence lengths: {store.lengths or 'Not specified'}")
+    print(f"FPS: {store.fps:g}")
+
+    # Create interactive plotter with Qt backend
+    plot = pvqt.BackgroundPlotter(
+        title="FlowMDM T2M Motion Viewer - 22 Joints", window_size=(1024, 768)
+    )
+    plot.set_background([0.95, 0.95, 0.95])  # Light gray background
+
+    # Add ground plane for reference (Y-up coordinate system)
+    plane = pv.Plane(
+        center=[0, 0, 0],
+        direction=[0, 1, 0],
+        i_size=4,
+        j_size=4,
+        i_resolution=20,
+        j_resolution=20,
+    )
+    plot.add_mesh(
+        plane, color=[0.6, 0.6, 0.6], opacity=0.3, show_edges=True, line_width=0.5
+    )
+
+    # Add coordinate axes
+    plot.add_axes()
+
+    # Frames to draw, oldest first so the current frame is the last (labelled) skeleton
+    frames = np.arange(
+        frame_index, frame_index - args.onion_frames * args.onion_step, -args.onion_step
+    )[::-1]
+    frames = frames[frames >= 0]
+    poses = motion_data[frames]  # (K, 22, 3) joint positions
+    print(
+        f"Visualizing frame {frame_index}/{store.num_frames - 1} ({len(frames)} pose(s))"
+    )
+
+    # Draw skeleton bones, joints and labels: one actor each regardless of pose count
+    add_skeletons(
+        plot,
+        poses,
+        labels=key_joint_labels(args.all_joints),
+        color=[0.2, 0.4, 0.8],  # Blue bones
+        joint_color=[1.0, 0.2, 0.2],  # Red joints
+        fade=len(frames) > 1,
+        line_width=3.0,
+        point_size=10,
+        font_size=8,
+    )
+
+    # Add frame counter
+    plot.add_text(
+        f"Frame: {frame_index}/{store.num_frames - 1}",
+        position="upper_left",
+        font_size=14,
+        color=[0, 0, 0],
+    )
+
+    # Set camera for good viewing angle (front-right, Y-up)
+    plot.camera_position = ([3, 2, 3], [0, 1, 0], [0, 1, 0])
+
+    # Show the interactive viewer
+    plot.show()
+    plot.app.exec_()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,416 @@
+"""Fit SMPL-X ``global_orient`` / ``body_pose`` / ``transl`` to T2M joint trajectories.
+
+FlowMDM results only carry the 22 T2M joint positions per frame, while mesh
+previews need SMPL-X axis-angle rotations and a root translation. This module
+solves that inverse-kinematics problem on CPU:
+
+- The T2M joints are the first 22 SMPL-X joints, so the model side only
+  needs forward kinematics over those 22 joints (``smplx.lbs``
+  ``batch_rodrigues`` + ``batch_rigid_transform``) on the rest joints of the
+  chosen shape. No vertices are skinned while fitting.
+- All frames of a chunk are optimized as one batched problem with Adam.
+  The loss combines joint positions, bone directions along
+  ``t2m_kinematic_chain`` (robust to the bone-length mismatch between T2M and
+  SMPL-X), a small pose prior, and temporal smoothness of joint acceleration
+  and pose velocity.
+- ``global_orient`` and ``transl`` start from a per-frame Kabsch alignment of
+  the rest torso to the target torso. Each chunk warm-starts ``body_pose``
+  from the last solved frame of the previous chunk, and the smoothness terms
+  reach back over a few already-solved frames so chunk seams stay continuous.
+
+Rotations of leaf joints (head, feet, wrists) are not observable from 22
+positions and stay near zero through the prior.
+
+The result is saved as ``smplx_pose.npy`` (``(frames, 165)``, hands/face zero)
+plus ``smplx_transl.npy``, the layout :mod:`motion_gen_survey.smplx_bake`
+reads, so a fit can go straight to the vertex cache and the mesh exporter.
+The fitted meshes live in the joints' coordinate frame (Y-up for FlowMDM).
+
+Usage:
+    python -m motion_gen_survey.ik_fit <result_dir> --sample 0 --model-path data --bake
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.smplx_bake import (
+    POSE_DIM,
+    POSE_LAYOUT,
+    TRANSL_FILENAME,
+    _normalize_betas,
+    bake_to_cache,
+    create_smplx_model,
+)
+from motion_gen_survey.t2m import NUM_JOINTS, skeleton_pairs
+
+
+POSE_FILENAME = "smplx_pose.npy"
+FIT_INFO_FILENAME = "ik_fit.json"
+# Pelvis, hips, spine and collars: a near-rigid set used for the Kabsch initialization
+TORSO_JOINTS: tuple[int, ...] = (0, 1, 2, 3, 6, 9, 13, 14)
+DEFAULT_CHUNK_FRAMES = 128
+DEFAULT_ITERS = 60
+DEFAULT_FIRST_ITERS = 150
+DEFAULT_OVERLAP = 2
+
+
+@dataclass
+class IKWeights:
+    """Loss weights of the IK objective."""
+
+    position: float = 1.0
+    bone_direction: float = 0.1
+    pose_prior: float = 1e-3
+    joint_accel: float = 10.0
+    pose_velocity: float = 1e-2
+
+
+@dataclass
+class IKResult:
+    """Fitted SMPL-X parameters of one sequence.
+
+    Attributes
+    ----------
+    poses : np.ndarray
+        ``(frames, 165)`` axis-angle poses (global orient and body filled).
+    transl : np.ndarray
+        ``(frames, 3)`` root translation.
+    joint_error : np.ndarray
+        ``(frames,)`` mean per-joint position error in meters.
+    seconds : float
+        Wall time of the fit.
+    """
+
+    poses: np.ndarray
+    transl: np.ndarray
+    joint_error: np.ndarray
+    seconds: float
+
+
+def kabsch_rotations(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Best rotations ``R`` with ``R @ src[j] ~ dst[..., j]`` for every frame.
+
+    ``src`` is ``(J, 3)`` (shared) or ``(..., J, 3)``; ``dst`` is ``(..., J, 3)``.
+    Both are centred on their means. Returns ``(..., 3, 3)``.
+    """
+    src = src - src.mean(axis=-2, keepdims=True)
+    dst = dst - dst.mean(axis=-2, keepdims=True)
+    h = np.einsum("...jc,...jd->...cd", src, dst)
+    u, _, vt = np.linalg.svd(h)
+    v = np.swapaxes(vt, -1, -2)
+    ut = np.swapaxes(u, -1, -2)
+    d = np.sign(np.linalg.det(v @ ut))
+    v[..., :, 2] *= d[..., None]
+    return v @ ut
+
+
+def matrix_to_axis_angle(rot: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    """Convert ``(..., 3, 3)`` rotation matrices to ``(..., 3)`` axis-angle vectors.
+
+    The angle comes from ``atan2(sin, cos)`` rather than ``arccos``, which
+    loses most of its precision near 0 and pi.
+    """
+    cos = (np.trace(rot, axis1=-2, axis2=-1) - 1.0) * 0.5
+    skew = np.stack(
+        [
+            rot[..., 2, 1] - rot[..., 1, 2],
+            rot[..., 0, 2] - rot[..., 2, 0],
+            rot[..., 1, 0] - rot[..., 0, 1],
+        ],
+        axis=-1,
+    )
+    sin = 0.5 * np.linalg.norm(skew, axis=-1)
+    angle = np.arctan2(sin, cos)
+    out = np.zeros((*rot.shape[:-2], 3), dtype=np.float64)
+    regular = sin > 1e-4
+    out[regular] = skew[regular] * (angle[regular] / (2.0 * sin[regular]))[..., None]
+    small = (~regular) & (cos > 0.0)
+    out[small] = skew[small] * 0.5  # angle ~ sin
+    # Near pi: axis from the largest column of (R + I) / 2 ~ a a^T, signed by the skew part
+    flip = (~regular) & (cos <= 0.0)
+    if flip.any():
+        b = (rot[flip] + np.eye(3)) * 0.5
+        col = np.argmax(np.diagonal(b, axis1=-2, axis2=-1), axis=-1)
+        axis = b[np.arange(len(b)), :, col]
+        axis /= np.maximum(np.linalg.norm(axis, axis=-1, keepdims=True), eps)
+        axis *= np.where(
+            np.einsum("...c,...c->...", axis, skew[flip]) < 0.0, -1.0, 1.0
+        )[..., None]
+        out[flip] = axis * angle[flip][..., None]
+    return out
+
+
+def initial_global_params(
+    rest_joints: np.ndarray, target: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame ``global_orient`` / ``transl`` aligning the rest torso to ``target``.
+
+    SMPL-X rotates the body about the rest pelvis, so with ``R`` from Kabsch
+    the translation is ``target_pelvis - rest_pelvis``.
+    """
+    torso = list(TORSO_JOINTS)
+    src = rest_joints[torso] - rest_joints[0]
+    dst = target[:, torso] - target[:, :1]
+    rot = kabsch_rotations(src, dst)
+    global_orient = matrix_to_axis_angle(rot).astype(np.float32)
+    transl = (target[:, 0] - rest_joints[0]).astype(np.float32)
+    return global_orient, transl
+
+
+def _rest_joints(model: Any, betas: np.ndarray) -> Any:
+    """Rest-pose joints ``(1, 55, 3)`` of ``model`` for ``betas`` (torch tensor)."""
+    import torch
+    from smplx.lbs import blend_shapes, vertices2joints  # type: ignore
+
+    with torch.no_grad():
+        betas_t = torch.from_numpy(betas[None]).to(model.shapedirs.device)
+        v_shaped = model.v_template[None] + blend_shapes(
+            betas_t, model.shapedirs[..., : betas_t.shape[1]]
+        )
+        return vertices2joints(model.J_regressor, v_shaped)
+
+
+def fit_sequence(
+    model: Any,
+    joints: np.ndarray,
+    betas: Sequence[float] | np.ndarray | None = None,
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+    iters: int = DEFAULT_ITERS,
+    first_iters: int = DEFAULT_FIRST_ITERS,
+    overlap: int = DEFAULT_OVERLAP,
+    lr: float = 0.05,
+    weights: IKWeights | None = None,
+    verbose: bool = False,
+) -> IKResult:
+    """Fit SMPL-X parameters to ``(frames, 22, 3)`` joint positions.
+
+    Parameters
+    ----------
+    model : smplx.SMPLX
+        Model from :func:`motion_gen_survey.smplx_bake.create_smplx_model`.
+    joints : np.ndarray
+        Target T2M joint positions, ``(frames, 22, 3)``.
+    betas : array-like, optional
+        Shape coefficients (kept fixed).
+    chunk_frames : int
+        Frames optimized together.
+    iters, first_iters : int
+        Adam steps per chunk (the first chunk starts cold and gets more).
+    overlap : int
+        Already-solved frames the smoothness terms look back on.
+    lr : float
+        Adam learning rate.
+    weights : IKWeights, optional
+        Loss weights.
+
+    Returns
+    -------
+    IKResult
+    """
+    import torch
+    from smplx.lbs import batch_rigid_transform, batch_rodrigues  # type: ignore
+
+    start_time = time.perf_counter()
+    w = weights or IKWeights()
+    target_np = np.ascontiguousarray(joints[:, :NUM_JOINTS], dtype=np.float32)
+    num_frames = len(target_np)
+    rest = _rest_joints(model, _normalize_betas(betas))[:, :NUM_JOINTS]  # (1, 22, 3)
+    parents = model.parents[:NUM_JOINTS].clone()
+    go_init, tr_init = initial_global_params(rest[0].cpu().numpy(), target_np)
+
+    pairs = torch.as_tensor(skeleton_pairs, dtype=torch.long)
+    target_all = torch.from_numpy(target_np)
+    body_dim = POSE_LAYOUT["body_pose"].stop - POSE_LAYOUT["body_pose"].start
+
+    poses = np.zeros((num_frames, POSE_DIM), dtype=np.float32)
+    transl = np.zeros((num_frames, 3), dtype=np.float32)
+    error = np.zeros(num_frames, dtype=np.float32)
+    tail_joints = tail_body = None
+
+    def forward(go: Any, body: Any, tr: Any) -> Any:
+        n = go.shape[0]
+        rot = batch_rodrigues(torch.cat([go, body], dim=1).reshape(-1, 3)).reshape(
+            n, NUM_JOINTS, 3, 3
+        )
+        posed, _ = batch_rigid_transform(
+            rot, rest.expand(n, -1, -1), parents, dtype=go.dtype
+        )
+        return posed + tr[:, None]
+
+    for chunk, start in enumerate(range(0, num_frames, chunk_frames)):
+        stop = min(num_frames, start + chunk_frames)
+        n = stop - start
+        tgt = target_all[start:stop]
+        tgt_bone = tgt[:, pairs[:, 1]] - tgt[:, pairs[:, 0]]
+        tgt_dir = tgt_bone / tgt_bone.norm(dim=-1, keepdim=True).clamp_min(1e-6)
+
+        go = torch.from_numpy(go_init[start:stop]).clone().requires_grad_(True)
+        tr = torch.from_numpy(tr_init[start:stop]).clone().requires_grad_(True)
+        if tail_body is None:
+            body = torch.zeros(n, body_dim)
+        else:
+            body = (
+                tail_body[-1:].expand(n, -1).clone()
+            )  # warm start from the last solved frame
+        body.requires_grad_(True)
+        opt = torch.optim.Adam([go, body, tr], lr=lr)
+
+        for _ in range(first_iters if chunk == 0 else iters):
+            opt.zero_grad(set_to_none=True)
+            pred = forward(go, body, tr)
+            loss = w.position * ((pred - tgt) ** 2).sum(-1).mean()
+            bone = pred[:, pairs[:, 1]] - pred[:, pairs[:, 0]]
+            cos = (
+                bone / bone.norm(dim=-1, keepdim=True).clamp_min(1e-6) * tgt_dir
+            ).sum(-1)
+            loss = loss + w.bone_direction * (1.0 - cos).mean()
+            loss = loss + w.pose_prior * (body**2).sum(-1).mean()
+            seq = pred if tail_joints is None else torch.cat([tail_joints, pred])
+            if len(seq) > 2:
+                accel = seq[2:] - 2.0 * seq[1:-1] + seq[:-2]
+                loss = loss + w.joint_accel * (accel**2).sum(-1).mean()
+            pseq = body if tail_body is None else torch.cat([tail_body, body])
+            if len(pseq) > 1:
+                loss = (
+                    loss
+                    + w.pose_velocity * ((pseq[1:] - pseq[:-1]) ** 2).sum(-1).mean()
+                )
+            loss.backward()
+            opt.step()
+
+        with torch.no_grad():
+            pred = forward(go, body, tr)
+            error[start:stop] = (pred - tgt).norm(dim=-1).mean(-1).numpy()
+            poses[start:stop, POSE_LAYOUT["global_orient"]] = go.numpy()
+            poses[start:stop, POSE_LAYOUT["body_pose"]] = body.numpy()
+            transl[start:stop] = tr.numpy()
+            tail_joints = pred[-overlap:].clone() if overlap > 0 else None
+            tail_body = body[-max(1, overlap) :].clone()
+        if verbose:
+            print(
+                f"  frames {start}-{stop - 1}: mean joint error {error[start:stop].mean() * 1000:.1f} mm"
+            )
+
+    return IKResult(poses, transl, error, time.perf_counter() - start_time)
+
+
+def save_fit(
+    result: IKResult,
+    out_dir: str | os.PathLike[str],
+    info: dict[str, Any] | None = None,
+) -> pathlib.Path:
+    """Write ``smplx_pose.npy``, ``smplx_transl.npy`` and ``ik_fit.json``; return the pose file."""
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pose_file = out_dir / POSE_FILENAME
+    np.save(pose_file, result.poses)
+    np.save(out_dir / TRANSL_FILENAME, result.transl)
+    summary = {
+        "frames": len(result.poses),
+        "mean_joint_error_m": float(result.joint_error.mean())
+        if len(result.joint_error)
+        else 0.0,
+        "max_joint_error_m": float(result.joint_error.max())
+        if len(result.joint_error)
+        else 0.0,
+        "seconds": round(result.seconds, 3),
+        **(info or {}),
+    }
+    (out_dir / FIT_INFO_FILENAME).write_text(
+        json.dumps(summary, indent=2), encoding="utf-8"
+    )
+    return pose_file
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from motion_gen_survey.motion_store import open_motion_store
+
+    parser = argparse.ArgumentParser(
+        description="Fit SMPL-X pose/translation to FlowMDM joint trajectories"
+    )
+    parser.add_argument(
+        "path", help="Result directory, results.npy or motion store directory"
+    )
+    parser.add_argument("--sample", type=int, default=0)
+    parser.add_argument(
+        "--model-path",
+        default="data",
+        help="Path containing smplx/ directory (default: data)",
+    )
+    parser.add_argument(
+        "--gender", choices=["neutral", "male", "female"], default="neutral"
+    )
+    parser.add_argument("--betas", type=float, nargs="*", default=None)
+    parser.add_argument(
+        "--out-dir",
+        default=None,
+        help="Output directory (default: <store>/ik/sample_NNN)",
+    )
+    parser.add_argument("--chunk-frames", type=int, default=DEFAULT_CHUNK_FRAMES)
+    parser.add_argument("--iters", type=int, default=DEFAULT_ITERS)
+    parser.add_argument("--first-iters", type=int, default=DEFAULT_FIRST_ITERS)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads")
+    parser.add_argument(
+        "--bake",
+        action="store_true",
+        help="Bake the fitted sequence into the vertex cache",
+    )
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        import torch
+
+        torch.set_num_threads(args.threads)
+
+    store = open_motion_store(args.path)
+    frames = store.segment_lengths(args.sample)
+    joints = np.asarray(store.sample(args.sample)[: sum(frames)], dtype=np.float32)
+    model = create_smplx_model(args.model_path, gender=args.gender)
+    print(f"Fitting {len(joints)} frames of sample {args.sample} ({store.store_dir})")
+    result = fit_sequence(
+        model,
+        joints,
+        betas=args.betas,
+        chunk_frames=args.chunk_frames,
+        iters=args.iters,
+        first_iters=args.first_iters,
+        verbose=True,
+    )
+    out_dir = (
+        pathlib.Path(args.out_dir)
+        if args.out_dir
+        else store.store_dir / "ik" / f"sample_{args.sample:03d}"
+    )
+    pose_file = save_fit(
+        result,
+        out_dir,
+        {
+            "source": str(store.store_dir),
+            "sample": args.sample,
+            "gender": args.gender,
+            "betas": _normalize_betas(args.betas).tolist(),
+            "weights": asdict(IKWeights()),
+        },
+    )
+    print(
+        f"Mean joint error {result.joint_error.mean() * 1000:.1f} mm in {result.seconds:.1f}s -> {pose_file}"
+    )
+    if args.bake:
+        cache_file = bake_to_cache(
+            pose_file, model_path=args.model_path, gender=args.gender, betas=args.betas
+        )
+        print(f"Baked vertices: {cache_file}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,204 @@
+"""Low-overhead per-stage timing of a frame loop.
+
+:class:`FrameProfiler` records, for the last ``window`` frames, the time
+spent in each named stage of a frame (e.g. point copy, label update, status
+text, VTK render), the whole-frame latency and, optionally, the Python heap
+allocated during the frame (``tracemalloc`` peak above the frame's starting
+level). All samples go into preallocated ring buffers; the only per-frame
+work is a few ``perf_counter`` calls and array stores, so it can stay on in
+production viewers.
+
+:meth:`FrameProfiler.stats` summarizes the window (per-stage mean / p50 /
+p95 / max, latency percentiles and histogram, rolling FPS, allocation
+counts), :meth:`FrameProfiler.hud` formats a one-line overlay that is
+refreshed every ``hud_every`` frames, and :meth:`FrameProfiler.dump` writes
+the summary as JSON.
+
+Usage::
+
+    prof = FrameProfiler(("copy", "label", "text", "render"))
+    prof.begin()
+    ...
+    prof.mark(0)
+    ...
+    prof.mark(1)
+    prof.end()
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import pathlib
+import time
+import tracemalloc
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+
+DEFAULT_WINDOW = 240
+DEFAULT_HUD_EVERY = 15
+# Frame latency histogram bin edges in milliseconds (60 Hz = 16.7 ms, 30 Hz = 33.3 ms)
+LATENCY_BINS_MS: tuple[float, ...] = (
+    0.0,
+    2.0,
+    4.0,
+    8.0,
+    16.7,
+    33.3,
+    50.0,
+    100.0,
+    float("inf"),
+)
+
+
+class FrameProfiler:
+    """Rolling per-stage timer for a render loop.
+
+    Parameters
+    ----------
+    stages : sequence of str
+        Stage names; :meth:`mark` takes the stage's index.
+    window : int
+        Frames kept for the rolling statistics.
+    track_allocations : bool
+        Record Python heap allocations per frame with ``tracemalloc``
+        (started here if it is not already tracing; adds noticeable overhead).
+    hud_every : int
+        Frames between refreshes of the :meth:`hud` string.
+
+    Attributes
+    ----------
+    frames : int
+        Frames recorded since creation.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[str],
+        window: int = DEFAULT_WINDOW,
+        track_allocations: bool = False,
+        hud_every: int = DEFAULT_HUD_EVERY,
+    ) -> None:
+        self.stages = tuple(stages)
+        self.window = max(2, int(window))
+        self.hud_every = max(1, int(hud_every))
+        self.frames = 0
+        self._stage_s = np.zeros((self.window, len(self.stages)))
+        self._frame_s = np.zeros(self.window)
+        self._frame_end = np.zeros(self.window)
+        self._alloc = np.zeros(self.window, dtype=np.int64)
+        self._row = 0
+        self._start = self._last = 0.0
+        self._mem0 = 0
+        self._hud = ""
+        self.track_allocations = track_allocations
+        self._owns_tracemalloc = False
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def begin(self) -> None:
+        """Start a frame."""
+        self._row = self.frames % self.window
+        self._stage_s[self._row] = 0.0
+        if self.track_allocations:
+            self._mem0 = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, stage: int) -> None:
+        """Attribute the time since the previous mark (or :meth:`begin`) to ``stage``."""
+        now = time.perf_counter()
+        self._stage_s[self._row, stage] += now - self._last
+        self._last = now
+
+    def end(self) -> None:
+        """Finish the frame started by :meth:`begin`."""
+        now = time.perf_counter()
+        self._frame_s[self._row] = now - self._start
+        self._frame_end[self._row] = now
+        if self.track_allocations:
+            self._alloc[self._row] = tracemalloc.get_traced_memory()[1] - self._mem0
+        self.frames += 1
+        if self.frames % self.hud_every == 0:
+            self._hud = ""
+
+    def stats(self) -> dict[str, Any]:
+        """Summary of the last ``window`` frames (times in milliseconds)."""
+        n = min(self.frames, self.window)
+        out: dict[str, Any] = {"frames": self.frames, "window": n}
+        if n == 0:
+            return out
+        stage_ms = self._stage_s[:n] * 1000.0
+        frame_ms = self._frame_s[:n] * 1000.0
+        out["stages_ms"] = {
+            name: {
+                "mean": float(col.mean()),
+                "p50": float(np.percentile(col, 50)),
+                "p95": float(np.percentile(col, 95)),
+                "max": float(col.max()),
+            }
+            for name, col in zip(self.stages, stage_ms.T, strict=True)
+        }
+        p50, p95, p99 = np.percentile(frame_ms, [50, 95, 99])
+        out["frame_ms"] = {
+            "mean": float(frame_ms.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(frame_ms.max()),
+        }
+        counts, _ = np.histogram(frame_ms, bins=np.asarray(LATENCY_BINS_MS))
+        out["frame_ms_histogram"] = {
+            f"{lo:g}-{hi:g}": int(c)
+            for (lo, hi), c in zip(
+                itertools.pairwise(LATENCY_BINS_MS), counts, strict=True
+            )
+        }
+        ends = self._frame_end[:n]
+        span = float(ends.max() - ends.min())
+        out["fps"] = (n - 1) / span if n > 1 and span > 0 else 0.0
+        if self.track_allocations:
+            alloc = self._alloc[:n]
+            out["alloc_bytes"] = {
+                "mean": float(alloc.mean()),
+                "max": int(alloc.max()),
+                "frames_allocating": int((alloc > 0).sum()),
+            }
+        return out
+
+    def hud(self) -> str:
+        """One-line overlay, recomputed every ``hud_every`` frames."""
+        if not self._hud and self.frames:
+            s = self.stats()
+            parts = [f"{name} {v['mean']:.1f}" for name, v in s["stages_ms"].items()]
+            line = (
+                f"{' | '.join(parts)} ms | frame p50 {s['frame_ms']['p50']:.1f} "
+                f"p95 {s['frame_ms']['p95']:.1f} ms | {s['fps']:.0f} fps"
+            )
+            if "alloc_bytes" in s:
+                line += f" | alloc {s['alloc_bytes']['mean']:.0f} B/frame"
+            self._hud = line
+        return self._hud
+
+    def dump(
+        self, path: str | os.PathLike[str], extra: dict[str, Any] | None = None
+    ) -> pathlib.Path:
+        """Write :meth:`stats` (plus ``extra``) as JSON."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**(extra or {}), **self.stats()}, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def close(self) -> None:
+        """Stop ``tracemalloc`` if this profiler started it."""
+        if self._owns_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._owns_tracemalloc = False
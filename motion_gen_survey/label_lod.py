@@ -0,0 +1,319 @@
+"""Level-of-detail joint labels for multi-skeleton scenes.
+
+``plotter.add_point_labels(..., always_visible=True)`` runs VTK's label
+placement (layout, collision tests and text rasterization of every visible
+string) on every render, and its cost grows with the number of labelled
+points. :class:`LabelLOD` replaces it with a fixed pool of
+``vtkBillboardTextActor3D`` actors:
+
+- **Selection by projected size.** Each skeleton's on-screen height in
+  pixels is estimated from the camera (distance, view angle or parallel
+  scale, and window height), so zooming, dollying and resizing all count.
+  The height picks a level from ``levels``: near skeletons get all joint
+  names, mid-range ones a few key joints, distant ones only the head, tiny
+  ones nothing. Skeletons outside the view frustum are skipped and the
+  nearest skeletons are served first until ``max_labels`` is reached.
+- **Lower anchor rate.** Label anchors follow the geometry every
+  ``update_every`` frames instead of every frame; the selection is redone
+  when the camera changes or every ``select_every`` frames.
+- **Cached text textures.** A billboard actor rasterizes its string once and
+  keeps the texture until the string changes. When the selection changes,
+  slots keep their (skeleton, joint) if it is still selected, and otherwise
+  are preferably reassigned to a label with the same text (e.g. ``Head`` of
+  another skeleton), so most selection changes re-rasterize nothing.
+
+Per-frame cost is bounded by ``max_labels`` and does not depend on the
+number of skeletons apart from one vectorized pass over their roots when the
+selection is refreshed.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.lazy_import import lazy_import
+from motion_gen_survey.t2m import NUM_JOINTS, ROOT_JOINT, t2m_joint_names
+
+
+vtk = lazy_import("vtk")
+
+
+# Approximate standing height used to estimate a skeleton's size on screen (m)
+SKELETON_HEIGHT = 1.7
+ALL_LABEL_JOINTS: tuple[int, ...] = (
+    0,
+    3,
+    6,
+    9,
+    12,
+    15,
+    1,
+    2,
+    4,
+    5,
+    7,
+    8,
+    10,
+    11,
+    16,
+    17,
+    18,
+    19,
+    20,
+    21,
+)
+KEY_LABEL_JOINTS: tuple[int, ...] = (0, 12, 15, 10, 11, 20, 21)
+# (minimum on-screen skeleton height in pixels, joints labelled), largest first
+DEFAULT_LEVELS: tuple[tuple[float, tuple[int, ...]], ...] = (
+    (350.0, ALL_LABEL_JOINTS),
+    (140.0, KEY_LABEL_JOINTS),
+    (60.0, (15,)),
+)
+DEFAULT_MAX_LABELS = 48
+DEFAULT_UPDATE_EVERY = 4
+DEFAULT_SELECT_EVERY = 30
+
+
+class LabelLOD:
+    """Budgeted, distance-dependent joint labels for N skeletons.
+
+    Parameters
+    ----------
+    renderer : vtk.vtkRenderer
+        Renderer the label actors are added to (``plotter.renderer``).
+    num_skeletons : int
+        Skeletons packed in the ``(N*22, 3)`` point block passed to
+        :meth:`update`.
+    names : Mapping[int, str]
+        Joint index -> label text.
+    levels : sequence of (float, sequence of int)
+        ``(min_pixels, joints)`` pairs, largest ``min_pixels`` first.
+    max_labels : int
+        Label budget; also the size of the actor pool.
+    update_every : int
+        Frames between label anchor updates.
+    select_every : int
+        Frames between selection refreshes while the camera is still.
+    font_size : int
+        Label font size in points.
+    color : sequence of float
+        Label colour.
+    offset : sequence of float
+        Offset added to label anchors (default 5 cm above the joint).
+
+    Attributes
+    ----------
+    num_labels : int
+        Labels currently shown.
+    selections : int
+        Selection refreshes so far.
+    text_changes : int
+        Slot text changes so far, i.e. label textures rasterized.
+    """
+
+    def __init__(
+        self,
+        renderer: Any,
+        num_skeletons: int,
+        names: Mapping[int, str] = t2m_joint_names,
+        levels: Sequence[tuple[float, Sequence[int]]] = DEFAULT_LEVELS,
+        max_labels: int = DEFAULT_MAX_LABELS,
+        update_every: int = DEFAULT_UPDATE_EVERY,
+        select_every: int = DEFAULT_SELECT_EVERY,
+        font_size: int = 15,
+        color: Sequence[float] = (0.0, 0.0, 0.0),
+        offset: Sequence[float] = (0.0, 0.05, 0.0),
+    ) -> None:
+        self.renderer = renderer
+        self.num_skeletons = int(num_skeletons)
+        self.names = dict(names)
+        self.levels = [
+            (float(px), np.asarray(joints, dtype=np.int64)) for px, joints in levels
+        ]
+        self.max_labels = max(0, int(max_labels))
+        self.update_every = max(1, int(update_every))
+        self.select_every = max(1, int(select_every))
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.num_labels = 0
+        self.selections = 0
+        self.text_changes = 0
+        self._frame = 0
+        self._last_select = -self.select_every
+        self._view: tuple[Any, ...] = ()
+        # Slot s shows point _slot_key[s] of the packed block (-1: hidden) with text _slot_text[s]
+        self._slot_key = np.full(self.max_labels, -1, dtype=np.int64)
+        self._slot_text = [""] * self.max_labels
+        # Active slots and their point ids, in slot order, for the anchor update
+        self._active_slots = np.zeros(0, dtype=np.int64)
+        self._active_ids = np.zeros(0, dtype=np.int64)
+        self._anchors = np.zeros((0, 3), dtype=np.float32)
+        self._actors: list[Any] = []
+        for _ in range(self.max_labels):
+            actor = vtk.vtkBillboardTextActor3D()
+            prop = actor.GetTextProperty()
+            prop.SetFontSize(int(font_size))
+            prop.SetColor(*color)
+            prop.SetJustificationToCentered()
+            prop.SetVerticalJustificationToBottom()
+            actor.VisibilityOff()
+            renderer.AddActor(actor)
+            self._actors.append(actor)
+
+    def update(self, points: np.ndarray, force: bool = False) -> None:
+        """Advance one frame with the packed ``(N*22, 3)`` joint positions.
+
+        Anchors are moved every ``update_every`` frames; the selection is
+        refreshed when the camera or window changed or every
+        ``select_every`` frames. ``force`` does both now (used for paused
+        stepping, where a stale label would be visible).
+        """
+        frame = self._frame
+        self._frame += 1
+        if self.max_labels == 0:
+            return
+        camera = self.renderer.GetActiveCamera()
+        # Not the camera's MTime: every render resets its clipping range and bumps it
+        view = (
+            camera.GetPosition(),
+            camera.GetFocalPoint(),
+            camera.GetViewAngle(),
+            camera.GetParallelScale(),
+            camera.GetParallelProjection(),
+            tuple(self.renderer.GetSize()),
+        )
+        if (
+            force
+            or view != self._view
+            or frame - self._last_select >= self.select_every
+        ):
+            self._view = view
+            self._last_select = frame
+            self._select(points, camera)
+        elif frame % self.update_every:
+            return
+        self._move_anchors(points)
+
+    def skeleton_pixels(
+        self, roots: np.ndarray, camera: Any | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """On-screen height in pixels and camera depth of skeletons rooted at ``roots``.
+
+        Skeletons outside the view frustum (or behind the camera) get a
+        height of 0.
+        """
+        camera = camera or self.renderer.GetActiveCamera()
+        height = max(1, int(self.renderer.GetSize()[1]))
+        eye = np.asarray(camera.GetPosition())
+        view_dir = np.asarray(camera.GetDirectionOfProjection())
+        depth = (roots - eye) @ view_dir
+        if camera.GetParallelProjection():
+            pixels = np.full(
+                len(roots), height * SKELETON_HEIGHT / (2.0 * camera.GetParallelScale())
+            )
+        else:
+            half = math.tan(math.radians(camera.GetViewAngle()) / 2.0)
+            pixels = height * SKELETON_HEIGHT / (2.0 * np.maximum(depth, 1e-6) * half)
+        # Frustum test on the pelvis, with a margin for the body's extent
+        aspect = self.renderer.GetTiledAspectRatio()
+        matrix = camera.GetCompositeProjectionTransformMatrix(aspect, -1.0, 1.0)
+        proj = np.array([[matrix.GetElement(r, c) for c in range(4)] for r in range(4)])
+        centre = np.concatenate([roots, np.ones((len(roots), 1))], axis=1)
+        clip = centre @ proj.T
+        w = clip[:, 3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ndc = np.abs(clip[:, :2] / w[:, None])
+        visible = (w > 0) & (depth > 0) & np.all(ndc <= 1.2, axis=1)
+        return np.where(visible, pixels, 0.0), depth
+
+    def _select(self, points: np.ndarray, camera: Any) -> None:
+        """Choose the labelled (skeleton, joint) pairs and assign them to slots."""
+        self.selections += 1
+        roots = np.asarray(points, dtype=np.float64).reshape(
+            self.num_skeletons, NUM_JOINTS, 3
+        )[:, ROOT_JOINT]
+        pixels, depth = self.skeleton_pixels(roots, camera)
+        chosen: list[np.ndarray] = []
+        budget = self.max_labels
+        for k in np.argsort(depth, kind="stable"):
+            if budget <= 0:
+                break
+            for min_px, joints in self.levels:
+                if pixels[k] >= min_px:
+                    ids = k * NUM_JOINTS + joints[:budget]
+                    chosen.append(ids)
+                    budget -= len(ids)
+                    break
+        wanted = np.concatenate(chosen) if chosen else np.zeros(0, dtype=np.int64)
+        self._assign(wanted)
+
+    def _assign(self, wanted: np.ndarray) -> None:
+        """Map point ids to slots, reusing slots whose key or text already matches."""
+        wanted_set = set(wanted.tolist())
+        slot_of = {
+            int(key): s
+            for s, key in enumerate(self._slot_key)
+            if key >= 0 and key in wanted_set
+        }
+        kept = set(slot_of.values())
+        free_by_text: dict[str, list[int]] = {}
+        for s in range(self.max_labels):
+            if s not in kept:
+                free_by_text.setdefault(self._slot_text[s], []).append(s)
+        pending = [int(i) for i in wanted if int(i) not in slot_of]
+        # Same text first (texture kept), then any free slot (texture re-rasterized)
+        unmatched = []
+        for i in pending:
+            same = free_by_text.get(self.names[i % NUM_JOINTS])
+            if same:
+                slot_of[i] = same.pop()
+            else:
+                unmatched.append(i)
+        rest = [s for slots in free_by_text.values() for s in slots]
+        # The selection is budgeted to max_labels, so there are at least as many free slots
+        for i, s in zip(unmatched, rest, strict=False):
+            slot_of[i] = s
+            text = self.names[i % NUM_JOINTS]
+            self._actors[s].SetInput(text)
+            self._slot_text[s] = text
+            self.text_changes += 1
+        used = set(slot_of.values())
+        for s in range(self.max_labels):
+            visible = s in used
+            if visible != (self._slot_key[s] >= 0):
+                self._actors[s].SetVisibility(visible)
+            if not visible:
+                self._slot_key[s] = -1
+        for i, s in slot_of.items():
+            self._slot_key[s] = i
+        order = sorted(slot_of.items(), key=lambda item: item[1])
+        self._active_ids = np.fromiter(
+            (i for i, _ in order), dtype=np.int64, count=len(order)
+        )
+        self._active_slots = np.fromiter(
+            (s for _, s in order), dtype=np.int64, count=len(order)
+        )
+        self._anchors = np.empty((len(order), 3), dtype=np.float32)
+        self.num_labels = len(order)
+
+    def _move_anchors(self, points: np.ndarray) -> None:
+        if not self.num_labels:
+            return
+        np.take(points, self._active_ids, axis=0, out=self._anchors, mode="clip")
+        self._anchors += self.offset
+        for s, anchor in zip(
+            self._active_slots.tolist(), self._anchors.tolist(), strict=True
+        ):
+            self._actors[s].SetPosition(anchor)
+
+    def stats(self) -> dict[str, int]:
+        """Counters for profiling dumps."""
+        return {
+            "labels": self.num_labels,
+            "max_labels": self.max_labels,
+            "selections": self.selections,
+            "text_changes": self.text_changes,
+        }
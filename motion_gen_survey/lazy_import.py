@@ -0,0 +1,44 @@
+"""Deferred imports for heavy optional backends (PyVista, VTK, torch, ...).
+
+``pv = lazy_import("pyvista")`` binds a module object whose real import
+runs on first attribute access, via :class:`importlib.util.LazyLoader`.
+Modules that only touch the backend inside functions can keep the usual
+module-level alias while ``--help``, argument parsing and non-rendering
+subcommands start without paying for the import.
+
+A missing backend is reported when it is first used, not at import time,
+so commands that never need it keep working without it installed.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+from typing import Any
+
+
+class MissingModule(types.ModuleType):
+    """Placeholder for a backend that is not installed; raises on first use."""
+
+    def __getattr__(self, attr: str) -> Any:
+        raise ModuleNotFoundError(
+            f"{self.__name__!r} is required for this command but is not installed",
+            name=self.__name__,
+        )
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return module ``name``, deferring its execution until first attribute access."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        return MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,589 @@
+"""Torch-free SMPL-X linear blend skinning in NumPy.
+
+Posing a mesh with ``smplx`` needs torch, whose import alone takes seconds
+and hundreds of MB per process. This module extracts what skinning needs from
+an SMPL-X model file once into a compact ``.npz`` and poses batches of frames
+with NumPy only:
+
+- **Extraction** (:func:`extract_lbs`) reads ``SMPLX_<GENDER>.npz`` (or
+  ``.pkl``) directly, without torch or smplx. The joint regressor is folded
+  into the shape space (rest joints = ``J_template + J_dirs @ betas``), so
+  the 55 x 10475 regressor is not stored. Skinning weights are truncated to
+  the ``top_k`` largest per vertex (renormalized; the largest dropped mass is
+  recorded), and the pose-corrective blend shapes are stored as float16 or
+  left out.
+- **Posing** (:meth:`LBSModel.pose`) runs Rodrigues, forward kinematics over
+  the kinematic tree one depth level at a time, pose correctives and sparse
+  LBS (``top_k`` weighted transforms per vertex) for ``batch_size`` frames
+  at a time into preallocated work buffers, writing straight into ``out``
+  (e.g. a ``np.memmap``).
+
+Poses use the 165-value layout of :mod:`motion_gen_survey.smplx_bake`
+(``global | body | left hand | right hand | jaw | leye | reye``), with the
+same conventions as ``smplx.SMPLX(use_pca=False)``: the hand pose mean is
+added unless the model is extracted with ``flat_hand_mean``. Extracted files
+are cached under ``tmp/smplx_lbs`` and re-extracted when the model file
+changes.
+
+Usage:
+    python -m motion_gen_survey lbs extract --model-path data --gender neutral --top-k 4
+    python -m motion_gen_survey lbs check --model-path data --frames 32
+    python -m motion_gen_survey bake smplx_pose.npy --backend numpy
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+import sys
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from motion_gen_survey.smplx_bake import (
+    NUM_BETAS,
+    NUM_EXPRESSION,
+    POSE_DIM,
+    POSE_LAYOUT,
+    _normalize_betas,
+)
+
+
+LBS_VERSION = 1
+NUM_SMPLX_JOINTS = 55
+DEFAULT_TOP_K = 4
+DEFAULT_LBS_DIR = pathlib.Path("tmp/smplx_lbs")
+DEFAULT_BATCH_SIZE = 64
+# Start of the expression components in SMPL-X shapedirs (after 300 shape components)
+SHAPE_SPACE_DIM = 300
+CORRECTIVE_DTYPES: tuple[str, ...] = ("float16", "float32", "none")
+
+# Joint order of the 165-value pose layout: smplx's full pose is
+# global | body | jaw | leye | reye | left hand | right hand
+_JOINT_ORDER = (
+    "global_orient",
+    "body_pose",
+    "jaw_pose",
+    "leye_pose",
+    "reye_pose",
+    "left_hand_pose",
+    "right_hand_pose",
+)
+POSE_TO_JOINTS = np.concatenate(
+    [np.arange(POSE_DIM)[POSE_LAYOUT[name]] for name in _JOINT_ORDER]
+)
+
+
+def find_model_file(
+    model_path: str | os.PathLike[str], gender: str = "neutral"
+) -> pathlib.Path:
+    """``<model_path>/smplx/SMPLX_<GENDER>.npz`` (or ``.pkl``), as ``smplx.SMPLX`` would load it."""
+    smplx_dir = pathlib.Path(model_path).expanduser().resolve() / "smplx"
+    for ext in ("npz", "pkl"):
+        candidate = smplx_dir / f"SMPLX_{gender.upper()}.{ext}"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(
+        f"Could not find SMPLX_{gender.upper()}.npz/.pkl in {smplx_dir}"
+    )
+
+
+def _read_model_file(path: pathlib.Path) -> dict[str, Any]:
+    if path.suffix == ".npz":
+        with np.load(path, allow_pickle=True) as data:
+            return {k: data[k] for k in data.files}
+    with open(path, "rb") as f:
+        return dict(pickle.load(f, encoding="latin1"))
+
+
+def _dense(value: Any) -> np.ndarray:
+    # scipy sparse regressors and chumpy arrays in .pkl model files
+    if hasattr(value, "toarray"):
+        value = value.toarray()
+    return np.asarray(value, dtype=np.float64)
+
+
+def rodrigues(rotvecs: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Axis-angle ``(..., 3)`` to rotation matrices ``(..., 3, 3)`` (``smplx.lbs.batch_rodrigues``)."""
+    v = np.asarray(rotvecs)
+    angle = np.sqrt(np.einsum("...c,...c->...", v + 1e-8, v + 1e-8))[..., None]
+    axis = v / angle
+    s = np.sin(angle)[..., None]
+    c = np.cos(angle)[..., None]
+    x, y, z = axis[..., 0], axis[..., 1], axis[..., 2]
+    zero = np.zeros_like(x)
+    k = np.stack([zero, -z, y, z, zero, -x, -y, x, zero], axis=-1).reshape(
+        *x.shape, 3, 3
+    )
+    if out is None:
+        out = np.empty(k.shape, dtype=v.dtype)
+    out[...] = np.eye(3, dtype=out.dtype)
+    out += s * k
+    out += (1.0 - c) * (k @ k)
+    return out
+
+
+def _depth_levels(parents: np.ndarray) -> list[np.ndarray]:
+    """Joints grouped by depth below the root (root excluded), for level-wise FK."""
+    depth = np.zeros(len(parents), dtype=np.int64)
+    for j in range(1, len(parents)):
+        depth[j] = depth[parents[j]] + 1
+    return [np.flatnonzero(depth == d) for d in range(1, int(depth.max()) + 1)]
+
+
+def extract_lbs(
+    model_file: str | os.PathLike[str],
+    out_path: str | os.PathLike[str],
+    top_k: int = DEFAULT_TOP_K,
+    num_betas: int = NUM_BETAS,
+    num_expression: int = NUM_EXPRESSION,
+    correctives: str = "float16",
+    flat_hand_mean: bool = False,
+) -> pathlib.Path:
+    """Write the compact skinning data of an SMPL-X model file to ``out_path``.
+
+    Parameters
+    ----------
+    model_file : path-like
+        ``SMPLX_<GENDER>.npz`` or ``.pkl``.
+    out_path : path-like
+        Output ``.npz``.
+    top_k : int
+        Skinning weights kept per vertex.
+    num_betas, num_expression : int
+        Shape / expression components kept.
+    correctives : str
+        Storage of the pose-corrective blend shapes: "float16", "float32"
+        or "none" (plain LBS, smallest and fastest).
+    flat_hand_mean : bool
+        Do not add the hand pose mean (``smplx`` ``flat_hand_mean=True``).
+    """
+    if correctives not in CORRECTIVE_DTYPES:
+        raise ValueError(
+            f"correctives must be one of {CORRECTIVE_DTYPES}, got {correctives!r}"
+        )
+    model_file = pathlib.Path(model_file)
+    data = _read_model_file(model_file)
+    v_template = _dense(data["v_template"])
+    shapedirs_all = _dense(data["shapedirs"])
+    num_betas = min(num_betas, shapedirs_all.shape[-1])
+    shapedirs = shapedirs_all[:, :, :num_betas]
+    expr_start = (
+        SHAPE_SPACE_DIM if shapedirs_all.shape[-1] > SHAPE_SPACE_DIM else NUM_BETAS
+    )
+    exprdirs = shapedirs_all[:, :, expr_start : expr_start + num_expression]
+    regressor = _dense(data["J_regressor"])
+    parents = np.asarray(data["kintree_table"], dtype=np.int64)[0].copy()
+    parents[0] = -1
+    weights = _dense(data["weights"])
+    num_joints = len(parents)
+
+    # Joints regressed from the shaped template, folded into the shape space
+    j_template = regressor @ v_template
+    j_dirs = np.einsum(
+        "jv,vcb->jcb", regressor, np.concatenate([shapedirs, exprdirs], axis=2)
+    )
+
+    # Top-k skinning weights per vertex, renormalized
+    k = max(1, min(int(top_k), num_joints))
+    index = np.argpartition(-weights, k - 1, axis=1)[:, :k]
+    kept = np.take_along_axis(weights, index, axis=1)
+    dropped = 1.0 - kept.sum(axis=1)
+    kept /= kept.sum(axis=1, keepdims=True)
+
+    pose_mean = np.zeros((num_joints, 3))
+    if not flat_hand_mean and "hands_meanl" in data:
+        pose_mean[25:40] = _dense(data["hands_meanl"]).reshape(15, 3)
+        pose_mean[40:55] = _dense(data["hands_meanr"]).reshape(15, 3)
+
+    arrays: dict[str, np.ndarray] = {
+        "v_template": v_template.astype(np.float32),
+        "shapedirs": shapedirs.astype(np.float32),
+        "exprdirs": exprdirs.astype(np.float32),
+        "j_template": j_template.astype(np.float32),
+        "j_dirs": j_dirs.astype(np.float32),
+        "parents": parents.astype(np.int16),
+        "weight_index": index.astype(np.uint8),
+        "weight_values": kept.astype(np.float32),
+        "pose_mean": pose_mean.astype(np.float32),
+        "faces": np.asarray(data["f"], dtype=np.int32),
+    }
+    if correctives != "none":
+        posedirs = _dense(data["posedirs"])
+        # (V, 3, P) -> (P, V*3), as smplx stores it
+        arrays["posedirs"] = posedirs.reshape(-1, posedirs.shape[-1]).T.astype(
+            correctives
+        )
+
+    st = model_file.stat()
+    meta = {
+        "version": LBS_VERSION,
+        "source": {
+            "path": str(model_file),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        },
+        "top_k": k,
+        "max_dropped_weight": float(dropped.max()),
+        "correctives": correctives,
+        "flat_hand_mean": flat_hand_mean,
+    }
+    out_path = pathlib.Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp.npz")
+    np.savez_compressed(tmp, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+class LBSModel:
+    """SMPL-X skinning from an extracted ``.npz``; a torch-free stand-in for ``smplx.SMPLX`` baking.
+
+    Parameters
+    ----------
+    path : path-like
+        File written by :func:`extract_lbs`.
+    dtype : dtype
+        Compute dtype (float32 by default; float64 for checks).
+
+    Attributes
+    ----------
+    faces : np.ndarray
+        ``(F, 3)`` int32 triangles.
+    parents : np.ndarray
+        ``(55,)`` parent joint per joint (-1 for the root).
+    meta : dict
+        Extraction parameters (``top_k``, ``max_dropped_weight``, ...).
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], dtype: npt.DTypeLike = np.float32
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.dtype = np.dtype(dtype)
+        with np.load(self.path) as data:
+            self.meta: dict[str, Any] = json.loads(str(data["meta"]))
+            if self.meta.get("version") != LBS_VERSION:
+                raise ValueError(
+                    f"Unsupported LBS file version {self.meta.get('version')} in {self.path}"
+                )
+            arr = {k: data[k] for k in data.files if k != "meta"}
+        f = self.dtype
+        self.v_template = arr["v_template"].astype(f)
+        self.shapedirs = arr["shapedirs"].astype(f)
+        self.exprdirs = arr["exprdirs"].astype(f)
+        self.j_template = arr["j_template"].astype(f)
+        self.j_dirs = arr["j_dirs"].astype(f)
+        self.parents = arr["parents"].astype(np.int64)
+        self.weight_index = arr["weight_index"].astype(np.intp)
+        self.weight_values = arr["weight_values"].astype(f)
+        self.pose_mean = arr["pose_mean"].astype(f)
+        self.faces = arr["faces"]
+        self.posedirs = arr["posedirs"].astype(f) if "posedirs" in arr else None
+        self.levels = _depth_levels(self.parents)
+        self._shape_key: bytes | None = None
+        self._v_shaped = self.v_template
+        self._j_rest = self.j_template
+
+    @property
+    def num_vertices(self) -> int:
+        return int(self.v_template.shape[0])
+
+    @property
+    def num_joints(self) -> int:
+        return int(self.parents.shape[0])
+
+    def get_num_verts(self) -> int:
+        """Vertex count (same call as ``smplx.SMPLX``)."""
+        return self.num_vertices
+
+    def shape(
+        self,
+        betas: Sequence[float] | np.ndarray | None = None,
+        expression: Sequence[float] | np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Shaped template vertices ``(V, 3)`` and rest joints ``(55, 3)``; cached per shape."""
+        b = _normalize_betas(betas)[: self.shapedirs.shape[2]].astype(self.dtype)
+        e = np.zeros(self.exprdirs.shape[2], dtype=self.dtype)
+        if expression is not None:
+            values = np.asarray(expression, dtype=self.dtype).ravel()[: len(e)]
+            e[: len(values)] = values
+        key = b.tobytes() + e.tobytes()
+        if key != self._shape_key:
+            self._v_shaped = self.v_template + self.shapedirs @ b + self.exprdirs @ e
+            self._j_rest = self.j_template + self.j_dirs @ np.concatenate([b, e])
+            self._shape_key = key
+        return self._v_shaped, self._j_rest
+
+    def pose(
+        self,
+        poses: np.ndarray,
+        betas: Sequence[float] | np.ndarray | None = None,
+        transl: np.ndarray | None = None,
+        expression: Sequence[float] | np.ndarray | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        out: np.ndarray | None = None,
+        joints_out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Skin ``(frames, 165)`` poses into ``(frames, V, 3)`` vertices.
+
+        Parameters
+        ----------
+        poses : np.ndarray
+            Axis-angle poses in the :data:`POSE_LAYOUT` order.
+        betas, expression : array-like, optional
+            Shape / expression coefficients shared by all frames.
+        transl : np.ndarray, optional
+            ``(frames, 3)`` root translation.
+        batch_size : int
+            Frames per block; work buffers are allocated once at this size.
+        out : np.ndarray, optional
+            Preallocated ``(frames, V, 3)`` output (any float dtype, e.g. a memmap).
+        joints_out : np.ndarray, optional
+            Also write the posed ``(frames, 55, 3)`` joints here.
+        """
+        poses = np.asarray(poses)
+        frames = len(poses)
+        if out is None:
+            out = np.empty((frames, self.num_vertices, 3), dtype=self.dtype)
+        v_shaped, j_rest = self.shape(betas, expression)
+        rows = max(1, min(int(batch_size), frames))
+        f, nj, nv = self.dtype, self.num_joints, self.num_vertices
+        # Work buffers, reused by every block
+        rot = np.empty((rows, nj, 3, 3), dtype=f)
+        g_rot = np.empty((rows, nj, 3, 3), dtype=f)
+        g_pos = np.empty((rows, nj, 3), dtype=f)
+        blend = np.empty((rows, nv, 3, 4), dtype=f)
+        gathered = np.empty((rows, nv, 3, 4), dtype=f)
+        transforms = np.empty((rows, nj, 3, 4), dtype=f)
+        posed = np.empty((rows, nv, 3), dtype=f)
+        skinned = np.empty((rows, nv, 3), dtype=f)
+        offsets = j_rest.copy()
+        offsets[1:] -= j_rest[self.parents[1:]]
+        eye = np.eye(3, dtype=f)
+
+        for start in range(0, frames, rows):
+            n = min(rows, frames - start)
+            full = (
+                poses[start : start + n][:, POSE_TO_JOINTS].astype(f).reshape(n, nj, 3)
+                + self.pose_mean
+            )
+            rodrigues(full, out=rot[:n])
+            # Pose-corrective blend shapes on the shaped template
+            if self.posedirs is not None:
+                feature = (rot[:n, 1:] - eye).reshape(n, -1)
+                np.matmul(feature, self.posedirs, out=posed[:n].reshape(n, nv * 3))
+                posed[:n] += v_shaped
+            else:
+                posed[:n] = v_shaped
+            # Forward kinematics, one depth level at a time
+            g_rot[:n, 0] = rot[:n, 0]
+            g_pos[:n, 0] = j_rest[0]
+            for level in self.levels:
+                parent = self.parents[level]
+                g_rot[:n, level] = g_rot[:n, parent] @ rot[:n, level]
+                g_pos[:n, level] = (
+                    np.einsum("bjrc,jc->bjr", g_rot[:n, parent], offsets[level])
+                    + g_pos[:n, parent]
+                )
+            # Skinning transforms: world rotation, translation relative to the rest joint
+            transforms[:n, :, :, :3] = g_rot[:n]
+            transforms[:n, :, :, 3] = g_pos[:n] - np.einsum(
+                "bjrc,jc->bjr", g_rot[:n], j_rest
+            )
+            # Sparse LBS: blend the top-k joint transforms of every vertex
+            for k in range(self.weight_index.shape[1]):
+                np.take(
+                    transforms[:n], self.weight_index[:, k], axis=1, out=gathered[:n]
+                )
+                gathered[:n] *= self.weight_values[None, :, k, None, None]
+                if k == 0:
+                    blend[:n] = gathered[:n]
+                else:
+                    blend[:n] += gathered[:n]
+            verts = np.einsum(
+                "bvrc,bvc->bvr", blend[:n, :, :, :3], posed[:n], out=skinned[:n]
+            )
+            verts += blend[:n, :, :, 3]
+            if transl is not None:
+                shift = np.asarray(transl[start : start + n], dtype=f)[:, None, :]
+                verts += shift
+            out[start : start + n] = verts
+            if joints_out is not None:
+                joints_out[start : start + n] = g_pos[:n] + (
+                    shift if transl is not None else 0.0
+                )
+        return out
+
+    def __repr__(self) -> str:
+        return (
+            f"LBSModel({str(self.path)!r}, top_k={self.meta['top_k']}, "
+            f"correctives={self.meta['correctives']}, dtype={self.dtype})"
+        )
+
+
+def lbs_path_for(
+    model_file: pathlib.Path,
+    top_k: int = DEFAULT_TOP_K,
+    correctives: str = "float16",
+    cache_dir: str | os.PathLike[str] = DEFAULT_LBS_DIR,
+) -> pathlib.Path:
+    """Cache file of the extraction of ``model_file`` with these settings."""
+    digest = hashlib.sha1(str(model_file.resolve()).encode()).hexdigest()[:8]
+    return (
+        pathlib.Path(cache_dir)
+        / f"{model_file.stem}-k{top_k}-{correctives}-{digest}.npz"
+    )
+
+
+def _is_current(path: pathlib.Path, model_file: pathlib.Path) -> bool:
+    if not path.exists():
+        return False
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+    st = model_file.stat()
+    source = meta.get("source", {})
+    return (
+        meta.get("version") == LBS_VERSION
+        and source.get("size") == st.st_size
+        and source.get("mtime_ns") == st.st_mtime_ns
+    )
+
+
+def load_lbs_model(
+    model_path: str | os.PathLike[str] = "data",
+    gender: str = "neutral",
+    top_k: int = DEFAULT_TOP_K,
+    correctives: str = "float16",
+    cache_dir: str | os.PathLike[str] = DEFAULT_LBS_DIR,
+    dtype: npt.DTypeLike = np.float32,
+) -> LBSModel:
+    """Load the extracted skinning model for ``gender``, extracting it on first use.
+
+    ``model_path`` may also be an extracted ``.npz`` itself (render nodes
+    without the original model files).
+    """
+    path = pathlib.Path(model_path)
+    if path.suffix == ".npz" and path.is_file():
+        return LBSModel(path, dtype=dtype)
+    model_file = find_model_file(model_path, gender)
+    path = lbs_path_for(model_file, top_k, correctives, cache_dir)
+    if not _is_current(path, model_file):
+        extract_lbs(model_file, path, top_k=top_k, correctives=correctives)
+    return LBSModel(path, dtype=dtype)
+
+
+def check_against_smplx(
+    model: LBSModel,
+    model_path: str | os.PathLike[str],
+    gender: str,
+    frames: int = 16,
+    scale: float = 0.4,
+    seed: int = 0,
+) -> dict[str, float]:
+    """Pose random frames with both backends; vertex errors in metres and timings (needs torch + smplx)."""
+    from motion_gen_survey.smplx_bake import bake_vertices, create_smplx_model
+
+    rng = np.random.default_rng(seed)
+    poses = (rng.standard_normal((frames, POSE_DIM)) * scale).astype(np.float32)
+    betas = rng.standard_normal(NUM_BETAS).astype(np.float32)
+    transl = rng.standard_normal((frames, 3)).astype(np.float32)
+    start = time.perf_counter()
+    reference = bake_vertices(
+        create_smplx_model(model_path, gender), poses, betas, transl
+    )
+    torch_s = time.perf_counter() - start
+    start = time.perf_counter()
+    ours = model.pose(poses, betas, transl)
+    numpy_s = time.perf_counter() - start
+    error = np.linalg.norm(ours.astype(np.float64) - reference, axis=-1)
+    return {
+        "mean_error_m": float(error.mean()),
+        "max_error_m": float(error.max()),
+        "torch_s": torch_s,
+        "numpy_s": numpy_s,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Torch-free SMPL-X skinning: extract and check"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("extract", "Extract the compact skinning .npz from an SMPL-X model file"),
+        ("check", "Compare against smplx on random poses (needs torch + smplx)"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument(
+            "--model-path",
+            default="data",
+            help="Path containing smplx/ directory (default: data)",
+        )
+        p.add_argument(
+            "--gender", choices=["neutral", "male", "female"], default="neutral"
+        )
+        p.add_argument(
+            "--top-k",
+            type=int,
+            default=DEFAULT_TOP_K,
+            help="Skinning weights kept per vertex",
+        )
+        p.add_argument(
+            "--correctives",
+            choices=CORRECTIVE_DTYPES,
+            default="float16",
+            help="Pose-corrective blend shapes: storage dtype, or none",
+        )
+        p.add_argument("--cache-dir", default=str(DEFAULT_LBS_DIR))
+        if name == "extract":
+            p.add_argument(
+                "--out", default=None, help="Output .npz (default: in --cache-dir)"
+            )
+        else:
+            p.add_argument("--frames", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    try:
+        model_file = find_model_file(args.model_path, args.gender)
+    except FileNotFoundError as e:
+        print("ERROR:", e, file=sys.stderr)
+        sys.exit(2)
+    if args.command == "extract":
+        out = (
+            pathlib.Path(args.out)
+            if args.out
+            else lbs_path_for(model_file, args.top_k, args.correctives, args.cache_dir)
+        )
+        extract_lbs(model_file, out, top_k=args.top_k, correctives=args.correctives)
+        model = LBSModel(out)
+        print(
+            f"{model}: {out.stat().st_size / 2**20:.1f} MiB (model file {model_file.stat().st_size / 2**20:.1f} MiB), "
+            f"largest dropped weight {model.meta['max_dropped_weight']:.4f}"
+        )
+        return
+    model = load_lbs_model(
+        args.model_path, args.gender, args.top_k, args.correctives, args.cache_dir
+    )
+    try:
+        result = check_against_smplx(
+            model, args.model_path, args.gender, frames=args.frames
+        )
+    except ImportError as e:
+        print("ERROR: the check needs torch/smplx:", e, file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"{model} vs smplx over {args.frames} frames: mean {result['mean_error_m'] * 1000:.3f} mm, "
+        f"max {result['max_error_m'] * 1000:.3f} mm; torch {result['torch_s']:.2f}s, numpy {result['numpy_s']:.2f}s"
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,370 @@
+"""Fast mesh-sequence export with shared topology (binary PLY, OBJ, animated GLB).
+
+Exporting a sequence by building one ``trimesh.Trimesh`` per frame re-encodes
+the same SMPL-X faces every time and formats everything as text. Here the
+topology is encoded once per export:
+
+- **PLY**: binary little-endian files; the header and face block are
+  preformatted bytes shared by every frame, so a frame costs one vertex
+  ``tobytes`` plus three ``write`` calls.
+- **OBJ**: the ``f`` lines are formatted once; vertex lines come from a
+  precompiled ``%``-format template.
+- **GLB**: a single glTF 2.0 binary with the faces and the first frame as
+  the base mesh, one morph target (position delta) per later frame and a
+  STEP animation of the morph weights. It is streamed to disk block by block,
+  so memory stays bounded for long sequences.
+
+Per-frame files are written from a thread pool. ``vertices`` may be any
+``(frames, V, 3)`` array, including the memory-mapped output of
+:func:`motion_gen_survey.smplx_bake.load_baked_vertices`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import struct
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+MESH_FORMATS: tuple[str, ...] = ("ply", "obj", "glb")
+DEFAULT_BLOCK_FRAMES = 64
+
+# glTF 2.0 constants
+_GLB_MAGIC = 0x46546C67  # "glTF"
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_FLOAT = 5126
+_UINT = 5125
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+FrameTransform = Callable[[np.ndarray], np.ndarray]
+
+
+def _frame(
+    vertices: np.ndarray, index: int, transform: FrameTransform | None
+) -> np.ndarray:
+    v = np.asarray(vertices[index], dtype=np.float32)
+    return transform(v) if transform is not None else v
+
+
+# --- PLY ---
+class PlyEncoder:
+    """Binary PLY writer with header and faces encoded once."""
+
+    def __init__(self, num_vertices: int, faces: np.ndarray) -> None:
+        faces = np.asarray(faces)
+        self.num_vertices = int(num_vertices)
+        self.header = (
+            "ply\nformat binary_little_endian 1.0\n"
+            f"element vertex {self.num_vertices}\n"
+            "property float x\nproperty float y\nproperty float z\n"
+            f"element face {len(faces)}\n"
+            "property list uchar int vertex_indices\nend_header\n"
+        ).encode("ascii")
+        block = np.empty(len(faces), dtype=[("n", "u1"), ("idx", "<i4", (3,))])
+        block["n"] = 3
+        block["idx"] = faces
+        self.face_bytes = block.tobytes()
+
+    def write(self, path: str | os.PathLike[str], vertices: np.ndarray) -> None:
+        with open(path, "wb") as f:
+            f.write(self.header)
+            f.write(np.ascontiguousarray(vertices, dtype="<f4").tobytes())
+            f.write(self.face_bytes)
+
+
+# --- OBJ ---
+class ObjEncoder:
+    """Text OBJ writer with the face lines formatted once."""
+
+    def __init__(
+        self, num_vertices: int, faces: np.ndarray, precision: int = 6
+    ) -> None:
+        self.num_vertices = int(num_vertices)
+        self._vertex_template = (
+            f"v %.{precision}f %.{precision}f %.{precision}f\n" * self.num_vertices
+        )
+        self.face_bytes = (
+            "f %d %d %d\n"
+            * len(faces)
+            % tuple((np.asarray(faces) + 1).ravel().tolist())
+        ).encode("ascii")
+
+    def write(self, path: str | os.PathLike[str], vertices: np.ndarray) -> None:
+        text = self._vertex_template % tuple(
+            np.asarray(vertices, dtype=np.float64).ravel().tolist()
+        )
+        with open(path, "wb") as f:
+            f.write(text.encode("ascii"))
+            f.write(self.face_bytes)
+
+
+def write_mesh(
+    path: str | os.PathLike[str],
+    vertices: np.ndarray,
+    faces: np.ndarray,
+) -> pathlib.Path:
+    """Write a single ``(V, 3)`` mesh as PLY or OBJ (chosen by suffix)."""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    encoder = ObjEncoder if path.suffix.lower() == ".obj" else PlyEncoder
+    encoder(len(vertices), faces).write(path, vertices)
+    return path
+
+
+def export_frames(
+    out_dir: str | os.PathLike[str],
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    fmt: str = "ply",
+    stem: str = "frame",
+    workers: int | None = None,
+    transform: FrameTransform | None = None,
+) -> list[pathlib.Path]:
+    """Write one PLY/OBJ file per frame from a thread pool.
+
+    Parameters
+    ----------
+    out_dir : path-like
+        Destination directory; files are named ``{stem}_{index:05d}.{fmt}``.
+    vertices : np.ndarray
+        ``(frames, V, 3)`` vertex positions.
+    faces : np.ndarray
+        ``(F, 3)`` triangle indices shared by all frames.
+    fmt : str
+        ``"ply"`` (binary) or ``"obj"``.
+    workers : int, optional
+        Writer threads (default: ``os.cpu_count()``).
+    transform : callable, optional
+        Applied to each ``(V, 3)`` frame before writing, e.g.
+        ``partial(apply_axis_map, axis_map=ZUP_TO_YUP)``; GLB export calls it
+        on ``(block, V, 3)`` blocks, so it must accept any ``(..., 3)`` batch.
+    """
+    if fmt not in ("ply", "obj"):
+        raise ValueError(f"Per-frame export supports ply/obj, not {fmt!r}")
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    num_frames, num_vertices = vertices.shape[:2]
+    encoder = (
+        PlyEncoder(num_vertices, faces)
+        if fmt == "ply"
+        else ObjEncoder(num_vertices, faces)
+    )
+    paths = [out_dir / f"{stem}_{i:05d}.{fmt}" for i in range(num_frames)]
+
+    def _write(i: int) -> None:
+        encoder.write(paths[i], _frame(vertices, i, transform))
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        list(pool.map(_write, range(num_frames)))
+    return paths
+
+
+# --- GLB ---
+def _delta_bounds(
+    vertices: np.ndarray,
+    base: np.ndarray,
+    transform: FrameTransform | None,
+    block_frames: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame min/max of ``frame - base`` (required by glTF for POSITION accessors)."""
+    num_frames = vertices.shape[0]
+    lo = np.zeros((num_frames, 3), np.float32)
+    hi = np.zeros((num_frames, 3), np.float32)
+    for start in range(1, num_frames, block_frames):
+        stop = min(num_frames, start + block_frames)
+        block = np.asarray(vertices[start:stop], dtype=np.float32)
+        if transform is not None:
+            block = transform(block)
+        block = block - base
+        lo[start:stop] = block.min(axis=1)
+        hi[start:stop] = block.max(axis=1)
+    return lo, hi
+
+
+def export_glb(
+    path: str | os.PathLike[str],
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    fps: float = 30.0,
+    transform: FrameTransform | None = None,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+) -> pathlib.Path:
+    """Write a sequence as one animated GLB (morph target per frame, STEP weights).
+
+    Frame 0 is the base mesh; frame ``k > 0`` is morph target ``k - 1`` whose
+    weight is 1 at time ``k / fps`` and 0 otherwise. The weight track is
+    ``frames x (frames - 1)`` floats, so this suits clips up to a few
+    thousand frames; use per-frame PLY for longer sequences.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    num_frames, num_vertices = vertices.shape[:2]
+    faces = np.ascontiguousarray(faces, dtype="<u4")
+    base = _frame(vertices, 0, transform)
+    num_targets = num_frames - 1
+    lo, hi = _delta_bounds(vertices, base, transform, block_frames)
+
+    index_bytes = faces.nbytes
+    pos_bytes = num_vertices * 12
+    time_bytes = num_frames * 4
+    weight_bytes = num_frames * num_targets * 4
+    views = []
+    offset = 0
+    for length, target in (
+        (index_bytes, _ELEMENT_ARRAY_BUFFER),
+        (pos_bytes, _ARRAY_BUFFER),
+    ):
+        views.append(
+            {"buffer": 0, "byteOffset": offset, "byteLength": length, "target": target}
+        )
+        offset += length
+    for _ in range(num_targets):
+        views.append(
+            {
+                "buffer": 0,
+                "byteOffset": offset,
+                "byteLength": pos_bytes,
+                "target": _ARRAY_BUFFER,
+            }
+        )
+        offset += pos_bytes
+    # A single frame has no animation: glTF forbids empty buffer views and accessors
+    if num_targets:
+        views.append({"buffer": 0, "byteOffset": offset, "byteLength": time_bytes})
+        offset += time_bytes
+        views.append({"buffer": 0, "byteOffset": offset, "byteLength": weight_bytes})
+        offset += weight_bytes
+    bin_length = offset
+
+    accessors = [
+        {
+            "bufferView": 0,
+            "componentType": _UINT,
+            "count": int(faces.size),
+            "type": "SCALAR",
+        },
+        {
+            "bufferView": 1,
+            "componentType": _FLOAT,
+            "count": num_vertices,
+            "type": "VEC3",
+            "min": base.min(axis=0).tolist(),
+            "max": base.max(axis=0).tolist(),
+        },
+    ]
+    for k in range(num_targets):
+        accessors.append(
+            {
+                "bufferView": 2 + k,
+                "componentType": _FLOAT,
+                "count": num_vertices,
+                "type": "VEC3",
+                "min": lo[k + 1].tolist(),
+                "max": hi[k + 1].tolist(),
+            }
+        )
+    time_accessor = len(accessors)
+    if num_targets:
+        accessors.append(
+            {
+                "bufferView": 2 + num_targets,
+                "componentType": _FLOAT,
+                "count": num_frames,
+                "type": "SCALAR",
+                "min": [0.0],
+                "max": [(num_frames - 1) / fps],
+            }
+        )
+        accessors.append(
+            {
+                "bufferView": 3 + num_targets,
+                "componentType": _FLOAT,
+                "count": num_frames * num_targets,
+                "type": "SCALAR",
+            }
+        )
+
+    primitive: dict = {"attributes": {"POSITION": 1}, "indices": 0, "mode": 4}
+    mesh: dict = {"primitives": [primitive]}
+    gltf: dict = {
+        "asset": {"version": "2.0", "generator": "motion_gen_survey.mesh_export"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [mesh],
+        "buffers": [{"byteLength": bin_length}],
+        "bufferViews": views,
+        "accessors": accessors,
+    }
+    if num_targets:
+        primitive["targets"] = [{"POSITION": 2 + k} for k in range(num_targets)]
+        mesh["weights"] = [0.0] * num_targets
+        gltf["animations"] = [
+            {
+                "samplers": [
+                    {
+                        "input": time_accessor,
+                        "output": time_accessor + 1,
+                        "interpolation": "STEP",
+                    }
+                ],
+                "channels": [{"sampler": 0, "target": {"node": 0, "path": "weights"}}],
+            }
+        ]
+
+    json_bytes = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_bytes += b" " * (-len(json_bytes) % 4)
+    total = 12 + 8 + len(json_bytes) + 8 + bin_length
+    with open(path, "wb") as f:
+        f.write(struct.pack("<III", _GLB_MAGIC, 2, total))
+        f.write(struct.pack("<II", len(json_bytes), _CHUNK_JSON))
+        f.write(json_bytes)
+        f.write(struct.pack("<II", bin_length, _CHUNK_BIN))
+        f.write(faces.tobytes())
+        f.write(np.ascontiguousarray(base, dtype="<f4").tobytes())
+        scratch = np.empty((block_frames, num_vertices, 3), dtype="<f4")
+        for start in range(1, num_frames, block_frames):
+            stop = min(num_frames, start + block_frames)
+            block = np.asarray(vertices[start:stop], dtype=np.float32)
+            if transform is not None:
+                block = transform(block)
+            delta = scratch[: stop - start]
+            np.subtract(block, base, out=delta)
+            f.write(delta.tobytes())
+        if num_targets:
+            f.write((np.arange(num_frames, dtype="<f4") / np.float32(fps)).tobytes())
+            # Weight row k is one-hot at target k - 1 (all zero for frame 0), written row by row
+            row = np.zeros(num_targets, dtype="<f4")
+            for k in range(num_frames):
+                if k:
+                    row[k - 1] = 1.0
+                f.write(row.tobytes())
+                if k:
+                    row[k - 1] = 0.0
+    return path
+
+
+def export_sequence(
+    out: str | os.PathLike[str],
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    fmt: str = "glb",
+    fps: float = 30.0,
+    workers: int | None = None,
+    transform: FrameTransform | None = None,
+) -> list[pathlib.Path]:
+    """Export ``(frames, V, 3)`` vertices as one GLB (``out`` is a file) or per-frame PLY/OBJ (``out`` is a directory)."""
+    if fmt == "glb":
+        return [export_glb(out, vertices, faces, fps=fps, transform=transform)]
+    if fmt in ("ply", "obj"):
+        return export_frames(
+            out, vertices, faces, fmt=fmt, workers=workers, transform=transform
+        )
+    raise ValueError(f"Unknown mesh format {fmt!r}; expected one of {MESH_FORMATS}")
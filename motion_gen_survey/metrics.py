@@ -0,0 +1,266 @@
+"""Transition-smoothness metrics (Peak Jerk / Area Under Jerk) without the GPU evaluator.
+
+FlowMDM reports motion composition smoothness with two jerk statistics
+computed around the boundaries between consecutive instructions:
+
+- **Peak Jerk (PJ)**: maximum jerk magnitude inside a transition window.
+- **Area Under Jerk (AUJ)**: area under the per-frame jerk curve inside the
+  window, ``sum(|jerk - reference|) / fps``. With the default reference of 0
+  this is the plain area; pass the mean jerk of real motion as reference to
+  get the excess-jerk variant.
+
+Jerk is the third time derivative of joint positions, estimated with a
+third-order finite difference over all samples and joints at once. The
+per-frame jerk is the maximum magnitude over joints. Transition windows are
+centred on the segment boundaries given by ``lengths`` and are
+``transition_length`` frames wide (FlowMDM uses 30 for Babel and 60 for
+HumanML3D).
+
+Usage:
+    python -m motion_gen_survey.metrics model_zoo/FlowMDM/results --out tmp/jerk.csv --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import pathlib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.features import FeatureIndex, open_features
+from motion_gen_survey.motion_store import (
+    MotionStore,
+    infer_dataset,
+    iter_result_dirs,
+    open_motion_store,
+    require_t2m,
+)
+
+
+TRANSITION_LENGTH: dict[str, int] = {"babel": 30, "humanml": 60}
+DEFAULT_TRANSITION_LENGTH = 30
+# Frames processed per block when computing jerk; bounds temporaries for very long sequences
+JERK_BLOCK_FRAMES = 4096
+
+
+def per_frame_jerk(
+    joints: np.ndarray, fps: float, block_frames: int = JERK_BLOCK_FRAMES
+) -> np.ndarray:
+    """Return the per-frame peak jerk magnitude (max over joints).
+
+    Parameters
+    ----------
+    joints : np.ndarray
+        Positions of shape ``(..., frames, joints, 3)`` (e.g. a store's
+        ``(batch, frames, 22, 3)`` memmap).
+    fps : float
+        Frame rate used to scale the finite difference to m/s^3.
+    block_frames : int
+        Frames per processing block; blocks overlap by 3 frames.
+
+    Returns
+    -------
+    np.ndarray
+        float32 array of shape ``(..., frames - 3)``. Entry ``t`` is centred
+        between frames ``t + 1`` and ``t + 2``.
+    """
+    num_frames = joints.shape[-3]
+    lead = joints.shape[:-3]
+    out = np.zeros((*lead, max(0, num_frames - 3)), dtype=np.float32)
+    scale = np.float32(fps) ** 3
+    for start in range(0, max(0, num_frames - 3), block_frames):
+        stop = min(num_frames, start + block_frames + 3)
+        x = np.asarray(joints[..., start:stop, :, :], dtype=np.float32)
+        # x[t+3] - 3 x[t+2] + 3 x[t+1] - x[t]
+        d3 = x[..., 3:, :, :] - x[..., :-3, :, :]
+        d3 -= 3.0 * (x[..., 2:-1, :, :] - x[..., 1:-2, :, :])
+        d3 *= scale
+        mag = np.sqrt(np.einsum("...jc,...jc->...j", d3, d3))
+        out[..., start : start + mag.shape[-2]] = mag.max(axis=-1)
+    return out
+
+
+def transition_windows(
+    segment_lengths: Sequence[int], transition_length: int
+) -> np.ndarray:
+    """Return ``(num_transitions, 2)`` ``[start, stop)`` frame windows around segment boundaries."""
+    bounds = np.cumsum(np.asarray(segment_lengths, dtype=np.int64))[:-1]
+    half = transition_length // 2
+    return (
+        np.stack([bounds - half, bounds - half + transition_length], axis=1)
+        if len(bounds)
+        else np.zeros((0, 2), np.int64)
+    )
+
+
+def transition_jerk_stats(
+    jerk: np.ndarray,
+    windows: np.ndarray,
+    fps: float,
+    reference: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute PJ and AUJ for every sample and transition window at once.
+
+    Parameters
+    ----------
+    jerk : np.ndarray
+        ``(batch, frames - 3)`` per-frame jerk from :func:`per_frame_jerk`.
+    windows : np.ndarray
+        ``(T, 2)`` frame windows shared by all samples in ``jerk``.
+    fps : float
+        Frame rate (AUJ integrates over seconds).
+    reference : float
+        Jerk level subtracted before integrating AUJ.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        ``(pj, auj)``, each of shape ``(batch, T)``.
+    """
+    batch, n = jerk.shape
+    if len(windows) == 0 or n == 0:
+        return np.zeros((batch, 0), np.float32), np.zeros((batch, 0), np.float32)
+    width = int((windows[:, 1] - windows[:, 0]).max())
+    # Frame f maps to jerk sample f - 1 (jerk[t] is centred at t + 1.5)
+    idx = windows[:, :1] - 1 + np.arange(width)[None, :]
+    valid = (idx >= 0) & (idx < n) & (idx < windows[:, 1:] - 1)
+    gathered = jerk[:, np.clip(idx, 0, n - 1)]  # (batch, T, width)
+    pj = np.where(valid, gathered, -np.inf).max(axis=-1)
+    pj[~np.isfinite(pj)] = 0.0
+    auj = (np.abs(gathered - reference) * valid).sum(axis=-1) / fps
+    return pj.astype(np.float32), auj.astype(np.float32)
+
+
+def evaluate_store(
+    store: MotionStore,
+    transition_length: int | None = None,
+    reference: float = 0.0,
+    features: FeatureIndex | None = None,
+) -> list[dict[str, Any]]:
+    """Score every sample of a motion store.
+
+    Samples sharing the same segment layout are processed as one batch. With
+    a feature index, each row also gets the foot-skate ratio over its valid
+    frames.
+
+    Returns
+    -------
+    list[dict]
+        One row per sample with the mean/max PJ and AUJ over its transitions
+        and the peak jerk over the whole valid sequence.
+    """
+    require_t2m(store, "the metrics")
+    if transition_length is None:
+        dataset = infer_dataset(store.store_dir)
+        transition_length = TRANSITION_LENGTH.get(
+            dataset or "", DEFAULT_TRANSITION_LENGTH
+        )
+    groups: dict[tuple[int, ...], list[int]] = {}
+    for i in range(store.num_samples):
+        groups.setdefault(tuple(store.segment_lengths(i)), []).append(i)
+
+    rows: list[dict[str, Any]] = []
+    for segments, samples in groups.items():
+        valid_frames = sum(segments)
+        if samples == list(range(samples[0], samples[-1] + 1)):
+            joints = store.joints[samples[0] : samples[-1] + 1, :valid_frames]
+        else:
+            joints = store.joints[samples, :valid_frames]
+        jerk = per_frame_jerk(joints, store.fps)
+        windows = transition_windows(segments, transition_length)
+        pj, auj = transition_jerk_stats(jerk, windows, store.fps, reference)
+        seq_peak = (
+            jerk.max(axis=-1) if jerk.shape[-1] else np.zeros(len(samples), np.float32)
+        )
+        for k, sample in enumerate(samples):
+            has_t = pj.shape[1] > 0
+            rows.append(
+                {
+                    "result": str(store.store_dir.parent),
+                    "sample": sample,
+                    "frames": valid_frames,
+                    "transitions": int(pj.shape[1]),
+                    "pj_mean": float(pj[k].mean()) if has_t else float("nan"),
+                    "pj_max": float(pj[k].max()) if has_t else float("nan"),
+                    "auj_mean": float(auj[k].mean()) if has_t else float("nan"),
+                    "auj_max": float(auj[k].max()) if has_t else float("nan"),
+                    "seq_peak_jerk": float(seq_peak[k]),
+                }
+            )
+            if features is not None:
+                rows[-1]["skate_ratio"] = features.skate_ratio(sample, valid_frames)
+    rows.sort(key=lambda r: r["sample"])
+    return rows
+
+
+def _evaluate_path(job: tuple[str, int | None, float, bool]) -> list[dict[str, Any]]:
+    path, transition_length, reference, with_features = job
+    store = open_motion_store(path)
+    features = open_features(store) if with_features else None
+    return evaluate_store(store, transition_length, reference, features)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Peak Jerk / Area Under Jerk over FlowMDM results"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="results.npy files, result directories or result trees"
+    )
+    parser.add_argument(
+        "--out", default=None, help="CSV output path (default: print a summary only)"
+    )
+    parser.add_argument(
+        "--transition-length",
+        type=int,
+        default=None,
+        help="Window width in frames (default: 30 for Babel, 60 for HumanML3D)",
+    )
+    parser.add_argument(
+        "--reference-jerk",
+        type=float,
+        default=0.0,
+        help="Jerk level subtracted for AUJ",
+    )
+    parser.add_argument(
+        "--features",
+        action="store_true",
+        help="Add the foot-skate ratio from the cached feature index (built on demand)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    jobs = [
+        (str(d), args.transition_length, args.reference_jerk, args.features)
+        for root in args.paths
+        for d in iter_result_dirs(root)
+    ]
+    rows: list[dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for result_rows in pool.map(_evaluate_path, jobs):
+            rows.extend(result_rows)
+
+    if args.out and rows:
+        out = pathlib.Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Wrote {len(rows)} rows to {out}")
+
+    pj = np.array([r["pj_mean"] for r in rows], dtype=np.float64)
+    auj = np.array([r["auj_mean"] for r in rows], dtype=np.float64)
+    print(f"Results: {len(jobs)}  samples: {len(rows)}")
+    if len(rows) and np.isfinite(pj).any():
+        print(f"PJ  mean: {np.nanmean(pj):.4f}")
+        print(f"AUJ mean: {np.nanmean(auj):.4f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
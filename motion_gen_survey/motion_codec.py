@@ -0,0 +1,612 @@
+"""Compact archive codec for T2M joint sequences.
+
+A motion archive (``motion.t2mc``) stores a motion store's
+``(batch, frames, 22, 3)`` joints in fixed-size frame blocks:
+
+1. **Quantize** positions to a grid of ``2 * tolerance`` metres, so every
+   decoded coordinate is within ``tolerance`` of the original (default
+   1 mm). ``tolerance=0`` stores the float32 bit patterns instead (lossless).
+2. **Parent-relative offsets** along ``t2m_kinematic_chain``: the root keeps
+   its (quantized) trajectory, every other joint stores the integer offset
+   from its parent. Bone offsets change slowly, so they code better than
+   absolute positions. Decoding sums offsets down the chain with one
+   ancestor-matrix product; since all of this happens on integer grid
+   coordinates, no error accumulates along the chain.
+3. **Delta-code in time** (``order`` 1 or 2) within the block; the first
+   frame(s) of a block are stored as-is, so every block decodes on its own.
+4. Zigzag to unsigned, narrow to the smallest of uint8/16/32, lay out each
+   joint coordinate's time series contiguously, shuffle bytes by
+   significance and compress with ``zlib``.
+
+Blocks are independent, so :meth:`MotionArchive.read` decodes only the
+blocks covering the requested frames. The file is
+``MAGIC | block payloads | footer JSON | footer length (u64 little-endian) |
+MAGIC``; the footer holds the codec parameters, the store metadata (fps,
+text, lengths, ...) and the block index (offset, size, width per sample and
+block).
+
+:attr:`MotionArchive.joints` is a lazy ``(batch, frames, 22, 3)`` array view,
+so archives play directly in the animator (``animate --result-dir
+motion.t2mc``) through its chunked frame source.
+
+Usage:
+    python -m motion_gen_survey codec encode model_zoo/FlowMDM/results --tolerance-mm 1 --workers 8
+    python -m motion_gen_survey codec info <result_dir>/motion.t2mc
+    python -m motion_gen_survey codec verify <result_dir>/motion.t2mc
+    python -m motion_gen_survey codec decode <result_dir>/motion.t2mc --store-dir tmp/decoded_store
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import mmap
+import os
+import pathlib
+import struct
+import zlib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.motion_store import (
+    FORMAT_VERSION,
+    JOINTS_FILENAME,
+    META_FILENAME,
+    STORE_DTYPE,
+    MotionStore,
+    iter_result_dirs,
+    open_motion_store,
+    publish_store,
+    require_t2m,
+)
+from motion_gen_survey.t2m import NUM_JOINTS, t2m_kinematic_chain
+
+
+MAGIC = b"T2MC"
+CODEC_VERSION = 1
+ARCHIVE_SUFFIX = ".t2mc"
+ARCHIVE_FILENAME = "motion" + ARCHIVE_SUFFIX
+DEFAULT_TOLERANCE_MM = 1.0
+DEFAULT_BLOCK_FRAMES = 256
+DEFAULT_ORDER = 2
+DEFAULT_LEVEL = 6
+_WIDTHS = (np.uint8, np.uint16, np.uint32, np.uint64)
+_FOOTER_TAIL = struct.Struct("<Q4s")
+
+
+def joint_parents(
+    chain: Sequence[Sequence[int]] = t2m_kinematic_chain, num_joints: int = NUM_JOINTS
+) -> np.ndarray:
+    """Parent index of every joint (``-1`` for the root) from kinematic chains."""
+    parents = np.full(num_joints, -1, dtype=np.int64)
+    for links in chain:
+        for parent, child in itertools.pairwise(links):
+            parents[child] = parent
+    return parents
+
+
+def ancestor_matrix(parents: np.ndarray) -> np.ndarray:
+    """``A[j, k] = 1`` if ``k`` is ``j`` or one of its ancestors, so positions = ``A @ offsets``."""
+    n = len(parents)
+    a = np.zeros((n, n), dtype=np.float64)
+    for j in range(n):
+        k = j
+        while k >= 0:
+            a[j, k] = 1.0
+            k = int(parents[k])
+    return a
+
+
+PARENTS = joint_parents()
+ANCESTORS = ancestor_matrix(PARENTS)
+_NON_ROOT = np.flatnonzero(PARENTS >= 0)
+
+
+# --- Block transform ---
+def quantize(joints: np.ndarray, step: float) -> np.ndarray:
+    """Integer grid coordinates (int64) of ``(..., 22, 3)`` positions; ``step=0`` keeps the float32 bits."""
+    x = np.asarray(joints, dtype=np.float32)
+    if step == 0.0:
+        return x.view(np.int32).astype(np.int64)
+    if not np.isfinite(x).all():
+        raise ValueError(
+            "non-finite joints cannot be quantized; encode with tolerance 0 (lossless)"
+        )
+    # float64: float32 division is off by up to ~1e-3 grid units at tens of metres
+    return np.rint(x.astype(np.float64) / step).astype(np.int64)
+
+
+def to_offsets(grid: np.ndarray) -> np.ndarray:
+    """Root stays absolute, other joints become offsets from their parent (in place on a copy)."""
+    out = grid.copy()
+    out[..., _NON_ROOT, :] -= grid[..., PARENTS[_NON_ROOT], :]
+    return out
+
+
+def from_offsets(offsets: np.ndarray) -> np.ndarray:
+    """Inverse of :func:`to_offsets` via the ancestor matrix (exact for |values| < 2**53)."""
+    return np.rint(np.matmul(ANCESTORS, offsets.astype(np.float64))).astype(np.int64)
+
+
+def delta_encode(q: np.ndarray, order: int, axis: int = -3) -> np.ndarray:
+    """``order`` rounds of first differences along ``axis``, keeping the leading values."""
+    d = q
+    for _ in range(order):
+        head = np.take(d, [0], axis=axis)
+        d = np.concatenate([head, np.diff(d, axis=axis)], axis=axis)
+    return d
+
+
+def delta_decode(d: np.ndarray, order: int, axis: int = -3) -> np.ndarray:
+    q = d
+    for _ in range(order):
+        q = np.cumsum(q, axis=axis)
+    return q
+
+
+def _zigzag(v: np.ndarray) -> np.ndarray:
+    return ((v << 1) ^ (v >> 63)).astype(np.uint64)
+
+
+def _unzigzag(u: np.ndarray) -> np.ndarray:
+    u = u.astype(np.uint64)
+    return (u >> np.uint64(1)).astype(np.int64) ^ -(u & np.uint64(1)).astype(np.int64)
+
+
+def pack_block(d: np.ndarray, level: int) -> tuple[bytes, int]:
+    """Compress one ``(frames, 22, 3)`` delta block; return ``(payload, byte width)``."""
+    u = _zigzag(d).transpose(1, 2, 0)  # (22, 3, frames): one time series per coordinate
+    peak = int(u.max()) if u.size else 0
+    dtype = next(w for w in _WIDTHS if peak <= np.iinfo(w).max)
+    narrow = np.ascontiguousarray(u, dtype=dtype)
+    width = narrow.itemsize
+    # Byte shuffle: all low bytes, then all next bytes, ...
+    shuffled = narrow.view(np.uint8).reshape(-1, width).T
+    return zlib.compress(np.ascontiguousarray(shuffled).tobytes(), level), width
+
+
+def unpack_block(payload: bytes, width: int, frames: int) -> np.ndarray:
+    raw = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+    narrow = np.ascontiguousarray(raw.reshape(width, -1).T).view(
+        _WIDTHS[width.bit_length() - 1]
+    )
+    return _unzigzag(narrow.reshape(NUM_JOINTS, 3, frames)).transpose(2, 0, 1)
+
+
+# --- Encoding ---
+def encode_store(
+    store: MotionStore,
+    out_path: str | os.PathLike[str] | None = None,
+    tolerance_mm: float = DEFAULT_TOLERANCE_MM,
+    block_frames: int = DEFAULT_BLOCK_FRAMES,
+    order: int = DEFAULT_ORDER,
+    level: int = DEFAULT_LEVEL,
+) -> pathlib.Path:
+    """Write ``store`` as a motion archive (default ``<result_dir>/motion.t2mc``).
+
+    Each frame block is quantized, offset- and delta-coded for all samples
+    at once; only the per-sample ``zlib`` calls loop in Python.
+    """
+    require_t2m(store, "the codec")
+    out_path = (
+        pathlib.Path(out_path)
+        if out_path is not None
+        else store.store_dir.parent / ARCHIVE_FILENAME
+    )
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    step = 2.0 * tolerance_mm / 1000.0
+    lossless = step == 0.0
+    batch, frames = store.num_samples, store.num_frames
+    block_frames = max(order + 1, int(block_frames))
+    num_blocks = -(-frames // block_frames)
+    offsets = np.zeros((batch, num_blocks), dtype=np.int64)
+    sizes = np.zeros((batch, num_blocks), dtype=np.int64)
+    widths = np.zeros((batch, num_blocks), dtype=np.int64)
+    hasher = hashlib.sha1()
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        for b in range(num_blocks):
+            start = b * block_frames
+            x = np.asarray(
+                store.joints[:, start : start + block_frames], dtype=np.float32
+            )
+            grid = quantize(x, step)
+            q = grid if lossless else to_offsets(grid)
+            d = delta_encode(q, order)
+            for s in range(batch):
+                payload, width = pack_block(d[s], level)
+                offsets[s, b] = f.tell()
+                sizes[s, b] = len(payload)
+                widths[s, b] = width
+                hasher.update(payload)
+                f.write(payload)
+        footer = {
+            "codec_version": CODEC_VERSION,
+            "shape": [batch, frames, NUM_JOINTS, 3],
+            "tolerance_mm": float(tolerance_mm),
+            "step": step,
+            "lossless": lossless,
+            "order": int(order),
+            "block_frames": block_frames,
+            "level": int(level),
+            "parents": PARENTS.tolist(),
+            "store_meta": {
+                k: v for k, v in store.meta.items() if k not in ("shape", "dtype")
+            },
+            "payload_sha1": hasher.hexdigest(),
+            "blocks": {
+                "offset": offsets.tolist(),
+                "size": sizes.tolist(),
+                "width": widths.tolist(),
+            },
+        }
+        data = json.dumps(footer).encode("utf-8")
+        f.write(data)
+        f.write(_FOOTER_TAIL.pack(len(data), MAGIC))
+    os.replace(tmp, out_path)
+    return out_path
+
+
+# --- Decoding ---
+class MotionArchive:
+    """Random-access reader of a motion archive.
+
+    Mirrors the read side of :class:`~motion_gen_survey.motion_store.MotionStore`
+    (``joints``, ``fps``, ``text``, ``lengths``, ``sample``,
+    ``segment_lengths``), so viewers can use either.
+
+    Parameters
+    ----------
+    path : path-like
+        The ``.t2mc`` file.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a motion archive")
+            f.seek(-_FOOTER_TAIL.size, os.SEEK_END)
+            length, magic = _FOOTER_TAIL.unpack(f.read(_FOOTER_TAIL.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is truncated (no footer)")
+            f.seek(-_FOOTER_TAIL.size - length, os.SEEK_END)
+            self.footer: dict[str, Any] = json.loads(f.read(length))
+            # The map outlives the handle; slicing it needs no shared seek position,
+            # so the prefetch thread of a frame source can read blocks without a lock
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.footer.get("codec_version") != CODEC_VERSION:
+            raise ValueError(
+                f"Unsupported motion archive version {self.footer.get('codec_version')} in {self.path}"
+            )
+        if self.footer["parents"] != PARENTS.tolist():
+            raise ValueError(f"{self.path} was encoded with a different skeleton")
+        self.meta: dict[str, Any] = self.footer["store_meta"]
+        self.shape: tuple[int, int, int, int] = tuple(self.footer["shape"])  # type: ignore[assignment]
+        self.block_frames = int(self.footer["block_frames"])
+        self.order = int(self.footer["order"])
+        self.step = float(self.footer["step"])
+        self.lossless = bool(self.footer["lossless"])
+        blocks = self.footer["blocks"]
+        self._offsets = np.asarray(blocks["offset"], dtype=np.int64).reshape(
+            self.num_samples, -1
+        )
+        self._sizes = np.asarray(blocks["size"], dtype=np.int64).reshape(
+            self.num_samples, -1
+        )
+        self._widths = np.asarray(blocks["width"], dtype=np.int64).reshape(
+            self.num_samples, -1
+        )
+        self.joints = ArchiveJoints(self, np.arange(self.num_samples))
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.shape[0])
+
+    @property
+    def num_frames(self) -> int:
+        return int(self.shape[1])
+
+    @property
+    def num_joints(self) -> int:
+        return int(self.shape[2])
+
+    @property
+    def num_blocks(self) -> int:
+        return int(self._offsets.shape[1])
+
+    @property
+    def fps(self) -> float:
+        return float(self.meta["fps"])
+
+    @property
+    def text(self) -> list[Any]:
+        return list(self.meta.get("text", []))
+
+    @property
+    def lengths(self) -> list[Any]:
+        return list(self.meta.get("lengths", []))
+
+    @property
+    def nbytes(self) -> int:
+        """Compressed payload size."""
+        return int(self._sizes.sum())
+
+    # Segment bookkeeping is identical to the store's
+    segment_lengths = MotionStore.segment_lengths
+
+    def block(self, sample: int, index: int) -> np.ndarray:
+        """Decode frame block ``index`` of ``sample`` as ``(<=block_frames, 22, 3)`` float32."""
+        start = index * self.block_frames
+        frames = min(self.block_frames, self.num_frames - start)
+        offset = int(self._offsets[sample, index])
+        payload = self._map[offset : offset + int(self._sizes[sample, index])]
+        q = delta_decode(
+            unpack_block(payload, int(self._widths[sample, index]), frames), self.order
+        )
+        if self.lossless:
+            return q.astype(np.int32).view(np.float32)
+        return (from_offsets(q) * self.step).astype(np.float32)
+
+    def read(
+        self, samples: Sequence[int] | np.ndarray, start: int, stop: int
+    ) -> np.ndarray:
+        """Decode frames ``[start, stop)`` of ``samples`` as ``(len(samples), frames, 22, 3)`` float32."""
+        start, stop = max(0, int(start)), min(self.num_frames, int(stop))
+        samples = np.asarray(samples, dtype=np.int64).reshape(-1)
+        out = np.empty(
+            (len(samples), max(0, stop - start), NUM_JOINTS, 3), dtype=np.float32
+        )
+        if stop <= start:
+            return out
+        first, last = start // self.block_frames, (stop - 1) // self.block_frames
+        for k, sample in enumerate(samples):
+            for b in range(first, last + 1):
+                block_start = b * self.block_frames
+                data = self.block(int(sample), b)
+                lo, hi = max(start, block_start), min(stop, block_start + len(data))
+                out[k, lo - start : hi - start] = data[
+                    lo - block_start : hi - block_start
+                ]
+        return out
+
+    def sample(self, index: int) -> np.ndarray:
+        """Decode all frames of one sample, ``(frames, 22, 3)``."""
+        return self.read([index], 0, self.num_frames)[0]
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> MotionArchive:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"MotionArchive({str(self.path)!r}, shape={self.shape}, fps={self.fps}, "
+            f"tolerance={self.footer['tolerance_mm']:g} mm)"
+        )
+
+
+class ArchiveJoints:
+    """Lazy ``(batch, frames, 22, 3)`` array view over a :class:`MotionArchive`.
+
+    Slicing the sample axis alone stays lazy; any frame selection decodes
+    just the blocks that cover it. This is all
+    :class:`~motion_gen_survey.frame_source.ChunkedFrameSource` needs.
+    """
+
+    dtype = np.dtype(np.float32)
+    ndim = 4
+
+    def __init__(self, archive: MotionArchive, samples: np.ndarray) -> None:
+        self.archive = archive
+        self.samples = samples
+        self.shape = (len(samples), *archive.shape[1:])
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key: Any) -> Any:
+        key = key if isinstance(key, tuple) else (key,)
+        sample_key, rest = (key[0] if key else slice(None)), key[1:]
+        samples = self.samples[sample_key]
+        if not rest:
+            if np.ndim(samples) == 0:
+                return self.archive.read([int(samples)], 0, self.archive.num_frames)[0]
+            return ArchiveJoints(self.archive, np.atleast_1d(samples))
+        frame_key, rest = rest[0], rest[1:]
+        picked = np.arange(self.archive.num_frames)[frame_key]
+        flat = np.atleast_1d(picked)
+        lo = int(flat.min()) if flat.size else 0
+        hi = int(flat.max()) + 1 if flat.size else 0
+        data = self.archive.read(np.atleast_1d(samples), lo, hi)[:, picked - lo]
+        if np.ndim(samples) == 0:
+            data = data[0]
+        # The remaining keys index the joint and coordinate axes, the last two
+        tail = (slice(None),) * (2 - len(rest))
+        return data[(Ellipsis, *rest, *tail)] if rest else data
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        data = self.archive.read(self.samples, 0, self.archive.num_frames)
+        return data if dtype is None else data.astype(dtype)
+
+
+def is_archive(path: str | os.PathLike[str]) -> bool:
+    """True for a ``.t2mc`` file, or a result directory that holds ``motion.t2mc`` and no results/store."""
+    path = pathlib.Path(path)
+    if path.is_file():
+        return path.suffix == ARCHIVE_SUFFIX
+    return (
+        (path / ARCHIVE_FILENAME).exists()
+        and not any(path.glob("results.npy"))
+        and not (path / "motion_store" / META_FILENAME).exists()
+    )
+
+
+def open_archive(path: str | os.PathLike[str]) -> MotionArchive:
+    """Open a ``.t2mc`` file, or the ``motion.t2mc`` of a result directory."""
+    path = pathlib.Path(path)
+    return MotionArchive(path if path.is_file() else path / ARCHIVE_FILENAME)
+
+
+def open_motion(path: str | os.PathLike[str]) -> MotionStore | MotionArchive:
+    """Open an archive if ``path`` is one, otherwise the motion store (see :func:`open_motion_store`)."""
+    return open_archive(path) if is_archive(path) else open_motion_store(path)
+
+
+def decode_to_store(
+    archive: MotionArchive, store_dir: str | os.PathLike[str]
+) -> pathlib.Path:
+    """Write the archive back out as a motion store (joints.f32 + meta.json)."""
+    store_dir = pathlib.Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    tmp_joints = (store_dir / JOINTS_FILENAME).with_suffix(".tmp")
+    out = np.memmap(tmp_joints, dtype=STORE_DTYPE, mode="w+", shape=archive.shape)
+    hasher = hashlib.sha1()
+    for s in range(archive.num_samples):
+        out[s] = archive.sample(s)
+        hasher.update(out[s])
+    out.flush()
+    del out
+    st = archive.path.stat()
+    meta = {
+        **archive.meta,
+        "format_version": FORMAT_VERSION,
+        "dtype": STORE_DTYPE,
+        "shape": list(archive.shape),
+        "content_hash": hasher.hexdigest(),
+        "source": {
+            "path": str(archive.path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        },
+    }
+    publish_store(store_dir, tmp_joints, meta)
+    return store_dir
+
+
+def verify(archive: MotionArchive, store: MotionStore) -> float:
+    """Largest absolute coordinate error of the archive against its source store (metres)."""
+    worst = 0.0
+    for s in range(archive.num_samples):
+        diff = np.abs(archive.sample(s) - np.asarray(store.joints[s], dtype=np.float32))
+        worst = max(worst, float(np.nanmax(diff)) if diff.size else 0.0)
+    return worst
+
+
+def _encode_path(job: tuple[str, float, int, int, int]) -> str:
+    path, tolerance_mm, block_frames, order, level = job
+    store = open_motion_store(path)
+    out = encode_store(
+        store,
+        tolerance_mm=tolerance_mm,
+        block_frames=block_frames,
+        order=order,
+        level=level,
+    )
+    raw = store.joints.nbytes
+    size = out.stat().st_size
+    return f"{out} ({raw / 2**20:.1f} MiB -> {size / 2**20:.2f} MiB, {raw / max(size, 1):.1f}x)"
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compact motion archives: encode, decode, verify"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_enc = sub.add_parser(
+        "encode", help="Encode result trees into <result_dir>/motion.t2mc"
+    )
+    p_enc.add_argument(
+        "paths",
+        nargs="+",
+        help="results.npy files, result directories, trees or manifests",
+    )
+    p_enc.add_argument(
+        "--tolerance-mm",
+        type=float,
+        default=DEFAULT_TOLERANCE_MM,
+        help="Maximum per-coordinate error in millimetres (0: lossless)",
+    )
+    p_enc.add_argument(
+        "--block-frames",
+        type=int,
+        default=DEFAULT_BLOCK_FRAMES,
+        help="Frames per random-access block",
+    )
+    p_enc.add_argument(
+        "--order",
+        type=int,
+        choices=[1, 2],
+        default=DEFAULT_ORDER,
+        help="Temporal delta order",
+    )
+    p_enc.add_argument(
+        "--level", type=int, default=DEFAULT_LEVEL, help="zlib level (1 fast - 9 small)"
+    )
+    p_enc.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    p_dec = sub.add_parser("decode", help="Write an archive back out as a motion store")
+    p_dec.add_argument("archive")
+    p_dec.add_argument("--store-dir", required=True)
+
+    p_ver = sub.add_parser(
+        "verify", help="Compare an archive with the store it was encoded from"
+    )
+    p_ver.add_argument("archive")
+    p_ver.add_argument(
+        "--store",
+        default=None,
+        help="Source store (default: the archive's result directory)",
+    )
+
+    p_info = sub.add_parser("info", help="Print archive parameters and size")
+    p_info.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    if args.command == "encode":
+        jobs = [
+            (str(d), args.tolerance_mm, args.block_frames, args.order, args.level)
+            for root in args.paths
+            for d in iter_result_dirs(root)
+        ]
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            for message in pool.map(_encode_path, jobs):
+                print(f"encoded: {message}")
+        return
+
+    archive = open_archive(args.archive)
+    if args.command == "decode":
+        print(f"decoded: {decode_to_store(archive, args.store_dir)}")
+    elif args.command == "verify":
+        store = open_motion_store(args.store or archive.path.parent)
+        worst = verify(archive, store)
+        bound = archive.footer["tolerance_mm"] / 1000.0
+        print(f"max error {worst * 1000:.4f} mm (tolerance {bound * 1000:g} mm)")
+        if worst > bound * (1 + 1e-4) + 1e-7:
+            raise SystemExit(1)
+    else:
+        print(archive)
+        raw = archive.num_samples * archive.num_frames * NUM_JOINTS * 3 * 4
+        print(
+            f"Blocks: {archive.num_samples} x {archive.num_blocks} of {archive.block_frames} frames, "
+            f"delta order {archive.order}"
+        )
+        print(
+            f"Payload: {archive.nbytes / 2**20:.2f} MiB ({raw / max(archive.nbytes, 1):.1f}x vs float32)"
+        )
+        print(f"Text prompts: {archive.text}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
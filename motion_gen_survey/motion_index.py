@@ -0,0 +1,680 @@
+"""Similarity search over generated motion clips and segments.
+
+Every clip of a result tree (or every instruction segment, from
+``lengths``) is turned into a fixed-length pose descriptor:
+
+- the segment is resampled to ``frames`` evenly spaced poses (linear
+  interpolation), so descriptors do not depend on duration or fps;
+- each pose is taken relative to the root's ground position, keeping height,
+  and the whole segment is turned about the up axis so the first frame faces
+  a canonical direction (hips + shoulders);
+- the root displacement from the first frame is appended.
+
+The vector is scaled by ``1 / sqrt(frames * (joints + 1))`` so the Euclidean
+distance between two descriptors is the RMS point distance in meters.
+
+An index directory holds:
+
+- ``descriptors.f32``: ``(count, dim)`` float32 matrix (memory-mapped on open)
+- ``norms.f32``: squared descriptor norms, for ``|q|^2 + |x|^2 - 2 q.x``
+- ``entries.json``: result directory, sample, segment, frame range and text
+  of every row
+- ``meta.json``: descriptor parameters and the content hash of every source
+  store
+- ``ivf.npz`` (optional): PCA projection, k-means coarse centroids and the
+  PCA codes grouped by list, for approximate search that scans only
+  ``nprobe`` lists and re-ranks the candidates with the full descriptors
+
+Exact search is one BLAS matrix product against the descriptor matrix.
+
+Usage:
+    python -m motion_gen_survey.motion_index build model_zoo/FlowMDM/results --out tmp/motion_index --ivf
+    python -m motion_gen_survey.motion_index query tmp/motion_index <result_dir> --sample 0 --segment 2 -k 10
+    python -m motion_gen_survey.motion_index dupes tmp/motion_index --threshold 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import pathlib
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.motion_store import (
+    MotionStore,
+    iter_result_dirs,
+    open_motion_store,
+    require_t2m,
+)
+from motion_gen_survey.t2m import NUM_JOINTS, ROOT_JOINT
+
+
+INDEX_VERSION = 1
+DESCRIPTORS_FILENAME = "descriptors.f32"
+NORMS_FILENAME = "norms.f32"
+ENTRIES_FILENAME = "entries.json"
+META_FILENAME = "meta.json"
+IVF_FILENAME = "ivf.npz"
+DESCRIPTOR_FRAMES = 16
+UNITS = ("segment", "clip")
+# Y-up
+UP_AXIS = 1
+# R.Hip, L.Hip, R.Shoulder, L.Shoulder (``face_joint_indx`` in HumanML3D)
+FACE_JOINTS: tuple[int, int, int, int] = (2, 1, 17, 16)
+DEFAULT_PCA_DIM = 64
+DEFAULT_NPROBE = 8
+# Rows of the descriptor matrix scored per BLAS call
+SEARCH_BLOCK_ROWS = 1 << 16
+
+
+def descriptor_dim(
+    frames: int = DESCRIPTOR_FRAMES, num_joints: int = NUM_JOINTS
+) -> int:
+    return frames * (num_joints + 1) * 3
+
+
+def compute_descriptors(
+    joints: np.ndarray, frames: int = DESCRIPTOR_FRAMES
+) -> np.ndarray:
+    """Descriptors of a batch of equal-length segments.
+
+    Parameters
+    ----------
+    joints : np.ndarray
+        ``(batch, n, joints, 3)`` Y-up positions (any float dtype, may be a
+        memmap slice).
+    frames : int
+        Poses the segment is resampled to.
+
+    Returns
+    -------
+    np.ndarray
+        ``(batch, frames * (joints + 1) * 3)`` float32.
+    """
+    batch, n, num_joints = joints.shape[:3]
+    pos = np.linspace(0.0, n - 1, frames)
+    i0 = np.floor(pos).astype(np.intp)
+    i1 = np.minimum(i0 + 1, n - 1)
+    t = (pos - i0)[None, :, None, None]
+    x = np.asarray(joints[:, i0], dtype=np.float64)
+    x += (np.asarray(joints[:, i1], dtype=np.float64) - x) * t
+
+    h0, h2 = [a for a in range(3) if a != UP_AXIS]
+    r_hip, l_hip, r_sdr, l_sdr = FACE_JOINTS
+    first = x[:, 0]
+    across = (first[:, l_hip] - first[:, r_hip]) + (first[:, l_sdr] - first[:, r_sdr])
+    yaw = np.arctan2(across[:, h2], across[:, h0])
+    cos, sin = np.cos(yaw)[:, None, None], np.sin(yaw)[:, None, None]
+
+    root = x[:, :, ROOT_JOINT].copy()
+    traj = root - root[:, :1]
+    local = x
+    local[..., h0] -= root[:, :, None, h0]
+    local[..., h2] -= root[:, :, None, h2]
+    out = np.empty((batch, frames, num_joints + 1, 3), dtype=np.float64)
+    out[:, :, :num_joints] = local
+    out[:, :, num_joints] = traj
+    a, b = out[..., h0].copy(), out[..., h2]
+    out[..., h0] = cos * a + sin * b
+    out[..., h2] = cos * b - sin * a
+    out *= 1.0 / np.sqrt(frames * (num_joints + 1))
+    return out.reshape(batch, -1).astype(np.float32)
+
+
+def _entry_text(
+    text: list[Any], sample: int, segment: int, num_samples: int, num_segments: int
+) -> str:
+    if segment >= 0 and len(text) == num_segments:
+        return str(text[segment])
+    if len(text) == num_samples:
+        value = text[sample]
+        if isinstance(value, list) and 0 <= segment < len(value):
+            return str(value[segment])
+        return " / ".join(map(str, value)) if isinstance(value, list) else str(value)
+    if segment < 0 and len(text) == num_segments:
+        return " / ".join(map(str, text))
+    return ""
+
+
+def store_descriptors(
+    store: MotionStore,
+    unit: str = "segment",
+    frames: int = DESCRIPTOR_FRAMES,
+) -> tuple[list[dict[str, Any]], np.ndarray]:
+    """Describe every clip or segment of ``store``; return ``(entries, descriptors)``.
+
+    Segments of FlowMDM compositions share their boundaries across samples,
+    so each segment is described for all samples in one batched call.
+    """
+    require_t2m(store, "the motion index")
+    result_dir = str(store.store_dir.parent)
+    text = store.text
+    entries: list[dict[str, Any]] = []
+    blocks: list[np.ndarray] = []
+    by_bounds: dict[tuple[int, ...], list[int]] = {}
+    for sample in range(store.num_samples):
+        by_bounds.setdefault(tuple(store.segment_lengths(sample)), []).append(sample)
+    for lengths, samples in by_bounds.items():
+        bounds = np.concatenate([[0], np.cumsum(lengths)]).tolist()
+        spans = (
+            list(itertools.pairwise(bounds)) if unit == "segment" else [(0, bounds[-1])]
+        )
+        for seg, (start, stop) in enumerate(spans):
+            if stop - start < 2:
+                continue
+            segment = seg if unit == "segment" else -1
+            blocks.append(
+                compute_descriptors(store.joints[samples, start:stop], frames)
+            )
+            for sample in samples:
+                entries.append(
+                    {
+                        "result_dir": result_dir,
+                        "sample": sample,
+                        "segment": segment,
+                        "start": int(start),
+                        "stop": int(stop),
+                        "text": _entry_text(
+                            text, sample, segment, store.num_samples, len(lengths)
+                        ),
+                    }
+                )
+    dim = descriptor_dim(frames, store.num_joints)
+    return entries, (
+        np.concatenate(blocks) if blocks else np.empty((0, dim), np.float32)
+    )
+
+
+def _describe_path(
+    job: tuple[str, str, int],
+) -> tuple[list[dict[str, Any]], np.ndarray, dict[str, str]]:
+    path, unit, frames = job
+    store = open_motion_store(path)
+    entries, desc = store_descriptors(store, unit, frames)
+    return (
+        entries,
+        desc,
+        {"result_dir": str(store.store_dir.parent), "content_hash": store.content_hash},
+    )
+
+
+def _write_json(path: pathlib.Path, data: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _topk(d2: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Smallest ``k`` entries of every row of ``d2``, sorted: ``(values, columns)``."""
+    k = min(k, d2.shape[1])
+    if k <= 0:
+        return np.empty((len(d2), 0), d2.dtype), np.empty((len(d2), 0), np.intp)
+    part = (
+        np.argpartition(d2, k - 1, axis=1)[:, :k]
+        if k < d2.shape[1]
+        else np.tile(np.arange(k), (len(d2), 1))
+    )
+    vals = np.take_along_axis(d2, part, axis=1)
+    order = np.argsort(vals, axis=1)
+    return np.take_along_axis(vals, order, axis=1), np.take_along_axis(
+        part, order, axis=1
+    )
+
+
+def kmeans(x: np.ndarray, clusters: int, iters: int = 10, seed: int = 0) -> np.ndarray:
+    """Plain Lloyd k-means with BLAS distance computation; returns the centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=clusters, replace=False)].astype(np.float32)
+    for _ in range(iters):
+        d2 = (centroids * centroids).sum(1)[None] - 2.0 * (x @ centroids.T)
+        assign = np.argmin(d2, axis=1)
+        counts = np.bincount(assign, minlength=clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # Re-seed empty clusters from random points
+        if not filled.all():
+            centroids[~filled] = x[rng.choice(len(x), size=int((~filled).sum()))]
+    return centroids
+
+
+def build_ivf(
+    descriptors: np.ndarray,
+    pca_dim: int = DEFAULT_PCA_DIM,
+    nlist: int | None = None,
+    train_size: int = 50_000,
+    block_rows: int = SEARCH_BLOCK_ROWS,
+    seed: int = 0,
+) -> dict[str, np.ndarray]:
+    """Train PCA + coarse k-means on ``descriptors`` and encode every row.
+
+    Returns the arrays stored in ``ivf.npz``: ``mean``, ``components``
+    (``(dim, pca_dim)``), ``centroids``, ``order`` (row ids grouped by list),
+    ``offsets`` (list boundaries into ``order``), ``codes`` (PCA codes in
+    ``order``) and ``code_norms``.
+    """
+    count, dim = descriptors.shape
+    rng = np.random.default_rng(seed)
+    train_ids = np.sort(rng.choice(count, size=min(count, train_size), replace=False))
+    train = np.asarray(descriptors[train_ids], dtype=np.float64)
+    mean = train.mean(axis=0)
+    train -= mean
+    # Top eigenvectors of the (dim x dim) covariance; cheaper than an SVD of the samples
+    _, vecs = np.linalg.eigh(train.T @ train)
+    pca_dim = min(pca_dim, dim)
+    components = np.ascontiguousarray(vecs[:, ::-1][:, :pca_dim], dtype=np.float32)
+    mean = mean.astype(np.float32)
+
+    codes = np.empty((count, pca_dim), dtype=np.float32)
+    for start in range(0, count, block_rows):
+        stop = min(count, start + block_rows)
+        np.matmul(
+            np.asarray(descriptors[start:stop]) - mean,
+            components,
+            out=codes[start:stop],
+        )
+
+    nlist = max(1, min(count, nlist or int(4 * np.sqrt(count))))
+    centroids = kmeans(codes[train_ids], nlist, seed=seed)
+    assign = np.empty(count, dtype=np.intp)
+    for start in range(0, count, block_rows):
+        block = codes[start : min(count, start + block_rows)]
+        d2 = (centroids * centroids).sum(1)[None] - 2.0 * (block @ centroids.T)
+        assign[start : start + len(block)] = np.argmin(d2, axis=1)
+    order = np.argsort(assign, kind="stable").astype(np.int64)
+    offsets = np.concatenate(
+        [[0], np.cumsum(np.bincount(assign, minlength=nlist))]
+    ).astype(np.int64)
+    codes = codes[order]
+    return {
+        "mean": mean,
+        "components": components,
+        "centroids": centroids,
+        "order": order,
+        "offsets": offsets,
+        "codes": codes,
+        "code_norms": (codes * codes).sum(1),
+    }
+
+
+def build_index(
+    paths: Sequence[str | os.PathLike[str]],
+    out_dir: str | os.PathLike[str],
+    unit: str = "segment",
+    frames: int = DESCRIPTOR_FRAMES,
+    workers: int = 1,
+    ivf: bool = False,
+    pca_dim: int = DEFAULT_PCA_DIM,
+    nlist: int | None = None,
+) -> MotionIndex:
+    """Describe every result below ``paths`` and write the index to ``out_dir``.
+
+    Stores are described in worker processes; descriptor rows are streamed
+    to ``descriptors.f32`` as they arrive.
+    """
+    if unit not in UNITS:
+        raise ValueError(f"unit must be one of {UNITS}, got {unit!r}")
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(str(d), unit, frames) for root in paths for d in iter_result_dirs(root)]
+    entries: list[dict[str, Any]] = []
+    sources: list[dict[str, str]] = []
+    dim = descriptor_dim(frames)
+    tmp_desc = out_dir / (DESCRIPTORS_FILENAME + ".tmp")
+    norms: list[np.ndarray] = []
+    with (
+        open(tmp_desc, "wb") as f,
+        ProcessPoolExecutor(max_workers=max(1, workers)) as pool,
+    ):
+        for rows, desc, source in pool.map(_describe_path, jobs):
+            if desc.shape[1] != dim:
+                raise ValueError(
+                    f"{source['result_dir']}: descriptor dim {desc.shape[1]} != {dim}"
+                )
+            f.write(desc.astype("<f4", copy=False).tobytes())
+            norms.append((desc * desc).sum(1))
+            entries.extend(rows)
+            sources.append(source)
+    os.replace(tmp_desc, out_dir / DESCRIPTORS_FILENAME)
+    norm_arr = np.concatenate(norms) if norms else np.empty(0, np.float32)
+    norm_arr.astype("<f4").tofile(out_dir / NORMS_FILENAME)
+    _write_json(out_dir / ENTRIES_FILENAME, entries)
+    (out_dir / IVF_FILENAME).unlink(missing_ok=True)
+    _write_json(
+        out_dir / META_FILENAME,
+        {
+            "version": INDEX_VERSION,
+            "count": len(entries),
+            "dim": dim,
+            "frames": frames,
+            "unit": unit,
+            "sources": sources,
+        },
+    )
+    index = MotionIndex(out_dir)
+    if ivf and index.count:
+        index.train_ivf(pca_dim=pca_dim, nlist=nlist)
+    return index
+
+
+class MotionIndex:
+    """k-NN index over motion descriptors.
+
+    Parameters
+    ----------
+    index_dir : path-like
+        Directory written by :func:`build_index`.
+
+    Attributes
+    ----------
+    descriptors : np.memmap
+        ``(count, dim)`` float32 descriptor matrix.
+    entries : list of dict
+        Row metadata (``result_dir``, ``sample``, ``segment``, ``start``,
+        ``stop``, ``text``).
+    """
+
+    def __init__(self, index_dir: str | os.PathLike[str]) -> None:
+        self.index_dir = pathlib.Path(index_dir)
+        with open(self.index_dir / META_FILENAME, encoding="utf-8") as f:
+            self.meta: dict[str, Any] = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported motion index version {self.meta.get('version')} in {self.index_dir}"
+            )
+        with open(self.index_dir / ENTRIES_FILENAME, encoding="utf-8") as f:
+            self.entries: list[dict[str, Any]] = json.load(f)
+        shape = (int(self.meta["count"]), int(self.meta["dim"]))
+        if shape[0]:
+            self.descriptors: np.ndarray = np.memmap(
+                self.index_dir / DESCRIPTORS_FILENAME,
+                dtype="<f4",
+                mode="r",
+                shape=shape,
+            )
+            self.norms = np.fromfile(self.index_dir / NORMS_FILENAME, dtype="<f4")
+        else:
+            self.descriptors = np.empty(shape, np.float32)
+            self.norms = np.empty(0, np.float32)
+        self.ivf: dict[str, np.ndarray] | None = None
+        ivf_path = self.index_dir / IVF_FILENAME
+        if ivf_path.exists():
+            with np.load(ivf_path) as data:
+                self.ivf = {key: data[key] for key in data.files}
+
+    @property
+    def count(self) -> int:
+        return int(self.meta["count"])
+
+    @property
+    def frames(self) -> int:
+        return int(self.meta["frames"])
+
+    def train_ivf(
+        self, pca_dim: int = DEFAULT_PCA_DIM, nlist: int | None = None
+    ) -> None:
+        """Train and save the compressed IVF/PCA search structure."""
+        self.ivf = build_ivf(self.descriptors, pca_dim=pca_dim, nlist=nlist)
+        path = self.index_dir / IVF_FILENAME
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **self.ivf)
+        os.replace(tmp, path)
+
+    def describe(self, joints: np.ndarray) -> np.ndarray:
+        """Descriptor of a ``(frames, joints, 3)`` segment, with this index's parameters."""
+        return compute_descriptors(np.asarray(joints)[None], self.frames)[0]
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        nprobe: int | None = None,
+        rerank: int | None = None,
+        block_rows: int = SEARCH_BLOCK_ROWS,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the ``k`` nearest rows of each query.
+
+        Parameters
+        ----------
+        queries : np.ndarray
+            ``(dim,)`` or ``(Q, dim)`` descriptors.
+        k : int
+            Neighbours per query.
+        nprobe : int, optional
+            Use the IVF/PCA structure and scan this many coarse lists.
+            Exact search over the full matrix if omitted.
+        rerank : int, optional
+            IVF candidates re-scored with the full descriptors
+            (default ``4 * k``).
+
+        Returns
+        -------
+        distances, ids : np.ndarray
+            ``(Q, k)`` RMS distances in meters (ascending) and row ids.
+        """
+        q = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if nprobe is not None:
+            if self.ivf is None:
+                raise ValueError(
+                    f"{self.index_dir} has no {IVF_FILENAME}; build with --ivf"
+                )
+            return self._search_ivf(q, k, nprobe, rerank or 4 * k)
+        qn = (q * q).sum(1)[:, None]
+        best_d = np.empty((len(q), 0), np.float32)
+        best_i = np.empty((len(q), 0), np.intp)
+        for start in range(0, self.count, block_rows):
+            stop = min(self.count, start + block_rows)
+            d2 = q @ np.asarray(self.descriptors[start:stop]).T
+            d2 *= -2.0
+            d2 += self.norms[None, start:stop]
+            d2 += qn
+            vals, cols = _topk(d2, k)
+            best_d, order = _topk(np.concatenate([best_d, vals], axis=1), k)
+            best_i = np.take_along_axis(
+                np.concatenate([best_i, cols + start], axis=1), order, axis=1
+            )
+        return np.sqrt(np.maximum(best_d, 0.0)), best_i
+
+    def _search_ivf(
+        self, q: np.ndarray, k: int, nprobe: int, rerank: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        ivf = self.ivf
+        assert ivf is not None
+        qc = (q - ivf["mean"]) @ ivf["components"]
+        cd2 = (ivf["centroids"] * ivf["centroids"]).sum(1)[None] - 2.0 * (
+            qc @ ivf["centroids"].T
+        )
+        _, probes = _topk(cd2, nprobe)
+        offsets, order, codes = ivf["offsets"], ivf["order"], ivf["codes"]
+        out_d = np.full((len(q), k), np.inf, np.float32)
+        out_i = np.full((len(q), k), -1, np.intp)
+        for row in range(len(q)):
+            spans = [np.arange(offsets[c], offsets[c + 1]) for c in probes[row]]
+            cand = np.concatenate(spans) if spans else np.empty(0, np.intp)
+            if not len(cand):
+                continue
+            d2 = ivf["code_norms"][cand] - 2.0 * (codes[cand] @ qc[row])
+            _, top = _topk(d2[None], rerank)
+            ids = np.sort(order[cand[top[0]]])
+            full = np.asarray(self.descriptors[ids])
+            exact = self.norms[ids] - 2.0 * (full @ q[row]) + q[row] @ q[row]
+            vals, cols = _topk(exact[None], k)
+            n = vals.shape[1]
+            out_d[row, :n] = np.sqrt(np.maximum(vals[0], 0.0))
+            out_i[row, :n] = ids[cols[0]]
+        return out_d, out_i
+
+    def near_duplicates(
+        self, threshold: float, block_rows: int = 1024
+    ) -> Iterator[tuple[int, int, float]]:
+        """Yield ``(i, j, distance)`` for every pair ``i < j`` closer than ``threshold`` meters."""
+        t2 = threshold * threshold
+        for start in range(0, self.count, block_rows):
+            stop = min(self.count, start + block_rows)
+            block = np.asarray(self.descriptors[start:stop])
+            bn = self.norms[start:stop, None]
+            # Only columns from ``start`` on, so every pair is visited once
+            for cstart in range(start, self.count, SEARCH_BLOCK_ROWS):
+                cstop = min(self.count, cstart + SEARCH_BLOCK_ROWS)
+                d2 = block @ np.asarray(self.descriptors[cstart:cstop]).T
+                d2 *= -2.0
+                d2 += bn
+                d2 += self.norms[None, cstart:cstop]
+                rows, cols = np.nonzero(d2 < t2)
+                for r, c in zip(rows.tolist(), cols.tolist(), strict=True):
+                    i, j = start + r, cstart + c
+                    if i < j:
+                        yield i, j, float(np.sqrt(max(d2[r, c], 0.0)))
+
+    def format_entry(self, row: int) -> str:
+        e = self.entries[row]
+        seg = f" seg {e['segment']}" if e["segment"] >= 0 else ""
+        text = f"  {e['text']!r}" if e["text"] else ""
+        return f"{e['result_dir']} sample {e['sample']}{seg} [{e['start']}:{e['stop']}]{text}"
+
+    def __repr__(self) -> str:
+        ivf = (
+            f", ivf lists={len(self.ivf['centroids'])}" if self.ivf is not None else ""
+        )
+        return (
+            f"MotionIndex({str(self.index_dir)!r}, count={self.count}, dim={self.meta['dim']}, "
+            f"unit={self.meta['unit']}{ivf})"
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Build and query motion similarity indexes"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Describe result trees and write an index")
+    p_build.add_argument(
+        "paths",
+        nargs="+",
+        help="results.npy files, result directories, trees or sweep manifests",
+    )
+    p_build.add_argument("--out", required=True, help="Index directory")
+    p_build.add_argument("--unit", choices=UNITS, default="segment")
+    p_build.add_argument(
+        "--frames", type=int, default=DESCRIPTOR_FRAMES, help="Poses per descriptor"
+    )
+    p_build.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p_build.add_argument(
+        "--ivf", action="store_true", help="Also train the IVF/PCA approximate index"
+    )
+    p_build.add_argument("--pca-dim", type=int, default=DEFAULT_PCA_DIM)
+    p_build.add_argument(
+        "--nlist",
+        type=int,
+        default=None,
+        help="Coarse lists (default: 4 * sqrt(count))",
+    )
+
+    p_query = sub.add_parser("query", help="Find the nearest clips/segments")
+    p_query.add_argument("index", help="Index directory")
+    p_query.add_argument(
+        "path",
+        nargs="?",
+        help="Result to query with (store, result dir or results.npy)",
+    )
+    p_query.add_argument(
+        "--entry",
+        type=int,
+        default=None,
+        help="Query with an indexed row instead of a path",
+    )
+    p_query.add_argument("--sample", type=int, default=0)
+    p_query.add_argument(
+        "--segment",
+        type=int,
+        default=None,
+        help="Segment of the sample (default: whole clip)",
+    )
+    p_query.add_argument("-k", type=int, default=10)
+    p_query.add_argument(
+        "--nprobe",
+        type=int,
+        default=None,
+        help="Approximate search over this many IVF lists",
+    )
+
+    p_dupes = sub.add_parser("dupes", help="List near-duplicate pairs")
+    p_dupes.add_argument("index", help="Index directory")
+    p_dupes.add_argument(
+        "--threshold", type=float, default=0.02, help="RMS distance in meters"
+    )
+
+    p_info = sub.add_parser("info", help="Summarize an index")
+    p_info.add_argument("index", help="Index directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = build_index(
+            args.paths,
+            args.out,
+            unit=args.unit,
+            frames=args.frames,
+            workers=args.workers,
+            ivf=args.ivf,
+            pca_dim=args.pca_dim,
+            nlist=args.nlist,
+        )
+        print(f"{index} built in {time.perf_counter() - start:.1f}s")
+        return
+
+    index = MotionIndex(args.index)
+    if args.command == "info":
+        print(index)
+        print(
+            f"Sources: {len(index.meta['sources'])}, descriptor frames: {index.frames}"
+        )
+    elif args.command == "query":
+        if args.entry is not None:
+            query = np.asarray(index.descriptors[args.entry])
+            print(f"Query: {index.format_entry(args.entry)}")
+        elif args.path:
+            store = open_motion_store(args.path)
+            lengths = store.segment_lengths(args.sample)
+            bounds = np.concatenate([[0], np.cumsum(lengths)]).tolist()
+            start, stop = (
+                (bounds[args.segment], bounds[args.segment + 1])
+                if args.segment is not None
+                else (0, bounds[-1])
+            )
+            query = index.describe(store.sample(args.sample)[start:stop])
+            print(
+                f"Query: {store.store_dir.parent} sample {args.sample} [{start}:{stop}]"
+            )
+        else:
+            parser.error("query needs a path or --entry")
+        t0 = time.perf_counter()
+        dist, ids = index.search(query, k=args.k, nprobe=args.nprobe)
+        ms = (time.perf_counter() - t0) * 1000
+        for d, i in zip(dist[0], ids[0], strict=True):
+            if i >= 0:
+                print(f"  {d * 100:7.2f} cm  #{i}  {index.format_entry(int(i))}")
+        print(f"Searched {index.count} rows in {ms:.2f} ms")
+    else:
+        pairs = 0
+        for i, j, d in index.near_duplicates(args.threshold):
+            pairs += 1
+            print(
+                f"{d * 100:6.2f} cm  #{i} {index.format_entry(i)}\n          #{j} {index.format_entry(j)}"
+            )
+        print(f"{pairs} pair(s) within {args.threshold * 100:g} cm")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
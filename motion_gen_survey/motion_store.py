@@ -0,0 +1,459 @@
+"""Memory-mapped, pickle-free storage for FlowMDM motion results.
+
+FlowMDM writes ``results.npy`` as a pickled dict whose ``motion`` entry has
+shape ``(batch, 22, 3, seq_len)``. Loading it with ``allow_pickle=True``
+unpickles every sample before a single frame can be shown. This module
+converts that file once into a *motion store* directory:
+
+- ``joints.f32``: raw little-endian float32 array of shape
+  ``(batch, frames, joints, 3)``. Every sample is a frame-contiguous
+  ``(frames, joints, 3)`` slab, so one frame is a single 264-byte read.
+- ``meta.json``: shape, fps, ``text``, ``lengths`` and the remaining scalar
+  fields of the original dict, plus the source file signature used to detect
+  stale stores and a content hash of the joint array. Stores written by
+  :mod:`motion_gen_survey.retarget` also record their ``joint_set`` and the
+  ``synthesized_joints`` that were estimated rather than generated.
+
+Opening a store only parses the JSON sidecar and maps the array with
+``np.memmap``, so cost and RSS are independent of the sequence length.
+
+Usage:
+    python -m motion_gen_survey.motion_store convert model_zoo/FlowMDM/results
+    python -m motion_gen_survey.motion_store info <result_dir>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.t2m import NUM_JOINTS
+
+
+FORMAT_VERSION = 1
+RESULTS_FILENAME = "results.npy"
+STORE_DIRNAME = "motion_store"
+JOINTS_FILENAME = "joints.f32"
+META_FILENAME = "meta.json"
+# Written by scripts/sweep_generate.py; lists result directories of a sweep
+MANIFEST_FILENAME = "manifest.json"
+STORE_DTYPE = "<f4"
+
+# Frame rates of the FlowMDM training datasets (``datasets_fps`` upstream)
+DATASET_FPS: dict[str, float] = {"babel": 30.0, "humanml": 20.0}
+DEFAULT_FPS = 30.0
+
+
+def infer_dataset(path: str | os.PathLike[str]) -> str | None:
+    """Return the FlowMDM dataset name (``babel``/``humanml``) found in ``path``.
+
+    FlowMDM stores results under ``results/<dataset>/...``.
+    """
+    parts = [p.lower() for p in pathlib.Path(path).parts]
+    for dataset in DATASET_FPS:
+        if dataset in parts:
+            return dataset
+    return None
+
+
+def infer_fps(path: str | os.PathLike[str]) -> float:
+    """Guess the frame rate of a result from the dataset name in its path.
+
+    Anything that does not mention a known dataset falls back to
+    ``DEFAULT_FPS``.
+    """
+    dataset = infer_dataset(path)
+    return DATASET_FPS[dataset] if dataset is not None else DEFAULT_FPS
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert numpy containers/scalars found in ``results.npy`` to JSON types."""
+    if isinstance(value, np.ndarray):
+        return _to_jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    return value
+
+
+def _source_signature(path: pathlib.Path) -> dict[str, Any]:
+    st = path.stat()
+    return {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def default_store_dir(results_file: str | os.PathLike[str]) -> pathlib.Path:
+    """Return the store directory used for ``results_file`` by default."""
+    return pathlib.Path(results_file).parent / STORE_DIRNAME
+
+
+def convert_results_npy(
+    results_file: str | os.PathLike[str],
+    store_dir: str | os.PathLike[str] | None = None,
+    fps: float | None = None,
+) -> pathlib.Path:
+    """Convert a FlowMDM ``results.npy`` into a motion store.
+
+    This is the only place that still needs ``allow_pickle=True``. The joint
+    array is written sample by sample into a memory-mapped output and the
+    store is published with :func:`publish_store`, so a partially written
+    store is never picked up.
+
+    Parameters
+    ----------
+    results_file : path-like
+        Path to the pickled ``results.npy`` dict.
+    store_dir : path-like, optional
+        Output directory. Defaults to ``<result_dir>/motion_store``.
+    fps : float, optional
+        Frame rate to record. Inferred from the path when omitted.
+
+    Returns
+    -------
+    pathlib.Path
+        The store directory.
+    """
+    results_file = pathlib.Path(results_file)
+    store_dir = (
+        pathlib.Path(store_dir)
+        if store_dir is not None
+        else default_store_dir(results_file)
+    )
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    result = np.load(results_file, allow_pickle=True).item()
+    motion = np.asarray(result["motion"])
+    if motion.ndim != 4 or motion.shape[2] != 3:
+        raise ValueError(
+            f"Expected motion of shape (batch, joints, 3, seq_len), got {motion.shape}"
+        )
+    batch, num_joints, _, num_frames = motion.shape
+
+    tmp_joints = (store_dir / JOINTS_FILENAME).with_suffix(".tmp")
+    hasher = hashlib.sha1()
+    out = np.memmap(
+        tmp_joints,
+        dtype=STORE_DTYPE,
+        mode="w+",
+        shape=(batch, num_frames, num_joints, 3),
+    )
+    for b in range(batch):
+        # (22, 3, seq_len) -> (seq_len, 22, 3)
+        out[b] = motion[b].transpose(2, 0, 1)
+        hasher.update(out[b])
+    out.flush()
+    del out
+
+    extra = {
+        k: _to_jsonable(v)
+        for k, v in result.items()
+        if k not in ("motion", "text", "lengths")
+    }
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "dtype": STORE_DTYPE,
+        "shape": [batch, num_frames, num_joints, 3],
+        "fps": float(fps) if fps is not None else infer_fps(results_file),
+        "text": _to_jsonable(result.get("text", [])),
+        "lengths": _to_jsonable(result.get("lengths", [])),
+        "extra": extra,
+        "content_hash": hasher.hexdigest(),
+        "source": _source_signature(results_file),
+    }
+    publish_store(store_dir, tmp_joints, meta)
+    return store_dir
+
+
+def publish_store(
+    store_dir: pathlib.Path, tmp_joints: pathlib.Path, meta: dict[str, Any]
+) -> None:
+    """Move a fully written joint array into ``store_dir`` together with its sidecar.
+
+    Both files are staged under temporary names first. The old sidecar is
+    removed before the joint array is swapped, and the new one is moved in
+    last, so a reader never pairs ``meta.json`` with the wrong joints: an
+    interrupted update leaves a store without a sidecar, which is rebuilt.
+    """
+    meta_path = store_dir / META_FILENAME
+    tmp_meta = meta_path.with_name(META_FILENAME + ".tmp")
+    tmp_meta.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    meta_path.unlink(missing_ok=True)
+    os.replace(tmp_joints, store_dir / JOINTS_FILENAME)
+    os.replace(tmp_meta, meta_path)
+
+
+class MotionStore:
+    """Read-only view of a converted motion store.
+
+    Parameters
+    ----------
+    store_dir : path-like
+        Directory containing ``joints.f32`` and ``meta.json``.
+
+    Attributes
+    ----------
+    store_dir : pathlib.Path
+        Location of the store.
+    meta : dict
+        Parsed sidecar.
+    joints : np.memmap
+        Read-only array of shape ``(batch, frames, joints, 3)``.
+    """
+
+    def __init__(self, store_dir: str | os.PathLike[str]) -> None:
+        self.store_dir = pathlib.Path(store_dir)
+        with open(self.store_dir / META_FILENAME, encoding="utf-8") as f:
+            self.meta: dict[str, Any] = json.load(f)
+        if self.meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported motion store version {self.meta.get('format_version')} in {self.store_dir}"
+            )
+        self.joints: np.memmap = np.memmap(
+            self.store_dir / JOINTS_FILENAME,
+            dtype=self.meta["dtype"],
+            mode="r",
+            shape=tuple(self.meta["shape"]),
+        )
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.joints.shape[0])
+
+    @property
+    def num_frames(self) -> int:
+        return int(self.joints.shape[1])
+
+    @property
+    def num_joints(self) -> int:
+        return int(self.joints.shape[2])
+
+    @property
+    def fps(self) -> float:
+        return float(self.meta["fps"])
+
+    @property
+    def text(self) -> list[Any]:
+        return list(self.meta.get("text", []))
+
+    @property
+    def lengths(self) -> list[Any]:
+        return list(self.meta.get("lengths", []))
+
+    @property
+    def content_hash(self) -> str:
+        return str(self.meta["content_hash"])
+
+    @property
+    def joint_set(self) -> str:
+        """``t2m`` for FlowMDM results; ``smpl``/``smplx`` for retargeted stores."""
+        return str(self.meta.get("joint_set") or "t2m")
+
+    @property
+    def synthesized_joints(self) -> list[str]:
+        """Names of joints regressed from other joints (no generated data behind them)."""
+        return list(self.meta.get("synthesized_joints", []))
+
+    def sample(self, index: int) -> np.ndarray:
+        """Return the ``(frames, joints, 3)`` slab of one sample (no copy)."""
+        return self.joints[index]
+
+    def segment_lengths(self, index: int = 0) -> list[int]:
+        """Return the per-segment frame counts of sample ``index``.
+
+        FlowMDM compositions store one length per instruction, shared by all
+        samples, while plain sampling stores one length per sample. Lengths
+        that do not add up to the frame count are treated as a single
+        segment covering the whole sample.
+        """
+        lengths = self.lengths
+        if lengths and isinstance(lengths[0], list):
+            segs = [int(v) for v in lengths[index]]
+        elif sum(int(v) for v in lengths) == self.num_frames:
+            segs = [int(v) for v in lengths]
+        elif len(lengths) == self.num_samples:
+            segs = [int(lengths[index])]
+        else:
+            segs = []
+        if not segs or sum(segs) > self.num_frames:
+            return [self.num_frames]
+        return segs
+
+    def __repr__(self) -> str:
+        return f"MotionStore({str(self.store_dir)!r}, shape={tuple(self.joints.shape)}, fps={self.fps})"
+
+
+def require_t2m(store: MotionStore, consumer: str) -> None:
+    """Raise ``ValueError`` unless ``store`` holds the 22 generated T2M joints.
+
+    Tools built on the T2M skeleton call this instead of misreading the
+    joint axis of a retargeted SMPL / SMPL-X store.
+    """
+    if (
+        store.joint_set != "t2m"
+        or store.num_joints != NUM_JOINTS
+        or store.synthesized_joints
+    ):
+        raise ValueError(
+            f"{consumer} needs the {NUM_JOINTS} T2M joints, but {store.store_dir} holds the "
+            f"{store.joint_set} joint set ({store.num_joints} joints, "
+            f"{len(store.synthesized_joints)} synthesized); convert it with 'retarget --joints t2m'"
+        )
+
+
+def _resolve_paths(
+    path: str | os.PathLike[str],
+) -> tuple[pathlib.Path | None, pathlib.Path]:
+    """Map a results file, result directory or store directory to (source, store)."""
+    path = pathlib.Path(path)
+    if (path / META_FILENAME).exists():
+        results_file = path.parent / RESULTS_FILENAME
+        return (results_file if results_file.exists() else None), path
+    if path.is_dir():
+        results_file = path / RESULTS_FILENAME
+        return (results_file if results_file.exists() else None), path / STORE_DIRNAME
+    return path, default_store_dir(path)
+
+
+def is_store_current(
+    store_dir: pathlib.Path, results_file: pathlib.Path | None
+) -> bool:
+    """Return True if ``store_dir`` exists and matches ``results_file``."""
+    meta_path = store_dir / META_FILENAME
+    if not meta_path.exists():
+        return False
+    if results_file is None:
+        return True
+    with open(meta_path, encoding="utf-8") as f:
+        source = json.load(f).get("source", {})
+    st = results_file.stat()
+    return source.get("size") == st.st_size and source.get("mtime_ns") == st.st_mtime_ns
+
+
+def open_motion_store(
+    path: str | os.PathLike[str], fps: float | None = None
+) -> MotionStore:
+    """Open the motion store for ``path``, converting ``results.npy`` if needed.
+
+    ``path`` may be a ``results.npy`` file, the result directory holding it,
+    or a store directory. The conversion only runs when the store is missing
+    or older than its source.
+    """
+    results_file, store_dir = _resolve_paths(path)
+    if not is_store_current(store_dir, results_file):
+        if results_file is None or not results_file.exists():
+            raise FileNotFoundError(
+                f"No motion store or {RESULTS_FILENAME} found at {path}"
+            )
+        convert_results_npy(results_file, store_dir, fps=fps)
+    return MotionStore(store_dir)
+
+
+def iter_results_files(root: str | os.PathLike[str]) -> Iterator[pathlib.Path]:
+    """Yield every ``results.npy`` below ``root`` (or ``root`` itself if a file)."""
+    root = pathlib.Path(root)
+    if root.is_file():
+        yield root
+    else:
+        yield from sorted(root.rglob(RESULTS_FILENAME))
+
+
+def iter_result_dirs(root: str | os.PathLike[str]) -> Iterator[pathlib.Path]:
+    """Yield every result directory below ``root`` that has a results file or store.
+
+    A directory qualifies if it contains ``results.npy`` or a converted
+    ``motion_store/``; ``root`` itself may be a file, a result directory or a
+    store directory. A sweep ``manifest.json`` yields the result directories
+    of its finished runs.
+    """
+    root = pathlib.Path(root)
+    if root.is_file() and root.name == MANIFEST_FILENAME:
+        yield from iter_manifest_result_dirs(root)
+        return
+    if root.is_file():
+        yield root.parent
+        return
+    if (root / META_FILENAME).exists():
+        yield root.parent
+        return
+    seen: set[pathlib.Path] = set()
+    for pattern in (RESULTS_FILENAME, f"{STORE_DIRNAME}/{META_FILENAME}"):
+        for hit in root.rglob(pattern):
+            seen.add(hit.parent if hit.name == RESULTS_FILENAME else hit.parent.parent)
+    yield from sorted(seen)
+
+
+def iter_manifest_result_dirs(
+    manifest: str | os.PathLike[str],
+) -> Iterator[pathlib.Path]:
+    """Yield the result directories of the finished runs listed in a sweep manifest."""
+    manifest = pathlib.Path(manifest)
+    with open(manifest, encoding="utf-8") as f:
+        runs = json.load(f).get("runs", [])
+    for run in runs:
+        result_dir = manifest.parent / run["result_dir"]
+        if run.get("status") == "done" and (
+            (result_dir / RESULTS_FILENAME).exists()
+            or (result_dir / STORE_DIRNAME / META_FILENAME).exists()
+        ):
+            yield result_dir
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert FlowMDM results.npy files into memory-mapped motion stores"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_conv = sub.add_parser(
+        "convert", help="Convert results.npy files (or whole result trees)"
+    )
+    p_conv.add_argument(
+        "paths",
+        nargs="+",
+        help="results.npy files or directories to search recursively",
+    )
+    p_conv.add_argument(
+        "--fps",
+        type=float,
+        default=None,
+        help="Override the frame rate inferred from the path",
+    )
+    p_conv.add_argument(
+        "--force", action="store_true", help="Reconvert even if the store is up to date"
+    )
+
+    p_info = sub.add_parser("info", help="Print the metadata of a store")
+    p_info.add_argument("path", help="Store directory, result directory or results.npy")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        for root in args.paths:
+            for results_file in iter_results_files(root):
+                store_dir = default_store_dir(results_file)
+                if not args.force and is_store_current(store_dir, results_file):
+                    print(f"up to date: {store_dir}")
+                    continue
+                convert_results_npy(results_file, store_dir, fps=args.fps)
+                print(f"converted: {results_file} -> {store_dir}")
+    else:
+        store = open_motion_store(args.path)
+        print(store)
+        print(f"Text prompts: {store.text}")
+        print(f"Sequence lengths: {store.lengths}")
+        print(f"Content hash: {store.content_hash}")
+        print(
+            f"Joint set: {store.joint_set} ({len(store.synthesized_joints)} synthesized joints)"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
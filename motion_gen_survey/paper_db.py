@@ -0,0 +1,833 @@
+"""SQLite store of survey papers with full-text search and taxonomy facets.
+
+The taxonomy of ``context/design/survey-taxonomy-design.md`` becomes data:
+
+- ``papers``: one row per paper (BibTeX key, title, abstract, authors, year,
+  venue, links) plus the source file and a hash of the raw entry.
+- ``papers_fts``: FTS5 index over title, abstract and authors (external
+  content, kept in sync by triggers).
+- ``paper_facets``: ``(facet, value, paper_id)`` rows for every taxonomy
+  field in :data:`TAXONOMY` plus ``year`` and ``venue``; the primary key
+  ``(facet, value, paper_id)`` makes filters and grouped counts index-only.
+
+Sources are ``.bib`` and ``.json`` files (or directories of them). Taxonomy
+values are custom BibTeX fields or JSON keys named like the facets
+(``approach_type = {neural, hybrid}``); lists are split on ``,`` / ``;`` and
+values are slugged (``Data-driven methods`` -> ``data-driven-methods``) and
+mapped through :data:`ALIASES`. Ingestion is incremental: files whose size
+and mtime (or content hash) are unchanged are not read, and in a changed
+file only entries whose raw text hash differs are parsed and rewritten.
+Entries that disappeared from a file, and files that disappeared, are
+removed.
+
+Usage:
+    python -m motion_gen_survey papers ingest context/papers --db tmp/paper_db/papers.sqlite
+    python -m motion_gen_survey papers query "diffusion text" --facet real_time=yes --counts all
+    python -m motion_gen_survey papers table --facet approach_type=neural \\
+        --columns key year title technical_framework real_time code_available --out tmp/comparison.md
+    python -m motion_gen_survey papers check
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import re
+import sqlite3
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+SCHEMA_VERSION = 1
+DEFAULT_DB = pathlib.Path("tmp/paper_db/papers.sqlite")
+SOURCE_SUFFIXES = (".bib", ".json")
+
+# Facet -> canonical values (slugs), following the survey taxonomy design
+TAXONOMY: dict[str, tuple[str, ...]] = {
+    "approach_type": ("physics-based", "data-driven", "neural", "hybrid", "rule-based"),
+    "motion_domain": ("locomotion", "upper-body", "full-body", "facial", "hand"),
+    "application_context": (
+        "character-animation",
+        "robotics",
+        "vr-simulation",
+        "medical",
+        "sports",
+    ),
+    "technical_framework": (
+        "vae",
+        "gan",
+        "diffusion",
+        "reinforcement-learning",
+        "imitation-learning",
+        "optimization",
+        "kinematic-dynamic-modeling",
+    ),
+    "real_time": ("yes", "no", "approximate"),
+    "data_requirements": ("large-dataset", "small-dataset", "no-training-data"),
+    "controllability": ("high", "medium", "low"),
+    "output_quality": ("naturalness", "diversity", "accuracy"),
+    "evaluation_metrics": ("quantitative", "qualitative", "both"),
+    "code_available": ("yes", "no"),
+}
+# Free-form facets: indexed and counted, but not checked against a vocabulary
+OPEN_FACETS = (
+    "datasets",
+    "baselines",
+    "computational_requirements",
+    "evaluation_protocols",
+)
+# Facets taken from the bibliographic columns
+COLUMN_FACETS = ("year", "venue")
+ALL_FACETS = (*TAXONOMY, *OPEN_FACETS, *COLUMN_FACETS)
+
+# Spellings used in the design document and in the wild -> canonical slug
+ALIASES: dict[str, str] = {
+    "physics-based-simulation": "physics-based",
+    "physics": "physics-based",
+    "data-driven-methods": "data-driven",
+    "neural-deep-learning-approaches": "neural",
+    "deep-learning": "neural",
+    "learning-based": "neural",
+    "hybrid-techniques": "hybrid",
+    "rule-based-systems": "rule-based",
+    "human-locomotion": "locomotion",
+    "upper-body-movements": "upper-body",
+    "full-body-activities": "full-body",
+    "facial-animation": "facial",
+    "face": "facial",
+    "hand-and-finger-articulation": "hand",
+    "hands": "hand",
+    "games": "character-animation",
+    "film": "character-animation",
+    "robot": "robotics",
+    "vr": "vr-simulation",
+    "virtual-reality": "vr-simulation",
+    "simulation": "vr-simulation",
+    "rehabilitation": "medical",
+    "sports-analysis": "sports",
+    "variational-autoencoder": "vae",
+    "diffusion-model": "diffusion",
+    "rl": "reinforcement-learning",
+    "il": "imitation-learning",
+    "optimization-based": "optimization",
+    "kinematic": "kinematic-dynamic-modeling",
+    "dynamic": "kinematic-dynamic-modeling",
+    "approx": "approximate",
+    "true": "yes",
+    "false": "no",
+    "large": "large-dataset",
+    "small": "small-dataset",
+    "none": "no-training-data",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    entry_type TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    abstract TEXT NOT NULL DEFAULT '',
+    authors TEXT NOT NULL DEFAULT '',
+    year INTEGER,
+    venue TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    doi TEXT NOT NULL DEFAULT '',
+    code_url TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL REFERENCES sources(path) ON DELETE CASCADE,
+    entry_sha1 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_source ON papers(source);
+CREATE INDEX IF NOT EXISTS papers_year ON papers(year);
+CREATE TABLE IF NOT EXISTS paper_facets (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    paper_id INTEGER NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
+    PRIMARY KEY (facet, value, paper_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_facets_paper ON paper_facets(paper_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, authors, content='papers', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract, authors) VALUES (new.id, new.title, new.abstract, new.authors);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors)
+    VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors)
+    VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+    INSERT INTO papers_fts(rowid, title, abstract, authors) VALUES (new.id, new.title, new.abstract, new.authors);
+END;
+"""
+
+PAPER_COLUMNS = (
+    "key",
+    "entry_type",
+    "title",
+    "abstract",
+    "authors",
+    "year",
+    "venue",
+    "url",
+    "doi",
+    "code_url",
+)
+
+
+def connect(db_path: str | os.PathLike[str] = DEFAULT_DB) -> sqlite3.Connection:
+    """Open (creating if needed) the paper database."""
+    db_path = pathlib.Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        raise ValueError(
+            f"Unsupported paper database version {version} in {db_path}; re-ingest into a new file"
+        )
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+# --- Parsing ---
+def slug(value: str) -> str:
+    """Lowercase, non-alphanumerics collapsed to ``-``, then mapped through :data:`ALIASES`."""
+    s = re.sub(r"[^0-9a-z]+", "-", value.lower()).strip("-")
+    return ALIASES.get(s, s)
+
+
+def split_values(value: Any) -> list[str]:
+    """Split a list or a ``,``/``;``-separated string into stripped items."""
+    items = value if isinstance(value, list) else re.split(r"[,;]", str(value))
+    return [str(v).strip() for v in items if str(v).strip()]
+
+
+def _match_brace(text: str, start: int, open_ch: str = "{", close_ch: str = "}") -> int:
+    """Index just past the bracket closing the one at ``text[start]``."""
+    depth = 0
+    for i in range(start, len(text)):
+        ch = text[i]
+        if ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    raise ValueError(f"unbalanced {open_ch}{close_ch} starting at offset {start}")
+
+
+_ENTRY_START = re.compile(r"@\s*(\w+)\s*([{(])")
+_FIELD_NAME = re.compile(r"\s*([\w.:-]+)\s*=\s*")
+
+
+def split_bibtex(text: str) -> Iterator[tuple[str, str, str]]:
+    """Yield ``(entry_type, key, raw_body)`` for each entry, without parsing fields.
+
+    ``@comment``, ``@preamble`` and ``@string`` blocks are skipped.
+    """
+    pos = 0
+    while (m := _ENTRY_START.search(text, pos)) is not None:
+        entry_type = m.group(1).lower()
+        open_ch = m.group(2)
+        end = _match_brace(text, m.end() - 1, open_ch, "}" if open_ch == "{" else ")")
+        pos = end
+        if entry_type in ("comment", "preamble", "string"):
+            continue
+        body = text[m.end() : end - 1]
+        key, _, fields = body.partition(",")
+        yield entry_type, key.strip(), fields
+
+
+def _clean(value: str) -> str:
+    return re.sub(r"\s+", " ", value.replace("{", "").replace("}", "")).strip()
+
+
+def parse_bibtex_fields(body: str) -> dict[str, str]:
+    """Parse ``name = {value}`` / ``"value"`` / ``bare`` fields (``#`` concatenation supported)."""
+    fields: dict[str, str] = {}
+    pos = 0
+    while (m := _FIELD_NAME.match(body, pos)) is not None:
+        name = m.group(1).lower()
+        pos = m.end()
+        parts: list[str] = []
+        while True:
+            while pos < len(body) and body[pos].isspace():
+                pos += 1
+            if pos >= len(body):
+                break
+            ch = body[pos]
+            if ch == "{":
+                end = _match_brace(body, pos)
+                parts.append(body[pos + 1 : end - 1])
+            elif ch == '"':
+                end = pos + 1
+                depth = 0
+                while end < len(body) and not (
+                    body[end] == '"' and depth == 0 and body[end - 1] != "\\"
+                ):
+                    depth += {"{": 1, "}": -1}.get(body[end], 0)
+                    end += 1
+                parts.append(body[pos + 1 : end])
+                end += 1
+            else:
+                bare = re.match(r"[^,#\s]+", body[pos:])
+                end = pos + (bare.end() if bare else 0)
+                parts.append(body[pos:end])
+            pos = end
+            while pos < len(body) and body[pos].isspace():
+                pos += 1
+            if pos < len(body) and body[pos] == "#":
+                pos += 1
+                continue
+            break
+        fields[name] = _clean("".join(parts))
+        if pos < len(body) and body[pos] == ",":
+            pos += 1
+    return fields
+
+
+@dataclass
+class PaperRecord:
+    """A normalized paper ready to be written."""
+
+    columns: dict[str, Any]
+    facets: list[tuple[str, str]]
+
+
+def normalize_record(key: str, entry_type: str, fields: dict[str, Any]) -> PaperRecord:
+    """Map BibTeX fields or JSON keys onto paper columns and facet rows."""
+
+    def first(*names: str) -> Any:
+        for name in names:
+            value = fields.get(name)
+            if value not in (None, "", []):
+                return value
+        return ""
+
+    authors = first("authors", "author")
+    if isinstance(authors, list):
+        authors = "; ".join(str(a) for a in authors)
+    else:
+        authors = "; ".join(a.strip() for a in str(authors).split(" and ") if a.strip())
+    year_text = str(first("year"))
+    year = int(m.group()) if (m := re.search(r"\d{4}", year_text)) else None
+    columns = {
+        "key": key,
+        "entry_type": entry_type,
+        "title": _clean(str(first("title"))),
+        "abstract": _clean(str(first("abstract"))),
+        "authors": authors,
+        "year": year,
+        "venue": _clean(str(first("venue", "booktitle", "journal"))),
+        "url": str(first("url")),
+        "doi": str(first("doi")),
+        "code_url": str(first("code_url", "code", "github")),
+    }
+    facets: set[tuple[str, str]] = set()
+    for facet in (*TAXONOMY, *OPEN_FACETS):
+        raw = first(facet, facet.replace("_", "-"))
+        if raw == "":
+            continue
+        for item in split_values(raw):
+            facets.add((facet, slug(item) if facet in TAXONOMY else item))
+    if columns["code_url"] and not any(f == "code_available" for f, _ in facets):
+        facets.add(("code_available", "yes"))
+    if year is not None:
+        facets.add(("year", str(year)))
+    if columns["venue"]:
+        facets.add(("venue", str(columns["venue"])))
+    return PaperRecord(columns, sorted(facets))
+
+
+def _entry_hash(raw: str) -> str:
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def iter_source_entries(
+    path: pathlib.Path, text: str
+) -> Iterator[tuple[str, str, Any]]:
+    """Yield ``(key, entry_sha1, payload)`` per entry; the payload is parsed only on demand.
+
+    For BibTeX the payload is ``(entry_type, raw_fields)``; for JSON it is
+    the entry dict.
+    """
+    if path.suffix == ".bib":
+        for entry_type, key, body in split_bibtex(text):
+            yield key, _entry_hash(f"{entry_type}\0{key}\0{body}"), (entry_type, body)
+        return
+    data = json.loads(text)
+    entries = data.get("papers", []) if isinstance(data, dict) else data
+    for entry in entries:
+        key = str(
+            entry.get("key")
+            or entry.get("id")
+            or slug(f"{entry.get('title', '')}-{entry.get('year', '')}")
+        )
+        yield key, _entry_hash(json.dumps(entry, sort_keys=True)), entry
+
+
+def parse_entry(path: pathlib.Path, key: str, payload: Any) -> PaperRecord:
+    if path.suffix == ".bib":
+        entry_type, body = payload
+        return normalize_record(key, entry_type, parse_bibtex_fields(body))
+    fields = {str(k).lower(): v for k, v in payload.items()}
+    return normalize_record(
+        key, str(fields.get("type", fields.get("entry_type", ""))), fields
+    )
+
+
+def iter_source_files(
+    paths: Iterable[str | os.PathLike[str]],
+) -> Iterator[pathlib.Path]:
+    for path in map(pathlib.Path, paths):
+        if path.is_dir():
+            yield from sorted(
+                p
+                for p in path.rglob("*")
+                if p.suffix in SOURCE_SUFFIXES and p.is_file()
+            )
+        elif path.suffix in SOURCE_SUFFIXES:
+            yield path
+
+
+# --- Ingestion ---
+@dataclass
+class IngestStats:
+    files: int = 0
+    files_skipped: int = 0
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} file(s) ({self.files_skipped} unchanged), {self.added} added, "
+            f"{self.updated} updated, {self.unchanged} unchanged, {self.removed} removed"
+        )
+
+
+def _write_paper(
+    conn: sqlite3.Connection, record: PaperRecord, source: str, entry_sha1: str
+) -> None:
+    cols = {**record.columns, "source": source, "entry_sha1": entry_sha1}
+    names = ", ".join(cols)
+    updates = ", ".join(f"{n} = excluded.{n}" for n in cols if n != "key")
+    conn.execute(
+        f"INSERT INTO papers ({names}) VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT(key) DO UPDATE SET {updates}",
+        list(cols.values()),
+    )
+    paper_id = conn.execute(
+        "SELECT id FROM papers WHERE key = ?", (record.columns["key"],)
+    ).fetchone()[0]
+    conn.execute("DELETE FROM paper_facets WHERE paper_id = ?", (paper_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO paper_facets (facet, value, paper_id) VALUES (?, ?, ?)",
+        [(facet, value, paper_id) for facet, value in record.facets],
+    )
+
+
+def ingest(
+    conn: sqlite3.Connection,
+    paths: Iterable[str | os.PathLike[str]],
+    force: bool = False,
+) -> IngestStats:
+    """Bring the database in line with the given source files (see module docstring)."""
+    stats = IngestStats()
+    with conn:
+        for path in iter_source_files(paths):
+            stats.files += 1
+            source = str(path.resolve())
+            st = path.stat()
+            known = conn.execute(
+                "SELECT mtime_ns, size, sha1 FROM sources WHERE path = ?", (source,)
+            ).fetchone()
+            if (
+                not force
+                and known
+                and known["mtime_ns"] == st.st_mtime_ns
+                and known["size"] == st.st_size
+            ):
+                stats.files_skipped += 1
+                continue
+            text = path.read_text(encoding="utf-8")
+            file_sha1 = _entry_hash(text)
+            conn.execute(
+                "INSERT INTO sources (path, mtime_ns, size, sha1) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size, "
+                "sha1 = excluded.sha1",
+                (source, st.st_mtime_ns, st.st_size, file_sha1),
+            )
+            if not force and known and known["sha1"] == file_sha1:
+                stats.files_skipped += 1  # touched, not changed
+                continue
+            existing = {
+                row["key"]: row["entry_sha1"]
+                for row in conn.execute(
+                    "SELECT key, entry_sha1 FROM papers WHERE source = ?", (source,)
+                )
+            }
+            seen: set[str] = set()
+            for key, entry_sha1, payload in iter_source_entries(path, text):
+                seen.add(key)
+                if not force and existing.get(key) == entry_sha1:
+                    stats.unchanged += 1
+                    continue
+                _write_paper(conn, parse_entry(path, key, payload), source, entry_sha1)
+                if key in existing:
+                    stats.updated += 1
+                else:
+                    stats.added += 1
+            gone = [k for k in existing if k not in seen]
+            conn.executemany(
+                "DELETE FROM papers WHERE key = ? AND source = ?",
+                [(k, source) for k in gone],
+            )
+            stats.removed += len(gone)
+        # Sources that no longer exist take their papers with them (ON DELETE CASCADE)
+        for row in conn.execute("SELECT path FROM sources").fetchall():
+            if not pathlib.Path(row["path"]).exists():
+                stats.removed += conn.execute(
+                    "SELECT COUNT(*) FROM papers WHERE source = ?", (row["path"],)
+                ).fetchone()[0]
+                conn.execute("DELETE FROM sources WHERE path = ?", (row["path"],))
+    return stats
+
+
+# --- Queries ---
+def parse_facet_filters(items: Sequence[str]) -> dict[str, list[str]]:
+    """``["facet=a,b", "facet2=c"]`` -> ``{"facet": ["a", "b"], "facet2": ["c"]}``."""
+    filters: dict[str, list[str]] = {}
+    for item in items:
+        facet, sep, values = item.partition("=")
+        facet = facet.strip().replace("-", "_")
+        if not sep or facet not in ALL_FACETS:
+            raise ValueError(
+                f"bad facet filter {item!r}; expected facet=value with facet in {', '.join(ALL_FACETS)}"
+            )
+        filters.setdefault(facet, []).extend(
+            slug(v) if facet in TAXONOMY else v for v in split_values(values)
+        )
+    return filters
+
+
+def _where(
+    text: str | None,
+    facets: dict[str, list[str]],
+    year_from: int | None,
+    year_to: int | None,
+) -> tuple[str, list[Any]]:
+    """SQL condition on ``papers.id`` (values OR'd within a facet, facets AND'd)."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if text:
+        clauses.append("id IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+        params.append(text)
+    for facet, values in facets.items():
+        clauses.append(
+            f"id IN (SELECT paper_id FROM paper_facets WHERE facet = ? "
+            f"AND value IN ({', '.join('?' * len(values))}))"
+        )
+        params += [facet, *values]
+    if year_from is not None:
+        clauses.append("year >= ?")
+        params.append(year_from)
+    if year_to is not None:
+        clauses.append("year <= ?")
+        params.append(year_to)
+    return (" AND ".join(clauses) or "1"), params
+
+
+def search(
+    conn: sqlite3.Connection,
+    text: str | None = None,
+    facets: dict[str, list[str]] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    limit: int | None = 20,
+) -> list[sqlite3.Row]:
+    """Matching papers, best full-text rank first (newest first without text)."""
+    # With text the FTS table is joined directly, so the condition leaves it out
+    where, params = _where(None if text else text, facets or {}, year_from, year_to)
+    if text:
+        sql = (
+            f"SELECT papers.*, bm25(papers_fts, 10.0, 1.0, 2.0) AS rank FROM papers_fts "
+            f"JOIN papers ON papers.id = papers_fts.rowid WHERE papers_fts MATCH ? AND {where} ORDER BY rank"
+        )
+        params = [text, *params]
+    else:
+        sql = f"SELECT * FROM papers WHERE {where} ORDER BY year DESC, key"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return conn.execute(sql, params).fetchall()
+
+
+def count_matches(
+    conn: sqlite3.Connection,
+    text: str | None = None,
+    facets: dict[str, list[str]] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+) -> int:
+    where, params = _where(text, facets or {}, year_from, year_to)
+    return int(
+        conn.execute(f"SELECT COUNT(*) FROM papers WHERE {where}", params).fetchone()[0]
+    )
+
+
+def facet_counts(
+    conn: sqlite3.Connection,
+    facet_names: Sequence[str],
+    text: str | None = None,
+    facets: dict[str, list[str]] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+) -> dict[str, list[tuple[str, int]]]:
+    """Per-facet value counts over the matching papers, most frequent first."""
+    where, params = _where(text, facets or {}, year_from, year_to)
+    placeholders = ", ".join("?" * len(facet_names))
+    rows = conn.execute(
+        f"SELECT facet, value, COUNT(*) AS n FROM paper_facets "
+        f"WHERE facet IN ({placeholders}) AND paper_id IN (SELECT id FROM papers WHERE {where}) "
+        f"GROUP BY facet, value ORDER BY facet, n DESC, value",
+        [*facet_names, *params],
+    ).fetchall()
+    counts: dict[str, list[tuple[str, int]]] = {name: [] for name in facet_names}
+    for row in rows:
+        counts[row["facet"]].append((row["value"], row["n"]))
+    return counts
+
+
+def paper_facets(
+    conn: sqlite3.Connection, paper_ids: Sequence[int]
+) -> dict[int, dict[str, list[str]]]:
+    """Facet values of the given papers, in one query."""
+    out: dict[int, dict[str, list[str]]] = {pid: {} for pid in paper_ids}
+    for start in range(0, len(paper_ids), 500):
+        chunk = list(paper_ids[start : start + 500])
+        for row in conn.execute(
+            f"SELECT paper_id, facet, value FROM paper_facets "
+            f"WHERE paper_id IN ({', '.join('?' * len(chunk))}) ORDER BY facet, value",
+            chunk,
+        ):
+            out[row["paper_id"]].setdefault(row["facet"], []).append(row["value"])
+    return out
+
+
+def comparison_table(
+    conn: sqlite3.Connection, papers: Sequence[sqlite3.Row], columns: Sequence[str]
+) -> str:
+    """Markdown table of ``papers`` with paper columns and/or facets as columns."""
+    facets = paper_facets(conn, [p["id"] for p in papers])
+    header = "| " + " | ".join(columns) + " |"
+    lines = [header, "|" + "|".join(" --- " for _ in columns) + "|"]
+    for paper in papers:
+        cells = []
+        for col in columns:
+            if col in PAPER_COLUMNS:
+                value = paper[col]
+                cells.append("" if value is None else str(value))
+            else:
+                cells.append(", ".join(facets[paper["id"]].get(col, [])))
+        lines.append("| " + " | ".join(c.replace("|", "\\|") for c in cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def check(conn: sqlite3.Connection) -> list[str]:
+    """Consistency problems: off-vocabulary taxonomy values and papers missing core fields."""
+    problems: list[str] = []
+    for facet, allowed in TAXONOMY.items():
+        for row in conn.execute(
+            f"SELECT f.value, p.key FROM paper_facets f JOIN papers p ON p.id = f.paper_id "
+            f"WHERE f.facet = ? AND f.value NOT IN ({', '.join('?' * len(allowed))}) ORDER BY p.key",
+            (facet, *allowed),
+        ):
+            problems.append(
+                f"{row['key']}: {facet}={row['value']!r} is not in the taxonomy"
+            )
+    for row in conn.execute(
+        "SELECT key, title, year FROM papers WHERE title = '' OR year IS NULL ORDER BY key"
+    ):
+        missing = [name for name in ("title", "year") if row[name] in ("", None)]
+        problems.append(f"{row['key']}: missing {', '.join(missing)}")
+    for row in conn.execute(
+        "SELECT key FROM papers WHERE id NOT IN (SELECT paper_id FROM paper_facets WHERE facet = 'approach_type') "
+        "ORDER BY key"
+    ):
+        problems.append(f"{row['key']}: not categorized (no approach_type)")
+    return problems
+
+
+# --- CLI ---
+def _add_filters(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "text",
+        nargs="?",
+        default=None,
+        help="FTS5 query over title, abstract and authors",
+    )
+    p.add_argument(
+        "--facet",
+        action="append",
+        default=[],
+        metavar="FACET=V1,V2",
+        help="Facet filter (repeatable; values OR'd, facets AND'd)",
+    )
+    p.add_argument("--year-from", type=int, default=None)
+    p.add_argument("--year-to", type=int, default=None)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Survey paper database: ingest, query, tables, checks"
+    )
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="SQLite database file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser(
+        "ingest", help="Incrementally ingest .bib / .json files or directories"
+    )
+    p_ingest.add_argument("paths", nargs="+")
+    p_ingest.add_argument("--force", action="store_true", help="Re-parse every entry")
+
+    p_query = sub.add_parser("query", help="Full-text / faceted search with counts")
+    _add_filters(p_query)
+    p_query.add_argument(
+        "--counts",
+        nargs="*",
+        default=None,
+        metavar="FACET",
+        help="Print value counts for these facets ('all' or no value: every facet)",
+    )
+    p_query.add_argument("--limit", type=int, default=20)
+    p_query.add_argument(
+        "--json", action="store_true", help="Print JSON instead of text"
+    )
+
+    p_table = sub.add_parser(
+        "table", help="Markdown comparison table of the matching papers"
+    )
+    _add_filters(p_table)
+    p_table.add_argument(
+        "--columns",
+        nargs="+",
+        default=[
+            "key",
+            "year",
+            "title",
+            "approach_type",
+            "technical_framework",
+            "real_time",
+            "code_available",
+        ],
+    )
+    p_table.add_argument(
+        "--out", default=None, help="Write the table here instead of stdout"
+    )
+
+    sub.add_parser("check", help="Report off-taxonomy values and incomplete entries")
+    sub.add_parser("info", help="Paper, source and facet totals")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    start = time.perf_counter()
+    if args.command == "ingest":
+        print(f"Ingested: {ingest(conn, args.paths, force=args.force)}")
+    elif args.command in ("query", "table"):
+        try:
+            filters = parse_facet_filters(args.facet)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.command == "table":
+            unknown = [
+                c
+                for c in args.columns
+                if c not in PAPER_COLUMNS and c not in ALL_FACETS
+            ]
+            if unknown:
+                parser.error(f"unknown column(s): {', '.join(unknown)}")
+            papers = search(
+                conn, args.text, filters, args.year_from, args.year_to, limit=None
+            )
+            table = comparison_table(conn, papers, args.columns)
+            if args.out:
+                out = pathlib.Path(args.out)
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_text(table, encoding="utf-8")
+                print(f"Wrote {len(papers)} rows to {out}")
+            else:
+                sys.stdout.write(table)
+            return
+        papers = search(
+            conn, args.text, filters, args.year_from, args.year_to, args.limit
+        )
+        names = (
+            list(ALL_FACETS)
+            if args.counts is not None and (not args.counts or args.counts == ["all"])
+            else [c.replace("-", "_") for c in args.counts or []]
+        )
+        counts = (
+            facet_counts(conn, names, args.text, filters, args.year_from, args.year_to)
+            if names
+            else {}
+        )
+        total = count_matches(conn, args.text, filters, args.year_from, args.year_to)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if args.json:
+            print(
+                json.dumps(
+                    {
+                        "total": total,
+                        "papers": [{c: p[c] for c in PAPER_COLUMNS} for p in papers],
+                        "counts": counts,
+                        "elapsed_ms": elapsed_ms,
+                    },
+                    indent=2,
+                )
+            )
+            return
+        for p in papers:
+            print(f"{p['key']:<28} {p['year'] or '':>4}  {p['title']}")
+        print(f"{total} match(es), showing {len(papers)}  ({elapsed_ms:.1f} ms)")
+        for facet, values in counts.items():
+            if values:
+                print(f"{facet}: " + ", ".join(f"{v} ({n})" for v, n in values))
+    elif args.command == "check":
+        problems = check(conn)
+        for line in problems:
+            print(line)
+        print(f"{len(problems)} problem(s)")
+        if problems:
+            sys.exit(1)
+    else:
+        papers = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        sources = conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        print(f"{args.db}: {papers} paper(s) from {sources} source file(s)")
+        for row in conn.execute(
+            "SELECT facet, COUNT(DISTINCT value) AS v, COUNT(DISTINCT paper_id) AS p "
+            "FROM paper_facets GROUP BY facet ORDER BY facet"
+        ):
+            print(f"  {row['facet']}: {row['v']} value(s) over {row['p']} paper(s)")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
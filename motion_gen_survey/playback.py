@@ -0,0 +1,216 @@
+"""Frame-rate-decoupled playback clock for the motion viewers.
+
+Stepping one source frame per GUI timer tick ties playback speed to render
+speed: when a render overruns the timer interval, playback slows down and
+drifts. :class:`PlaybackClock` instead maps a monotonic wall clock to a
+fractional source-frame position. Viewers ask it for the position on every
+tick, render whatever frame that is (skipping frames when behind), and can
+linearly interpolate between the two neighbouring source frames with
+:func:`lerp_frames`.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+
+MIN_SPEED = 0.25
+MAX_SPEED = 8.0
+SPEED_STEPS: tuple[float, ...] = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+
+class PlaybackClock:
+    """Map monotonic time to a fractional frame position.
+
+    Parameters
+    ----------
+    fps : float
+        Source frame rate (from the motion store metadata).
+    num_frames : int
+        Number of source frames.
+    speed : float
+        Playback speed multiplier, clamped to [0.25, 8].
+    loop : bool
+        Wrap around at the end instead of stopping.
+    clock : callable
+        Time source in seconds (default ``time.monotonic``).
+
+    Attributes
+    ----------
+    dropped_frames : int
+        Source frames skipped because a tick arrived late, i.e. more than one
+        source-frame interval after the previous one. Frames a fast speed
+        skips by design are not counted.
+    rendered_frames : int
+        Number of renders reported through :meth:`record_render`.
+    last_latency : float
+        Duration of the last render in seconds.
+    mean_latency : float
+        Exponential moving average of render duration in seconds.
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        num_frames: int,
+        speed: float = 1.0,
+        loop: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fps = float(fps)
+        self.num_frames = int(num_frames)
+        self.loop = loop
+        self._clock = clock
+        self.speed = min(MAX_SPEED, max(MIN_SPEED, float(speed)))
+        self.playing = False
+        self._anchor_pos = 0.0
+        self._anchor_time = clock()
+        self._last_index = 0
+        self._last_tick = self._anchor_time
+        self.dropped_frames = 0
+        self.rendered_frames = 0
+        self.last_latency = 0.0
+        self.mean_latency = 0.0
+
+    # --- state ---
+    def _now_position(self) -> float:
+        if not self.playing:
+            return self._anchor_pos
+        pos = (
+            self._anchor_pos
+            + (self._clock() - self._anchor_time) * self.fps * self.speed
+        )
+        if self.loop:
+            return pos % self.num_frames
+        return min(pos, self.num_frames - 1.0)
+
+    def _reanchor(self, position: float) -> None:
+        self._anchor_pos = float(position)
+        self._anchor_time = self._clock()
+        self._last_index = int(position)
+        self._last_tick = self._anchor_time
+
+    def play(self) -> None:
+        if not self.playing:
+            self._reanchor(self._anchor_pos)
+            self.playing = True
+
+    def pause(self) -> None:
+        if self.playing:
+            self._reanchor(self._now_position())
+            self.playing = False
+
+    def seek(self, frame: float) -> None:
+        """Jump to ``frame`` without counting skipped frames as dropped."""
+        self._reanchor(min(max(0.0, float(frame)), self.num_frames - 1.0))
+
+    def set_num_frames(self, num_frames: int) -> None:
+        """Change the frame count (a live stream grew) without a position jump."""
+        position = self._now_position()
+        self.num_frames = max(1, int(num_frames))
+        self._reanchor(min(position, self.num_frames - 1.0))
+
+    def set_speed(self, speed: float) -> float:
+        """Change speed (clamped to [0.25, 8]) without a position jump."""
+        self._reanchor(self._now_position())
+        self.speed = min(MAX_SPEED, max(MIN_SPEED, float(speed)))
+        return self.speed
+
+    def step_speed(self, direction: int) -> float:
+        """Move to the next faster (+1) or slower (-1) entry of ``SPEED_STEPS``."""
+        steps = SPEED_STEPS
+        idx = min(range(len(steps)), key=lambda i: abs(steps[i] - self.speed))
+        return self.set_speed(steps[min(len(steps) - 1, max(0, idx + direction))])
+
+    # --- per tick ---
+    def tick(self) -> float:
+        """Return the current fractional frame position and update drop counters."""
+        now = self._clock()
+        pos = self._now_position()
+        index = int(pos)
+        advanced = index - self._last_index
+        if advanced < 0 and self.loop:
+            advanced += self.num_frames
+        # An on-time tick (at most one source-frame interval later) may advance up
+        # to ``speed`` frames; only the excess of a late tick counts as dropped
+        allowed = max(
+            1, math.ceil(self.speed * min(1.0, (now - self._last_tick) * self.fps))
+        )
+        if self.playing and advanced > allowed:
+            self.dropped_frames += advanced - allowed
+        self._last_index = index
+        self._last_tick = now
+        if not self.loop and self.playing and pos >= self.num_frames - 1:
+            self.pause()
+        return pos
+
+    def record_render(self, seconds: float, smoothing: float = 0.1) -> None:
+        """Report how long the last render took."""
+        self.rendered_frames += 1
+        self.last_latency = seconds
+        if self.rendered_frames == 1:
+            self.mean_latency = seconds
+        else:
+            self.mean_latency += smoothing * (seconds - self.mean_latency)
+
+    @property
+    def frame(self) -> int:
+        """Integer source frame at the current position."""
+        return int(self._now_position())
+
+    def status(self) -> str:
+        """Short HUD string with speed, render latency and drop counter."""
+        return f"{self.speed:g}x | {self.mean_latency * 1000:.1f} ms | drop {self.dropped_frames}"
+
+
+def lerp_frames(
+    motion: np.ndarray, position: float, out: np.ndarray, loop: bool = True
+) -> int:
+    """Linearly interpolate all skeletons at a fractional frame position.
+
+    Parameters
+    ----------
+    motion : np.ndarray
+        ``(N, frames, joints, 3)`` source positions.
+    position : float
+        Fractional frame index.
+    out : np.ndarray
+        Preallocated ``(N, joints, 3)`` destination; no other buffers are
+        allocated.
+    loop : bool
+        Interpolate from the last frame back to frame 0 when wrapping.
+
+    Returns
+    -------
+    int
+        The lower source frame index.
+    """
+    i0, i1, t = frame_pair(position, motion.shape[1], loop)
+    lerp_poses(motion[:, i0], motion[:, i1] if t > 0.0 else None, t, out)
+    return i0
+
+
+def frame_pair(
+    position: float, num_frames: int, loop: bool = True
+) -> tuple[int, int, float]:
+    """Split a fractional position into ``(lower frame, upper frame, weight)``."""
+    i0 = math.floor(position)
+    i1 = i0 + 1
+    if i1 >= num_frames:
+        i1 = 0 if loop else num_frames - 1
+    t = position - i0 if i1 != i0 else 0.0
+    return i0, i1, t
+
+
+def lerp_poses(a: np.ndarray, b: np.ndarray | None, t: float, out: np.ndarray) -> None:
+    """Write ``a + t * (b - a)`` into ``out`` without temporaries (``b`` unused when ``t == 0``)."""
+    if b is None or t <= 0.0:
+        np.copyto(out, a)
+        return
+    np.subtract(b, a, out=out)
+    out *= t
+    out += a
@@ -0,0 +1,418 @@
+"""Persistent text-prompt embedding cache shared by generation runs.
+
+FlowMDM encodes every instruction string with its text encoder (CLIP) on
+each ``runners.generate`` run, although composition JSONs reuse a small
+vocabulary of prompts. This cache stores one embedding per
+``(encoder id, normalized text)`` so repeat prompts skip the encoder, and a
+run whose prompts are all cached never has to load the encoder at all.
+
+A cache directory holds one sub-directory per encoder id:
+
+- ``embeddings.f32``: ``(capacity, dim)`` float32 matrix, memory-mapped.
+  Capacity grows by doubling up to the size budget.
+- ``index.json``: encoder id, dim, ``text -> [row, last_used]`` and the free
+  rows left by evictions.
+
+When the matrix would exceed ``max_bytes``, the least recently used rows are
+evicted and reused. Writers take an exclusive ``flock`` on ``lock`` and
+re-read the index first, so concurrent sweep workers can share one cache.
+
+Texts are normalized by collapsing whitespace and lower-casing, which is
+what the CLIP tokenizer does anyway.
+
+Usage:
+    python -m motion_gen_survey.prompt_cache info tmp/prompt_cache
+    python -m motion_gen_survey.prompt_cache check tmp/prompt_cache runners/jsons/composition_babel.json
+    python -m motion_gen_survey.prompt_cache prune tmp/prompt_cache --max-mb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+CACHE_VERSION = 1
+EMBEDDINGS_FILENAME = "embeddings.f32"
+INDEX_FILENAME = "index.json"
+LOCK_FILENAME = "lock"
+DEFAULT_CACHE_DIR = pathlib.Path("tmp/prompt_cache")
+DEFAULT_MAX_BYTES = 256 << 20
+INITIAL_CAPACITY = 256
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def encoder_dirname(encoder_id: str) -> str:
+    """Filesystem-safe directory name for ``encoder_id``."""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", encoder_id).strip("_")[:48]
+    return f"{slug}-{hashlib.sha1(encoder_id.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _stamp(path: pathlib.Path) -> tuple[int, int]:
+    """Identity of the current index file.
+
+    Every write replaces the file, so the inode changes even when two writes
+    land within the (coarse) file timestamp resolution.
+    """
+    st = path.stat()
+    return st.st_ino, st.st_mtime_ns
+
+
+class PromptCache:
+    """Embedding cache of one text encoder.
+
+    Parameters
+    ----------
+    cache_dir : path-like
+        Root cache directory (shared by all encoders).
+    encoder_id : str
+        Identifies the encoder and everything that changes its output
+        (model version, context length, ...).
+    dim : int, optional
+        Embedding size; taken from the existing cache or the first
+        :meth:`put` if omitted.
+    max_bytes : int
+        Size budget of the embedding matrix.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Lookup statistics of this instance.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike[str],
+        encoder_id: str,
+        dim: int | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.encoder_id = encoder_id
+        self.dir = pathlib.Path(cache_dir) / encoder_dirname(encoder_id)
+        self.max_bytes = int(max_bytes)
+        self.dim = dim
+        self.hits = 0
+        self.misses = 0
+        self._rows: dict[str, list[int]] = {}
+        self._free: list[int] = []
+        self._clock = 0
+        self._capacity = 0
+        self._matrix: np.memmap | None = None
+        self._index_stamp: tuple[int, int] | None = None
+        self._load_index()
+
+    # -- persistence -----------------------------------------------------
+
+    def _load_index(self) -> None:
+        path = self.dir / INDEX_FILENAME
+        try:
+            stamp = _stamp(path)
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._index_stamp = stamp
+        if (
+            index.get("version") != CACHE_VERSION
+            or index.get("encoder_id") != self.encoder_id
+        ):
+            return
+        if self.dim is not None and index["dim"] != self.dim:
+            raise ValueError(
+                f"{self.dir}: cached dim {index['dim']} != requested {self.dim}"
+            )
+        self.dim = int(index["dim"])
+        self._rows = {text: list(entry) for text, entry in index["rows"].items()}
+        self._free = list(index["free"])
+        self._clock = int(index["clock"])
+        self._capacity = int(index["capacity"])
+        self._matrix = None
+
+    def _write_index(self) -> None:
+        index = {
+            "version": CACHE_VERSION,
+            "encoder_id": self.encoder_id,
+            "dim": self.dim,
+            "capacity": self._capacity,
+            "clock": self._clock,
+            "free": self._free,
+            "rows": self._rows,
+        }
+        path = self.dir / INDEX_FILENAME
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+        self._index_stamp = _stamp(path)
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.dir / LOCK_FILENAME, "a+b") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _map(self) -> np.memmap | None:
+        if self._matrix is None and self._capacity and self.dim:
+            self._matrix = np.memmap(
+                self.dir / EMBEDDINGS_FILENAME,
+                dtype="<f4",
+                mode="r+",
+                shape=(self._capacity, self.dim),
+            )
+        return self._matrix
+
+    def _grow(self, needed: int) -> None:
+        """Make room for ``needed`` more rows: free rows, then growth, then LRU eviction."""
+        assert self.dim is not None
+        row_bytes = self.dim * 4
+        max_rows = max(1, self.max_bytes // row_bytes)
+        used = len(self._rows)
+        if len(self._free) >= needed:
+            return
+        target = min(max_rows, max(INITIAL_CAPACITY, self._capacity * 2, used + needed))
+        if target > self._capacity:
+            self._matrix = None
+            with open(self.dir / EMBEDDINGS_FILENAME, "ab") as f:
+                f.truncate(target * row_bytes)
+            self._free.extend(range(self._capacity, target))
+            self._capacity = target
+        shortfall = needed - len(self._free)
+        if shortfall > 0:
+            for text, _ in sorted(self._rows.items(), key=lambda item: item[1][1])[
+                :shortfall
+            ]:
+                self._free.append(self._rows.pop(text)[0])
+
+    # -- public API ------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, text: str) -> bool:
+        return normalize_text(text) in self._rows
+
+    @property
+    def nbytes(self) -> int:
+        return self._capacity * (self.dim or 0) * 4
+
+    def get(self, texts: Sequence[str]) -> tuple[np.ndarray | None, list[int]]:
+        """Look up ``texts``.
+
+        Returns ``(embeddings, missing)``: a ``(len(texts), dim)`` array whose
+        rows for cached texts are filled (``None`` if the cache has no
+        dim yet), and the positions of the texts that were not cached.
+        """
+        keys = [normalize_text(t) for t in texts]
+        # Rows may have been evicted and reused by another process since we loaded
+        with contextlib.suppress(OSError):
+            if _stamp(self.dir / INDEX_FILENAME) != self._index_stamp:
+                self._load_index()
+        matrix = self._map()
+        if matrix is None or self.dim is None:
+            self.misses += len(keys)
+            return None, list(range(len(keys)))
+        out = np.zeros((len(keys), self.dim), dtype=np.float32)
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            entry = self._rows.get(key)
+            if entry is None or entry[0] >= self._capacity:
+                missing.append(i)
+                continue
+            out[i] = matrix[entry[0]]
+            self._clock += 1
+            entry[1] = self._clock
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        return out, missing
+
+    def put(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        """Store ``(len(texts), dim)`` embeddings and persist the index."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(texts):
+            embeddings = embeddings.reshape(len(texts), -1)
+            if self.dim is None:
+                self.dim = embeddings.shape[1]
+            if embeddings.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dim {embeddings.shape[1]} != cache dim {self.dim}"
+                )
+        with self._locked():
+            # Another process may have written since we loaded; merge from disk, keep our recency
+            recency = {text: entry[1] for text, entry in self._rows.items()}
+            clock = self._clock
+            self._load_index()
+            self._clock = max(self._clock, clock)
+            for text, used in recency.items():
+                if text in self._rows:
+                    self._rows[text][1] = max(self._rows[text][1], used)
+            new = {}
+            for text, emb in zip(texts, embeddings, strict=True):
+                key = normalize_text(text)
+                if key not in self._rows:
+                    new[key] = emb
+            if new and self.dim:
+                # More new texts than the budget holds: keep the last ones
+                max_rows = max(1, self.max_bytes // (self.dim * 4))
+                new = dict(list(new.items())[-max_rows:])
+                self._grow(len(new))
+                matrix = self._map()
+                assert matrix is not None
+                for key, emb in new.items():
+                    row = self._free.pop(0)
+                    matrix[row] = emb
+                    self._clock += 1
+                    self._rows[key] = [row, self._clock]
+                matrix.flush()
+            self._write_index()
+
+    def touch(self) -> None:
+        """Persist the recency of this instance's hits (for LRU eviction)."""
+        self.put([], np.empty((0, 0), np.float32))
+
+    def encode(
+        self, texts: Sequence[str], encode_fn: Callable[[list[str]], Any]
+    ) -> np.ndarray:
+        """Embeddings of ``texts``; only uncached unique texts go through ``encode_fn``.
+
+        ``encode_fn`` takes a list of strings and returns a ``(n, dim)``
+        array (or anything ``np.asarray`` accepts, e.g. a CPU tensor).
+        """
+        out, missing = self.get(texts)
+        if missing:
+            first: dict[str, str] = {}
+            for i in missing:
+                first.setdefault(normalize_text(texts[i]), texts[i])
+            unique = list(first.values())
+            encoded = np.asarray(encode_fn(unique), dtype=np.float32).reshape(
+                len(unique), -1
+            )
+            if out is None:
+                out = np.zeros((len(texts), encoded.shape[1]), dtype=np.float32)
+            lookup = {
+                normalize_text(t): e for t, e in zip(unique, encoded, strict=True)
+            }
+            for i in missing:
+                out[i] = lookup[normalize_text(texts[i])]
+            self.put(unique, encoded)
+        elif texts:
+            self.touch()
+        assert out is not None
+        return out
+
+    def prune(self, max_bytes: int) -> int:
+        """Evict LRU rows until the live rows fit ``max_bytes``; return rows evicted."""
+        with self._locked():
+            self._load_index()
+            keep = max(0, max_bytes // ((self.dim or 1) * 4))
+            ordered = sorted(
+                self._rows.items(), key=lambda item: item[1][1], reverse=True
+            )
+            evicted = ordered[keep:]
+            for text, (row, _) in evicted:
+                del self._rows[text]
+                self._free.append(row)
+            self._write_index()
+        return len(evicted)
+
+    def __repr__(self) -> str:
+        return (
+            f"PromptCache({self.encoder_id!r}, entries={len(self)}, dim={self.dim}, "
+            f"{self.nbytes / 2**20:.1f}/{self.max_bytes / 2**20:.0f} MB)"
+        )
+
+
+def iter_instruction_texts(data: Any) -> Iterator[str]:
+    """Yield every prompt string under ``text`` keys of an instructions JSON."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "text":
+                if isinstance(value, str):
+                    yield value
+                elif isinstance(value, list):
+                    yield from (v for v in value if isinstance(v, str))
+            else:
+                yield from iter_instruction_texts(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_instruction_texts(value)
+
+
+def instruction_texts(paths: Iterable[str | os.PathLike[str]]) -> list[str]:
+    """Unique normalized prompts of instruction JSON files, in first-seen order."""
+    texts: dict[str, None] = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for text in iter_instruction_texts(json.load(f)):
+                texts.setdefault(normalize_text(text), None)
+    return list(texts)
+
+
+def iter_caches(cache_dir: str | os.PathLike[str]) -> Iterator[PromptCache]:
+    for index_path in sorted(pathlib.Path(cache_dir).glob(f"*/{INDEX_FILENAME}")):
+        with open(index_path, encoding="utf-8") as f:
+            encoder_id = json.load(f).get("encoder_id", "")
+        yield PromptCache(cache_dir, encoder_id)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Inspect and maintain the prompt embedding cache"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_info = sub.add_parser("info", help="List cached encoders")
+    p_info.add_argument("cache_dir", nargs="?", default=str(DEFAULT_CACHE_DIR))
+    p_check = sub.add_parser(
+        "check", help="Report which prompts of instruction files are cached"
+    )
+    p_check.add_argument("cache_dir")
+    p_check.add_argument("instructions", nargs="+", help="Instruction JSON files")
+    p_prune = sub.add_parser("prune", help="Evict least recently used entries")
+    p_prune.add_argument("cache_dir")
+    p_prune.add_argument("--max-mb", type=float, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        for cache in iter_caches(args.cache_dir):
+            print(cache)
+    elif args.command == "check":
+        texts = instruction_texts(args.instructions)
+        for cache in iter_caches(args.cache_dir):
+            cached = sum(t in cache for t in texts)
+            print(f"{cache.encoder_id}: {cached}/{len(texts)} prompts cached")
+            for text in texts:
+                if text not in cache:
+                    print(f"  missing: {text!r}")
+    else:
+        for cache in iter_caches(args.cache_dir):
+            evicted = cache.prune(int(args.max_mb * 2**20))
+            print(f"{cache.encoder_id}: evicted {evicted}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,270 @@
+"""Per-sample trajectory and sanity statistics over whole results trees.
+
+One row per generated sample, computed for all samples of a store that share
+a segment layout at once (no per-sample Python loop over frames):
+
+- ``frames``, ``duration_s``, ``segments``, ``text``: what was generated.
+- ``nonfinite_frames``: frames with any NaN/inf coordinate.
+- ``root_path_m``: ground-plane distance travelled by the root;
+  ``root_displacement_m``: start-to-end ground-plane distance.
+- ``bbox_x/y/z_m``, ``bbox_volume_m3``: extent of all joints over the
+  sequence; ``min_height_m``: lowest joint height (floor penetration).
+- ``speed_p50/p95/max``: joint speed (m/s) over all joints and frames, and
+  ``speed_p95_<joint>`` per joint.
+- ``max_joint_range_m``: largest distance any joint moves away from its mean
+  position; ``frozen_ratio``: fraction of frames identical to the previous
+  one.
+- ``issues``: ``nonfinite``, ``static`` (no joint moves more than
+  ``--static-range``, the "model does not move" symptom), ``frozen`` (more
+  than half the frames repeat), ``short`` (< 2 frames). Results that fail
+  to load get one row with ``error`` set instead.
+
+Every result is handled by a process pool worker; the table is written as CSV,
+or Parquet when the output ends in ``.parquet`` (needs ``pyarrow``).
+
+Usage:
+    python -m motion_gen_survey report model_zoo/FlowMDM/results --out tmp/report.csv --workers 8
+    python -m motion_gen_survey report model_zoo/FlowMDM/results --out tmp/report.parquet --issues-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import pathlib
+import sys
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.motion_store import (
+    MotionStore,
+    infer_dataset,
+    iter_result_dirs,
+    open_motion_store,
+    require_t2m,
+)
+from motion_gen_survey.t2m import NUM_JOINTS, ROOT_JOINT, t2m_joint_names
+
+
+UP_AXIS = 1
+# A sample whose joints all stay within this distance of their mean position is "static" (m)
+STATIC_RANGE = 0.02
+# Fraction of repeated frames above which a sample is "frozen"
+FROZEN_RATIO = 0.5
+
+
+def _ground(x: np.ndarray) -> np.ndarray:
+    return np.delete(x, UP_AXIS, axis=-1)
+
+
+def sample_stats(
+    joints: np.ndarray, fps: float, static_range: float = STATIC_RANGE
+) -> dict[str, np.ndarray]:
+    """Vectorized statistics for a ``(batch, frames, 22, 3)`` block.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Column name -> ``(batch,)`` array (``issues`` is an object array of
+        comma-separated flags).
+    """
+    x = np.asarray(joints, dtype=np.float32)
+    batch, frames = x.shape[:2]
+    finite = np.isfinite(x).all(axis=(2, 3))  # (batch, frames)
+    cols: dict[str, np.ndarray] = {"nonfinite_frames": (~finite).sum(axis=1)}
+
+    root = _ground(x[:, :, ROOT_JOINT])
+    if frames > 1:
+        step = np.diff(root, axis=1)
+        cols["root_path_m"] = np.sqrt(np.einsum("btc,btc->bt", step, step)).sum(axis=1)
+    else:
+        cols["root_path_m"] = np.zeros(batch, np.float32)
+    cols["root_displacement_m"] = np.linalg.norm(root[:, -1] - root[:, 0], axis=-1)
+
+    lo, hi = x.min(axis=(1, 2)), x.max(axis=(1, 2))  # (batch, 3)
+    extent = hi - lo
+    for axis, name in enumerate("xyz"):
+        cols[f"bbox_{name}_m"] = extent[:, axis]
+    cols["bbox_volume_m3"] = extent.prod(axis=1)
+    cols["min_height_m"] = lo[:, UP_AXIS]
+
+    if frames > 1:
+        delta = np.diff(x, axis=1)  # (batch, frames - 1, 22, 3)
+        speed = np.sqrt(np.einsum("btjc,btjc->btj", delta, delta)) * np.float32(fps)
+        pooled = np.percentile(speed.reshape(batch, -1), [50, 95], axis=1)
+        cols["speed_p50"], cols["speed_p95"] = pooled[0], pooled[1]
+        cols["speed_max"] = speed.max(axis=(1, 2))
+        per_joint = np.percentile(speed, 95, axis=1)  # (batch, 22)
+        for j in range(NUM_JOINTS):
+            cols[f"speed_p95_{t2m_joint_names[j]}"] = per_joint[:, j]
+        cols["frozen_ratio"] = (speed.max(axis=2) == 0).sum(axis=1) / (frames - 1)
+    else:
+        for name in ("speed_p50", "speed_p95", "speed_max", "frozen_ratio"):
+            cols[name] = np.zeros(batch, np.float32)
+        for j in range(NUM_JOINTS):
+            cols[f"speed_p95_{t2m_joint_names[j]}"] = np.zeros(batch, np.float32)
+
+    dev = x - x.mean(axis=1, keepdims=True)
+    cols["max_joint_range_m"] = np.sqrt(np.einsum("btjc,btjc->btj", dev, dev)).max(
+        axis=(1, 2)
+    )
+
+    flags = np.stack(
+        [
+            cols["nonfinite_frames"] > 0,
+            cols["max_joint_range_m"] < static_range,
+            cols["frozen_ratio"] > FROZEN_RATIO,
+            np.full(batch, frames < 2),
+        ],
+        axis=1,
+    )
+    names = ("nonfinite", "static", "frozen", "short")
+    cols["issues"] = np.array(
+        [",".join(n for n, f in zip(names, row, strict=True) if f) for row in flags],
+        dtype=object,
+    )
+    return cols
+
+
+def report_store(
+    store: MotionStore, static_range: float = STATIC_RANGE
+) -> list[dict[str, Any]]:
+    """One report row per sample of ``store``, batched by segment layout."""
+    require_t2m(store, "the report")
+    groups: dict[tuple[int, ...], list[int]] = {}
+    for i in range(store.num_samples):
+        groups.setdefault(tuple(store.segment_lengths(i)), []).append(i)
+    texts = store.text
+    dataset = infer_dataset(store.store_dir) or ""
+    rows: list[dict[str, Any]] = []
+    for segments, samples in groups.items():
+        valid_frames = sum(segments)
+        if samples == list(range(samples[0], samples[-1] + 1)):
+            joints = store.joints[samples[0] : samples[-1] + 1, :valid_frames]
+        else:
+            joints = store.joints[samples, :valid_frames]
+        cols = sample_stats(joints, store.fps, static_range)
+        for k, sample in enumerate(samples):
+            # Compositions share one text per segment; plain sampling has one text per sample
+            if len(texts) == store.num_samples and len(segments) == 1:
+                text = str(texts[sample])
+            else:
+                text = " | ".join(str(t) for t in texts[: len(segments)])
+            row: dict[str, Any] = {
+                "result": str(store.store_dir.parent),
+                "dataset": dataset,
+                "sample": sample,
+                "fps": store.fps,
+                "frames": valid_frames,
+                "duration_s": valid_frames / store.fps,
+                "segments": len(segments),
+                "text": text,
+                "error": "",
+            }
+            for name, values in cols.items():
+                value = values[k]
+                row[name] = value if isinstance(value, str) else value.item()
+            rows.append(row)
+    rows.sort(key=lambda r: r["sample"])
+    return rows
+
+
+def _report_path(job: tuple[str, float]) -> list[dict[str, Any]]:
+    path, static_range = job
+    try:
+        return report_store(open_motion_store(path), static_range)
+    except Exception as exc:  # one broken result must not abort a tree-wide audit
+        return [
+            {"result": path, "error": f"{type(exc).__name__}: {exc}", "issues": "error"}
+        ]
+
+
+def write_table(
+    rows: list[dict[str, Any]], out: str | os.PathLike[str]
+) -> pathlib.Path:
+    """Write rows to CSV, or Parquet for a ``.parquet`` path (columns: union of all row keys)."""
+    out = pathlib.Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fields: dict[str, None] = {}
+    for row in rows:
+        fields.update(dict.fromkeys(row))
+    tmp = out.with_name(out.name + ".tmp")
+    if out.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist([{k: row.get(k) for k in fields} for row in rows])
+        pq.write_table(table, tmp)
+    else:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(fields), restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+    os.replace(tmp, out)
+    return out
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-sample trajectory statistics and sanity checks over results"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="results.npy files, result directories, trees or manifests",
+    )
+    parser.add_argument(
+        "--out", default=None, help="Output table (.csv, or .parquet with pyarrow)"
+    )
+    parser.add_argument(
+        "--static-range",
+        type=float,
+        default=STATIC_RANGE,
+        help="Samples whose joints all stay within this distance (m) are flagged static",
+    )
+    parser.add_argument(
+        "--issues-only",
+        action="store_true",
+        help="Only write rows with at least one issue",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    jobs = [
+        (str(d), args.static_range)
+        for root in args.paths
+        for d in iter_result_dirs(root)
+    ]
+    rows: list[dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for result_rows in pool.map(_report_path, jobs):
+            rows.extend(result_rows)
+
+    issues = Counter(
+        flag for row in rows for flag in str(row.get("issues", "")).split(",") if flag
+    )
+    print(
+        f"Results: {len(jobs)}  samples: {sum(1 for r in rows if not r.get('error'))}"
+    )
+    for flag, count in issues.most_common():
+        print(f"  {flag}: {count}")
+    if args.out:
+        selected = [r for r in rows if r.get("issues")] if args.issues_only else rows
+        if not selected:
+            print("No rows to write")
+            return
+        try:
+            out = write_table(selected, args.out)
+        except ImportError as e:
+            print("ERROR: writing Parquet needs pyarrow:", e, file=sys.stderr)
+            sys.exit(1)
+        print(f"Wrote {len(selected)} rows to {out}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
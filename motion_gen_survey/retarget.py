@@ -0,0 +1,491 @@
+"""Batched frame-rate resampling and joint-set conversion of motion stores.
+
+Babel results are 30 FPS and HumanML3D results 20 FPS; FlowMDM joints are
+the 22 T2M joints, while the SMPL-X tools work on the 55 SMPL-X joints (the
+first 22 of which are the T2M joints) and SMPL has 24. This module converts
+whole stores between frame rates and joint sets so mixed results can be
+compared, evaluated or viewed together:
+
+- :func:`resample` linearly interpolates every sample of a ``(batch, frames,
+  joints, 3)`` block to a new frame rate in one gather + blend. Output frame
+  ``k`` is source time ``k / fps_out``; the last output frame never lies
+  past the last source frame.
+- :class:`JointMap` maps one joint set to another with a precomputed table:
+  a plain index selection when every target joint exists in the source
+  (SMPL-X -> T2M), otherwise a ``(target, source)`` regressor matrix applied
+  with one ``einsum``. Joints the source cannot observe (SMPL hand joints,
+  SMPL-X jaw, eyes and fingers from T2M) are regressed from the wrist,
+  elbow, neck and head and flagged in ``observed``. Maps without a direct
+  table are composed through T2M.
+- :func:`retarget_store` streams a store through both steps in chunks of
+  output frames, so memory stays bounded for long sequences, and writes the
+  result as a new motion store (``joint_set`` recorded in its metadata).
+  ``lengths`` are rescaled so segment boundaries follow the new frame rate.
+  Regressed joints are listed in ``synthesized_joints``; tools that need
+  generated T2M joints reject such stores (``motion_store.require_t2m``),
+  and converting back to T2M drops them.
+
+Usage:
+    python -m motion_gen_survey retarget model_zoo/FlowMDM/results --fps 30 --out tmp/retarget_30fps
+    python -m motion_gen_survey retarget <result_dir> --joints smplx --out tmp/smplx_joints --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import pathlib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.motion_store import (
+    FORMAT_VERSION,
+    JOINTS_FILENAME,
+    META_FILENAME,
+    STORE_DIRNAME,
+    STORE_DTYPE,
+    MotionStore,
+    iter_result_dirs,
+    open_motion_store,
+    publish_store,
+)
+from motion_gen_survey.t2m import NUM_JOINTS, t2m_joint_names
+
+
+DEFAULT_CHUNK_FRAMES = 4096
+_SIDES = ("left", "right")
+_FINGERS = ("index", "middle", "pinky", "ring", "thumb")
+
+T2M_JOINTS: tuple[str, ...] = tuple(t2m_joint_names[j] for j in range(NUM_JOINTS))
+# SMPL / SMPL-X body joints share the T2M order
+SMPL_JOINTS: tuple[str, ...] = (*T2M_JOINTS, "L.Hand", "R.Hand")
+SMPLX_JOINTS: tuple[str, ...] = (
+    *T2M_JOINTS,
+    "Jaw",
+    "L.Eye",
+    "R.Eye",
+    *(
+        f"{side[0].upper()}.{finger.capitalize()}{k}"
+        for side in _SIDES
+        for finger in _FINGERS
+        for k in (1, 2, 3)
+    ),
+)
+JOINT_SETS: dict[str, tuple[str, ...]] = {
+    "t2m": T2M_JOINTS,
+    "smpl": SMPL_JOINTS,
+    "smplx": SMPLX_JOINTS,
+}
+
+# Extrapolation along the forearm (wrist - elbow) for joints T2M does not have,
+# as fractions of the forearm length beyond the wrist
+_HAND_REACH = 0.33
+_FINGER_REACH: dict[str, tuple[float, float, float]] = {
+    "index": (0.36, 0.48, 0.56),
+    "middle": (0.38, 0.51, 0.60),
+    "ring": (0.36, 0.48, 0.56),
+    "pinky": (0.32, 0.41, 0.47),
+    "thumb": (0.12, 0.22, 0.30),
+}
+
+
+@dataclass(frozen=True)
+class JointMap:
+    """Linear map from joint set ``source`` to joint set ``target``.
+
+    Attributes
+    ----------
+    source, target : str
+        Joint set names (keys of ``JOINT_SETS``).
+    weights : np.ndarray
+        ``(target_joints, source_joints)`` regressor; row ``t`` gives target
+        joint ``t`` as a weighted sum of source joints.
+    index : np.ndarray | None
+        Source joint per target joint when the map is a pure selection
+        (applied with ``np.take`` instead of the regressor).
+    observed : np.ndarray
+        ``(target_joints,)`` bool; False for joints estimated from others.
+    """
+
+    source: str
+    target: str
+    weights: np.ndarray
+    index: np.ndarray | None = field(default=None)
+    observed: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+
+    @property
+    def num_target(self) -> int:
+        return int(self.weights.shape[0])
+
+    def apply(self, joints: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Map ``(..., source_joints, 3)`` positions to ``(..., target_joints, 3)``."""
+        x = np.asarray(joints)
+        if self.index is not None:
+            return np.take(x, self.index, axis=-2, out=out)
+        w = self.weights.astype(x.dtype, copy=False)
+        return np.einsum("ts,...sc->...tc", w, x, out=out, optimize=True)
+
+    def then(self, other: JointMap) -> JointMap:
+        """``other`` after ``self`` as one map (regressors multiplied)."""
+        if other.source != self.target:
+            raise ValueError(
+                f"cannot chain {self.source}->{self.target} with {other.source}->{other.target}"
+            )
+        index = None
+        if self.index is not None and other.index is not None:
+            index = self.index[other.index]
+        observed = other.observed.copy()
+        if other.index is not None:
+            observed &= self.observed[other.index]
+        return JointMap(
+            self.source, other.target, other.weights @ self.weights, index, observed
+        )
+
+
+def _selection(source: str, target: str) -> JointMap:
+    """Target joints picked by name from the source set."""
+    names = JOINT_SETS[source]
+    index = np.array([names.index(n) for n in JOINT_SETS[target]], dtype=np.int64)
+    weights = np.zeros((len(index), len(names)))
+    weights[np.arange(len(index)), index] = 1.0
+    return JointMap(source, target, weights, index, np.ones(len(index), dtype=bool))
+
+
+def _from_t2m(target: str) -> JointMap:
+    """T2M -> SMPL / SMPL-X: body joints copied, the rest regressed from the body."""
+    names = JOINT_SETS[target]
+    weights = np.zeros((len(names), NUM_JOINTS))
+    weights[np.arange(NUM_JOINTS), np.arange(NUM_JOINTS)] = 1.0
+    observed = np.zeros(len(names), dtype=bool)
+    observed[:NUM_JOINTS] = True
+    pos = {n: i for i, n in enumerate(T2M_JOINTS)}
+
+    def extrapolate(row: int, base: str, away_from: str, reach: float) -> None:
+        # base + reach * (base - away_from)
+        weights[row, pos[base]] += 1.0 + reach
+        weights[row, pos[away_from]] -= reach
+
+    for t, name in enumerate(names[NUM_JOINTS:], start=NUM_JOINTS):
+        if name == "Jaw":
+            weights[t, pos["Neck"]], weights[t, pos["Head"]] = 0.3, 0.7
+        elif name.endswith(".Eye"):
+            extrapolate(t, "Head", "Neck", 0.6)
+        elif name.endswith(".Hand"):
+            extrapolate(t, f"{name[0]}.Wrist", f"{name[0]}.Elbow", _HAND_REACH)
+        else:
+            finger, k = name[2:-1].lower(), int(name[-1])
+            extrapolate(
+                t, f"{name[0]}.Wrist", f"{name[0]}.Elbow", _FINGER_REACH[finger][k - 1]
+            )
+    return JointMap("t2m", target, weights, None, observed)
+
+
+def _smplx_to_smpl() -> JointMap:
+    """SMPL-X -> SMPL: body joints copied, each SMPL hand joint at the middle finger base."""
+    names = JOINT_SETS["smplx"]
+    index = np.array(
+        [names.index(n) for n in T2M_JOINTS]
+        + [names.index("L.Middle1"), names.index("R.Middle1")]
+    )
+    weights = np.zeros((len(index), len(names)))
+    weights[np.arange(len(index)), index] = 1.0
+    return JointMap("smplx", "smpl", weights, index, np.ones(len(index), dtype=bool))
+
+
+def joint_map(source: str, target: str) -> JointMap:
+    """Precomputed map between two joint sets of ``JOINT_SETS``."""
+    for name in (source, target):
+        if name not in JOINT_SETS:
+            raise ValueError(
+                f"unknown joint set {name!r}; expected one of {sorted(JOINT_SETS)}"
+            )
+    if source == target or target == "t2m":
+        return _selection(source, target)
+    if source == "t2m":
+        return _from_t2m(target)
+    if (source, target) == ("smplx", "smpl"):
+        return _smplx_to_smpl()
+    # smpl -> smplx: only the body is shared, so go through T2M
+    return _selection(source, "t2m").then(_from_t2m(target))
+
+
+def synthesized_joints(
+    jmap: JointMap, source_synthesized: Sequence[str] = ()
+) -> list[str]:
+    """Target joints of ``jmap`` that are estimated rather than copied from generated data.
+
+    A joint is synthesized if the map regresses it or it reads a source
+    joint that was itself synthesized by an earlier conversion.
+    """
+    flagged = np.isin(np.array(JOINT_SETS[jmap.source]), list(source_synthesized))
+    tainted = (jmap.weights[:, flagged] != 0.0).any(axis=1)
+    return [
+        name
+        for name, observed, taint in zip(
+            JOINT_SETS[jmap.target], jmap.observed, tainted, strict=True
+        )
+        if taint or not observed
+    ]
+
+
+def infer_joint_set(num_joints: int) -> str:
+    """Joint set name for a joint count (22 / 24 / 55)."""
+    for name, names in JOINT_SETS.items():
+        if len(names) == num_joints:
+            return name
+    raise ValueError(f"no known joint set has {num_joints} joints")
+
+
+# --- Resampling ---
+def resampled_length(num_frames: int, src_fps: float, dst_fps: float) -> int:
+    """Output frames for ``num_frames`` source frames, ending at or before the last source frame."""
+    if num_frames <= 0:
+        return 0
+    return math.floor((num_frames - 1) * dst_fps / src_fps + 1e-9) + 1
+
+
+def source_positions(
+    start: int, stop: int, src_fps: float, dst_fps: float
+) -> np.ndarray:
+    """Fractional source frame of output frames ``[start, stop)``."""
+    return np.arange(start, stop, dtype=np.float64) * (src_fps / dst_fps)
+
+
+def resample(
+    joints: np.ndarray, src_fps: float, dst_fps: float, axis: int = 1
+) -> np.ndarray:
+    """Linearly resample ``joints`` along the frame ``axis`` from ``src_fps`` to ``dst_fps``.
+
+    All samples and joints are blended at once: one gather of the two
+    neighbouring source frames per output frame and one fused blend.
+    """
+    x = np.asarray(joints)
+    axis = axis % x.ndim
+    n = x.shape[axis]
+    if src_fps == dst_fps or n == 0:
+        return x.copy()
+    return _interpolate(
+        x,
+        source_positions(0, resampled_length(n, src_fps, dst_fps), src_fps, dst_fps),
+        axis,
+    )
+
+
+def _interpolate(
+    x: np.ndarray, positions: np.ndarray, axis: int, offset: int = 0
+) -> np.ndarray:
+    """Blend frames of ``x`` (which starts at source frame ``offset``) at ``positions``."""
+    n = x.shape[axis]
+    local = positions - offset
+    i0 = np.clip(np.floor(local).astype(np.int64), 0, n - 1)
+    i1 = np.minimum(i0 + 1, n - 1)
+    shape = [1] * x.ndim
+    shape[axis] = len(positions)
+    t = (
+        (local - i0)
+        .astype(x.dtype if x.dtype.kind == "f" else np.float32)
+        .reshape(shape)
+    )
+    a = np.take(x, i0, axis=axis)
+    b = np.take(x, i1, axis=axis)
+    # a + t * (b - a), in place on the gathered copies
+    np.subtract(b, a, out=b)
+    b *= t
+    a += b
+    return a
+
+
+def rescale_lengths(
+    lengths: list[Any],
+    num_frames: int,
+    num_samples: int,
+    src_fps: float,
+    dst_fps: float,
+) -> list[Any]:
+    """Rescale store ``lengths`` (per sample, per segment, or nested) to ``dst_fps``.
+
+    Segment boundaries move to the first output frame at or after the
+    original boundary time, and the total follows :func:`resampled_length`.
+    """
+
+    def segments(segs: list[int]) -> list[int]:
+        ends = np.cumsum(segs)
+        new_ends = [math.ceil(e * dst_fps / src_fps - 1e-9) for e in ends[:-1].tolist()]
+        new_ends.append(resampled_length(int(ends[-1]), src_fps, dst_fps))
+        bounds = np.maximum.accumulate(np.minimum(new_ends, new_ends[-1]))
+        return [int(n) for n in np.diff(np.concatenate([[0], bounds]))]
+
+    if not lengths:
+        return []
+    if isinstance(lengths[0], list):
+        return [segments([int(v) for v in row]) if row else [] for row in lengths]
+    flat = [int(v) for v in lengths]
+    if sum(flat) == num_frames and len(flat) != num_samples:
+        return segments(flat)
+    return [resampled_length(v, src_fps, dst_fps) for v in flat]
+
+
+# --- Pipeline ---
+def retarget_store(
+    store: MotionStore,
+    out_dir: str | os.PathLike[str],
+    fps: float | None = None,
+    joint_set: str = "t2m",
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+) -> pathlib.Path:
+    """Write ``store`` resampled to ``fps`` and mapped to ``joint_set`` as a new motion store.
+
+    Output frames are produced ``chunk_frames`` at a time for all samples at
+    once; each chunk reads only the source frames it interpolates between.
+    """
+    source_set = store.meta.get("joint_set") or infer_joint_set(store.num_joints)
+    jmap = joint_map(source_set, joint_set)
+    src_fps = store.fps
+    dst_fps = float(fps) if fps else src_fps
+    batch, frames = store.num_samples, store.num_frames
+    out_frames = resampled_length(frames, src_fps, dst_fps)
+    chunk_frames = max(1, int(chunk_frames))
+
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp_joints = (out_dir / JOINTS_FILENAME).with_suffix(".tmp")
+    shape = (batch, out_frames, jmap.num_target, 3)
+    out = np.memmap(tmp_joints, dtype=STORE_DTYPE, mode="w+", shape=shape)
+    hasher = hashlib.sha1()
+    for start in range(0, out_frames, chunk_frames):
+        stop = min(out_frames, start + chunk_frames)
+        if src_fps == dst_fps:
+            block = np.asarray(store.joints[:, start:stop], dtype=np.float32)
+        else:
+            pos = source_positions(start, stop, src_fps, dst_fps)
+            first, last = int(pos[0]), min(frames - 1, int(pos[-1]) + 1)
+            block = _interpolate(
+                np.asarray(store.joints[:, first : last + 1], dtype=np.float32),
+                pos,
+                1,
+                first,
+            )
+        jmap.apply(block, out=out[:, start:stop])
+        hasher.update(np.ascontiguousarray(out[:, start:stop]))
+    out.flush()
+    del out
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "dtype": STORE_DTYPE,
+        "shape": list(shape),
+        "fps": dst_fps,
+        "joint_set": joint_set,
+        "synthesized_joints": synthesized_joints(jmap, store.synthesized_joints),
+        "text": store.text,
+        "lengths": rescale_lengths(store.lengths, frames, batch, src_fps, dst_fps),
+        "extra": store.meta.get("extra", {}),
+        "content_hash": hasher.hexdigest(),
+        "retargeted_from": {
+            "store": str(store.store_dir),
+            "content_hash": store.content_hash,
+            "fps": src_fps,
+            "joint_set": source_set,
+        },
+    }
+    publish_store(out_dir, tmp_joints, meta)
+    return out_dir
+
+
+def is_retarget_current(
+    store: MotionStore, out_dir: pathlib.Path, fps: float | None, joint_set: str
+) -> bool:
+    """True if ``out_dir`` already holds ``store`` converted with these settings."""
+    meta_path = out_dir / META_FILENAME
+    if not meta_path.exists():
+        return False
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    origin = meta.get("retargeted_from", {})
+    return (
+        origin.get("content_hash") == store.content_hash
+        and meta.get("joint_set") == joint_set
+        and float(meta.get("fps", 0.0)) == float(fps or store.fps)
+    )
+
+
+def _retarget_path(job: tuple[str, str, float | None, str, int, bool]) -> str:
+    path, out_dir, fps, joint_set, chunk_frames, force = job
+    store = open_motion_store(path)
+    out = pathlib.Path(out_dir)
+    if not force and is_retarget_current(store, out, fps, joint_set):
+        return f"up to date: {out}"
+    retarget_store(store, out, fps=fps, joint_set=joint_set, chunk_frames=chunk_frames)
+    synthesized = len(open_motion_store(out).synthesized_joints)
+    return f"{store.store_dir} ({store.fps:g} FPS, {store.num_joints} joints) -> {out} ({synthesized} synthesized joints)"
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Resample and retarget motion stores to a common FPS / joint set"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="results.npy files, result directories, trees or manifests",
+    )
+    parser.add_argument(
+        "--out",
+        required=True,
+        help=f"Output root; each result becomes <out>/<relative path>/{STORE_DIRNAME}",
+    )
+    parser.add_argument(
+        "--fps", type=float, default=None, help="Target frame rate (default: keep)"
+    )
+    parser.add_argument(
+        "--joints", choices=sorted(JOINT_SETS), default="t2m", help="Target joint set"
+    )
+    parser.add_argument(
+        "--chunk-frames",
+        type=int,
+        default=DEFAULT_CHUNK_FRAMES,
+        help="Output frames converted per chunk",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconvert even if the output is up to date",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    out_root = pathlib.Path(args.out)
+    jobs = []
+    for root in args.paths:
+        base = pathlib.Path(root)
+        base = base.parent if base.is_file() else base
+        for result_dir in iter_result_dirs(root):
+            rel = (
+                result_dir.relative_to(base)
+                if result_dir.is_relative_to(base)
+                else pathlib.Path(result_dir.name)
+            )
+            jobs.append(
+                (
+                    str(result_dir),
+                    str(out_root / rel / STORE_DIRNAME),
+                    args.fps,
+                    args.joints,
+                    args.chunk_frames,
+                    args.force,
+                )
+            )
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for message in pool.map(_retarget_path, jobs):
+            print(message)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,181 @@
+"""Batched T2M skeleton rendering for PyVista plotters.
+
+Drawing each bone and label as its own actor makes the actor count grow with
+``bones x skeletons``. :func:`add_skeletons` instead packs any number of poses
+(an onion skin of K frames of one sequence, or many samples) into one
+``pv.PolyData`` and emits exactly three actors:
+
+- one line actor for all bones (shared offset topology from ``t2m``),
+- one point-glyph actor for all joints (same PolyData, ``style="points"``),
+- one label actor for the selected joints of the selected skeletons.
+
+Poses can later be moved in place with :meth:`SkeletonActors.update`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.lazy_import import lazy_import
+from motion_gen_survey.t2m import NUM_JOINTS, skeleton_line_cells, t2m_joint_names
+
+
+pv = lazy_import("pyvista")
+
+
+@dataclass
+class SkeletonActors:
+    """Actors and buffers created by :func:`add_skeletons`.
+
+    Attributes
+    ----------
+    poly : pv.PolyData
+        Packed ``(K*22, 3)`` joint positions with bone line cells.
+    label_poly : pv.PolyData | None
+        Label anchor points, or None when no labels were requested.
+    line_actor, point_actor, label_actor : Any
+        The three VTK actors (``label_actor`` may be None).
+    label_joint_ids : np.ndarray
+        Flat point indices (into ``poly``) that carry labels.
+    label_offset : np.ndarray
+        Offset added to label anchors.
+    """
+
+    poly: Any
+    label_poly: Any | None
+    line_actor: Any
+    point_actor: Any
+    label_actor: Any
+    label_joint_ids: np.ndarray
+    label_offset: np.ndarray
+
+    def update(self, poses: np.ndarray) -> None:
+        """Move all skeletons to ``poses`` (``(K, 22, 3)``) in place."""
+        pts = self.poly.points
+        np.copyto(pts.reshape(-1, NUM_JOINTS, 3), poses)
+        self.poly.points = pts
+        if self.label_poly is not None:
+            lpts = self.label_poly.points
+            np.take(pts, self.label_joint_ids, axis=0, out=lpts, mode="clip")
+            lpts += self.label_offset
+            self.label_poly.points = lpts
+
+
+def build_skeleton_batch(poses: np.ndarray) -> Any:
+    """Pack ``(K, 22, 3)`` poses into one PolyData with bone line cells."""
+    poses = np.asarray(poses, dtype=np.float32).reshape(-1, NUM_JOINTS, 3)
+    poly = pv.PolyData()
+    poly.points = poses.reshape(-1, 3).copy()
+    poly.lines = skeleton_line_cells(len(poses))
+    return poly
+
+
+def add_skeletons(
+    plotter: Any,
+    poses: np.ndarray,
+    labels: Mapping[int, str] | None = None,
+    label_skeletons: Sequence[int] | None = None,
+    color: Sequence[float] = (0.2, 0.4, 0.8),
+    joint_color: Sequence[float] = (1.0, 0.2, 0.2),
+    fade: bool = False,
+    cmap: str = "Blues",
+    line_width: float = 3.0,
+    point_size: float = 10.0,
+    font_size: int = 12,
+    label_offset: Sequence[float] = (0.0, 0.1, 0.0),
+) -> SkeletonActors:
+    """Add K skeletons to ``plotter`` as one line, one point and one label actor.
+
+    Parameters
+    ----------
+    plotter : pv.Plotter
+        Any PyVista plotter (including ``pvqt.BackgroundPlotter``).
+    poses : np.ndarray
+        ``(K, 22, 3)`` joint positions (a single ``(22, 3)`` pose is accepted).
+    labels : Mapping[int, str], optional
+        Joint index -> label text. Defaults to no labels.
+    label_skeletons : Sequence[int], optional
+        Which skeletons get labels (default: the last one only).
+    color, joint_color : sequence of float
+        Bone and joint colours when ``fade`` is False.
+    fade : bool
+        Colour skeletons by their index with ``cmap`` (onion-skin look).
+    cmap : str
+        Colormap used when ``fade`` is True.
+    line_width, point_size, font_size : float
+        Styling.
+    label_offset : sequence of float
+        Offset added to label anchors (default 10 cm above the joint).
+
+    Returns
+    -------
+    SkeletonActors
+        Actors and buffers for later in-place updates.
+    """
+    poly = build_skeleton_batch(poses)
+    num_skeletons = poly.n_points // NUM_JOINTS
+
+    style: dict[str, Any] = {"color": list(color)}
+    point_style: dict[str, Any] = {"color": list(joint_color)}
+    if fade and num_skeletons > 1:
+        poly.point_data["skeleton"] = np.repeat(
+            np.arange(num_skeletons, dtype=np.float32), NUM_JOINTS
+        )
+        style = point_style = {
+            "scalars": "skeleton",
+            "cmap": cmap,
+            "show_scalar_bar": False,
+            "clim": [-0.3 * num_skeletons, num_skeletons - 1],
+        }
+
+    line_actor = plotter.add_mesh(
+        poly,
+        style="wireframe",
+        line_width=line_width,
+        render_lines_as_tubes=True,
+        **style,
+    )
+    point_actor = plotter.add_mesh(
+        poly,
+        style="points",
+        point_size=point_size,
+        render_points_as_spheres=True,
+        **point_style,
+    )
+
+    label_ids = np.zeros(0, dtype=np.int64)
+    label_poly = None
+    label_actor = None
+    offset = np.asarray(label_offset, dtype=np.float32)
+    if labels:
+        skeletons = (
+            list(label_skeletons)
+            if label_skeletons is not None
+            else [num_skeletons - 1]
+        )
+        joint_ids = list(labels)
+        label_ids = (
+            np.asarray(skeletons)[:, None] * NUM_JOINTS + np.asarray(joint_ids)[None, :]
+        ).ravel()
+        label_poly = pv.PolyData(poly.points[label_ids] + offset)
+        label_actor = plotter.add_point_labels(
+            label_poly,
+            [labels[j] for _ in skeletons for j in joint_ids],
+            show_points=False,
+            font_size=font_size,
+            always_visible=True,
+        )
+    return SkeletonActors(
+        poly, label_poly, line_actor, point_actor, label_actor, label_ids, offset
+    )
+
+
+def key_joint_labels(show_all_joints: bool = False) -> dict[int, str]:
+    """Return the default joint label set (all 22, or the key joints only)."""
+    if show_all_joints:
+        return dict(t2m_joint_names)
+    return {j: t2m_joint_names[j] for j in (0, 12, 15, 10, 11, 20, 21)}
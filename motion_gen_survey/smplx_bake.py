@@ -0,0 +1,432 @@
+"""Batched SMPL-X vertex baking with an on-disk, content-hashed vertex cache.
+
+Mesh viewers used to run one SMPL-X forward pass per displayed frame. This
+module runs a whole 165-dim axis-angle pose sequence through SMPL-X in large
+CPU batches (preallocated tensors, ``torch.no_grad``) and writes the
+``(frames, 10475, 3)`` vertex array to a ``.npy`` cache file. Replaying a
+baked sequence only needs ``np.load(..., mmap_mode="r")`` and never imports
+torch. With ``--backend numpy`` baking itself is torch-free too: frames are
+skinned by :mod:`motion_gen_survey.lbs_numpy` from a compact extraction of
+the model (top-k skinning weights).
+
+Pose layout (per frame, 165 values)::
+
+    global_orient 3 | body 63 | left hand 45 | right hand 45 | jaw 3 | leye 3 | reye 3
+
+Cache files are keyed by the content of the pose (and translation) file, the
+gender, betas, output dtype and (for the NumPy backend) its skinning
+settings, so editing any of them produces a new entry.
+
+Usage:
+    python -m motion_gen_survey.smplx_bake smplx_pose.npy --model-path data --gender neutral
+    python -m motion_gen_survey.smplx_bake smplx_pose.npy --dtype float16 --batch-size 512
+    python -m motion_gen_survey.smplx_bake smplx_pose.npy --backend numpy --top-k 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+CACHE_VERSION = 1
+POSE_DIM = 165
+NUM_BETAS = 10
+NUM_EXPRESSION = 10
+NUM_VERTICES = 10475
+POSE_LAYOUT: dict[str, slice] = {
+    "global_orient": slice(0, 3),
+    "body_pose": slice(3, 66),
+    "left_hand_pose": slice(66, 111),
+    "right_hand_pose": slice(111, 156),
+    "jaw_pose": slice(156, 159),
+    "leye_pose": slice(159, 162),
+    "reye_pose": slice(162, 165),
+}
+TRANSL_FILENAME = "smplx_transl.npy"
+FACES_FILENAME = "smplx_faces.npy"
+DEFAULT_CACHE_DIR = pathlib.Path("tmp/smplx_vertex_cache")
+BACKENDS: tuple[str, ...] = ("torch", "numpy")
+
+
+def load_pose_sequence(pose_file: str | os.PathLike[str]) -> np.ndarray:
+    """Load and validate a ``(frames, 165)`` pose sequence as float32."""
+    poses = np.load(pose_file)
+    if poses.ndim == 3 and poses.shape[0] == 1:
+        poses = poses[0]
+    if poses.ndim != 2 or poses.shape[1] != POSE_DIM:
+        raise ValueError(
+            f"Expected pose array of shape (frames, {POSE_DIM}), got {poses.shape} in {pose_file}"
+        )
+    if not np.isfinite(poses).all():
+        bad = np.unique(np.nonzero(~np.isfinite(poses))[0])
+        raise ValueError(
+            f"Pose sequence {pose_file} has NaN/Inf in frames {bad[:10].tolist()}"
+        )
+    if (
+        len(poses) > 1
+        and np.allclose(poses[0], poses[-1])
+        and np.allclose(poses, poses[0])
+    ):
+        print(
+            f"WARNING: all {len(poses)} frames of {pose_file} are identical; check the export pipeline",
+            file=sys.stderr,
+        )
+    return np.ascontiguousarray(poses, dtype=np.float32)
+
+
+def find_transl_file(pose_file: str | os.PathLike[str]) -> pathlib.Path | None:
+    """Return the ``smplx_transl.npy`` stored next to ``pose_file`` if present."""
+    candidate = pathlib.Path(pose_file).parent / TRANSL_FILENAME
+    return candidate if candidate.exists() else None
+
+
+def _hash_file(hasher: Any, path: pathlib.Path, block_size: int = 1 << 20) -> None:
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            hasher.update(block)
+
+
+def cache_key(
+    pose_file: str | os.PathLike[str],
+    gender: str,
+    betas: np.ndarray | None = None,
+    dtype: str = "float32",
+    transl_file: str | os.PathLike[str] | None = None,
+    variant: str = "",
+) -> str:
+    """Return the content hash identifying a baked vertex sequence.
+
+    ``variant`` names a non-default skinning backend; torch bakes leave it
+    empty so their keys are unchanged.
+    """
+    hasher = hashlib.sha1()
+    hasher.update(f"v{CACHE_VERSION}|{gender}|{np.dtype(dtype).str}|".encode())
+    if variant:
+        hasher.update(f"backend|{variant}|".encode())
+    _hash_file(hasher, pathlib.Path(pose_file))
+    if transl_file is not None:
+        hasher.update(b"|transl|")
+        _hash_file(hasher, pathlib.Path(transl_file))
+    hasher.update(b"|betas|")
+    hasher.update(_normalize_betas(betas).tobytes())
+    return hasher.hexdigest()
+
+
+def _normalize_betas(betas: Sequence[float] | np.ndarray | None) -> np.ndarray:
+    out = np.zeros(NUM_BETAS, dtype=np.float32)
+    if betas is not None:
+        values = np.asarray(betas, dtype=np.float32).ravel()[:NUM_BETAS]
+        out[: len(values)] = values
+    return out
+
+
+def create_smplx_model(
+    model_path: str | os.PathLike[str], gender: str = "neutral"
+) -> Any:
+    """Create a full-component SMPL-X model from ``<model_path>/smplx``.
+
+    ``torch`` and ``smplx`` are imported here so that importing this module
+    (and replaying cached vertices) stays torch-free.
+    """
+    import smplx  # type: ignore
+
+    smplx_dir = pathlib.Path(model_path).expanduser().resolve() / "smplx"
+    if not smplx_dir.exists():
+        raise FileNotFoundError(f"Could not find smplx directory at {smplx_dir}")
+    return smplx.SMPLX(
+        model_path=str(smplx_dir),
+        gender=gender,
+        use_pca=False,
+        create_global_orient=True,
+        create_body_pose=True,
+        create_betas=True,
+        create_left_hand_pose=True,
+        create_right_hand_pose=True,
+        create_expression=True,
+        create_jaw_pose=True,
+        create_leye_pose=True,
+        create_reye_pose=True,
+        num_betas=NUM_BETAS,
+        num_expression_coeffs=NUM_EXPRESSION,
+    )
+
+
+def load_model(
+    model_path: str | os.PathLike[str],
+    gender: str = "neutral",
+    backend: str = "torch",
+    top_k: int | None = None,
+) -> Any:
+    """SMPL-X model for ``backend``: ``smplx.SMPLX`` (torch) or a :class:`~motion_gen_survey.lbs_numpy.LBSModel`."""
+    if backend == "torch":
+        return create_smplx_model(model_path, gender)
+    from motion_gen_survey.lbs_numpy import DEFAULT_TOP_K, load_lbs_model
+
+    return load_lbs_model(model_path, gender, top_k=top_k or DEFAULT_TOP_K)
+
+
+def _variant(backend: str, top_k: int | None) -> str:
+    if backend == "torch":
+        return ""
+    from motion_gen_survey.lbs_numpy import DEFAULT_TOP_K
+
+    return f"{backend}-k{top_k or DEFAULT_TOP_K}"
+
+
+def bake_vertices(
+    model: Any,
+    poses: np.ndarray,
+    betas: Sequence[float] | np.ndarray | None = None,
+    transl: np.ndarray | None = None,
+    batch_size: int = 256,
+    out: np.ndarray | None = None,
+    dtype: npt.DTypeLike = np.float32,
+) -> np.ndarray:
+    """Run a pose sequence through SMPL-X in batches and return its vertices.
+
+    Input tensors are allocated once at ``batch_size`` rows and refilled per
+    batch; the last (short) batch uses row slices of the same tensors.
+
+    Parameters
+    ----------
+    model : smplx.SMPLX | LBSModel
+        Model created by :func:`create_smplx_model` or :func:`load_model`;
+        an ``LBSModel`` is posed with NumPy (no torch import).
+    poses : np.ndarray
+        ``(frames, 165)`` axis-angle poses.
+    betas : array-like, optional
+        Shape coefficients (up to 10), shared by all frames.
+    transl : np.ndarray, optional
+        ``(frames, 3)`` root translation.
+    batch_size : int
+        Frames per forward pass.
+    out : np.ndarray, optional
+        Preallocated ``(frames, V, 3)`` output (e.g. a ``np.memmap``).
+    dtype : dtype
+        Output dtype when ``out`` is not given.
+
+    Returns
+    -------
+    np.ndarray
+        Vertex positions of shape ``(frames, V, 3)``.
+    """
+    from motion_gen_survey.lbs_numpy import LBSModel
+
+    num_frames = len(poses)
+    if out is None:
+        out = np.empty((num_frames, int(model.get_num_verts()), 3), dtype=dtype)
+    if isinstance(model, LBSModel):
+        return model.pose(poses, betas, transl, batch_size=batch_size, out=out)
+
+    import torch
+
+    rows = max(1, min(batch_size, num_frames))
+    device = model.shapedirs.device
+
+    pose_t = torch.zeros(rows, POSE_DIM, device=device)
+    transl_t = torch.zeros(rows, 3, device=device)
+    expression_t = torch.zeros(rows, NUM_EXPRESSION, device=device)
+    betas_t = (
+        torch.from_numpy(_normalize_betas(betas)).to(device).expand(rows, NUM_BETAS)
+    )
+
+    with torch.no_grad():
+        for start in range(0, num_frames, rows):
+            n = min(rows, num_frames - start)
+            pose_t[:n].copy_(torch.from_numpy(poses[start : start + n]))
+            if transl is not None:
+                transl_t[:n].copy_(
+                    torch.from_numpy(
+                        np.ascontiguousarray(
+                            transl[start : start + n], dtype=np.float32
+                        )
+                    )
+                )
+            params = {name: pose_t[:n, sl] for name, sl in POSE_LAYOUT.items()}
+            output = model(
+                betas=betas_t[:n],
+                expression=expression_t[:n],
+                transl=transl_t[:n],
+                return_verts=True,
+                **params,
+            )
+            out[start : start + n] = output.vertices.cpu().numpy()
+    return out
+
+
+def cache_path_for(
+    pose_file: str | os.PathLike[str],
+    gender: str,
+    betas: np.ndarray | None = None,
+    dtype: str = "float32",
+    transl_file: str | os.PathLike[str] | None = None,
+    cache_dir: str | os.PathLike[str] = DEFAULT_CACHE_DIR,
+    variant: str = "",
+) -> pathlib.Path:
+    """Return the cache file a bake of these inputs would be written to."""
+    key = cache_key(pose_file, gender, betas, dtype, transl_file, variant)
+    stem = pathlib.Path(pose_file).stem
+    return pathlib.Path(cache_dir) / f"{stem}-{gender}-{key[:16]}.npy"
+
+
+def bake_to_cache(
+    pose_file: str | os.PathLike[str],
+    model_path: str | os.PathLike[str] = "data",
+    gender: str = "neutral",
+    betas: Sequence[float] | np.ndarray | None = None,
+    transl_file: str | os.PathLike[str] | None = None,
+    cache_dir: str | os.PathLike[str] = DEFAULT_CACHE_DIR,
+    dtype: str = "float32",
+    batch_size: int = 256,
+    force: bool = False,
+    backend: str = "torch",
+    top_k: int | None = None,
+) -> pathlib.Path:
+    """Bake ``pose_file`` unless an up-to-date cache entry already exists.
+
+    The vertices are written straight into a memory-mapped ``.npy`` so peak
+    memory stays at one batch. The topology is stored once per cache
+    directory in ``smplx_faces.npy``. ``backend="numpy"`` skins with
+    ``top_k`` weights per vertex instead of running smplx.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the cached ``(frames, 10475, 3)`` vertex array.
+    """
+    betas_arr = _normalize_betas(betas)
+    if transl_file is None:
+        transl_file = find_transl_file(pose_file)
+    variant = _variant(backend, top_k)
+    path = cache_path_for(
+        pose_file, gender, betas_arr, dtype, transl_file, cache_dir, variant
+    )
+    faces_path = path.parent / FACES_FILENAME
+    if path.exists() and faces_path.exists() and not force:
+        return path
+
+    poses = load_pose_sequence(pose_file)
+    transl = None
+    if transl_file is not None:
+        transl = np.load(transl_file).reshape(-1, 3)
+        if len(transl) != len(poses):
+            raise ValueError(
+                f"Translation has {len(transl)} frames but poses have {len(poses)}"
+            )
+
+    model = load_model(model_path, gender, backend, top_k)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    out = np.lib.format.open_memmap(
+        tmp, mode="w+", dtype=dtype, shape=(len(poses), int(model.get_num_verts()), 3)
+    )
+    bake_vertices(model, poses, betas_arr, transl, batch_size=batch_size, out=out)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+    if not faces_path.exists():
+        np.save(faces_path, np.asarray(model.faces, dtype=np.int32))
+
+    info = {
+        "pose_file": str(pose_file),
+        "transl_file": str(transl_file) if transl_file is not None else None,
+        "gender": gender,
+        "betas": betas_arr.tolist(),
+        "dtype": dtype,
+        "frames": len(poses),
+        "backend": variant or backend,
+    }
+    path.with_suffix(".json").write_text(json.dumps(info, indent=2), encoding="utf-8")
+    return path
+
+
+def load_baked_vertices(
+    cache_file: str | os.PathLike[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Memory-map a baked vertex array and load the shared faces (torch-free).
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        ``(vertices, faces)`` with shapes ``(frames, V, 3)`` and ``(F, 3)``.
+    """
+    cache_file = pathlib.Path(cache_file)
+    vertices = np.load(cache_file, mmap_mode="r")
+    faces = np.load(cache_file.parent / FACES_FILENAME)
+    return vertices, faces
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Bake an SMPL-X pose sequence into a cached vertex array"
+    )
+    parser.add_argument("pose_file", help="(frames, 165) axis-angle pose .npy")
+    parser.add_argument(
+        "--model-path",
+        default="data",
+        help="Path containing smplx/ directory (default: data)",
+    )
+    parser.add_argument(
+        "--gender", choices=["neutral", "male", "female"], default="neutral"
+    )
+    parser.add_argument(
+        "--betas",
+        type=float,
+        nargs="*",
+        default=None,
+        help="Up to 10 shape coefficients",
+    )
+    parser.add_argument(
+        "--transl-file",
+        default=None,
+        help=f"(frames, 3) translation .npy (default: {TRANSL_FILENAME} next to pose file)",
+    )
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument(
+        "--force", action="store_true", help="Re-bake even if a cache entry exists"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="torch",
+        help="smplx forward pass (torch) or torch-free NumPy skinning",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Skinning weights per vertex (numpy backend)",
+    )
+    args = parser.parse_args(argv)
+
+    path = bake_to_cache(
+        args.pose_file,
+        model_path=args.model_path,
+        gender=args.gender,
+        betas=args.betas,
+        transl_file=args.transl_file,
+        cache_dir=args.cache_dir,
+        dtype=args.dtype,
+        batch_size=args.batch_size,
+        force=args.force,
+        backend=args.backend,
+        top_k=args.top_k,
+    )
+    vertices, _ = load_baked_vertices(path)
+    print(f"Baked vertices {vertices.shape} {vertices.dtype}: {path}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
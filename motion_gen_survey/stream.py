@@ -0,0 +1,608 @@
+"""Live joint-frame streaming between a producer and the viewers.
+
+A producer (a generation loop, or :func:`replay` of a finished result)
+serves frames on a local socket; viewers connect at any time, first receive
+everything sent so far, then the live frames. Messages are a fixed 20-byte
+header followed by a payload::
+
+    magic b"T2MS" | type u8 | version u8 | skeletons u16 | start u32 | count u32 | payload bytes u32
+
+- ``HELLO``: JSON payload with ``num_skeletons``, ``num_joints``, ``fps``
+  and optional ``text`` / ``lengths``; sent once, first.
+- ``FRAMES``: ``count`` frames starting at frame ``start``, as
+  little-endian float32 ``(count, skeletons, joints, 3)``.
+- ``END``: the sequence is complete.
+
+Addresses are ``host:port`` (TCP, default ``127.0.0.1:8765``) or
+``unix:/path/to/socket``.
+
+:class:`StreamServer` runs an asyncio server on a background thread;
+:meth:`StreamServer.send` can be called from any (e.g. the generation)
+thread. :class:`StreamClient` runs an asyncio reader on a background thread
+that appends frames to a :class:`StreamBuffer`, a growable ring buffer that
+implements the viewers' frame-source interface. The animator's Qt timer
+polls the buffer's frame count and keeps playback running at the live edge
+(``animate --stream ADDRESS``).
+
+In a generation loop::
+
+    with StreamServer(
+        DEFAULT_ADDRESS, num_skeletons=1, fps=30.0, meta={"text": texts}
+    ) as server:
+        for chunk in chunks:  # (1, frames, 22, 3) float32 each
+            server.send(chunk)
+        server.finish()
+
+Usage:
+    python -m motion_gen_survey stream replay <result_dir> --rate 1.0 --chunk-frames 30
+    python -m motion_gen_survey animate --stream 127.0.0.1:8765
+    python -m motion_gen_survey stream tail 127.0.0.1:8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import struct
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.t2m import NUM_JOINTS
+from motion_gen_survey.transforms import IDENTITY, AxisMap, apply_axis_map
+
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+PROTOCOL_VERSION = 1
+MAGIC = b"T2MS"
+HEADER = struct.Struct("<4sBBHIII")
+MSG_HELLO, MSG_FRAMES, MSG_END = 1, 2, 3
+DEFAULT_CHUNK_FRAMES = 30
+INITIAL_CAPACITY = 1024
+
+
+def parse_address(address: str) -> tuple[str, Any]:
+    """``"unix:/path"`` -> ``("unix", path)``; ``"host:port"`` -> ``("tcp", (host, port))``."""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:") :]
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(
+            f"bad stream address {address!r}; expected host:port or unix:/path"
+        )
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def encode_message(
+    kind: int, payload: bytes = b"", skeletons: int = 0, start: int = 0, count: int = 0
+) -> bytes:
+    return (
+        HEADER.pack(
+            MAGIC, kind, PROTOCOL_VERSION, skeletons, start, count, len(payload)
+        )
+        + payload
+    )
+
+
+def encode_frames(frames: np.ndarray, start: int) -> bytes:
+    """``FRAMES`` message for ``(skeletons, count, joints, 3)`` frames starting at ``start``."""
+    data = np.ascontiguousarray(np.asarray(frames, dtype="<f4").transpose(1, 0, 2, 3))
+    return encode_message(
+        MSG_FRAMES,
+        data.tobytes(),
+        skeletons=data.shape[1],
+        start=start,
+        count=data.shape[0],
+    )
+
+
+# --- Producer ---
+class StreamServer:
+    """Serve frames to any number of viewers from a background asyncio loop.
+
+    Parameters
+    ----------
+    address : str
+        ``host:port`` or ``unix:/path``.
+    num_skeletons : int
+        Skeletons per frame.
+    fps : float
+        Source frame rate.
+    meta : dict, optional
+        Extra ``HELLO`` fields (``text``, ``lengths``, ...).
+    num_joints : int
+        Joints per skeleton.
+
+    Attributes
+    ----------
+    frames_sent : int
+        Frames published so far.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        num_skeletons: int,
+        fps: float,
+        meta: dict[str, Any] | None = None,
+        num_joints: int = NUM_JOINTS,
+    ) -> None:
+        self.address = address
+        self.num_skeletons = int(num_skeletons)
+        self.num_joints = int(num_joints)
+        self.frames_sent = 0
+        hello = {
+            **(meta or {}),
+            "num_skeletons": self.num_skeletons,
+            "num_joints": self.num_joints,
+            "fps": float(fps),
+            "version": PROTOCOL_VERSION,
+        }
+        # Every message ever sent, so late viewers get the full sequence
+        self._history: list[bytes] = [
+            encode_message(MSG_HELLO, json.dumps(hello).encode("utf-8"))
+        ]
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._loop = asyncio.new_event_loop()
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> StreamServer:
+        """Bind and start serving on a daemon thread."""
+        ready = threading.Event()
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._server = self._loop.run_until_complete(self._bind())
+            except BaseException as exc:  # surface bind errors in start()
+                errors.append(exc)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="stream-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    async def _bind(self) -> asyncio.AbstractServer:
+        kind, target = parse_address(self.address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.unlink(target)
+            return await asyncio.start_unix_server(self._handle, path=target)
+        return await asyncio.start_server(self._handle, host=target[0], port=target[1])
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        for message in self._history:
+            writer.write(message)
+        self._writers.add(writer)
+        try:
+            await writer.drain()
+            await reader.read()  # viewers send nothing; returns at disconnect
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _publish(self, message: bytes) -> None:
+        self._history.append(message)
+        for writer in list(self._writers):
+            if writer.is_closing():
+                self._writers.discard(writer)
+            else:
+                writer.write(message)
+
+    def send(self, frames: np.ndarray) -> None:
+        """Publish ``(skeletons, count, joints, 3)`` frames (thread-safe)."""
+        frames = np.asarray(frames, dtype=np.float32)
+        if frames.ndim == 3:
+            frames = frames[None]
+        if frames.shape[0] != self.num_skeletons or frames.shape[2:] != (
+            self.num_joints,
+            3,
+        ):
+            raise ValueError(
+                f"expected ({self.num_skeletons}, count, {self.num_joints}, 3) frames, "
+                f"got {frames.shape}"
+            )
+        message = encode_frames(frames, self.frames_sent)
+        self.frames_sent += frames.shape[1]
+        self._loop.call_soon_threadsafe(self._publish, message)
+
+    def finish(self) -> None:
+        """Tell viewers the sequence is complete."""
+        self._loop.call_soon_threadsafe(self._publish, encode_message(MSG_END))
+
+    def close(self) -> None:
+        """Stop serving and join the loop thread."""
+        if self._thread is None:
+            return
+
+        async def shutdown() -> None:
+            if self._server is not None:
+                self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+        kind, target = parse_address(self.address)
+        if kind == "unix" and os.path.exists(target):
+            os.unlink(target)
+
+    def __enter__(self) -> StreamServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# --- Consumer ---
+class StreamBuffer:
+    """Growable ring buffer of received frames; a frame source for the viewers.
+
+    Capacity doubles as frames arrive, up to ``max_frames``; beyond that the
+    oldest frames are overwritten and reading them returns the oldest frame
+    still held.
+
+    Attributes
+    ----------
+    num_frames : int
+        Frames received so far (absolute index of the live edge + 1).
+    first_frame : int
+        Oldest frame still held.
+    live : bool
+        True while the producer may still send frames; the animator keeps
+        growing its frame count and holds at the live edge meanwhile.
+    """
+
+    def __init__(
+        self,
+        num_skeletons: int,
+        num_joints: int = NUM_JOINTS,
+        max_frames: int | None = None,
+        initial_capacity: int = INITIAL_CAPACITY,
+    ) -> None:
+        self.num_skeletons = int(num_skeletons)
+        self.num_joints = int(num_joints)
+        self.max_frames = int(max_frames) if max_frames else None
+        capacity = max(
+            1,
+            initial_capacity
+            if self.max_frames is None
+            else min(initial_capacity, self.max_frames),
+        )
+        # Frame-major, so frame(i) is one contiguous (N, joints, 3) block
+        self._buf = np.zeros(
+            (capacity, self.num_skeletons, self.num_joints, 3), dtype=np.float32
+        )
+        self._lock = threading.Lock()
+        self.num_frames = 0
+        self.first_frame = 0
+        self.live = True
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed and (
+            self.max_frames is None or capacity < self.max_frames
+        ):
+            capacity *= 2
+        if self.max_frames is not None:
+            capacity = min(capacity, self.max_frames)
+        if capacity == self.capacity:
+            return
+        new = np.zeros((capacity, *self._buf.shape[1:]), dtype=np.float32)
+        for i in range(self.first_frame, self.num_frames):
+            new[i % capacity] = self._buf[i % self.capacity]
+        self._buf = new
+
+    def append(self, start: int, frames: np.ndarray) -> None:
+        """Store ``(count, N, joints, 3)`` frames beginning at absolute frame ``start``."""
+        count = len(frames)
+        with self._lock:
+            stop = start + count
+            self._grow(stop - self.first_frame)
+            capacity = self.capacity
+            if count > capacity:
+                frames, start = frames[-capacity:], stop - capacity
+            idx = np.arange(start, stop) % capacity
+            self._buf[idx] = frames
+            self.num_frames = max(self.num_frames, stop)
+            self.first_frame = max(self.first_frame, self.num_frames - capacity)
+
+    def frame(self, index: int) -> np.ndarray:
+        with self._lock:
+            index = min(max(int(index), self.first_frame), self.num_frames - 1)
+            return self._buf[index % self.capacity]
+
+    def close(self) -> None:
+        pass
+
+
+class StreamClient:
+    """Connect to a :class:`StreamServer` and fill a :class:`StreamBuffer` on a background asyncio loop.
+
+    Parameters
+    ----------
+    address : str
+        ``host:port`` or ``unix:/path``.
+    max_frames : int, optional
+        Ring buffer limit (default: keep every frame).
+    connect_timeout : float
+        Seconds to keep retrying while the producer is not up yet.
+    axis_map : AxisMap, optional
+        Axis conversion applied to received frames (e.g. Z-up to Y-up).
+
+    Attributes
+    ----------
+    meta : dict
+        The producer's ``HELLO`` fields.
+    buffer : StreamBuffer | None
+        Received frames (created on ``HELLO``).
+    live : bool
+        True until ``END`` arrives or the connection drops.
+    first_frame_s : float | None
+        Seconds from :meth:`start` to the first received frames.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        max_frames: int | None = None,
+        connect_timeout: float = 30.0,
+        axis_map: AxisMap | None = None,
+    ) -> None:
+        self.address = address
+        self.max_frames = max_frames
+        self.connect_timeout = connect_timeout
+        self.axis_map = (
+            axis_map if axis_map is not None and axis_map != IDENTITY else None
+        )
+        self.meta: dict[str, Any] = {}
+        self.buffer: StreamBuffer | None = None
+        self.live = True
+        self.error: BaseException | None = None
+        self.first_frame_s: float | None = None
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> StreamClient:
+        self._started = time.perf_counter()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._task = self._loop.create_task(self._run())
+            with contextlib.suppress(asyncio.CancelledError):
+                self._loop.run_until_complete(self._task)
+
+        self._thread = threading.Thread(target=run, name="stream-client", daemon=True)
+        self._thread.start()
+        return self
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        kind, target = parse_address(self.address)
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                if kind == "unix":
+                    return await asyncio.open_unix_connection(target)
+                return await asyncio.open_connection(*target)
+            except (ConnectionError, FileNotFoundError):
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+    async def _run(self) -> None:
+        writer = None
+        try:
+            reader, writer = await self._connect()
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                magic, kind, version, skeletons, start, count, length = HEADER.unpack(
+                    header
+                )
+                if magic != MAGIC or version != PROTOCOL_VERSION:
+                    raise ValueError(
+                        f"not a T2M frame stream (magic {magic!r}, version {version})"
+                    )
+                payload = await reader.readexactly(length)
+                if kind == MSG_HELLO:
+                    self.meta = json.loads(payload)
+                    self.buffer = StreamBuffer(
+                        self.meta["num_skeletons"],
+                        self.meta.get("num_joints", NUM_JOINTS),
+                        max_frames=self.max_frames,
+                    )
+                elif kind == MSG_FRAMES and self.buffer is not None:
+                    frames = np.frombuffer(payload, dtype="<f4").reshape(
+                        count, skeletons, -1, 3
+                    )
+                    if self.axis_map is not None:
+                        frames = apply_axis_map(frames, self.axis_map)
+                    self.buffer.append(start, frames)
+                    if self.first_frame_s is None:
+                        self.first_frame_s = time.perf_counter() - self._started
+                        self._ready.set()
+                elif kind == MSG_END:
+                    break
+        except asyncio.IncompleteReadError:
+            pass  # producer went away
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.live = False
+            if self.buffer is not None:
+                self.buffer.live = False
+            self._ready.set()
+            if writer is not None:
+                writer.close()
+
+    def wait_first_frame(self, timeout: float | None = None) -> StreamBuffer:
+        """Block until frames arrive; raise if the stream ended or failed first."""
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"no frames from {self.address} within {timeout} s")
+        if self.buffer is None or self.buffer.num_frames == 0:
+            raise ConnectionError(
+                f"stream {self.address} ended without frames"
+            ) from self.error
+        return self.buffer
+
+    @property
+    def fps(self) -> float:
+        return float(self.meta.get("fps", 30.0))
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        if self._task is not None and not self._task.done():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+
+# --- Replay ---
+def replay(
+    path: str,
+    address: str = DEFAULT_ADDRESS,
+    rate: float = 1.0,
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+    sample: int = 0,
+    grid: int = 1,
+    linger: bool = True,
+) -> None:
+    """Serve a finished result as if it were being generated, ``rate`` x real time.
+
+    With ``linger`` the server keeps running after the last frame (until
+    Ctrl-C) so viewers can still attach.
+    """
+    from motion_gen_survey.motion_codec import MotionArchive, open_motion
+    from motion_gen_survey.motion_store import require_t2m
+
+    store = open_motion(path)
+    if not isinstance(store, MotionArchive):
+        require_t2m(store, "the stream replay")
+    stop = min(store.num_samples, sample + max(1, grid))
+    joints = store.joints[sample:stop]
+    meta = {"text": store.text, "lengths": store.lengths, "source": str(path)}
+    with StreamServer(address, stop - sample, store.fps, meta=meta) as server:
+        print(
+            f"Serving {stop - sample} skeleton(s) x {store.num_frames} frames on {address}"
+        )
+        start = time.perf_counter()
+        for first in range(0, store.num_frames, chunk_frames):
+            last = min(store.num_frames, first + chunk_frames)
+            if rate > 0:
+                # Pace by the chunk's last frame so the stream never runs ahead of real time
+                delay = start + last / (store.fps * rate) - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            server.send(np.asarray(joints[:, first:last], dtype=np.float32))
+        server.finish()
+        print(
+            f"Sent {server.frames_sent} frames in {time.perf_counter() - start:.1f} s"
+        )
+        if linger:
+            print("Still serving for late viewers; Ctrl-C to stop")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Live joint-frame streaming: replay a result, tail a stream"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_replay = sub.add_parser(
+        "replay", help="Serve a result (store, results.npy or .t2mc) at a given rate"
+    )
+    p_replay.add_argument("path")
+    p_replay.add_argument(
+        "--address", default=DEFAULT_ADDRESS, help="host:port or unix:/path"
+    )
+    p_replay.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Multiple of real time (0: as fast as possible)",
+    )
+    p_replay.add_argument(
+        "--chunk-frames",
+        type=int,
+        default=DEFAULT_CHUNK_FRAMES,
+        help="Frames per message",
+    )
+    p_replay.add_argument("--sample", type=int, default=0)
+    p_replay.add_argument(
+        "--grid", type=int, default=1, help="Consecutive samples to stream together"
+    )
+    p_replay.add_argument(
+        "--exit-when-done",
+        action="store_true",
+        help="Stop serving after the last frame",
+    )
+
+    p_tail = sub.add_parser("tail", help="Connect and report frames as they arrive")
+    p_tail.add_argument("address", nargs="?", default=DEFAULT_ADDRESS)
+    p_tail.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        replay(
+            args.path,
+            args.address,
+            args.rate,
+            args.chunk_frames,
+            args.sample,
+            args.grid,
+            linger=not args.exit_when_done,
+        )
+        return
+    client = StreamClient(args.address, connect_timeout=args.timeout).start()
+    buffer = client.wait_first_frame(args.timeout)
+    latency = client.first_frame_s
+    assert latency is not None  # set before the first frames are handed out
+    print(f"First frames after {latency * 1000:.0f} ms: {client.meta}")
+    seen = 0
+    try:
+        while client.live or buffer.num_frames != seen:
+            if buffer.num_frames != seen:
+                seen = buffer.num_frames
+                print(f"  {seen} frames ({seen / client.fps:.1f} s of motion)")
+            time.sleep(0.25)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    print(f"Stream ended after {seen} frames")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,101 @@
+"""T2M (HumanML3D) 22-joint skeleton definition shared by viewers and tools.
+
+Joint order and kinematic chains follow
+``data_loaders/humanml/utils/paramUtil.py`` in FlowMDM. The order matches the
+first 22 SMPL / SMPL-X body joints.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+NUM_JOINTS = 22
+ROOT_JOINT = 0
+# L.Ankle, R.Ankle, L.Foot, R.Foot
+FOOT_JOINTS: tuple[int, ...] = (7, 8, 10, 11)
+
+# T2M joint indices and names (HumanML3D format)
+t2m_joint_names: dict[int, str] = {
+    0: "Pelvis",
+    1: "L.Hip",
+    2: "R.Hip",
+    3: "Spine1",
+    4: "L.Knee",
+    5: "R.Knee",
+    6: "Spine2",
+    7: "L.Ankle",
+    8: "R.Ankle",
+    9: "Spine3",
+    10: "L.Foot",
+    11: "R.Foot",
+    12: "Neck",
+    13: "L.Collar",
+    14: "R.Collar",
+    15: "Head",
+    16: "L.Shoulder",
+    17: "R.Shoulder",
+    18: "L.Elbow",
+    19: "R.Elbow",
+    20: "L.Wrist",
+    21: "R.Wrist",
+}
+
+# T2M kinematic chain structure from data_loaders/humanml/utils/paramUtil.py
+t2m_kinematic_chain: list[list[int]] = [
+    [0, 2, 5, 8, 11],  # Right leg: Pelvis → R.Hip → R.Knee → R.Ankle → R.Foot
+    [0, 1, 4, 7, 10],  # Left leg: Pelvis → L.Hip → L.Knee → L.Ankle → L.Foot
+    [0, 3, 6, 9, 12, 15],  # Spine: Pelvis → Spine1 → Spine2 → Spine3 → Neck → Head
+    [
+        9,
+        14,
+        17,
+        19,
+        21,
+    ],  # Right arm: Spine3 → R.Collar → R.Shoulder → R.Elbow → R.Wrist
+    [9, 13, 16, 18, 20],  # Left arm: Spine3 → L.Collar → L.Shoulder → L.Elbow → L.Wrist
+]
+
+# Bones as (start, end) joint index pairs, in chain order
+skeleton_pairs: list[tuple[int, int]] = [
+    (chain[i], chain[i + 1])
+    for chain in t2m_kinematic_chain
+    for i in range(len(chain) - 1)
+]
+
+
+def skeleton_line_cells(
+    num_skeletons: int = 1, num_joints: int = NUM_JOINTS
+) -> np.ndarray:
+    """Build VTK line cells for ``num_skeletons`` skeletons packed in one point array.
+
+    Skeleton ``k`` owns points ``[k * num_joints, (k + 1) * num_joints)``.
+
+    Returns
+    -------
+    np.ndarray
+        Flat ``[2, a, b, 2, a, b, ...]`` cell array of length
+        ``3 * len(skeleton_pairs) * num_skeletons``.
+    """
+    pairs = np.asarray(skeleton_pairs, dtype=np.int64)
+    offsets = np.arange(num_skeletons, dtype=np.int64)[:, None, None] * num_joints
+    cells = np.empty((num_skeletons, len(pairs), 3), dtype=np.int64)
+    cells[:, :, 0] = 2
+    cells[:, :, 1:] = pairs[None] + offsets
+    return cells.ravel()
+
+
+def grid_layout(num_cells: int, spacing: float = 1.5) -> np.ndarray:
+    """Return ``(num_cells, 3)`` ground-plane (x, z) cell centres around the origin.
+
+    Cells are laid out row-major on a near-square grid in the Y-up frame.
+    """
+    cols = max(1, math.ceil(math.sqrt(num_cells)))
+    rows = max(1, math.ceil(num_cells / cols))
+    idx = np.arange(num_cells)
+    centres = np.zeros((num_cells, 3))
+    centres[:, 0] = (idx % cols - (cols - 1) / 2) * spacing
+    centres[:, 2] = (idx // cols - (rows - 1) / 2) * spacing
+    return centres
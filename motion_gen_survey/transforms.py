@@ -0,0 +1,217 @@
+"""Coordinate-frame conversions for ``(..., 3)`` point batches.
+
+FlowMDM joints are Y-up; SMPL-X meshes are Z-up. The conversions between
+them are signed axis permutations, represented by :class:`AxisMap`:
+
+    Z-up -> Y-up:  (x, y, z) -> (x, z, -y)   # -90 deg about X
+    Y-up -> Z-up:  (x, y, z) -> (x, -z, y)
+
+:func:`apply_axis_map` and :func:`apply_rotation` work on any ``(..., 3)``
+array (one mesh, a ``(frames, V, 3)`` sequence, a ``(batch, frames, 22, 3)``
+store) either into a caller-provided ``out`` buffer (no temporaries: one
+strided ufunc call per output column) or in place, in which case rows are
+staged through a bounded scratch block. :func:`infer_up_axis` (and its
+batched form :func:`infer_up_axes`) votes over the frames of each sequence
+in one vectorized pass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+AXIS_NAMES = ("X", "Y", "Z")
+# Rows staged per scratch block for in-place conversions (64k rows = 768 KB float32)
+SCRATCH_ROWS = 1 << 16
+
+
+@dataclass(frozen=True)
+class AxisMap:
+    """Signed axis permutation: ``out[..., i] = signs[i] * x[..., perm[i]]``."""
+
+    perm: tuple[int, int, int]
+    signs: tuple[float, float, float]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Equivalent 3x3 matrix ``M`` with ``out = x @ M.T``."""
+        m = np.zeros((3, 3), dtype=np.float64)
+        m[np.arange(3), self.perm] = self.signs
+        return m
+
+    def inverse(self) -> AxisMap:
+        perm = [0, 0, 0]
+        signs = [1.0, 1.0, 1.0]
+        for i, (p, s) in enumerate(zip(self.perm, self.signs, strict=True)):
+            perm[p] = i
+            signs[p] = s
+        return AxisMap((perm[0], perm[1], perm[2]), (signs[0], signs[1], signs[2]))
+
+
+IDENTITY = AxisMap((0, 1, 2), (1.0, 1.0, 1.0))
+ZUP_TO_YUP = AxisMap((0, 2, 1), (1.0, 1.0, -1.0))
+YUP_TO_ZUP = ZUP_TO_YUP.inverse()
+
+
+def _apply_into(x: np.ndarray, axis_map: AxisMap, out: np.ndarray) -> None:
+    for i, (p, s) in enumerate(zip(axis_map.perm, axis_map.signs, strict=True)):
+        if s == 1.0:
+            np.copyto(out[..., i], x[..., p])
+        else:
+            np.multiply(x[..., p], s, out=out[..., i])
+
+
+def apply_axis_map(
+    points: np.ndarray,
+    axis_map: AxisMap,
+    out: np.ndarray | None = None,
+    scratch_rows: int = SCRATCH_ROWS,
+) -> np.ndarray:
+    """Apply a signed axis permutation to ``(..., 3)`` points.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Input of shape ``(..., 3)``.
+    axis_map : AxisMap
+        Conversion to apply, e.g. ``ZUP_TO_YUP``.
+    out : np.ndarray, optional
+        Destination of the same shape. May be ``points`` itself for an
+        in-place conversion (rows are staged through a scratch block of at
+        most ``scratch_rows`` rows). Allocated if omitted.
+
+    Returns
+    -------
+    np.ndarray
+        ``out``.
+    """
+    if points.shape[-1] != 3:
+        raise ValueError(f"Expected (..., 3) points, got {points.shape}")
+    if out is None:
+        out = np.empty(points.shape, dtype=points.dtype)
+    elif out.shape != points.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {points.shape}")
+    if not np.shares_memory(points, out):
+        _apply_into(points, axis_map, out)
+        return out
+    if axis_map == IDENTITY:
+        return out
+    src = points.reshape(-1, 3)
+    dst = out.reshape(-1, 3)
+    if not np.shares_memory(dst, out):
+        raise ValueError(
+            "In-place conversion needs an array that can be viewed as (-1, 3)"
+        )
+    scratch = np.empty((min(scratch_rows, len(src)), 3), dtype=points.dtype)
+    for start in range(0, len(src), len(scratch)):
+        stop = min(len(src), start + len(scratch))
+        block = scratch[: stop - start]
+        np.copyto(block, src[start:stop])
+        _apply_into(block, axis_map, dst[start:stop])
+    return out
+
+
+def rotation_matrix(axis: int | str, degrees: float) -> np.ndarray:
+    """Right-handed rotation matrix about ``axis`` (0/1/2 or ``"x"``/``"y"``/``"z"``)."""
+    a = "xyz".index(axis.lower()) if isinstance(axis, str) else int(axis)
+    c, s = np.cos(np.radians(degrees)), np.sin(np.radians(degrees))
+    i, j = [k for k in range(3) if k != a]
+    m = np.eye(3)
+    m[i, i] = c
+    m[j, j] = c
+    m[j, i] = s
+    m[i, j] = -s
+    return m
+
+
+def apply_rotation(
+    points: np.ndarray,
+    matrix: np.ndarray,
+    out: np.ndarray | None = None,
+    scratch_rows: int = SCRATCH_ROWS,
+) -> np.ndarray:
+    """Rotate ``(..., 3)`` points by ``matrix`` (``out = points @ matrix.T``).
+
+    Works in blocks of ``scratch_rows`` rows so temporaries stay bounded;
+    ``out`` may be ``points`` itself.
+    """
+    if points.shape[-1] != 3:
+        raise ValueError(f"Expected (..., 3) points, got {points.shape}")
+    if out is None:
+        out = np.empty(points.shape, dtype=points.dtype)
+    mt = np.ascontiguousarray(np.asarray(matrix, dtype=points.dtype).T)
+    src = points.reshape(-1, 3)
+    dst = out.reshape(-1, 3)
+    if not np.shares_memory(dst, out):
+        raise ValueError("out must be viewable as (-1, 3)")
+    in_place = np.shares_memory(src, dst)
+    scratch = np.empty((min(scratch_rows, max(1, len(src))), 3), dtype=points.dtype)
+    for start in range(0, len(src), len(scratch)):
+        stop = min(len(src), start + len(scratch))
+        if in_place:
+            block = scratch[: stop - start]
+            np.copyto(block, src[start:stop])
+            np.matmul(block, mt, out=dst[start:stop])
+        else:
+            np.matmul(src[start:stop], mt, out=dst[start:stop])
+    return out
+
+
+def axis_bounds(
+    points: np.ndarray, batch_dims: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per-axis min/max over everything except the first ``batch_dims`` axes.
+
+    Returns two arrays of shape ``points.shape[:batch_dims] + (3,)``.
+    """
+    lead = points.shape[:batch_dims]
+    flat = points.reshape((*lead, -1, 3))
+    return flat.min(axis=-2), flat.max(axis=-2)
+
+
+def infer_up_axis(points: np.ndarray) -> int:
+    """Infer the up axis (0/1/2) of a body from its per-frame extent.
+
+    A standing human is much taller than wide or deep, so within one frame
+    the axis with the largest spread of the points is the up axis. The
+    extent is taken per frame (over the second-to-last axis), so it does not
+    depend on where the body is: the spread over a whole sequence would be
+    dominated by the distance travelled, which for walking easily exceeds
+    body height. Each frame votes and the majority wins; frames with
+    non-finite coordinates or no spread at all (zero padding) do not vote.
+
+    ``points`` is ``(..., points, 3)``: a single ``(V, 3)`` mesh or
+    ``(frames, joints, 3)`` pose, or anything with more leading axes
+    (e.g. ``(samples, frames, joints, 3)``), all of which vote together.
+    Use :func:`infer_up_axes` for one axis per sequence.
+    """
+    return int(infer_up_axes(points, batch_dims=0))
+
+
+def infer_up_axes(points: np.ndarray, batch_dims: int = 1) -> np.ndarray:
+    """Batched :func:`infer_up_axis`: one up axis per leading index.
+
+    The first ``batch_dims`` axes of ``points`` are kept, so a
+    ``(batch, frames, joints, 3)`` array yields a ``(batch,)`` integer array;
+    everything after them votes together.
+    """
+    x = np.asarray(points)
+    lead = x.shape[:batch_dims]
+    frames = x.reshape((*lead, -1, *x.shape[-2:]))  # (*batch, frames, points, 3)
+    extent = frames.max(axis=-2) - frames.min(axis=-2)  # (*batch, frames, 3)
+    valid = np.isfinite(extent).all(axis=-1) & (extent.max(axis=-1, initial=0.0) > 0.0)
+    votes = np.argmax(np.where(np.isfinite(extent), extent, -np.inf), axis=-1)
+    counts = ((votes[..., None] == np.arange(3)) & valid[..., None]).sum(axis=-2)
+    return np.asarray(np.argmax(counts, axis=-1))
+
+
+def up_axis_map(up_axis: int) -> AxisMap:
+    """Return the conversion that brings data with ``up_axis`` up to Y-up."""
+    if up_axis == 1:
+        return IDENTITY
+    if up_axis == 2:
+        return ZUP_TO_YUP
+    # X-up -> Y-up: (x, y, z) -> (-y, x, z)
+    return AxisMap((1, 0, 2), (-1.0, 1.0, 1.0))
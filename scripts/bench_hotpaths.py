@@ -0,0 +1,389 @@
+"""Benchmarks for the load, render, bake, export and metric hot paths.
+
+Everything runs on synthetic data, so no FlowMDM checkpoint or result is
+needed:
+
+- motion: a smooth random walk of shape ``(batch, 22, 3, seq_len)`` saved as
+  a FlowMDM-style pickled ``results.npy``;
+- mesh: an SMPL-X-sized mesh sequence (10475 vertices, 20908 faces).
+
+Cases (``--cases`` selects a subset):
+
+- ``load``: ``np.load(allow_pickle=True)`` of ``results.npy`` vs. motion store
+  conversion, opening a converted store and random single-frame reads.
+- ``render``: ``FlowMDMAnimator.render_frame`` off-screen; per-frame latency
+  percentiles, the copy/label/text/render split from the animator's
+  profiler, and Python heap allocations across the loop (tracemalloc),
+  which checks the "no allocation during animation" claim. Needs PyVista.
+- ``bake``: SMPL-X vertex baking throughput. Needs torch, smplx and the
+  model files under ``--model-path``.
+- ``export``: per-frame PLY / OBJ and animated GLB throughput.
+- ``metrics``: per-frame jerk and full ``evaluate_store`` over the store.
+
+Cases whose optional dependencies are missing are reported as skipped.
+Results go to JSON; ``--baseline`` compares every timing/throughput metric
+against an earlier run (``*_per_s`` metrics are higher-is-better, all others
+lower-is-better) and ``--fail-on-regression`` turns slowdowns beyond
+``--tolerance`` into a non-zero exit.
+
+Usage (from the project root):
+    python scripts/bench_hotpaths.py --json tmp/bench/hotpaths.json
+    python scripts/bench_hotpaths.py --cases load metrics --baseline tmp/bench/hotpaths.json --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from motion_gen_survey.mesh_export import export_frames, export_glb
+from motion_gen_survey.metrics import evaluate_store, per_frame_jerk
+from motion_gen_survey.motion_store import convert_results_npy, open_motion_store
+from motion_gen_survey.t2m import NUM_JOINTS
+
+
+SMPLX_VERTS = 10475
+SMPLX_FACES = 20908
+
+
+class UnavailableError(Exception):
+    """Raised by a case whose optional dependencies or inputs are missing."""
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """Best wall time of ``repeat`` calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def synthetic_motion(batch: int, frames: int, seed: int = 0) -> np.ndarray:
+    """Smooth random-walk joints in FlowMDM layout ``(batch, 22, 3, frames)``."""
+    rng = np.random.default_rng(seed)
+    rest = rng.normal(scale=0.3, size=(1, NUM_JOINTS, 3, 1)).astype(np.float32)
+    rest[:, :, 1] += 1.0
+    accel = rng.normal(scale=1e-4, size=(batch, NUM_JOINTS, 3, frames)).astype(
+        np.float32
+    )
+    return rest + np.cumsum(np.cumsum(accel, axis=-1), axis=-1)
+
+
+def synthetic_mesh(frames: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """SMPL-X-sized ``(frames, 10475, 3)`` vertices and ``(20908, 3)`` faces."""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(scale=0.3, size=(1, SMPLX_VERTS, 3)).astype(np.float32)
+    drift = np.linspace(0.0, 1.0, frames, dtype=np.float32)[:, None, None]
+    verts = base + drift * rng.normal(scale=0.05, size=(1, SMPLX_VERTS, 3)).astype(
+        np.float32
+    )
+    faces = rng.integers(0, SMPLX_VERTS, size=(SMPLX_FACES, 3), dtype=np.int64)
+    return verts, faces
+
+
+def bench_load(ctx: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    work: pathlib.Path = ctx["work"]
+    results_file = work / "result" / "results.npy"
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    motion = synthetic_motion(args.batch, args.frames)
+    segment = max(1, args.frames // 4)
+    lengths = [segment] * 3 + [args.frames - 3 * segment]
+    results = {
+        "motion": motion,
+        "text": ["walk", "turn", "sit", "stand"][: len(lengths)],
+        "lengths": lengths,
+        "num_samples": args.batch,
+        "num_repetitions": 1,
+    }
+    np.save(results_file, np.array(results, dtype=object))
+
+    pickle_s, _ = _timed(
+        lambda: np.load(results_file, allow_pickle=True).item()["motion"], args.repeat
+    )
+    convert_s, _ = _timed(
+        lambda: convert_results_npy(results_file, fps=30.0), args.repeat
+    )
+    open_s, store = _timed(lambda: open_motion_store(results_file.parent), args.repeat)
+    ctx["store"] = store
+
+    rng = np.random.default_rng(1)
+    picks = rng.integers(0, [store.num_samples, store.num_frames], size=(args.reads, 2))
+    start = time.perf_counter()
+    for sample, frame in picks:
+        np.asarray(store.joints[sample, frame]).sum()
+    read_us = (time.perf_counter() - start) / len(picks) * 1e6
+    return {
+        "results_mb": results_file.stat().st_size / 2**20,
+        "pickle_load_s": pickle_s,
+        "convert_s": convert_s,
+        "store_open_s": open_s,
+        "frame_read_us": read_us,
+    }
+
+
+def bench_render(ctx: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        import pyvista  # noqa: F401
+    except ImportError as exc:
+        raise UnavailableError(f"pyvista not installed ({exc})") from exc
+    from motion_gen_survey.animation_viewer import FlowMDMAnimator
+
+    store = ctx.get("store") or open_motion_store(ctx["work"] / "result")
+    grid = min(args.grid, store.num_samples)
+    animator = FlowMDMAnimator(
+        store.joints[:grid],
+        offscreen=True,
+        window_size=(640, 480),
+        fps=store.fps,
+        profile=True,
+    )
+    frames = min(args.render_frames, animator.total_frames)
+    try:
+        for i in range(min(10, frames)):  # warm up GL state and the chunk cache
+            animator.render_frame(i)
+        tracemalloc.start()
+        base_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        latencies = np.empty(frames)
+        for i in range(frames):
+            start = time.perf_counter()
+            animator.render_frame(i)
+            latencies[i] = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        animator.plotter.close()  # type: ignore[attr-defined]
+        animator.source.close()
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    metrics = {
+        "skeletons": grid,
+        "frames": frames,
+        "frame_p50_ms": p50,
+        "frame_p95_ms": p95,
+        "frame_p99_ms": p99,
+        "frames_per_s": frames / latencies.sum(),
+        "py_heap_growth_bytes": current - base_current,
+        "py_heap_peak_bytes": peak - base_current,
+    }
+    # Per-stage split from the animator's own profiler
+    stages = (
+        animator.profiler.stats().get("stages_ms", {})
+        if animator.profiler is not None
+        else {}
+    )
+    metrics.update({f"stage_{name}_mean_ms": v["mean"] for name, v in stages.items()})
+    return metrics
+
+
+def bench_bake(ctx: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        import smplx  # noqa: F401
+        import torch  # noqa: F401
+    except ImportError as exc:
+        raise UnavailableError(f"torch/smplx not installed ({exc})") from exc
+    from motion_gen_survey.smplx_bake import POSE_DIM, bake_vertices, create_smplx_model
+
+    if not (pathlib.Path(args.model_path) / "smplx").is_dir():
+        raise UnavailableError(f"no SMPL-X models under {args.model_path}/smplx")
+    model = create_smplx_model(args.model_path)
+    poses = (
+        np.random.default_rng(0).normal(scale=0.2, size=(args.bake_frames, POSE_DIM))
+    ).astype(np.float32)
+    out = np.empty((len(poses), int(model.get_num_verts()), 3), np.float32)
+    seconds, _ = _timed(lambda: bake_vertices(model, poses, out=out), args.repeat)
+    return {
+        "frames": len(poses),
+        "bake_s": seconds,
+        "bake_frames_per_s": len(poses) / seconds,
+    }
+
+
+def bench_export(ctx: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    verts, faces = synthetic_mesh(args.mesh_frames)
+    out = ctx["work"] / "export"
+    metrics: dict[str, Any] = {"frames": len(verts)}
+    for fmt in ("ply", "obj"):
+        seconds, paths = _timed(
+            functools.partial(export_frames, out / fmt, verts, faces, fmt=fmt),
+            args.repeat,
+        )
+        size = sum(p.stat().st_size for p in paths)
+        metrics[f"{fmt}_s"] = seconds
+        metrics[f"{fmt}_frames_per_s"] = len(verts) / seconds
+        metrics[f"{fmt}_mb_per_s"] = size / 2**20 / seconds
+    seconds, path = _timed(
+        lambda: export_glb(out / "seq.glb", verts, faces), args.repeat
+    )
+    metrics["glb_s"] = seconds
+    metrics["glb_frames_per_s"] = len(verts) / seconds
+    metrics["glb_mb_per_s"] = path.stat().st_size / 2**20 / seconds
+    return metrics
+
+
+def bench_metrics(ctx: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    store = ctx.get("store") or open_motion_store(ctx["work"] / "result")
+    frames = store.num_samples * store.num_frames
+    jerk_s, _ = _timed(lambda: per_frame_jerk(store.joints, store.fps), args.repeat)
+    eval_s, _ = _timed(lambda: evaluate_store(store), args.repeat)
+    return {
+        "jerk_s": jerk_s,
+        "jerk_frames_per_s": frames / jerk_s,
+        "evaluate_s": eval_s,
+    }
+
+
+CASES: dict[str, Callable[[dict[str, Any], argparse.Namespace], dict[str, Any]]] = {
+    "load": bench_load,
+    "render": bench_render,
+    "bake": bench_bake,
+    "export": bench_export,
+    "metrics": bench_metrics,
+}
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return a line per metric that got worse than ``baseline`` by more than ``tolerance``."""
+    regressions = []
+    for case, metrics in results.items():
+        base = baseline.get(case, {})
+        for key, value in metrics.items():
+            old = base.get(key)
+            if not (
+                key.endswith("_s")
+                or key.endswith("_ms")
+                or key.endswith("_us")
+                or key.endswith("_per_s")
+            ):
+                continue
+            if (
+                not isinstance(value, (int, float))
+                or not isinstance(old, (int, float))
+                or old <= 0
+            ):
+                continue
+            higher_better = key.endswith("_per_s")
+            change = (old / value - 1.0) if higher_better else (value / old - 1.0)
+            if change > tolerance:
+                regressions.append(
+                    f"{case}.{key}: {old:.4g} -> {value:.4g} ({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark load/render/bake/export/metric hot paths"
+    )
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--batch", type=int, default=16, help="Synthetic samples")
+    parser.add_argument(
+        "--frames", type=int, default=2000, help="Synthetic sequence length"
+    )
+    parser.add_argument(
+        "--reads",
+        type=int,
+        default=10000,
+        help="Random single-frame reads in the load case",
+    )
+    parser.add_argument("--render-frames", type=int, default=300)
+    parser.add_argument(
+        "--grid", type=int, default=1, help="Skeletons rendered per frame"
+    )
+    parser.add_argument("--bake-frames", type=int, default=512)
+    parser.add_argument("--mesh-frames", type=int, default=60)
+    parser.add_argument(
+        "--model-path",
+        default="data",
+        help="Directory containing smplx/ for the bake case",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per timing (best is reported)"
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Keep synthetic files here instead of a temp dir",
+    )
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    parser.add_argument(
+        "--baseline", default=None, help="Earlier --json output to compare against"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative slowdown"
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_hotpaths_") as tmp:
+        work = pathlib.Path(args.work_dir or tmp)
+        work.mkdir(parents=True, exist_ok=True)
+        ctx: dict[str, Any] = {"work": work}
+        results: dict[str, Any] = {}
+        skipped: dict[str, str] = {}
+        # Later cases reuse the synthetic store written by the load case
+        cases = (
+            args.cases
+            if "load" in args.cases or not ({"render", "metrics"} & set(args.cases))
+            else ["load", *args.cases]
+        )
+        for name in cases:
+            try:
+                results[name] = CASES[name](ctx, args)
+            except UnavailableError as exc:
+                skipped[name] = str(exc)
+                print(f"{name:8s} skipped: {exc}")
+                continue
+            summary = ", ".join(
+                f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in results[name].items()
+            )
+            print(f"{name:8s} {summary}")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(
+                results, json.load(f).get("results", {}), args.tolerance
+            )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if not regressions:
+            print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+        failed = bool(regressions) and args.fail_on_regression
+    if args.json:
+        out = pathlib.Path(args.json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "params": {
+                k: v for k, v in vars(args).items() if k not in ("json", "baseline")
+            },
+            "results": results,
+            "skipped": skipped,
+        }
+        out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Wrote {out}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
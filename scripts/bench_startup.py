@@ -0,0 +1,190 @@
+"""Cold-start benchmark of the command-line tools.
+
+Runs every case in a fresh interpreter (``python -X importtime``), several
+times, and reports the median wall time plus the slowest top-level imports
+of the last run. Batch pipelines invoke these tools thousands of times, so
+anything that pulls torch / VTK into ``--help`` or a stats command shows up
+here immediately.
+
+Usage (from the project root):
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 10 --json tmp/bench/startup.json
+    python scripts/bench_startup.py --baseline tmp/bench/startup.json --max-regression 0.25
+    python scripts/bench_startup.py --budget 1.0   # exit 1 if any case exceeds 1 s
+
+Cases are ``python -m motion_gen_survey <command> --help`` for every command
+plus ``scripts/export_smplx_obj.py --help``; add more with
+``--case "store info tmp/some_result"``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+from motion_gen_survey.__main__ import COMMANDS
+
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def default_cases() -> dict[str, list[str]]:
+    cases = {
+        f"{name} --help": ["-m", "motion_gen_survey", name, "--help"]
+        for name in COMMANDS
+    }
+    cases["motion_gen_survey --help"] = ["-m", "motion_gen_survey", "--help"]
+    cases["export_smplx_obj.py --help"] = [
+        str(PROJECT_ROOT / "scripts" / "export_smplx_obj.py"),
+        "--help",
+    ]
+    return cases
+
+
+def parse_importtime(stderr: str, top: int = 5) -> list[tuple[str, float]]:
+    """Slowest top-level imports (cumulative ms) from ``-X importtime`` output."""
+    totals: list[tuple[str, float]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):
+            # Exactly one leading space: imported directly by the entry point
+            totals.append((name.strip(), int(parts[1]) / 1000.0))
+    return sorted(totals, key=lambda item: item[1], reverse=True)[:top]
+
+
+def run_case(args: list[str], repeat: int, python: str) -> dict[str, Any]:
+    times: list[float] = []
+    stderr = ""
+    returncode = 0
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [python, "-X", "importtime", *args],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        times.append(time.perf_counter() - start)
+        stderr, returncode = proc.stderr, proc.returncode
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "max_s": max(times),
+        "returncode": returncode,
+        "top_imports_ms": parse_importtime(stderr),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure cold start time of the CLI tools"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per case (median reported)"
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        default=[],
+        help="Extra 'python -m motion_gen_survey' argument string to time",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        default=None,
+        help="Run only cases whose name contains one of these",
+    )
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    parser.add_argument(
+        "--baseline", default=None, help="Previous --json output to compare against"
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown against --baseline before failing",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Fail if any case's median exceeds this (s)",
+    )
+    args = parser.parse_args()
+
+    cases = default_cases()
+    for extra in args.case:
+        cases[extra] = ["-m", "motion_gen_survey", *shlex.split(extra)]
+    if args.only:
+        cases = {k: v for k, v in cases.items() if any(s in k for s in args.only)}
+
+    baseline: dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("cases", {})
+
+    # Warm the OS file cache and bytecode once so the first case is not penalized
+    subprocess.run(
+        [args.python, "-c", "import motion_gen_survey"], cwd=PROJECT_ROOT, check=False
+    )
+
+    results: dict[str, Any] = {}
+    failed = False
+    width = max(map(len, cases))
+    for name, case_args in cases.items():
+        res = run_case(case_args, max(1, args.repeat), args.python)
+        results[name] = res
+        note = ""
+        if res["returncode"] != 0:
+            note += f"  exit {res['returncode']}"
+            failed = True
+        base = baseline.get(name, {}).get("median_s")
+        if base:
+            change = res["median_s"] / base - 1.0
+            note += f"  {change:+.0%} vs baseline"
+            if change > args.max_regression:
+                note += " REGRESSION"
+                failed = True
+        if args.budget is not None and res["median_s"] > args.budget:
+            note += " OVER BUDGET"
+            failed = True
+        slowest = ", ".join(
+            f"{mod} {ms:.0f}ms" for mod, ms in res["top_imports_ms"][:3]
+        )
+        print(f"{name:<{width}}  {res['median_s'] * 1000:7.0f} ms  [{slowest}]{note}")
+
+    if args.json:
+        out = pathlib.Path(args.json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "cases": results,
+        }
+        out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Wrote {out}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
-"""Quick SMPLX axis confirmation & OBJ export utility.
+"""Quick SMPLX axis confirmation & OBJ export utility, plus bulk sequence export.
 
 Usage (from FlowMDM root or project root containing data/smplx models):
     pixi run -e latest python tmp/export_smplx_obj.py --gender neutral --out tmp/smplx_neutral.obj
+    python scripts/export_smplx_obj.py --sequence smplx_pose.npy --format glb --sequence-out tmp/walk.glb
+    python scripts/export_smplx_obj.py --sequence tmp/smplx_vertex_cache/walk-neutral-xxxx.npy --format ply --sequence-out tmp/walk_ply
+    python scripts/export_smplx_obj.py --backend numpy --sequence smplx_pose.npy --format glb
 
 The script:
  1. Loads SMPLX model (neutral/male/female) from data/smplx
@@ -15,64 +18,154 @@ Axis Logic:
    (x, y, z)_Zup -> (x, z, -y)_Yup   # equivalent to -90 deg rotation about X
 Reverse:
    (x, y, z)_Yup -> (x, -z, y)_Zup
+Both live in motion_gen_survey.transforms (ZUP_TO_YUP / YUP_TO_ZUP), shared with
+the viewers.
 
 We keep both arrays to print stats for verification.
+
+Sequence mode (--sequence) takes a (frames, 165) pose .npy (baked through the
+vertex cache of motion_gen_survey.smplx_bake) or an already baked
+(frames, 10475, 3) vertex .npy and writes either one animated GLB or one
+binary PLY / OBJ per frame via motion_gen_survey.mesh_export, encoding the
+shared faces once.
+
+--backend numpy poses the mesh with motion_gen_survey.lbs_numpy (compact
+model extracted once, top-k skinning weights) so neither torch nor smplx is
+imported.
 """
+
 from __future__ import annotations
 
 import argparse
 import pathlib
 import sys
+import time
 
 import numpy as np
 
-try:
-    import torch
-except Exception as e:  # pragma: no cover
-    print("ERROR: torch import failed (required for smplx):", e, file=sys.stderr)
-    sys.exit(1)
-
-try:
-    import smplx  # type: ignore
-except ImportError as e:  # pragma: no cover
-    print("ERROR: smplx not installed in this environment:", e, file=sys.stderr)
-    sys.exit(1)
+from motion_gen_survey.mesh_export import MESH_FORMATS, export_sequence, write_mesh
+from motion_gen_survey.smplx_bake import (
+    BACKENDS,
+    FACES_FILENAME,
+    POSE_DIM,
+    bake_to_cache,
+    bake_vertices,
+    load_baked_vertices,
+    load_model,
+)
+from motion_gen_survey.transforms import (
+    ZUP_TO_YUP,
+    apply_axis_map,
+    axis_bounds,
+    infer_up_axis,
+)
 
-try:
-    import trimesh  # type: ignore
-except ImportError as e:  # pragma: no cover
-    print("ERROR: trimesh not installed in this environment:", e, file=sys.stderr)
-    sys.exit(1)
 
-
-def axis_stats(verts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    vmin = verts.min(axis=0)
-    vmax = verts.max(axis=0)
-    return vmin, vmax
-
-
-def infer_up_axis(vmin: np.ndarray, vmax: np.ndarray) -> str:
-    spans = vmax - vmin
-    # Typical human body: vertical span >> lateral (x) ~ depth
-    axis_idx = int(np.argmax(spans))
-    return {0: "X (unexpected)", 1: "Y", 2: "Z"}[axis_idx]
+UP_AXIS_LABELS = {0: "X (unexpected)", 1: "Y", 2: "Z"}
 
 
 def convert_zup_to_yup(verts: np.ndarray) -> np.ndarray:
-    # (x, y, z)_Z -> (x, z, -y)_Y
-    x = verts[:, 0]
-    y = verts[:, 1]
-    z = verts[:, 2]
-    return np.stack([x, z, -y], axis=1)
+    # (x, y, z)_Z -> (x, z, -y)_Y, for any (..., 3) batch
+    return apply_axis_map(verts, ZUP_TO_YUP)
+
+
+def export_sequence_mode(args: argparse.Namespace, model_root: pathlib.Path) -> None:
+    """Export a pose or baked-vertex sequence as GLB or per-frame PLY/OBJ."""
+    seq_path = pathlib.Path(args.sequence)
+    header = np.load(seq_path, mmap_mode="r")
+    if header.ndim == 2 and header.shape[1] == POSE_DIM:
+        print(f"Baking {header.shape[0]} poses from {seq_path} (cached)")
+        cache_file = bake_to_cache(
+            seq_path, model_path=model_root, gender=args.gender, backend=args.backend
+        )
+        verts, faces = load_baked_vertices(cache_file)
+    elif header.ndim == 3 and header.shape[2] == 3:
+        verts = header
+        faces_file = seq_path.parent / FACES_FILENAME
+        faces = (
+            np.load(faces_file)
+            if faces_file.exists()
+            else np.asarray(
+                load_model(model_root, gender=args.gender, backend=args.backend).faces
+            )
+        )
+    else:
+        print(
+            f"ERROR: expected (frames, {POSE_DIM}) poses or (frames, V, 3) vertices, got {header.shape}",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    default_out = "tmp/smplx_sequence" + (".glb" if args.format == "glb" else "")
+    out = pathlib.Path(args.sequence_out or default_out)
+    transform = None if args.raw else convert_zup_to_yup
+    start = time.perf_counter()
+    written = export_sequence(
+        out,
+        verts,
+        faces,
+        fmt=args.format,
+        fps=args.fps,
+        workers=args.workers,
+        transform=transform,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Exported {verts.shape[0]} frames as {args.format} ({len(written)} file(s)) to {out} in {elapsed:.2f}s"
+    )
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="SMPLX OBJ export & axis confirmation")
-    parser.add_argument("--gender", choices=["neutral", "male", "female"], default="neutral")
-    parser.add_argument("--model-path", default="data", help="Path containing smplx/ directory (default: data)")
-    parser.add_argument("--out", default="tmp/smplx_axis_check_yup.obj", help="Output converted Y-up OBJ path")
-    parser.add_argument("--out-raw", default="tmp/smplx_axis_check_raw.obj", help="Output raw (as-loaded) OBJ path")
-    parser.add_argument("--no-export", action="store_true", help="Skip writing OBJ (still prints stats)")
+    parser.add_argument(
+        "--gender", choices=["neutral", "male", "female"], default="neutral"
+    )
+    parser.add_argument(
+        "--model-path",
+        default="data",
+        help="Path containing smplx/ directory (default: data)",
+    )
+    parser.add_argument(
+        "--out",
+        default="tmp/smplx_axis_check_yup.obj",
+        help="Output converted Y-up OBJ path",
+    )
+    parser.add_argument(
+        "--out-raw",
+        default="tmp/smplx_axis_check_raw.obj",
+        help="Output raw (as-loaded) OBJ path",
+    )
+    parser.add_argument(
+        "--no-export", action="store_true", help="Skip writing OBJ (still prints stats)"
+    )
+    parser.add_argument(
+        "--sequence",
+        default=None,
+        help="Export a (frames, 165) pose .npy or baked (frames, V, 3) vertex .npy instead of the T-pose",
+    )
+    parser.add_argument(
+        "--format", choices=MESH_FORMATS, default="glb", help="Sequence export format"
+    )
+    parser.add_argument(
+        "--sequence-out",
+        default=None,
+        help="GLB file or PLY/OBJ directory (default: tmp/smplx_sequence[.glb])",
+    )
+    parser.add_argument(
+        "--fps", type=float, default=30.0, help="Frame rate of the GLB animation"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Writer threads for per-frame export"
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="Keep the SMPLX Z-up axes in sequence export"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="torch",
+        help="Pose with smplx (torch) or the torch-free NumPy skinning runtime",
+    )
     args = parser.parse_args()
 
     model_root = pathlib.Path(args.model_path).expanduser().resolve()
@@ -81,47 +174,39 @@ def main() -> None:
         print(f"ERROR: Could not find smplx directory at {smplx_dir}", file=sys.stderr)
         sys.exit(2)
 
-    print(f"Loading SMPLX model gender={args.gender} from {smplx_dir} (full components)")
-    model = smplx.SMPLX(
-        model_path=str(smplx_dir),
-        gender=args.gender,
-        use_pca=False,
-        create_global_orient=True,
-        create_body_pose=True,
-        create_betas=True,
-        create_left_hand_pose=True,
-        create_right_hand_pose=True,
-        create_expression=True,
-        create_jaw_pose=True,
-        create_leye_pose=True,
-        create_reye_pose=True,
-        num_betas=10,
-        num_expression_coeffs=10,
+    if args.sequence:
+        try:
+            export_sequence_mode(args, model_root)
+        except ImportError as e:  # pragma: no cover
+            print(
+                "ERROR: torch/smplx not installed in this environment:",
+                e,
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        return
+
+    print(
+        f"Loading SMPLX model gender={args.gender} from {smplx_dir} (full components, {args.backend})"
     )
+    try:
+        model = load_model(model_root, gender=args.gender, backend=args.backend)
+    except ImportError as e:  # pragma: no cover
+        print(
+            "ERROR: torch/smplx not installed in this environment:", e, file=sys.stderr
+        )
+        sys.exit(1)
     model_type = "smplx"
 
-    with torch.no_grad():
-        device = model.global_orient.device
-        zeros = lambda *shape: torch.zeros(*shape, device=device)  # noqa: E731
-        output = model(
-            betas=zeros(1, 10),
-            body_pose=zeros(1, model.NUM_BODY_JOINTS * 3),
-            global_orient=zeros(1, 3),
-            left_hand_pose=zeros(1, 15 * 3),
-            right_hand_pose=zeros(1, 15 * 3),
-            expression=zeros(1, 10),
-            jaw_pose=zeros(1, 3),
-            leye_pose=zeros(1, 3),
-            reye_pose=zeros(1, 3),
-        )
-    verts_z = output.vertices[0].cpu().numpy()
+    # Zero pose & zero shape (T-pose), one frame through the shared batched baker
+    verts_z = bake_vertices(model, np.zeros((1, POSE_DIM), dtype=np.float32))[0]
 
-    vmin_z, vmax_z = axis_stats(verts_z)
-    up_inferred_z = infer_up_axis(vmin_z, vmax_z)
+    vmin_z, vmax_z = axis_bounds(verts_z)
+    up_inferred_z = UP_AXIS_LABELS[infer_up_axis(verts_z)]
 
     verts_y = convert_zup_to_yup(verts_z)
-    vmin_y, vmax_y = axis_stats(verts_y)
-    up_inferred_y = infer_up_axis(vmin_y, vmax_y)
+    vmin_y, vmax_y = axis_bounds(verts_y)
+    up_inferred_y = UP_AXIS_LABELS[infer_up_axis(verts_y)]
 
     print(f"Raw Z-up vertex bounds ({model_type}):")
     print(f"  min: {vmin_z}")
@@ -138,16 +223,16 @@ def main() -> None:
     if not args.no_export:
         raw_path = pathlib.Path(args.out_raw)
         raw_path.parent.mkdir(parents=True, exist_ok=True)
-        mesh_raw = trimesh.Trimesh(vertices=verts_z, faces=model.faces, process=False)
-        mesh_raw.export(raw_path)
+        write_mesh(raw_path, verts_z, model.faces)
         print(f"\nExported RAW OBJ (no axis conversion) to: {raw_path}")
 
         out_path = pathlib.Path(args.out)
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        mesh_y = trimesh.Trimesh(vertices=verts_y, faces=model.faces, process=False)
-        mesh_y.export(out_path)
+        write_mesh(out_path, verts_y, model.faces)
         print(f"Exported Y-up OBJ to: {out_path}")
-        print("Import both to compare orientation. If RAW already stands upright in Y-up tools, model is Y-up.")
+        print(
+            "Import both to compare orientation. If RAW already stands upright in Y-up tools, model is Y-up."
+        )
 
     print("\nConclusion:")
     if up_inferred_z.startswith("Z") and up_inferred_y.startswith("Y"):
@@ -0,0 +1,198 @@
+"""Run FlowMDM ``runners.generate`` with the persistent prompt embedding cache.
+
+Patches the model class before ``runners.generate`` builds it:
+
+- ``encode_text(self, raw_text)`` consults
+  :class:`motion_gen_survey.prompt_cache.PromptCache` and only sends
+  uncached prompts to the original encoder. Cached embeddings are returned
+  as float32 tensors on the model's device, exactly as stored.
+- ``load_and_freeze_clip(self, ...)`` returns a lazy proxy that loads CLIP
+  (onto the model's device) on first use, so a run whose prompts are all
+  cached never loads the encoder. Disable with ``--eager-encoder``.
+
+The encoder id is ``<model class>:<clip_version>:<dataset>``; both
+attributes are read from the model instance (FlowMDM/MDM keep them), since
+the dataset decides the text context length.
+
+Both hooks are MDM's text-encoder API, which FlowMDM inherits. If the model
+class lacks one of them, or ``runners.generate`` finishes without calling
+``encode_text``, the script exits with an error instead of quietly running
+uncached.
+
+Run from the FlowMDM checkout, with the FlowMDM interpreter; arguments after
+``--`` go to ``runners.generate`` unchanged:
+    cd model_zoo/FlowMDM
+    python ../../scripts/generate_cached.py --prompt-cache ../../tmp/prompt_cache -- \\
+        --model_path ./results/babel/FlowMDM/model001300000.pt \\
+        --instructions_file ./runners/jsons/composition_babel.json --num_repetitions 1
+
+``scripts/sweep_generate.py --prompt-cache DIR`` runs every cell this way.
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import importlib
+import os
+import pathlib
+import runpy
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+# The FlowMDM environment does not install this workspace; make the package importable
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from motion_gen_survey.prompt_cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_MAX_BYTES,
+    PromptCache,
+)
+
+
+class _LazyModule:
+    """Stands in for a module until one of its attributes is used."""
+
+    def __init__(self, loader: Callable[[], Any]) -> None:
+        self._loader = loader
+        self._module: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._module is None:
+            self._module = self._loader()
+        return getattr(self._module, name)
+
+
+def _device_of(model: Any) -> Any:
+    return next(model.parameters()).device
+
+
+def encoder_id(model: Any) -> str:
+    return f"{type(model).__name__}:{getattr(model, 'clip_version', '')}:{getattr(model, 'dataset', '')}"
+
+
+def install_prompt_cache(
+    model_cls: type,
+    cache_dir: str | os.PathLike[str],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    lazy_encoder: bool = True,
+) -> dict[str, PromptCache]:
+    """Patch ``model_cls`` to use the prompt cache; return the caches by encoder id.
+
+    Raises ``AttributeError`` if ``model_cls`` lacks ``encode_text`` (or
+    ``load_and_freeze_clip`` when ``lazy_encoder`` is set).
+    """
+    import torch
+
+    name = f"{model_cls.__module__}.{model_cls.__qualname__}"
+    original_encode = getattr(model_cls, "encode_text", None)
+    if not callable(original_encode):
+        raise AttributeError(
+            f"{name} has no encode_text(self, raw_text) to route through the prompt cache"
+        )
+    original_load = getattr(model_cls, "load_and_freeze_clip", None)
+    if lazy_encoder and not callable(original_load):
+        raise AttributeError(
+            f"{name} has no load_and_freeze_clip to defer; rerun with --eager-encoder"
+        )
+
+    caches: dict[str, PromptCache] = {}
+
+    def encode_text(self: Any, raw_text: Any) -> Any:
+        key = encoder_id(self)
+        cache = caches.get(key)
+        if cache is None:
+            cache = caches[key] = PromptCache(cache_dir, key, max_bytes=max_bytes)
+        emb = cache.encode(
+            list(raw_text),
+            lambda texts: original_encode(self, texts).float().cpu().numpy(),
+        )
+        return torch.from_numpy(emb).to(_device_of(self))
+
+    model_cls.encode_text = encode_text  # type: ignore[attr-defined]
+
+    if lazy_encoder:
+        assert callable(original_load)
+        load = original_load
+
+        def load_and_freeze_clip(self: Any, *args: Any, **kwargs: Any) -> Any:
+            return _LazyModule(lambda: load(self, *args, **kwargs).to(_device_of(self)))
+
+        model_cls.load_and_freeze_clip = load_and_freeze_clip  # type: ignore[attr-defined]
+    return caches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="runners.generate with a persistent prompt embedding cache"
+    )
+    parser.add_argument(
+        "--prompt-cache", default=str(DEFAULT_CACHE_DIR), help="Cache directory"
+    )
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 2**20,
+        help="Cache size budget",
+    )
+    parser.add_argument(
+        "--model-module",
+        default="model.FlowMDM",
+        help="Module defining the model class",
+    )
+    parser.add_argument("--model-class", default="FlowMDM")
+    parser.add_argument(
+        "--eager-encoder",
+        action="store_true",
+        help="Load the text encoder at model creation",
+    )
+    parser.add_argument(
+        "generate_args",
+        nargs=argparse.REMAINDER,
+        help="-- followed by runners.generate arguments",
+    )
+    args = parser.parse_args()
+    generate_args = (
+        args.generate_args[1:]
+        if args.generate_args[:1] == ["--"]
+        else args.generate_args
+    )
+
+    # runners.generate imports FlowMDM modules relative to the checkout
+    sys.path.insert(0, os.getcwd())
+    model_cls = getattr(importlib.import_module(args.model_module), args.model_class)
+    try:
+        caches = install_prompt_cache(
+            model_cls,
+            pathlib.Path(args.prompt_cache).resolve(),
+            int(args.max_mb * 2**20),
+            lazy_encoder=not args.eager_encoder,
+        )
+    except AttributeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    def report() -> None:
+        for cache in caches.values():
+            print(
+                f"[prompt-cache] {cache.encoder_id}: {cache.hits} hit(s), {cache.misses} miss(es), "
+                f"{len(cache)} cached",
+                file=sys.stderr,
+            )
+
+    atexit.register(report)
+    sys.argv = ["runners.generate", *generate_args]
+    runpy.run_module("runners.generate", run_name="__main__", alter_sys=True)
+    if not caches:
+        print(
+            f"ERROR: runners.generate never called {args.model_class}.encode_text; "
+            "prompts were encoded without the cache",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Parallel parameter sweep over FlowMDM ``runners.generate`` with result caching.
+
+Expands a grid of instruction files x guidance x BPE denoising step x seed
+(x checkpoint) and runs ``python -m runners.generate`` for every cell, with
+at most ``--workers`` generate processes alive at once. Each cell is keyed by
+a hash of
+
+    (checkpoint identity, instruction-file content, generation params, seed, extra args)
+
+and lives in ``<out-dir>/<dataset>/<key>/``:
+
+- ``generation/results.npy``: what ``runners.generate`` wrote (``--output_dir``)
+- ``run.json``: the cell's parameters, status, return code and wall time
+- ``generate.log``: stdout/stderr of the run
+
+Cells whose ``run.json`` says ``done`` and whose ``results.npy`` exists are
+skipped, so re-running a 200-cell sweep after adding one prompt only computes
+the new cells. ``<out-dir>/manifest.json`` lists every cell and is rewritten
+after each finished run; the viewers and metric tools accept it wherever they
+take a result tree (see ``motion_gen_survey.motion_store.iter_result_dirs``).
+
+Usage (from the project root):
+    python scripts/sweep_generate.py \\
+        --model-path ./results/babel/FlowMDM/model001300000.pt \\
+        --instructions ./runners/jsons/composition_babel.json ./runners/jsons/extrapolation_babel.json \\
+        --guidance-param 1.5 2.5 --bpe-denoising-step 60 125 --seed 10 11 \\
+        --out-dir tmp/sweeps/babel --workers 4 --cpu
+    python -m motion_gen_survey.metrics tmp/sweeps/babel/manifest.json --out tmp/sweeps/babel/jerk.csv
+
+Checkpoint and instruction paths are relative to ``--flowmdm-dir`` (the
+directory ``runners.generate`` is run from) unless absolute.
+
+With ``--prompt-cache DIR`` every cell runs through ``scripts/generate_cached.py``
+so all workers share one prompt embedding cache and cells whose prompts are
+already cached skip loading the text encoder.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from motion_gen_survey.motion_store import (
+    MANIFEST_FILENAME,
+    RESULTS_FILENAME,
+    infer_dataset,
+)
+
+
+SWEEP_VERSION = 1
+GENERATION_DIRNAME = "generation"
+RUN_FILENAME = "run.json"
+LOG_FILENAME = "generate.log"
+GENERATE_CACHED = pathlib.Path(__file__).resolve().with_name("generate_cached.py")
+
+
+@dataclass
+class SweepCell:
+    """One ``runners.generate`` invocation of the sweep."""
+
+    model_path: str
+    instructions_file: str
+    guidance_param: float
+    bpe_denoising_step: int
+    seed: int
+    num_repetitions: int
+    extra_args: list[str] = field(default_factory=list)
+    key: str = ""
+    dataset: str = "unknown"
+
+
+def _file_digest(path: pathlib.Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _checkpoint_identity(path: pathlib.Path) -> dict[str, Any]:
+    # Checkpoints are large; identify them by path, size and mtime instead of content
+    st = path.stat()
+    return {"path": str(path.resolve()), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def cell_key(cell: SweepCell, flowmdm_dir: pathlib.Path) -> str:
+    """Hash the inputs that determine a generation's output."""
+    payload = {
+        "version": SWEEP_VERSION,
+        "checkpoint": _checkpoint_identity(flowmdm_dir / cell.model_path),
+        "instructions": _file_digest(flowmdm_dir / cell.instructions_file),
+        "guidance_param": cell.guidance_param,
+        "bpe_denoising_step": cell.bpe_denoising_step,
+        "num_repetitions": cell.num_repetitions,
+        "seed": cell.seed,
+        "extra_args": cell.extra_args,
+    }
+    return hashlib.sha1(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def expand_grid(args: argparse.Namespace, flowmdm_dir: pathlib.Path) -> list[SweepCell]:
+    """Build the keyed cells of the parameter grid (duplicates removed)."""
+    instructions: list[str] = []
+    for entry in args.instructions:
+        path = flowmdm_dir / entry
+        if path.is_dir():
+            instructions.extend(
+                str(p.relative_to(flowmdm_dir))
+                if p.is_relative_to(flowmdm_dir)
+                else str(p)
+                for p in sorted(path.glob("*.json"))
+            )
+        else:
+            instructions.append(entry)
+    cells: dict[str, SweepCell] = {}
+    grid = itertools.product(
+        args.model_path,
+        instructions,
+        args.guidance_param,
+        args.bpe_denoising_step,
+        args.seed,
+    )
+    for model_path, instr, guidance, bpe, seed in grid:
+        cell = SweepCell(
+            model_path,
+            instr,
+            guidance,
+            bpe,
+            seed,
+            args.num_repetitions,
+            list(args.extra),
+        )
+        cell.key = cell_key(cell, flowmdm_dir)
+        cell.dataset = infer_dataset(model_path) or "unknown"
+        cells.setdefault(cell.key, cell)
+    return list(cells.values())
+
+
+def run_dir(out_dir: pathlib.Path, cell: SweepCell) -> pathlib.Path:
+    return out_dir / cell.dataset / cell.key
+
+
+def is_cell_done(out_dir: pathlib.Path, cell: SweepCell) -> bool:
+    d = run_dir(out_dir, cell)
+    try:
+        with open(d / RUN_FILENAME, encoding="utf-8") as f:
+            status = json.load(f).get("status")
+    except (OSError, ValueError):
+        return False
+    return status == "done" and (d / GENERATION_DIRNAME / RESULTS_FILENAME).exists()
+
+
+def _write_json(path: pathlib.Path, data: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run_cell(
+    cell: SweepCell,
+    flowmdm_dir: pathlib.Path,
+    out_dir: pathlib.Path,
+    python: str,
+    cpu: bool,
+    prompt_cache: pathlib.Path | None = None,
+) -> dict[str, Any]:
+    """Run one generation as a subprocess and record its outcome in ``run.json``."""
+    d = run_dir(out_dir, cell)
+    d.mkdir(parents=True, exist_ok=True)
+    if prompt_cache is None:
+        entry = [python, "-m", "runners.generate"]
+    else:
+        entry = [
+            python,
+            str(GENERATE_CACHED),
+            "--prompt-cache",
+            str(prompt_cache),
+            "--",
+        ]
+    cmd = [
+        *entry,
+        "--model_path",
+        cell.model_path,
+        "--instructions_file",
+        cell.instructions_file,
+        "--guidance_param",
+        f"{cell.guidance_param:g}",
+        "--bpe_denoising_step",
+        str(cell.bpe_denoising_step),
+        "--seed",
+        str(cell.seed),
+        "--num_repetitions",
+        str(cell.num_repetitions),
+        "--output_dir",
+        str((d / GENERATION_DIRNAME).resolve()),
+        *cell.extra_args,
+    ]
+    env = dict(os.environ)
+    if cpu:
+        env["CUDA_VISIBLE_DEVICES"] = ""
+    record: dict[str, Any] = {"cell": asdict(cell), "command": cmd, "status": "running"}
+    _write_json(d / RUN_FILENAME, record)
+    start = time.perf_counter()
+    with open(d / LOG_FILENAME, "w", encoding="utf-8") as log:
+        proc = subprocess.run(
+            cmd, cwd=flowmdm_dir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    record["returncode"] = proc.returncode
+    ok = proc.returncode == 0 and (d / GENERATION_DIRNAME / RESULTS_FILENAME).exists()
+    record["status"] = "done" if ok else "failed"
+    _write_json(d / RUN_FILENAME, record)
+    return record
+
+
+def write_manifest(out_dir: pathlib.Path, cells: list[SweepCell]) -> pathlib.Path:
+    """Write ``manifest.json`` describing every cell and where its result lives."""
+    runs = []
+    for cell in cells:
+        d = run_dir(out_dir, cell)
+        status = "pending"
+        record: dict[str, Any] = {}
+        if (d / RUN_FILENAME).exists():
+            try:
+                with open(d / RUN_FILENAME, encoding="utf-8") as f:
+                    record = json.load(f)
+                status = record.get("status", status)
+            except ValueError:
+                pass
+        runs.append(
+            {
+                "key": cell.key,
+                "status": status,
+                "dataset": cell.dataset,
+                "params": asdict(cell),
+                "result_dir": str((d / GENERATION_DIRNAME).relative_to(out_dir)),
+                "seconds": record.get("seconds"),
+            }
+        )
+    path = out_dir / MANIFEST_FILENAME
+    _write_json(path, {"version": SWEEP_VERSION, "runs": runs})
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Sweep FlowMDM runners.generate over a parameter grid"
+    )
+    parser.add_argument(
+        "--flowmdm-dir",
+        default="model_zoo/FlowMDM",
+        help="FlowMDM checkout to run generate from",
+    )
+    parser.add_argument(
+        "--model-path",
+        nargs="+",
+        required=True,
+        help="Checkpoint(s), relative to --flowmdm-dir",
+    )
+    parser.add_argument(
+        "--instructions",
+        nargs="+",
+        required=True,
+        help="Instruction JSON files or directories of them, relative to --flowmdm-dir",
+    )
+    parser.add_argument("--guidance-param", type=float, nargs="+", default=[1.5])
+    parser.add_argument("--bpe-denoising-step", type=int, nargs="+", default=[125])
+    parser.add_argument("--seed", type=int, nargs="+", default=[10])
+    parser.add_argument("--num-repetitions", type=int, default=1)
+    parser.add_argument(
+        "--extra",
+        nargs=argparse.REMAINDER,
+        default=[],
+        help="Further runners.generate arguments (e.g. --extra --use_chunked_att); must be last",
+    )
+    parser.add_argument(
+        "--out-dir", default="tmp/sweeps/default", help="Sweep output directory"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=2, help="Concurrent generate processes"
+    )
+    parser.add_argument(
+        "--cpu", action="store_true", help="Hide GPUs from the generate processes"
+    )
+    parser.add_argument(
+        "--python",
+        default=sys.executable,
+        help="Python interpreter for runners.generate",
+    )
+    parser.add_argument(
+        "--prompt-cache",
+        default=None,
+        help="Share a prompt embedding cache directory across cells",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-run cells that are already done"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="List pending cells without running them"
+    )
+    args = parser.parse_args()
+
+    flowmdm_dir = pathlib.Path(args.flowmdm_dir).resolve()
+    out_dir = pathlib.Path(args.out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prompt_cache = (
+        pathlib.Path(args.prompt_cache).resolve() if args.prompt_cache else None
+    )
+
+    cells = expand_grid(args, flowmdm_dir)
+    pending = [c for c in cells if args.force or not is_cell_done(out_dir, c)]
+    print(
+        f"Sweep: {len(cells)} cell(s), {len(cells) - len(pending)} cached, {len(pending)} to run"
+    )
+    if args.dry_run:
+        for cell in pending:
+            print(
+                f"  {cell.key}  {cell.instructions_file}  g={cell.guidance_param:g} "
+                f"bpe={cell.bpe_denoising_step} seed={cell.seed}"
+            )
+        write_manifest(out_dir, cells)
+        return
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            pool.submit(
+                run_cell, c, flowmdm_dir, out_dir, args.python, args.cpu, prompt_cache
+            ): c
+            for c in pending
+        }
+        for future in as_completed(futures):
+            cell = futures[future]
+            record = future.result()
+            failed += record["status"] != "done"
+            print(
+                f"  [{record['status']}] {cell.key} {cell.instructions_file} "
+                f"g={cell.guidance_param:g} bpe={cell.bpe_denoising_step} seed={cell.seed} ({record['seconds']:.0f}s)"
+            )
+            write_manifest(out_dir, cells)
+    manifest = write_manifest(out_dir, cells)
+    print(f"Manifest: {manifest} ({failed} failed)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
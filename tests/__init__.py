@@ -1 +1 @@
-"""Test suite for motion-gen-survey project."""
\ No newline at end of file
+"""Test suite for motion-gen-survey project."""
@@ -0,0 +1,100 @@
+"""Shared synthetic motion for the unit tests (no FlowMDM results needed)."""
+
+from __future__ import annotations
+
+import pathlib
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.motion_store import MotionStore, open_motion_store
+
+
+# T2M joints of a standing body in metres, Y-up, facing +Z
+REST_POSE = np.array(
+    [
+        [0.00, 0.95, 0.00],  # Pelvis
+        [0.09, 0.88, 0.00],  # L.Hip
+        [-0.09, 0.88, 0.00],  # R.Hip
+        [0.00, 1.05, 0.00],  # Spine1
+        [0.10, 0.50, 0.02],  # L.Knee
+        [-0.10, 0.50, 0.02],  # R.Knee
+        [0.00, 1.18, 0.00],  # Spine2
+        [0.10, 0.08, -0.02],  # L.Ankle
+        [-0.10, 0.08, -0.02],  # R.Ankle
+        [0.00, 1.30, 0.00],  # Spine3
+        [0.10, 0.02, 0.12],  # L.Foot
+        [-0.10, 0.02, 0.12],  # R.Foot
+        [0.00, 1.50, 0.00],  # Neck
+        [0.07, 1.42, 0.00],  # L.Collar
+        [-0.07, 1.42, 0.00],  # R.Collar
+        [0.00, 1.65, 0.03],  # Head
+        [0.18, 1.42, 0.00],  # L.Shoulder
+        [-0.18, 1.42, 0.00],  # R.Shoulder
+        [0.20, 1.15, 0.00],  # L.Elbow
+        [-0.20, 1.15, 0.00],  # R.Elbow
+        [0.22, 0.90, 0.02],  # L.Wrist
+        [-0.22, 0.90, 0.02],  # R.Wrist
+    ],
+    dtype=np.float32,
+)
+LEFT_LEG, RIGHT_LEG = (4, 7, 10), (5, 8, 11)
+LEFT_ARM, RIGHT_ARM = (18, 20), (19, 21)
+
+
+def walk(
+    frames: int = 120,
+    fps: float = 20.0,
+    speed: float = 1.4,
+    batch: int = 1,
+    seed: int = 0,
+) -> np.ndarray:
+    """``(batch, frames, 22, 3)`` float32 walk along +X with swinging limbs.
+
+    Samples differ in phase and heading offset so they are not identical.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames, dtype=np.float64) / fps
+    out = np.empty((batch, frames, 22, 3), dtype=np.float64)
+    for b in range(batch):
+        phase = rng.uniform(0.0, 2.0 * np.pi)
+        swing = 0.25 * np.sin(2.0 * np.pi * 0.9 * t + phase)
+        pose = np.broadcast_to(REST_POSE, (frames, 22, 3)).astype(np.float64)
+        pose[:, :, 0] += speed * t[:, None]
+        pose[:, :, 2] += rng.uniform(-0.5, 0.5)
+        for legs, arms, sign in (
+            (LEFT_LEG, RIGHT_ARM, 1.0),
+            (RIGHT_LEG, LEFT_ARM, -1.0),
+        ):
+            pose[:, legs, 2] += sign * swing[:, None] * np.array([0.5, 1.0, 1.0])
+            pose[:, arms, 2] += sign * swing[:, None] * np.array([0.4, 0.8])
+        pose[:, :, 1] += 0.02 * np.abs(np.sin(2.0 * np.pi * 0.9 * t + phase))[:, None]
+        out[b] = pose
+    return out.astype(np.float32)
+
+
+@pytest.fixture
+def make_store(tmp_path: pathlib.Path) -> Callable[..., MotionStore]:
+    """Factory writing a FlowMDM-style ``results.npy`` and opening it as a store."""
+
+    def factory(
+        joints: np.ndarray,
+        name: str = "humanml",
+        text: list[str] | None = None,
+        lengths: list[int] | None = None,
+        fps: float | None = None,
+    ) -> MotionStore:
+        result_dir = tmp_path / name
+        result_dir.mkdir(parents=True, exist_ok=True)
+        batch, frames = joints.shape[:2]
+        results = {
+            # (batch, frames, 22, 3) -> FlowMDM's (batch, 22, 3, frames)
+            "motion": np.ascontiguousarray(joints.transpose(0, 2, 3, 1)),
+            "text": text if text is not None else [f"walk {i}" for i in range(batch)],
+            "lengths": lengths if lengths is not None else [frames] * batch,
+        }
+        np.save(result_dir / "results.npy", results, allow_pickle=True)
+        return open_motion_store(result_dir, fps=fps)
+
+    return factory
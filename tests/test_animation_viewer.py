@@ -0,0 +1,44 @@
+"""Tests for motion_gen_survey.animation_viewer (the parts that need no display)."""
+
+from __future__ import annotations
+
+from motion_gen_survey.animation_viewer import _render_job, resolve_up_axis
+from motion_gen_survey.transforms import YUP_TO_ZUP, apply_axis_map
+from tests.conftest import walk
+
+
+def test_resolve_up_axis():
+    joints = walk(frames=60, batch=2)
+    assert resolve_up_axis("auto", joints) == 1
+    assert resolve_up_axis("z", joints) == 2
+    assert resolve_up_axis("auto", apply_axis_map(joints, YUP_TO_ZUP)) == 2
+
+
+def render_job(result_path, sample=0):
+    """A headless render job tuple with default settings."""
+    return (
+        str(result_path),
+        "out.mp4",
+        sample,
+        1,
+        1.5,
+        (640, 480),
+        "ffmpeg",
+        23,
+        False,
+        False,
+        "off",
+        0,
+        1,
+        "y",
+        None,
+    )
+
+
+def test_render_job_reports_failures(make_store, tmp_path):
+    store = make_store(walk(frames=20, batch=2))
+    ok, message = _render_job(render_job(store.store_dir.parent, sample=2))
+    assert not ok
+    assert "sample 2 out of range for 2 stored samples" in message
+    ok, message = _render_job(render_job(tmp_path / "missing"))
+    assert not ok and message.startswith(str(tmp_path / "missing"))
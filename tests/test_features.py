@@ -0,0 +1,61 @@
+"""Tests for motion_gen_survey.features."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from motion_gen_survey.features import FEATURE_KEYS, build_features, compute_features
+from tests.conftest import walk
+
+
+def pad(joints: np.ndarray, lengths: list[int], value: float) -> np.ndarray:
+    out = joints.copy()
+    for i, n in enumerate(lengths):
+        out[i, n:] = value
+    return out
+
+
+def test_padding_does_not_change_valid_frames():
+    joints = walk(frames=80, batch=2)
+    lengths = [80, 50]
+    # Padding far below the feet would drag the floor down if it counted
+    padded = compute_features(pad(joints, lengths, -1.0), 20.0, lengths=lengths)
+    trimmed = compute_features(joints[1:, :50], 20.0)
+    for key in FEATURE_KEYS:
+        np.testing.assert_allclose(padded[key][1, :50], trimmed[key][0], atol=1e-6)
+    whole = compute_features(joints[:1], 20.0)
+    for key in FEATURE_KEYS:
+        np.testing.assert_allclose(padded[key][0], whole[key][0], atol=1e-6)
+
+
+def test_padding_frames_are_still():
+    joints = walk(frames=60, batch=1)
+    features = compute_features(pad(joints, [40], 0.0), 20.0, lengths=[40])
+    assert not features["joint_speed"][0, 40:].any()
+    assert not features["foot_contact"][0, 40:].any()
+    assert not features["foot_skate"][0, 40:].any()
+    assert features["foot_height"][0, :40].min() == 0.0
+
+
+def test_blocks_match_single_pass():
+    joints = walk(frames=70, batch=2)
+    a = compute_features(joints, 20.0, block_frames=16)
+    b = compute_features(joints, 20.0)
+    for key in FEATURE_KEYS:
+        np.testing.assert_allclose(a[key], b[key], atol=1e-6)
+
+
+def test_walk_speeds():
+    features = compute_features(walk(frames=60, speed=1.4), 20.0)
+    root_speed = features["joint_speed"][0, :, 0]
+    assert np.allclose(root_speed, 1.4, atol=0.1)
+
+
+def test_build_features_uses_store_lengths(make_store):
+    joints = walk(frames=60, batch=2)
+    store = make_store(pad(joints, [60, 30], 0.0), lengths=[60, 30])
+    index = build_features(store)
+    assert index.meta["lengths"] == [60, 30]
+    skate = index.foot_skate[1, :30].any(axis=-1).mean()
+    assert index.skate_ratio(1) == skate
+    assert not index.foot_contact[1, 30:].any()
@@ -0,0 +1,109 @@
+"""Tests for motion_gen_survey.ik_fit.
+
+The fit itself needs ``torch`` and ``smplx`` (only for ``smplx.lbs``); it
+runs on a stand-in model whose rest joints are the T2M rest pose, so no
+SMPL-X model files are required.
+"""
+
+from __future__ import annotations
+
+import types
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.ik_fit import (
+    POSE_FILENAME,
+    fit_sequence,
+    initial_global_params,
+    kabsch_rotations,
+    matrix_to_axis_angle,
+    save_fit,
+)
+from motion_gen_survey.lbs_numpy import rodrigues
+from motion_gen_survey.motion_codec import joint_parents
+from motion_gen_survey.smplx_bake import NUM_BETAS, POSE_LAYOUT, TRANSL_FILENAME
+from tests.conftest import REST_POSE
+
+
+def test_axis_angle_round_trip():
+    rng = np.random.default_rng(0)
+    axis = rng.normal(size=(64, 3))
+    axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+    angles = np.concatenate([rng.uniform(0.0, 3.0, 60), [1e-5, 0.3, 3.1, 3.14]])
+    rotvecs = axis * angles[:, None]
+    np.testing.assert_allclose(
+        matrix_to_axis_angle(rodrigues(rotvecs)), rotvecs, atol=2e-4
+    )
+    # At exactly pi either axis sign is the same rotation
+    half_turn = rodrigues(np.array([0.0, np.pi, 0.0]))
+    np.testing.assert_allclose(
+        rodrigues(matrix_to_axis_angle(half_turn)), half_turn, atol=1e-6
+    )
+
+
+def test_kabsch_recovers_rotation():
+    rng = np.random.default_rng(1)
+    rot = rodrigues(rng.normal(size=(5, 3)))
+    src = REST_POSE.astype(np.float64)
+    dst = np.einsum("fcd,jd->fjc", rot, src) + rng.normal(size=(5, 1, 3))
+    np.testing.assert_allclose(kabsch_rotations(src, dst), rot, atol=1e-9)
+
+
+def test_initial_global_params_align_rigid_motion():
+    rot = rodrigues(np.array([[0.0, 0.7, 0.0], [0.2, -1.2, 0.1]]))
+    pelvis = REST_POSE[0].astype(np.float64)
+    shift = np.array([[1.0, 0.0, 2.0], [-0.5, 0.1, 0.0]])
+    # Rotation about the rest pelvis, then translation (the SMPL-X convention)
+    target = np.einsum("fcd,jd->fjc", rot, REST_POSE - pelvis) + pelvis + shift[:, None]
+    global_orient, transl = initial_global_params(REST_POSE, target)
+    np.testing.assert_allclose(
+        rodrigues(global_orient.astype(np.float64)), rot, atol=1e-5
+    )
+    np.testing.assert_allclose(transl, shift, atol=1e-5)
+
+
+def _stand_in_model(torch):
+    """The attributes of ``smplx.SMPLX`` that ``fit_sequence`` reads, on the T2M skeleton."""
+    return types.SimpleNamespace(
+        v_template=torch.from_numpy(REST_POSE.copy()),
+        shapedirs=torch.zeros(len(REST_POSE), 3, NUM_BETAS),
+        J_regressor=torch.eye(len(REST_POSE)),
+        parents=torch.from_numpy(joint_parents()),
+    )
+
+
+def test_fit_recovers_synthetic_pose(tmp_path):
+    torch = pytest.importorskip("torch")
+    lbs = pytest.importorskip("smplx.lbs")
+    model = _stand_in_model(torch)
+    frames = 24
+    t = np.linspace(0.0, 1.0, frames)[:, None]
+    rng = np.random.default_rng(2)
+    body = (0.3 * rng.uniform(-1.0, 1.0, (1, 63)) * np.sin(np.pi * t)).astype(
+        np.float32
+    )
+    go = np.zeros((frames, 3), np.float32)
+    go[:, 1] = 0.8 * t[:, 0]
+    transl = np.zeros((frames, 3), np.float32)
+    transl[:, 0] = 1.4 * t[:, 0]
+
+    with torch.no_grad():
+        aa = torch.from_numpy(np.concatenate([go, body], axis=1))
+        rot = lbs.batch_rodrigues(aa.reshape(-1, 3)).reshape(frames, 22, 3, 3)
+        rest = torch.from_numpy(REST_POSE)[None].expand(frames, -1, -1)
+        posed, _ = lbs.batch_rigid_transform(
+            rot, rest, model.parents, dtype=torch.float32
+        )
+        target = (posed + torch.from_numpy(transl)[:, None]).numpy()
+
+    result = fit_sequence(model, target, chunk_frames=16, iters=200, first_iters=400)
+    assert result.poses.shape == (frames, 165)
+    assert result.joint_error.mean() < 0.015
+    assert result.joint_error.max() < 0.04
+    np.testing.assert_allclose(result.transl, transl, atol=0.05)
+    assert not result.poses[:, POSE_LAYOUT["body_pose"].stop :].any()
+
+    pose_file = save_fit(result, tmp_path)
+    assert pose_file == tmp_path / POSE_FILENAME
+    np.testing.assert_array_equal(np.load(tmp_path / TRANSL_FILENAME), result.transl)
@@ -0,0 +1,101 @@
+"""Tests for motion_gen_survey.instrument."""
+
+from __future__ import annotations
+
+import itertools
+import tracemalloc
+import types
+
+import pytest
+
+from motion_gen_survey import instrument
+from motion_gen_survey.instrument import LATENCY_BINS_MS, FrameProfiler
+
+
+class Clock:
+    """Stand-in for ``time.perf_counter`` that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, ms: float) -> None:
+        self.now += ms / 1000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(instrument, "time", types.SimpleNamespace(perf_counter=fake))
+    return fake
+
+
+def record(prof: FrameProfiler, clock: Clock, *stage_ms: float) -> None:
+    """One frame spending ``stage_ms[i]`` in stage ``i``."""
+    prof.begin()
+    for stage, ms in enumerate(stage_ms):
+        clock.advance(ms)
+        prof.mark(stage)
+    prof.end()
+
+
+def test_ring_buffer_keeps_last_window(clock):
+    prof = FrameProfiler(("copy", "render"), window=4)
+    for ms in range(1, 7):
+        record(prof, clock, 0.5, ms)
+    s = prof.stats()
+    assert (s["frames"], s["window"]) == (6, 4)
+    # Frames 3..6 survive the wraparound; 1 and 2 were overwritten
+    assert s["stages_ms"]["render"]["mean"] == pytest.approx(4.5)
+    assert s["stages_ms"]["render"]["max"] == pytest.approx(6.0)
+    assert s["stages_ms"]["copy"]["mean"] == pytest.approx(0.5)
+    assert s["frame_ms"]["max"] == pytest.approx(6.5)
+    # Frames end 4.5, 5.5 and 6.5 ms apart: 3 intervals over 16.5 ms
+    assert s["fps"] == pytest.approx(3 / 0.0165)
+
+
+def test_latency_histogram_bins(clock):
+    durations = [1.0, 3.0, 5.0, 10.0, 20.0, 40.0, 60.0, 200.0, 3.5, 3.9]
+    prof = FrameProfiler(("render",), window=len(durations))
+    for ms in durations:
+        record(prof, clock, ms)
+    hist = prof.stats()["frame_ms_histogram"]
+    assert list(hist) == [
+        f"{lo:g}-{hi:g}" for lo, hi in itertools.pairwise(LATENCY_BINS_MS)
+    ]
+    assert list(hist.values()) == [1, 3, 1, 1, 1, 1, 1, 1]
+
+
+def test_hud_refreshes_every_n_frames(clock):
+    prof = FrameProfiler(("render",), hud_every=3)
+    assert prof.hud() == ""
+    record(prof, clock, 1.0)
+    first = prof.hud()
+    assert first.startswith("render 1.0 ms")
+    record(prof, clock, 10.0)
+    assert prof.hud() == first
+    record(prof, clock, 10.0)  # third frame: the overlay is recomputed
+    assert prof.hud() != first
+    assert prof.hud().startswith("render 7.0 ms")
+
+
+def test_close_stops_only_its_own_tracemalloc():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc is already active in this interpreter")
+    prof = FrameProfiler(("render",), track_allocations=True)
+    assert tracemalloc.is_tracing()
+    prof.begin()
+    prof.end()
+    assert "alloc_bytes" in prof.stats()
+    prof.close()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        prof = FrameProfiler(("render",), track_allocations=True)
+        prof.close()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
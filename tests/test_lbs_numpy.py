@@ -0,0 +1,99 @@
+"""Tests for motion_gen_survey.lbs_numpy on a tiny synthetic SMPL-X-layout model."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.lbs_numpy import (
+    NUM_SMPLX_JOINTS,
+    LBSModel,
+    extract_lbs,
+)
+from motion_gen_survey.smplx_bake import POSE_DIM, POSE_LAYOUT
+
+
+NUM_VERTS = 40
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    """``SMPLX_NEUTRAL.npz``-style file: 55 joints in a random tree, 40 vertices."""
+    rng = np.random.default_rng(0)
+    nj, nv = NUM_SMPLX_JOINTS, NUM_VERTS
+    parents = np.array([-1] + [int(rng.integers(0, j)) for j in range(1, nj)])
+    regressor = rng.random((nj, nv))
+    weights = rng.random((nv, nj)) ** 4  # a few dominant joints per vertex
+    path = tmp_path / "SMPLX_NEUTRAL.npz"
+    np.savez(
+        path,
+        v_template=rng.normal(size=(nv, 3)),
+        shapedirs=rng.normal(scale=0.01, size=(nv, 3, 2)),
+        J_regressor=regressor / regressor.sum(axis=1, keepdims=True),
+        kintree_table=np.stack([parents, np.arange(nj)]),
+        weights=weights / weights.sum(axis=1, keepdims=True),
+        posedirs=rng.normal(scale=0.01, size=(nv, 3, (nj - 1) * 9)),
+        f=rng.integers(0, nv, size=(20, 3)),
+    )
+    return path
+
+
+def load(model_file, tmp_path, correctives="float32", top_k=NUM_SMPLX_JOINTS):
+    out = extract_lbs(
+        model_file, tmp_path / "lbs.npz", top_k=top_k, correctives=correctives
+    )
+    return LBSModel(out, dtype=np.float64)
+
+
+def rotation_z(angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def dense_lbs(model: LBSModel, rotations: np.ndarray) -> np.ndarray:
+    """Textbook LBS with 4x4 world transforms and the full weight matrix."""
+    v, j_rest = model.shape()
+    world = np.zeros((model.num_joints, 4, 4))
+    for j, parent in enumerate(model.parents):
+        local = np.eye(4)
+        local[:3, :3] = rotations[j]
+        local[:3, 3] = j_rest[j] - (j_rest[parent] if parent >= 0 else 0.0)
+        world[j] = local if parent < 0 else world[parent] @ local
+    skin = world.copy()
+    skin[:, :3, 3] -= np.einsum("jrc,jc->jr", world[:, :3, :3], j_rest)
+    weights = np.zeros((model.num_vertices, model.num_joints))
+    np.put_along_axis(weights, model.weight_index, model.weight_values, axis=1)
+    blended = np.einsum("vj,jrc->vrc", weights, skin)
+    return np.einsum("vrc,vc->vr", blended[:, :3, :3], v) + blended[:, :3, 3]
+
+
+def test_identity_pose_is_template(model_file, tmp_path):
+    model = load(model_file, tmp_path)
+    verts = model.pose(np.zeros((2, POSE_DIM)))
+    np.testing.assert_allclose(verts, np.broadcast_to(model.v_template, verts.shape))
+
+
+def test_single_joint_rotation_matches_dense_reference(model_file, tmp_path):
+    model = load(model_file, tmp_path, correctives="none")
+    joint = 1  # first body joint
+    pose = np.zeros(POSE_DIM)
+    pose[POSE_LAYOUT["body_pose"]][:3] = [0.0, 0.0, 0.7]
+    rotations = np.broadcast_to(np.eye(3), (model.num_joints, 3, 3)).copy()
+    rotations[joint] = rotation_z(0.7)
+    verts = model.pose(pose[None])[0]
+    np.testing.assert_allclose(verts, dense_lbs(model, rotations), atol=1e-6)
+    assert not np.allclose(verts, model.v_template)
+
+
+def test_chunked_pose_matches_single_pass(model_file, tmp_path):
+    model = load(model_file, tmp_path, top_k=4)
+    rng = np.random.default_rng(1)
+    poses = rng.normal(scale=0.3, size=(7, POSE_DIM))
+    transl = rng.normal(size=(7, 3))
+    betas = rng.normal(size=2)
+    joints_one = np.empty((7, NUM_SMPLX_JOINTS, 3))
+    joints_chunked = np.empty_like(joints_one)
+    one = model.pose(poses, betas, transl, batch_size=7, joints_out=joints_one)
+    chunked = model.pose(poses, betas, transl, batch_size=3, joints_out=joints_chunked)
+    np.testing.assert_allclose(chunked, one, atol=1e-12)
+    np.testing.assert_allclose(joints_chunked, joints_one, atol=1e-12)
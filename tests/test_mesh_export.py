@@ -0,0 +1,111 @@
+"""Tests for motion_gen_survey.mesh_export."""
+
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.mesh_export import export_frames, export_glb
+
+
+@pytest.fixture
+def mesh():
+    """A small deforming mesh: ``(frames, V, 3)`` vertices and ``(F, 3)`` faces."""
+    rng = np.random.default_rng(0)
+    verts = rng.normal(size=(5, 12, 3)).astype(np.float32)
+    faces = rng.integers(0, 12, size=(8, 3))
+    return verts, faces
+
+
+def read_ply(path):
+    data = path.read_bytes()
+    end = data.index(b"end_header\n") + len(b"end_header\n")
+    header = data[:end].decode("ascii").splitlines()
+    num_v = int(next(h for h in header if h.startswith("element vertex")).split()[-1])
+    num_f = int(next(h for h in header if h.startswith("element face")).split()[-1])
+    verts = np.frombuffer(data, "<f4", num_v * 3, end).reshape(num_v, 3)
+    rows = np.frombuffer(
+        data, [("n", "u1"), ("idx", "<i4", (3,))], num_f, end + verts.nbytes
+    )
+    assert (rows["n"] == 3).all()
+    return verts, rows["idx"]
+
+
+def read_obj(path):
+    lines = path.read_text().splitlines()
+    verts = [[float(v) for v in line.split()[1:]] for line in lines if line[0] == "v"]
+    faces = [[int(i) - 1 for i in line.split()[1:]] for line in lines if line[0] == "f"]
+    return np.array(verts), np.array(faces)
+
+
+def read_glb(path):
+    """``(gltf, bin_chunk)``; checks the GLB header and chunk lengths on the way."""
+    data = path.read_bytes()
+    magic, version, total = struct.unpack_from("<III", data, 0)
+    assert (magic, version, total) == (0x46546C67, 2, len(data))
+    json_len, json_type = struct.unpack_from("<II", data, 12)
+    assert json_type == 0x4E4F534A and json_len % 4 == 0
+    gltf = json.loads(data[20 : 20 + json_len])
+    bin_len, bin_type = struct.unpack_from("<II", data, 20 + json_len)
+    assert bin_type == 0x004E4942
+    assert 28 + json_len + bin_len == len(data)
+    assert bin_len == gltf["buffers"][0]["byteLength"]
+    for view in gltf["bufferViews"]:
+        assert view["byteLength"] > 0
+        assert view["byteOffset"] + view["byteLength"] <= bin_len
+    for accessor in gltf["accessors"]:
+        assert accessor["count"] > 0
+    return gltf, data[28 + json_len :]
+
+
+def accessor_array(gltf, chunk, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    dtype = "<f4" if accessor["componentType"] == 5126 else "<u4"
+    width = 3 if accessor["type"] == "VEC3" else 1
+    out = np.frombuffer(chunk, dtype, accessor["count"] * width, view["byteOffset"])
+    return out.reshape(accessor["count"], width) if width > 1 else out
+
+
+@pytest.mark.parametrize("fmt", ["ply", "obj"])
+def test_per_frame_round_trip(mesh, tmp_path, fmt):
+    verts, faces = mesh
+    paths = export_frames(tmp_path, verts, faces, fmt=fmt, workers=2)
+    assert [p.name for p in paths] == [f"frame_{i:05d}.{fmt}" for i in range(5)]
+    read = read_ply if fmt == "ply" else read_obj
+    for frame, path in zip(verts, paths, strict=True):
+        v, f = read(path)
+        np.testing.assert_allclose(v, frame, atol=1e-6)
+        np.testing.assert_array_equal(f, faces)
+
+
+def test_glb_morph_targets_rebuild_frames(mesh, tmp_path):
+    verts, faces = mesh
+    gltf, chunk = read_glb(export_glb(tmp_path / "seq.glb", verts, faces, fps=20.0))
+    primitive = gltf["meshes"][0]["primitives"][0]
+    np.testing.assert_array_equal(
+        accessor_array(gltf, chunk, primitive["indices"]), faces.ravel()
+    )
+    base = accessor_array(gltf, chunk, primitive["attributes"]["POSITION"])
+    np.testing.assert_array_equal(base, verts[0])
+    assert len(primitive["targets"]) == len(verts) - 1
+    for k, target in enumerate(primitive["targets"], start=1):
+        delta = accessor_array(gltf, chunk, target["POSITION"])
+        np.testing.assert_allclose(base + delta, verts[k], atol=1e-6)
+    sampler = gltf["animations"][0]["samplers"][0]
+    times = accessor_array(gltf, chunk, sampler["input"])
+    np.testing.assert_allclose(times, np.arange(5) / 20.0)
+    weights = accessor_array(gltf, chunk, sampler["output"]).reshape(5, 4)
+    np.testing.assert_array_equal(weights, np.eye(5, 4, k=-1))
+
+
+def test_single_frame_glb_has_no_animation(mesh, tmp_path):
+    verts, faces = mesh
+    gltf, chunk = read_glb(export_glb(tmp_path / "one.glb", verts[:1], faces))
+    assert "animations" not in gltf
+    assert "targets" not in gltf["meshes"][0]["primitives"][0]
+    assert len(gltf["bufferViews"]) == len(gltf["accessors"]) == 2
+    np.testing.assert_array_equal(accessor_array(gltf, chunk, 1), verts[0])
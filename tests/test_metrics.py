@@ -0,0 +1,75 @@
+"""Tests for motion_gen_survey.metrics."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.features import build_features
+from motion_gen_survey.metrics import (
+    evaluate_store,
+    per_frame_jerk,
+    transition_jerk_stats,
+    transition_windows,
+)
+from tests.conftest import REST_POSE, walk
+
+
+def cubic(frames: int, fps: float, a: float) -> np.ndarray:
+    """A body translating along X as ``a * t**3``: constant jerk ``6 a``."""
+    t = np.arange(frames) / fps
+    x = np.repeat(REST_POSE[None, None], frames, axis=1)
+    x[..., 0] += (a * t**3)[None, :, None]
+    return x
+
+
+def test_cubic_trajectory_has_constant_jerk():
+    jerk = per_frame_jerk(cubic(50, 20.0, 0.5), 20.0)
+    assert jerk.shape == (1, 47)
+    np.testing.assert_allclose(jerk, 3.0, rtol=1e-2)
+
+
+def test_jerk_blocks_match_single_pass():
+    joints = walk(frames=90, batch=2)
+    joints += np.random.default_rng(0).normal(scale=0.01, size=joints.shape)
+    np.testing.assert_allclose(
+        per_frame_jerk(joints, 20.0, block_frames=8), per_frame_jerk(joints, 20.0)
+    )
+    assert per_frame_jerk(joints[:, :3], 20.0).shape == (2, 0)
+
+
+def test_transition_windows():
+    np.testing.assert_array_equal(
+        transition_windows([40, 30, 50], 30), [[25, 55], [55, 85]]
+    )
+    assert transition_windows([40], 30).shape == (0, 2)
+
+
+def test_transition_stats_match_loop():
+    rng = np.random.default_rng(1)
+    jerk = rng.uniform(0.0, 5.0, size=(3, 97)).astype(np.float32)
+    windows = np.array([[-5, 25], [40, 70], [80, 110]])
+    pj, auj = transition_jerk_stats(jerk, windows, 20.0, reference=1.0)
+    for b in range(3):
+        for w, (start, stop) in enumerate(windows):
+            # Frame f is jerk sample f - 1
+            picked = jerk[b, max(0, start - 1) : min(97, stop - 1)]
+            assert pj[b, w] == pytest.approx(picked.max())
+            assert auj[b, w] == pytest.approx(np.abs(picked - 1.0).sum() / 20.0)
+
+
+def test_evaluate_store_scores_transitions(make_store):
+    joints = walk(frames=100, batch=2)
+    # A jump at the boundary between the two instructions
+    joints[:, 60:, :, 0] += 0.5
+    store = make_store(joints, lengths=[60, 40])
+    rows = evaluate_store(store, transition_length=20)
+    assert [r["sample"] for r in rows] == [0, 1]
+    assert all(r["transitions"] == 1 and r["frames"] == 100 for r in rows)
+    assert rows[0]["pj_max"] == pytest.approx(rows[0]["seq_peak_jerk"])
+    assert rows[0]["pj_max"] > 0.5 * 20.0**3
+
+    smooth = evaluate_store(make_store(walk(frames=100, batch=2), lengths=[60, 40]))
+    assert smooth[0]["pj_max"] < 0.1 * rows[0]["pj_max"]
+    with_skate = evaluate_store(store, features=build_features(store))
+    assert 0.0 <= with_skate[0]["skate_ratio"] <= 1.0
@@ -0,0 +1,81 @@
+"""Tests for motion_gen_survey.motion_codec."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.motion_codec import (
+    decode_to_store,
+    delta_decode,
+    delta_encode,
+    encode_store,
+    from_offsets,
+    open_archive,
+    quantize,
+    to_offsets,
+    verify,
+)
+from motion_gen_survey.motion_store import open_motion_store
+from tests.conftest import walk
+
+
+def test_block_transform_round_trip():
+    grid = quantize(walk(frames=33, batch=2), 0.002)
+    offsets = to_offsets(grid)
+    for order in (1, 2):
+        np.testing.assert_array_equal(
+            delta_decode(delta_encode(offsets, order), order), offsets
+        )
+    np.testing.assert_array_equal(from_offsets(offsets), grid)
+
+
+@pytest.mark.parametrize("order", [1, 2])
+def test_encode_within_tolerance(make_store, tmp_path, order):
+    joints = walk(frames=150, batch=3)
+    joints[:, :, :, 0] += 25.0  # far from the origin, where float32 steps are coarse
+    store = make_store(joints, lengths=[150, 120, 90])
+    out = encode_store(
+        store, tmp_path / "m.t2mc", tolerance_mm=1.0, block_frames=64, order=order
+    )
+    with open_archive(out) as archive:
+        assert archive.shape == store.joints.shape
+        assert archive.num_blocks == 3
+        assert archive.fps == store.fps
+        assert archive.lengths == [150, 120, 90]
+        assert archive.nbytes < store.joints.nbytes / 4
+        assert verify(archive, store) <= 0.001 * (1 + 1e-4)
+
+
+def test_random_access_matches_full_decode(make_store, tmp_path):
+    store = make_store(walk(frames=100, batch=3))
+    with open_archive(encode_store(store, tmp_path / "m.t2mc", block_frames=16)) as a:
+        full = np.asarray(a.joints)
+        np.testing.assert_array_equal(a.read([2, 0], 30, 71), full[[2, 0], 30:71])
+        np.testing.assert_array_equal(a.joints[1, 15:17], full[1, 15:17])
+        np.testing.assert_array_equal(a.joints[1:][:, ::7, 3], full[1:, ::7, 3])
+
+
+def test_lossless_keeps_bits(make_store, tmp_path):
+    joints = walk(frames=40, batch=2)
+    joints[1, 10] = np.nan
+    store = make_store(joints)
+    with pytest.raises(ValueError, match="non-finite"):
+        encode_store(store, tmp_path / "lossy.t2mc")
+    with open_archive(
+        encode_store(store, tmp_path / "m.t2mc", tolerance_mm=0.0)
+    ) as archive:
+        assert archive.lossless
+        np.testing.assert_array_equal(
+            np.asarray(archive.joints).view(np.int32), joints.view(np.int32)
+        )
+
+
+def test_decode_to_store(make_store, tmp_path):
+    store = make_store(walk(frames=50, batch=2), lengths=[50, 30])
+    archive = open_archive(encode_store(store))
+    decoded = open_motion_store(decode_to_store(archive, tmp_path / "decoded"))
+    archive.close()
+    assert decoded.lengths == [50, 30]
+    assert decoded.text == store.text
+    np.testing.assert_allclose(decoded.joints, store.joints, atol=0.001 + 1e-6)
@@ -0,0 +1,91 @@
+"""Tests for motion_gen_survey.motion_index."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.motion_index import (
+    MotionIndex,
+    build_index,
+    compute_descriptors,
+    store_descriptors,
+)
+from motion_gen_survey.transforms import rotation_matrix
+from tests.conftest import walk
+
+
+def rms(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.linalg.norm(a - b))
+
+
+def test_descriptor_ignores_position_heading_and_duration():
+    joints = walk(frames=60)
+    base = compute_descriptors(joints)[0]
+    turned = joints @ rotation_matrix("y", 70.0).T.astype(np.float32)
+    turned[..., [0, 2]] += np.float32([3.0, -2.0])
+    assert rms(compute_descriptors(turned)[0], base) < 1e-5
+    # The same walk sampled at twice the frame rate
+    dense = walk(frames=119, fps=40.0)
+    assert rms(compute_descriptors(dense)[0], base) < 5e-3
+    assert rms(compute_descriptors(walk(frames=60, seed=3))[0], base) > 0.02
+
+
+def test_store_descriptors_split_segments(make_store):
+    store = make_store(
+        walk(frames=90, batch=3), text=["walk", "turn"], lengths=[50, 40]
+    )
+    entries, desc = store_descriptors(store)
+    assert desc.shape == (6, 16 * 23 * 3)
+    assert [(e["sample"], e["segment"], e["text"]) for e in entries] == [
+        (0, 0, "walk"),
+        (1, 0, "walk"),
+        (2, 0, "walk"),
+        (0, 1, "turn"),
+        (1, 1, "turn"),
+        (2, 1, "turn"),
+    ]
+    clips, _ = store_descriptors(store, unit="clip")
+    assert [(e["start"], e["stop"], e["text"]) for e in clips] == [
+        (0, 90, "walk / turn"),
+    ] * 3
+
+
+@pytest.fixture
+def index(make_store, tmp_path) -> MotionIndex:
+    rng = np.random.default_rng(0)
+    # Per-sample body proportions, so clips are a few centimetres apart
+    a = walk(frames=60, batch=40, seed=1) + rng.normal(0.0, 0.03, (40, 1, 22, 3))
+    b = walk(frames=80, batch=40, seed=2) + rng.normal(0.0, 0.03, (40, 1, 22, 3))
+    a, b = a.astype(np.float32), b.astype(np.float32)
+    b[7, :60] = a[3]  # one clip repeated across the two result dirs
+    make_store(a, name="a/humanml")
+    make_store(b, name="b/humanml", lengths=[60, 20])
+    return build_index([tmp_path], tmp_path / "index", ivf=True, nlist=8)
+
+
+def test_exact_search_matches_brute_force(index):
+    assert index.count == 40 + 80
+    queries = np.asarray(index.descriptors[[5, 50, 100]])
+    dist, ids = index.search(queries, k=5, block_rows=16)
+    full = np.linalg.norm(queries[:, None] - index.descriptors[None], axis=-1)
+    np.testing.assert_array_equal(ids, np.argsort(full, axis=1, kind="stable")[:, :5])
+    np.testing.assert_allclose(dist, np.sort(full, axis=1)[:, :5], atol=2e-3)
+
+
+def test_ivf_search_with_every_list_is_exact(index):
+    queries = np.asarray(index.descriptors[:10])
+    exact_d, _ = index.search(queries, k=3)
+    ivf_d, ivf_i = index.search(queries, k=3, nprobe=8, rerank=index.count)
+    np.testing.assert_array_equal(ivf_i[:, 0], np.arange(10))
+    np.testing.assert_allclose(ivf_d, exact_d, atol=2e-3)
+    reopened = MotionIndex(index.index_dir)
+    assert reopened.ivf is not None and len(reopened.ivf["centroids"]) == 8
+
+
+def test_near_duplicates(index):
+    pairs = list(index.near_duplicates(0.005, block_rows=16))
+    # Segment rows come first for every sample of a result
+    assert [(i, j) for i, j, _ in pairs] == [(3, 40 + 7)]
+    row = index.entries[pairs[0][1]]
+    assert (row["sample"], row["segment"], row["stop"]) == (7, 0, 60)
@@ -0,0 +1,60 @@
+"""Tests for motion_gen_survey.motion_store."""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from motion_gen_survey import motion_store
+from motion_gen_survey.motion_store import (
+    JOINTS_FILENAME,
+    META_FILENAME,
+    open_motion_store,
+)
+from tests.conftest import walk
+
+
+def test_convert_round_trip(make_store):
+    joints = walk(frames=40, batch=2)
+    store = make_store(joints, lengths=[40, 25])
+    assert store.joints.shape == (2, 40, 22, 3)
+    assert store.fps == 20.0
+    assert store.joint_set == "t2m"
+    assert store.text == ["walk 0", "walk 1"]
+    assert store.segment_lengths(1) == [25]
+    np.testing.assert_array_equal(store.joints, joints)
+
+
+def test_reconverts_when_results_change(make_store):
+    store = make_store(walk(frames=20))
+    newer = walk(frames=30, seed=1)
+    reopened = make_store(newer)
+    assert reopened.num_frames == 30
+    assert reopened.content_hash != store.content_hash
+    np.testing.assert_array_equal(reopened.joints, newer)
+
+
+def test_interrupted_update_never_pairs_old_meta_with_new_joints(
+    make_store, monkeypatch
+):
+    store = make_store(walk(frames=20))
+    store_dir = store.store_dir
+    del store
+    real_replace = os.replace
+
+    def crash_on_meta(src, dst):
+        if str(dst).endswith(META_FILENAME):
+            raise KeyboardInterrupt
+        real_replace(src, dst)
+
+    monkeypatch.setattr(motion_store.os, "replace", crash_on_meta)
+    with pytest.raises(KeyboardInterrupt):
+        make_store(walk(frames=30, seed=1))
+    monkeypatch.undo()
+
+    # The new joints are in place but the stale sidecar is gone, not kept
+    assert (store_dir / JOINTS_FILENAME).stat().st_size == 30 * 22 * 3 * 4
+    assert not (store_dir / META_FILENAME).exists()
+    assert open_motion_store(store_dir.parent).num_frames == 30
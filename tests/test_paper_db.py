@@ -0,0 +1,147 @@
+"""Tests for motion_gen_survey.paper_db."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from motion_gen_survey.paper_db import (
+    check,
+    comparison_table,
+    connect,
+    count_matches,
+    facet_counts,
+    ingest,
+    parse_bibtex_fields,
+    parse_facet_filters,
+    search,
+    slug,
+    split_bibtex,
+)
+
+
+BIB = """
+@comment{ignored {nested} block}
+@inproceedings{flowmdm2024,
+  title = {{FlowMDM}: Seamless Human Motion Composition},
+  author = "Barquero, German and Escalera, Sergio and Palmero, Cristina",
+  booktitle = {CVPR},
+  year = 2024,
+  abstract = {Diffusion for long human motion " # "composition.},
+  approach_type = {Neural / deep learning approaches},
+  technical_framework = {diffusion-model; VAE},
+  code_url = {https://github.com/BarqueroGerman/FlowMDM},
+}
+@article(deepmimic,
+  title = "Deep" # "Mimic",
+  author = {Peng, Xue Bin},
+  journal = {TOG},
+  year = {2018},
+  approach_type = {hybrid},
+  technical_framework = {RL},
+  real_time = {yes},
+)
+"""
+
+
+def test_split_and_parse_bibtex():
+    entries = list(split_bibtex(BIB))
+    assert [(t, k) for t, k, _ in entries] == [
+        ("inproceedings", "flowmdm2024"),
+        ("article", "deepmimic"),
+    ]
+    fields = parse_bibtex_fields(entries[0][2])
+    assert fields["title"] == "FlowMDM: Seamless Human Motion Composition"
+    assert fields["year"] == "2024"
+    assert fields["abstract"] == 'Diffusion for long human motion " # "composition.'
+    assert parse_bibtex_fields(entries[1][2])["title"] == "DeepMimic"
+
+
+def test_slug_aliases():
+    assert slug("Data-driven methods") == "data-driven"
+    assert slug("Neural / deep learning approaches") == "neural"
+    assert slug("Some New Thing") == "some-new-thing"
+    assert parse_facet_filters(["approach-type=Neural,hybrid", "year=2024"]) == {
+        "approach_type": ["neural", "hybrid"],
+        "year": ["2024"],
+    }
+    with pytest.raises(ValueError, match="bad facet filter"):
+        parse_facet_filters(["colour=red"])
+
+
+@pytest.fixture
+def sources(tmp_path):
+    root = tmp_path / "papers"
+    root.mkdir()
+    (root / "survey.bib").write_text(BIB, encoding="utf-8")
+    papers = [
+        {
+            "key": "mdm2023",
+            "title": "Human Motion Diffusion Model",
+            "authors": ["Tevet, Guy"],
+            "year": 2023,
+            "venue": "ICLR",
+            "approach_type": "neural",
+            "technical_framework": ["diffusion"],
+            "real_time": "no",
+        },
+        {"key": "draft", "title": "Untitled", "approach_type": "magic"},
+    ]
+    (root / "extra.json").write_text(json.dumps({"papers": papers}), encoding="utf-8")
+    return root
+
+
+def test_ingest_is_incremental(sources, tmp_path):
+    conn = connect(tmp_path / "db" / "papers.sqlite")
+    stats = ingest(conn, [sources])
+    assert (stats.files, stats.added, stats.removed) == (2, 4, 0)
+    stats = ingest(conn, [sources])
+    assert (stats.files_skipped, stats.added, stats.updated) == (2, 0, 0)
+
+    bib = sources / "survey.bib"
+    st = bib.stat()
+    bib.write_text(BIB.replace("{2018}", "{2019}"), encoding="utf-8")
+    os.utime(bib, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    stats = ingest(conn, [sources])
+    assert (stats.updated, stats.unchanged, stats.added) == (1, 1, 0)
+    assert search(conn, "deepmimic")[0]["year"] == 2019
+
+    (sources / "extra.json").unlink()
+    assert ingest(conn, [sources]).removed == 2
+    assert count_matches(conn) == 2
+
+
+def test_search_counts_and_table(sources, tmp_path):
+    conn = connect(tmp_path / "papers.sqlite")
+    ingest(conn, [sources])
+    # Title matches weigh more than abstract matches
+    assert [p["key"] for p in search(conn, "diffusion")] == ["mdm2023", "flowmdm2024"]
+    assert [p["key"] for p in search(conn)] == [
+        "flowmdm2024",
+        "mdm2023",
+        "deepmimic",
+        "draft",
+    ]
+    neural = {"approach_type": ["neural"]}
+    assert [p["key"] for p in search(conn, facets=neural, year_from=2024)] == [
+        "flowmdm2024"
+    ]
+    assert count_matches(conn, "diffusion", {"real_time": ["no"]}) == 1
+
+    counts = facet_counts(
+        conn, ["technical_framework", "code_available"], facets=neural
+    )
+    assert counts["technical_framework"] == [("diffusion", 2), ("vae", 1)]
+    assert counts["code_available"] == [("yes", 1)]
+
+    table = comparison_table(
+        conn, search(conn, facets=neural), ["key", "year", "technical_framework"]
+    )
+    assert table.splitlines()[2] == "| flowmdm2024 | 2024 | diffusion, vae |"
+
+    assert check(conn) == [
+        "draft: approach_type='magic' is not in the taxonomy",
+        "draft: missing year",
+    ]
@@ -0,0 +1,158 @@
+"""Tests for motion_gen_survey.playback."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.playback import (
+    MAX_SPEED,
+    PlaybackClock,
+    frame_pair,
+    lerp_frames,
+)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def make_clock(fps=20.0, num_frames=100, speed=1.0, loop=True):
+    fake = FakeClock()
+    clock = PlaybackClock(fps, num_frames, speed=speed, loop=loop, clock=fake)
+    clock.play()
+    return clock, fake
+
+
+def run_ticks(clock, fake, interval, ticks):
+    for _ in range(ticks):
+        fake.advance(interval)
+        clock.tick()
+
+
+class TestDroppedFrames:
+    def test_on_time_ticks_drop_nothing(self):
+        clock, fake = make_clock(fps=20.0)
+        run_ticks(clock, fake, 1 / 60, 90)
+        assert clock.dropped_frames == 0
+        assert clock.frame == pytest.approx(30, abs=1)
+
+    @pytest.mark.parametrize("speed", [2.0, 4.0, 8.0])
+    def test_fast_speed_is_not_a_drop(self, speed):
+        clock, fake = make_clock(fps=20.0, num_frames=1000, speed=speed)
+        run_ticks(clock, fake, 1 / 20, 50)
+        assert clock.dropped_frames == 0
+        assert clock.frame == pytest.approx(50 * speed % 1000, abs=1)
+
+    def test_fast_speed_at_display_rate_is_not_a_drop(self):
+        clock, fake = make_clock(fps=20.0, num_frames=1000, speed=MAX_SPEED)
+        run_ticks(clock, fake, 1 / 60, 120)
+        assert clock.dropped_frames == 0
+
+    def test_late_tick_counts_missed_frames(self):
+        clock, fake = make_clock(fps=20.0)
+        run_ticks(clock, fake, 1 / 20, 5)
+        fake.advance(4 / 20)  # one render took four frame intervals
+        clock.tick()
+        assert clock.dropped_frames == 3
+
+    def test_late_tick_at_double_speed(self):
+        clock, fake = make_clock(fps=20.0, speed=2.0)
+        run_ticks(clock, fake, 1 / 20, 5)
+        fake.advance(3 / 20)  # 6 frames advanced, 2 expected on time
+        clock.tick()
+        assert clock.dropped_frames == 4
+
+    def test_loop_wrap_is_not_a_drop(self):
+        clock, fake = make_clock(fps=20.0, num_frames=10)
+        run_ticks(clock, fake, 1 / 20, 35)
+        assert clock.dropped_frames == 0
+
+    def test_seek_and_resume_are_not_drops(self):
+        clock, fake = make_clock(fps=20.0)
+        clock.tick()
+        clock.seek(80)
+        clock.tick()
+        clock.pause()
+        fake.advance(10.0)
+        clock.tick()
+        clock.play()
+        run_ticks(clock, fake, 1 / 20, 3)
+        assert clock.dropped_frames == 0
+        assert clock.tick() == pytest.approx(83.0)
+
+
+class TestClock:
+    def test_position_follows_wall_time(self):
+        clock, fake = make_clock(fps=30.0, num_frames=100, speed=0.5)
+        fake.advance(2.0)
+        assert clock.tick() == pytest.approx(30.0)
+
+    def test_no_loop_pauses_at_end(self):
+        clock, fake = make_clock(fps=20.0, num_frames=10, loop=False)
+        fake.advance(5.0)
+        assert clock.tick() == 9.0
+        assert not clock.playing
+
+    def test_set_speed_keeps_position(self):
+        clock, fake = make_clock(fps=20.0)
+        fake.advance(1.0)
+        clock.set_speed(4.0)
+        assert clock.tick() == pytest.approx(20.0)
+        fake.advance(0.5)
+        assert clock.tick() == pytest.approx(60.0)
+
+    def test_speed_is_clamped_and_stepped(self):
+        clock, _ = make_clock(speed=100.0)
+        assert clock.speed == MAX_SPEED
+        assert clock.step_speed(-1) == 4.0
+        assert clock.step_speed(+1) == 8.0
+        assert clock.step_speed(+1) == 8.0
+
+    def test_set_num_frames_keeps_position(self):
+        clock, fake = make_clock(fps=20.0, num_frames=10, loop=False)
+        fake.advance(0.25)
+        clock.set_num_frames(50)
+        assert clock.tick() == pytest.approx(5.0)
+        fake.advance(1.0)
+        assert clock.tick() == pytest.approx(25.0)
+
+    def test_record_render_averages(self):
+        clock, _ = make_clock()
+        clock.record_render(0.010)
+        clock.record_render(0.020, smoothing=0.5)
+        assert clock.rendered_frames == 2
+        assert clock.last_latency == 0.020
+        assert clock.mean_latency == pytest.approx(0.015)
+
+
+class TestInterpolation:
+    def test_frame_pair(self):
+        assert frame_pair(2.25, 10) == (2, 3, 0.25)
+        assert frame_pair(9.5, 10, loop=True) == (9, 0, 0.5)
+        assert frame_pair(9.5, 10, loop=False) == (9, 9, 0.0)
+
+    def test_lerp_frames_writes_into_out(self):
+        motion = np.arange(2 * 4 * 3 * 3, dtype=np.float32).reshape(2, 4, 3, 3)
+        out = np.empty((2, 3, 3), dtype=np.float32)
+        assert lerp_frames(motion, 1.5, out) == 1
+        np.testing.assert_allclose(out, 0.5 * (motion[:, 1] + motion[:, 2]))
+        lerp_frames(motion, 3.0, out)
+        np.testing.assert_array_equal(out, motion[:, 3])
+
+    def test_lerp_frames_wraps_to_first_frame(self):
+        motion = np.random.default_rng(0).normal(size=(1, 4, 22, 3)).astype(np.float32)
+        out = np.empty((1, 22, 3), dtype=np.float32)
+        lerp_frames(motion, 3.25, out, loop=True)
+        np.testing.assert_allclose(
+            out, motion[:, 3] + 0.25 * (motion[:, 0] - motion[:, 3]), rtol=1e-6
+        )
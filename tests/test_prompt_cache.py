@@ -0,0 +1,110 @@
+"""Tests for motion_gen_survey.prompt_cache."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.prompt_cache import (
+    PromptCache,
+    instruction_texts,
+    normalize_text,
+)
+
+
+class FakeEncoder:
+    """Deterministic ``(n, dim)`` embeddings that records every text it encodes."""
+
+    def __init__(self, dim: int = 4) -> None:
+        self.dim = dim
+        self.seen: list[str] = []
+
+    def embed(self, text: str) -> np.ndarray:
+        seed = sum(normalize_text(text).encode("utf-8"))
+        return np.random.default_rng(seed).normal(size=self.dim).astype(np.float32)
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.seen.extend(texts)
+        return np.stack([self.embed(t) for t in texts])
+
+
+def test_encode_only_sends_uncached_unique_texts(tmp_path):
+    enc = FakeEncoder()
+    cache = PromptCache(tmp_path, "clip")
+    texts = ["a person walks", "A person   walks", "jumps"]
+    out = cache.encode(texts, enc)
+    assert enc.seen == ["a person walks", "jumps"]
+    np.testing.assert_array_equal(out[0], out[1])
+    np.testing.assert_array_equal(out[2], enc.embed("jumps"))
+
+    out = cache.encode(["jumps", "sits down"], enc)
+    assert enc.seen[2:] == ["sits down"]
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_persists_across_instances(tmp_path):
+    PromptCache(tmp_path, "clip").encode(["walk", "run"], FakeEncoder())
+
+    def fail(texts):
+        raise AssertionError(f"encoder called for {texts}")
+
+    reopened = PromptCache(tmp_path, "clip")
+    assert reopened.dim == 4 and len(reopened) == 2
+    np.testing.assert_array_equal(
+        reopened.encode(["RUN"], fail)[0], FakeEncoder().embed("run")
+    )
+    # Another encoder id never shares rows
+    assert "run" not in PromptCache(tmp_path, "clip-large")
+
+
+def test_sees_writes_of_another_instance(tmp_path):
+    reader = PromptCache(tmp_path, "clip")
+    writer = PromptCache(tmp_path, "clip")
+    enc = FakeEncoder()
+    for text in ("walk", "run", "jump"):
+        writer.put([text], enc([text]))
+        emb, missing = reader.get([text])
+        assert missing == []
+        np.testing.assert_array_equal(emb[0], enc.embed(text))
+
+
+def test_lru_eviction_within_budget(tmp_path):
+    enc = FakeEncoder()
+    cache = PromptCache(tmp_path, "clip", max_bytes=4 * 4 * 4)  # four rows of dim 4
+    cache.encode(["a", "b", "c", "d"], enc)
+    cache.encode(["a"], enc)
+    cache.encode(["e"], enc)
+    assert cache.nbytes == 64
+    assert [t in cache for t in "abcde"] == [True, False, True, True, True]
+    np.testing.assert_array_equal(cache.get(["e"])[0][0], enc.embed("e"))
+
+    assert cache.prune(2 * 4 * 4) == 2
+    assert sorted(t for t in "abcde" if t in PromptCache(tmp_path, "clip")) == [
+        "a",
+        "e",
+    ]
+
+
+def test_dim_mismatch(tmp_path):
+    cache = PromptCache(tmp_path, "clip")
+    cache.put(["walk"], np.zeros((1, 4), np.float32))
+    with pytest.raises(ValueError, match="dim"):
+        cache.put(["run"], np.zeros((1, 8), np.float32))
+    with pytest.raises(ValueError, match="dim"):
+        PromptCache(tmp_path, "clip", dim=8)
+
+
+def test_instruction_texts(tmp_path):
+    path = tmp_path / "composition.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"text": ["Walk  forward", "turn left"], "lengths": [60, 40]},
+                {"text": "walk forward", "meta": {"text": "sit"}},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    assert instruction_texts([path]) == ["walk forward", "turn left", "sit"]
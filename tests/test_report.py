@@ -0,0 +1,67 @@
+"""Tests for motion_gen_survey.report."""
+
+from __future__ import annotations
+
+import csv
+
+import numpy as np
+
+from motion_gen_survey.report import main, report_store, sample_stats
+from tests.conftest import REST_POSE, walk
+
+
+def issues(cols, sample):
+    return set(filter(None, cols["issues"][sample].split(",")))
+
+
+def test_walk_is_clean_and_travels():
+    cols = sample_stats(walk(frames=41, fps=20.0, speed=1.4, batch=2), 20.0)
+    assert [issues(cols, k) for k in range(2)] == [set(), set()]
+    # Ground-plane path of the pelvis: 1.4 m/s for 2 s
+    np.testing.assert_allclose(cols["root_path_m"], 2.8, rtol=1e-4)
+    np.testing.assert_array_equal(cols["nonfinite_frames"], [0, 0])
+    assert (cols["frozen_ratio"] == 0).all()
+
+
+def test_constant_pose_with_nan_is_flagged():
+    x = np.repeat(REST_POSE[None, None], 10, axis=1).repeat(2, axis=0)
+    x[1, 4, 20] = np.nan  # one wrist coordinate of sample 1, frame 4
+    cols = sample_stats(x, 20.0)
+    assert issues(cols, 0) == {"static", "frozen"}
+    assert {"nonfinite", "frozen"} <= issues(cols, 1)
+    np.testing.assert_array_equal(cols["nonfinite_frames"], [0, 1])
+    np.testing.assert_array_equal(cols["root_path_m"], [0.0, 0.0])
+    assert cols["frozen_ratio"][0] == 1.0
+    # The two differences touching the NaN frame are not repeats
+    np.testing.assert_allclose(cols["frozen_ratio"][1], 7 / 9)
+
+
+def test_single_frame_is_short():
+    cols = sample_stats(walk(frames=1), 20.0)
+    assert "short" in issues(cols, 0)
+    assert cols["root_path_m"][0] == 0.0
+
+
+def test_report_store_rows(make_store):
+    store = make_store(walk(frames=30, batch=3))
+    rows = report_store(store)
+    assert [r["sample"] for r in rows] == [0, 1, 2]
+    assert [r["text"] for r in rows] == ["walk 0", "walk 1", "walk 2"]
+    assert all(r["error"] == "" and r["issues"] == "" for r in rows)
+    assert rows[0]["frames"] == 30 and rows[0]["dataset"] == "humanml"
+
+
+def test_broken_result_gives_error_row(make_store, tmp_path, capsys):
+    make_store(walk(frames=30, batch=2))
+    broken = tmp_path / "broken"
+    broken.mkdir()
+    (broken / "results.npy").write_bytes(b"not a numpy file")
+    out = tmp_path / "report.csv"
+    main([str(tmp_path), "--out", str(out), "--workers", "1"])
+    assert "Results: 2  samples: 2" in capsys.readouterr().out
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    errors = [r for r in rows if r["error"]]
+    assert len(rows) == 3 and len(errors) == 1
+    assert errors[0]["result"] == str(broken)
+    assert errors[0]["issues"] == "error"
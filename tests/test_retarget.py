@@ -0,0 +1,135 @@
+"""Tests for motion_gen_survey.retarget."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.features import build_features
+from motion_gen_survey.motion_codec import encode_store
+from motion_gen_survey.motion_index import store_descriptors
+from motion_gen_survey.motion_store import open_motion_store, require_t2m
+from motion_gen_survey.retarget import (
+    JOINT_SETS,
+    infer_joint_set,
+    joint_map,
+    resample,
+    resampled_length,
+    rescale_lengths,
+    retarget_store,
+    synthesized_joints,
+)
+from tests.conftest import walk
+
+
+def direct_resample(x: np.ndarray, src_fps: float, dst_fps: float) -> np.ndarray:
+    """Per-frame reference interpolation along axis 1."""
+    n = resampled_length(x.shape[1], src_fps, dst_fps)
+    out = np.empty((x.shape[0], n, *x.shape[2:]), dtype=np.float64)
+    for k in range(n):
+        pos = k * src_fps / dst_fps
+        i0 = min(int(np.floor(pos)), x.shape[1] - 1)
+        i1 = min(i0 + 1, x.shape[1] - 1)
+        t = pos - i0
+        out[:, k] = (1.0 - t) * x[:, i0] + t * x[:, i1]
+    return out
+
+
+class TestResample:
+    @pytest.mark.parametrize(("src", "dst"), [(20.0, 30.0), (30.0, 20.0), (30.0, 60.0)])
+    def test_matches_direct_interpolation(self, src, dst):
+        x = walk(frames=47, batch=2)
+        np.testing.assert_allclose(
+            resample(x, src, dst), direct_resample(x, src, dst), atol=1e-5
+        )
+
+    def test_length_never_passes_last_frame(self):
+        assert resampled_length(21, 20.0, 30.0) == 31
+        assert resampled_length(20, 20.0, 30.0) == 29
+        assert resampled_length(0, 20.0, 30.0) == 0
+
+    def test_same_fps_is_a_copy(self):
+        x = walk(frames=10)
+        y = resample(x, 20.0, 20.0)
+        assert y is not x
+        np.testing.assert_array_equal(y, x)
+
+    def test_rescale_segment_lengths(self):
+        assert rescale_lengths([20, 40], 60, 1, 20.0, 30.0) == [30, 59]
+        assert rescale_lengths([[20, 40]], 60, 1, 20.0, 30.0) == [[30, 59]]
+        assert rescale_lengths([60, 40], 60, 2, 20.0, 30.0) == [89, 59]
+
+
+class TestJointMap:
+    def test_t2m_round_trip_through_smplx(self):
+        x = walk(frames=5)
+        to_smplx = joint_map("t2m", "smplx")
+        back = joint_map("smplx", "t2m").apply(to_smplx.apply(x))
+        np.testing.assert_allclose(back, x, atol=1e-6)
+
+    def test_selection_uses_index(self):
+        jmap = joint_map("smplx", "smpl")
+        assert jmap.index is not None
+        assert jmap.num_target == len(JOINT_SETS["smpl"])
+
+    def test_smpl_to_smplx_composes_through_t2m(self):
+        jmap = joint_map("smpl", "smplx")
+        assert jmap.weights.shape == (55, 24)
+        assert jmap.observed[:22].all() and not jmap.observed[22:].any()
+
+    def test_synthesized_joints(self):
+        assert synthesized_joints(joint_map("t2m", "t2m")) == []
+        assert synthesized_joints(joint_map("t2m", "smpl")) == ["L.Hand", "R.Hand"]
+        assert len(synthesized_joints(joint_map("t2m", "smplx"))) == 55 - 22
+        # SMPL hands read the SMPL-X middle fingers, synthesized from T2M
+        from_t2m = synthesized_joints(joint_map("t2m", "smplx"))
+        assert synthesized_joints(joint_map("smplx", "smpl"), from_t2m) == [
+            "L.Hand",
+            "R.Hand",
+        ]
+        assert synthesized_joints(joint_map("smplx", "t2m"), from_t2m) == []
+
+    def test_unknown_joint_set(self):
+        with pytest.raises(ValueError, match="unknown joint set"):
+            joint_map("t2m", "mano")
+        with pytest.raises(ValueError):
+            infer_joint_set(23)
+
+
+class TestRetargetStore:
+    def test_store_matches_direct_resample(self, make_store, tmp_path):
+        joints = walk(frames=101, batch=3)
+        store = make_store(joints, lengths=[101, 90, 80])
+        out = retarget_store(store, tmp_path / "out", fps=30.0, chunk_frames=16)
+        result = open_motion_store(out)
+        assert result.fps == 30.0
+        assert result.joint_set == "t2m"
+        assert result.synthesized_joints == []
+        assert result.lengths == [151, 134, 119]
+        np.testing.assert_allclose(
+            result.joints, direct_resample(joints, 20.0, 30.0), atol=1e-5
+        )
+
+    def test_smplx_store_is_flagged_and_rejected(self, make_store, tmp_path):
+        store = make_store(walk(frames=30, batch=2))
+        out = open_motion_store(
+            retarget_store(store, tmp_path / "smplx", joint_set="smplx")
+        )
+        assert out.num_joints == 55
+        assert out.joint_set == "smplx"
+        assert out.synthesized_joints == list(JOINT_SETS["smplx"][22:])
+        np.testing.assert_array_equal(out.joints[:, :, :22], store.joints)
+        for consume in (
+            lambda s: require_t2m(s, "test"),
+            lambda s: encode_store(s, tmp_path / "x.t2mc"),
+            lambda s: store_descriptors(s),
+            build_features,
+        ):
+            with pytest.raises(ValueError, match="22 T2M joints"):
+                consume(out)
+
+        back = open_motion_store(
+            retarget_store(out, tmp_path / "back", joint_set="t2m")
+        )
+        require_t2m(back, "test")
+        np.testing.assert_array_equal(back.joints, store.joints)
@@ -0,0 +1,141 @@
+"""Tests for motion_gen_survey.stream."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.retarget import retarget_store
+from motion_gen_survey.stream import (
+    HEADER,
+    MAGIC,
+    MSG_FRAMES,
+    PROTOCOL_VERSION,
+    StreamBuffer,
+    StreamClient,
+    StreamServer,
+    encode_frames,
+    parse_address,
+    replay,
+)
+from motion_gen_survey.transforms import YUP_TO_ZUP, apply_axis_map
+from tests.conftest import walk
+
+
+def chunks(joints: np.ndarray, size: int):
+    """``(start, (skeletons, count, 22, 3))`` pieces of ``(skeletons, frames, 22, 3)``."""
+    for start in range(0, joints.shape[1], size):
+        yield start, joints[:, start : start + size]
+
+
+class TestStreamBuffer:
+    def test_grows_and_keeps_every_frame(self):
+        joints = walk(frames=50, batch=2)
+        buf = StreamBuffer(2, initial_capacity=4)
+        for start, piece in chunks(joints, 7):
+            buf.append(start, piece.transpose(1, 0, 2, 3))
+        assert (buf.num_frames, buf.first_frame, buf.capacity) == (50, 0, 64)
+        for i in (0, 17, 49):
+            np.testing.assert_array_equal(buf.frame(i), joints[:, i])
+
+    def test_ring_wraps_at_max_frames(self):
+        joints = walk(frames=50, batch=1)
+        buf = StreamBuffer(1, max_frames=12, initial_capacity=4)
+        for start, piece in chunks(joints, 5):
+            buf.append(start, piece.transpose(1, 0, 2, 3))
+        assert (buf.num_frames, buf.first_frame, buf.capacity) == (50, 38, 12)
+        for i in range(38, 50):
+            np.testing.assert_array_equal(buf.frame(i), joints[:, i])
+        # Overwritten frames read as the oldest frame still held
+        np.testing.assert_array_equal(buf.frame(3), joints[:, 38])
+        np.testing.assert_array_equal(buf.frame(99), joints[:, 49])
+
+    def test_chunk_larger_than_ring(self):
+        joints = walk(frames=30, batch=1)
+        buf = StreamBuffer(1, max_frames=8)
+        buf.append(0, joints.transpose(1, 0, 2, 3))
+        assert (buf.num_frames, buf.first_frame) == (30, 22)
+        np.testing.assert_array_equal(buf.frame(22), joints[:, 22])
+
+
+def test_frames_message_layout():
+    joints = walk(frames=6, batch=2)
+    message = encode_frames(joints, start=40)
+    header = HEADER.unpack(message[: HEADER.size])
+    assert header == (MAGIC, MSG_FRAMES, PROTOCOL_VERSION, 2, 40, 6, joints.nbytes)
+    payload = np.frombuffer(message[HEADER.size :], dtype="<f4")
+    # Frame-major on the wire: (count, skeletons, joints, 3)
+    np.testing.assert_array_equal(
+        payload.reshape(6, 2, 22, 3), joints.transpose(1, 0, 2, 3)
+    )
+
+
+def test_parse_address():
+    assert parse_address("unix:/tmp/s.sock") == ("unix", "/tmp/s.sock")
+    assert parse_address(":9000") == ("tcp", ("127.0.0.1", 9000))
+    assert parse_address("[::1]:9000") == ("tcp", ("[::1]", 9000))
+    with pytest.raises(ValueError, match="bad stream address"):
+        parse_address("localhost")
+
+
+def wait_done(client: StreamClient, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while client.live and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not client.live
+
+
+def test_server_to_client(tmp_path):
+    address = f"unix:{tmp_path / 's.sock'}"
+    joints = walk(frames=90, batch=2)
+    with StreamServer(address, 2, fps=20.0, meta={"text": ["a", "b"]}) as server:
+        pieces = list(chunks(joints, 10))
+        for _, piece in pieces[:3]:
+            server.send(piece)
+        # Joins late: the history replays the frames sent before it connected
+        late = StreamClient(address, connect_timeout=5.0).start()
+        wrap = StreamClient(address, max_frames=16, axis_map=YUP_TO_ZUP).start()
+        assert late.wait_first_frame(5.0).num_frames >= 10
+        for _, piece in pieces[3:]:
+            server.send(piece)
+        server.finish()
+        for client in (late, wrap):
+            wait_done(client)
+            client.close()
+
+    assert late.error is None and wrap.error is None
+    assert late.meta["text"] == ["a", "b"] and late.fps == 20.0
+    assert (late.buffer.num_frames, late.buffer.first_frame) == (90, 0)
+    assert not late.buffer.live
+    for i in (0, 45, 89):
+        np.testing.assert_array_equal(late.buffer.frame(i), joints[:, i])
+    assert (wrap.buffer.num_frames, wrap.buffer.first_frame) == (90, 74)
+    np.testing.assert_allclose(
+        wrap.buffer.frame(80), apply_axis_map(joints[:, 80], YUP_TO_ZUP)
+    )
+
+
+def test_client_reports_a_stream_without_frames(tmp_path):
+    address = f"unix:{tmp_path / 's.sock'}"
+    with StreamServer(address, 1, fps=20.0) as server:
+        server.finish()
+        client = StreamClient(address, connect_timeout=5.0).start()
+        with pytest.raises(ConnectionError, match="ended without frames"):
+            client.wait_first_frame(5.0)
+        client.close()
+
+
+def test_replay_as_fast_as_possible(make_store, tmp_path, capsys):
+    store = make_store(walk(frames=50, batch=2))
+    address = f"unix:{tmp_path / 's.sock'}"
+    replay(str(store.store_dir.parent), address, rate=0.0, chunk_frames=8, linger=False)
+    assert "Sent 50 frames" in capsys.readouterr().out
+
+
+def test_replay_rejects_retargeted_store(make_store, tmp_path):
+    store = make_store(walk(frames=30, batch=1))
+    out = retarget_store(store, tmp_path / "smplx", joint_set="smplx")
+    with pytest.raises(ValueError, match="22 T2M joints"):
+        replay(str(out), f"unix:{tmp_path / 's.sock'}", rate=0.0, linger=False)
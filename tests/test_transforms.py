@@ -0,0 +1,94 @@
+"""Tests for motion_gen_survey.transforms."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from motion_gen_survey.transforms import (
+    IDENTITY,
+    YUP_TO_ZUP,
+    ZUP_TO_YUP,
+    AxisMap,
+    apply_axis_map,
+    apply_rotation,
+    infer_up_axes,
+    infer_up_axis,
+    rotation_matrix,
+    up_axis_map,
+)
+from tests.conftest import walk
+
+
+class TestAxisMap:
+    def test_zup_to_yup_formula(self):
+        out = apply_axis_map(np.array([1.0, 2.0, 3.0]), ZUP_TO_YUP)
+        np.testing.assert_array_equal(out, [1.0, 3.0, -2.0])
+
+    def test_inverse_round_trip(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(4, 7, 3)).astype(np.float32)
+        back = apply_axis_map(apply_axis_map(x, YUP_TO_ZUP), ZUP_TO_YUP)
+        np.testing.assert_array_equal(back, x)
+        assert YUP_TO_ZUP.inverse() == ZUP_TO_YUP
+
+    @pytest.mark.parametrize(
+        "axis_map", [ZUP_TO_YUP, YUP_TO_ZUP, AxisMap((2, 0, 1), (-1.0, 1.0, -1.0))]
+    )
+    def test_matches_matrix(self, axis_map):
+        x = np.random.default_rng(1).normal(size=(50, 3))
+        np.testing.assert_allclose(apply_axis_map(x, axis_map), x @ axis_map.matrix.T)
+
+    def test_in_place_across_scratch_blocks(self):
+        x = np.random.default_rng(2).normal(size=(3, 101, 3)).astype(np.float32)
+        expected = apply_axis_map(x, ZUP_TO_YUP)
+        out = apply_axis_map(x, ZUP_TO_YUP, out=x, scratch_rows=16)
+        assert out is x
+        np.testing.assert_array_equal(x, expected)
+
+    def test_identity_in_place_is_noop(self):
+        x = np.arange(12.0).reshape(4, 3)
+        apply_axis_map(x, IDENTITY, out=x)
+        np.testing.assert_array_equal(x, np.arange(12.0).reshape(4, 3))
+
+    def test_rejects_bad_shapes(self):
+        with pytest.raises(ValueError):
+            apply_axis_map(np.zeros((4, 2)), ZUP_TO_YUP)
+        with pytest.raises(ValueError):
+            apply_axis_map(np.zeros((4, 3)), ZUP_TO_YUP, out=np.zeros((5, 3)))
+
+
+def test_rotation_in_place_matches_matmul():
+    x = np.random.default_rng(3).normal(size=(40, 3))
+    m = rotation_matrix("y", 30.0)
+    expected = x @ m.T
+    apply_rotation(x, m, out=x, scratch_rows=7)
+    np.testing.assert_allclose(x, expected)
+
+
+class TestInferUpAxis:
+    def test_walk_translating_horizontally_is_y_up(self):
+        # 120 frames at 1.4 m/s: ~8 m of travel along X, far more than the body height
+        joints = walk(frames=120, speed=1.4)[0]
+        assert np.ptp(joints[..., 0]) > 4 * np.ptp(joints[..., 1])
+        assert infer_up_axis(joints) == 1
+
+    def test_walk_converted_to_z_up(self):
+        joints = apply_axis_map(walk(frames=120, speed=1.4)[0], YUP_TO_ZUP)
+        assert infer_up_axis(joints) == 2
+
+    def test_batch_dims_gives_one_axis_per_sequence(self):
+        batch = walk(frames=80, batch=3)
+        batch[1] = apply_axis_map(batch[1], YUP_TO_ZUP)
+        np.testing.assert_array_equal(infer_up_axes(batch), [1, 2, 1])
+
+    def test_padding_and_nan_frames_do_not_vote(self):
+        joints = walk(frames=60)[0]
+        joints[20:] = 0.0
+        joints[10:15] = np.nan
+        assert infer_up_axis(joints) == 1
+
+    def test_up_axis_map_brings_z_up_to_y_up(self):
+        joints = apply_axis_map(walk(frames=40)[0], YUP_TO_ZUP)
+        fixed = apply_axis_map(joints, up_axis_map(infer_up_axis(joints)))
+        assert infer_up_axis(fixed) == 1